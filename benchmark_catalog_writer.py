@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark catalog updates: psql subprocess path vs. CatalogWriter.
+
+Compares, for a sample of catalog rows of one layer:
+1. psql      - one `psql -c "UPDATE ..."` process (and DB connection) per entity, as
+               layer_upload used to do
+2. writer    - CatalogWriter.update_entity (pooled connection, UPDATE ... RETURNING)
+3. batch     - CatalogWriter.queue_update + flush (execute_values, one transaction)
+
+Every path sets publish_date to its current value and rolls back, so the catalog is
+not modified.
+
+Usage: python3 benchmark_catalog_writer.py [layer] [--limit N] [--db gisdev]
+"""
+
+import argparse
+import subprocess
+import time
+
+import psycopg2
+import psycopg2.extras
+
+from layers_helpers import PG_CONNECTION
+from layers_scrape import CatalogWriter
+
+
+def fetch_sample(layer: str, limit: int) -> list[dict]:
+    """Return up to `limit` (layer_subgroup, county, city, publish_date) rows for the layer."""
+    conn = psycopg2.connect(PG_CONNECTION)
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute(
+                "SELECT layer_subgroup, county, city, publish_date FROM m_gis_data_catalog_main "
+                "WHERE status IS DISTINCT FROM 'DELETE' AND lower(layer_subgroup) = %s "
+                "AND county IS NOT NULL AND city IS NOT NULL LIMIT %s",
+                (layer.lower(), limit),
+            )
+            return [dict(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def _sql_literal(value) -> str:
+    return "NULL" if value is None else "'" + str(value).replace("'", "''") + "'"
+
+
+def bench_psql(rows: list[dict], db: str) -> float:
+    start = time.perf_counter()
+    for r in rows:
+        sql = (
+            "BEGIN; UPDATE m_gis_data_catalog_main SET publish_date = publish_date "
+            f"WHERE layer_subgroup = {_sql_literal(r['layer_subgroup'])} "
+            f"AND county = {_sql_literal(r['county'])} AND city = {_sql_literal(r['city'])}; ROLLBACK;"
+        )
+        subprocess.run(['psql', '-d', db, '-U', 'postgres', '-c', sql], capture_output=True, text=True, check=True)
+    return time.perf_counter() - start
+
+
+def bench_writer(rows: list[dict]) -> float:
+    writer = CatalogWriter(rollback_only=True)
+    try:
+        # Warm the pool so connection setup is not attributed to the first row
+        with writer.connection():
+            pass
+        start = time.perf_counter()
+        for r in rows:
+            writer.update_entity(r['layer_subgroup'], r['county'], r['city'], {'publish_date': r['publish_date']})
+        return time.perf_counter() - start
+    finally:
+        writer.close()
+
+
+def bench_batch(rows: list[dict]) -> float:
+    writer = CatalogWriter(rollback_only=True)
+    try:
+        with writer.connection():
+            pass
+        start = time.perf_counter()
+        for i, r in enumerate(rows):
+            writer.queue_update(r['layer_subgroup'], f"row_{i}", r['county'], r['city'], {'publish_date': r['publish_date']})
+        outcomes = writer.flush(rows[0]['layer_subgroup'])
+        elapsed = time.perf_counter() - start
+        errors = [msg for msg, _ in outcomes.values() if msg]
+        if errors:
+            print(f"  batch: {len(errors)} rows reported errors, e.g. {errors[0]}")
+        return elapsed
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog update paths (psql vs pooled writer vs batch).")
+    parser.add_argument("layer", nargs='?', default='zoning', help="layer_subgroup to sample (default: zoning)")
+    parser.add_argument("--limit", type=int, default=100, help="Number of catalog rows to update (default: 100)")
+    parser.add_argument("--db", default='gisdev', help="Database name for the psql path (default: gisdev)")
+    parser.add_argument("--skip-psql", action="store_true", help="Skip the psql subprocess path")
+    args = parser.parse_args()
+
+    rows = fetch_sample(args.layer, args.limit)
+    if not rows:
+        print(f"No catalog rows found for layer '{args.layer}'")
+        return
+    print(f"Benchmarking {len(rows)} catalog updates for layer '{args.layer}' (all rolled back)")
+
+    timings = {}
+    if not args.skip_psql:
+        timings['psql'] = bench_psql(rows, args.db)
+    timings['writer'] = bench_writer(rows)
+    timings['batch'] = bench_batch(rows)
+
+    baseline = timings.get('psql')
+    for name, seconds in timings.items():
+        per_row_ms = seconds / len(rows) * 1000
+        speedup = f"  ({baseline / seconds:.1f}x vs psql)" if baseline and name != 'psql' and seconds > 0 else ""
+        print(f"  {name:<7} {seconds:8.3f}s total  {per_row_ms:8.2f} ms/row{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark FILL mode field checks: per-field derivation vs. precomputed entity context.
+
+Runs the FILL health checks over the catalog records of one layer three ways:
+1. per-field - LayersPrescrape._check_field_health for every field, which parses the
+               entity and derives every expected value again on each call (how FILL
+               used to check records)
+2. context   - check_fill_records: one EntityContext per record shared by all checks
+3. pool      - the same across --workers processes (LayersPrescrape._check_fill_records)
+
+URLs are validated once up front (cached results are reused) so no path pays for them;
+nothing is written to the catalog, manual file or reports.
+
+Usage: python3 benchmark_fill_mode.py [layer] [--limit N] [--workers 4]
+"""
+
+import argparse
+import time
+
+from layers_prescrape import Config, LayersPrescrape, check_fill_records, format_name
+
+FIELDS = [
+    "new_title", "state", "county", "city", "src_url_file", "format", "download_method", "download",
+    "resource", "layer_group", "category", "sys_raw_folder", "table_name",
+    "fields_obj_transform", "layer_subgroup", "source_comments", "processing_comments", "distrib_comments",
+]
+
+
+def fetch_records(runner: LayersPrescrape, limit: int) -> list[tuple[str, dict]]:
+    """Return up to `limit` (entity, record) pairs for the runner's layer."""
+    layer_internal = format_name(runner.cfg.layer, 'layer', external=False)
+    layer_external = format_name(runner.cfg.layer, 'layer', external=True)
+    rows = runner.db.fetchall(
+        "SELECT * FROM m_gis_data_catalog_main WHERE status IS DISTINCT FROM 'DELETE' "
+        "AND (lower(title) LIKE %s OR lower(title) LIKE %s) ORDER BY title LIMIT %s",
+        (f'%{layer_internal}%', f'%{layer_external.lower()}%', limit),
+    )
+    records = [dict(row) for row in rows]
+    pairs = [(runner._generate_entity_from_record(r), r) for r in records]
+    return [(entity, r) for entity, r in pairs if entity != "ERROR"]
+
+
+def reset_state(runner: LayersPrescrape):
+    runner.missing_fields.clear()
+    runner.distrib_comments_updates.clear()
+
+
+def bench_per_field(runner: LayersPrescrape, pairs: list[tuple[str, dict]]) -> float:
+    reset_state(runner)
+    start = time.perf_counter()
+    for entity, record in pairs:
+        for field in FIELDS:
+            runner._check_field_health(record, entity, field)
+    return time.perf_counter() - start
+
+
+def bench_context(runner: LayersPrescrape, pairs: list[tuple[str, dict]]) -> float:
+    reset_state(runner)
+    start = time.perf_counter()
+    check_fill_records(runner.cfg.layer, pairs, FIELDS, runner._field_check_state(), runner._get_manual_overrides())
+    return time.perf_counter() - start
+
+
+def bench_pool(runner: LayersPrescrape, pairs: list[tuple[str, dict]], workers: int) -> float:
+    reset_state(runner)
+    runner.cfg.fill_workers = workers
+    start = time.perf_counter()
+    runner._check_fill_records(pairs, FIELDS)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FILL field checks (per-field vs entity context vs process pool).")
+    parser.add_argument("layer", nargs='?', default='zoning', help="Layer to check (default: zoning)")
+    parser.add_argument("--limit", type=int, default=2000, help="Number of catalog records to check (default: 2000)")
+    parser.add_argument("--workers", type=int, default=4, help="Processes for the pool path (default: 4)")
+    args = parser.parse_args()
+
+    runner = LayersPrescrape(Config(layer=args.layer, mode="fill", generate_csv=False))
+    pairs = fetch_records(runner, args.limit)
+    if not pairs:
+        print(f"No catalog records found for layer '{args.layer}'")
+        return
+    runner._batch_validate_urls(pairs)
+    runner._existing_titles_lower = {str(r.get('title') or '').strip().lower() for _, r in pairs}
+    print(f"Benchmarking FILL checks of {len(FIELDS)} fields over {len(pairs)} records for layer '{args.layer}'")
+
+    timings = {
+        'per-field': bench_per_field(runner, pairs),
+        'context': bench_context(runner, pairs),
+        f'pool x{args.workers}': bench_pool(runner, pairs, args.workers),
+    }
+
+    baseline = timings['per-field']
+    for name, seconds in timings.items():
+        rate = len(pairs) / seconds if seconds > 0 else float('inf')
+        speedup = f"  ({baseline / seconds:.1f}x vs per-field)" if name != 'per-field' and seconds > 0 else ""
+        print(f"  {name:<10} {seconds:8.3f}s total  {rate:10.0f} records/s{speedup}")
+    runner.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Catalog access layer for m_gis_data_catalog_main lookups.
+
+Lookups from layers_prescrape.py, layers_scrape.py, opendata_to_ags.py and
+table_to_catalog.py go through catalog_execute()/catalog_fetchall():
+  - each distinct SQL text is PREPAREd once per connection and run with EXECUTE, so
+    repeated lookups skip parsing and planning
+  - the first time a statement runs in a process, its plan is checked with EXPLAIN and
+    a warning is logged if it sequentially scans the catalog (missing index)
+
+The indexes those lookups rely on are declared in CATALOG_INDEXES:
+  - a pg_trgm GIN index on lower(title) for `lower(title) LIKE '%...%'` searches
+  - a btree on (layer_subgroup, lower(county), lower(city)) for non-deleted rows
+Lookups that read most of a layer are allowed to scan (see SEQ_SCAN_MAX_FRACTION).
+
+Usage:
+  python3 catalog_access.py                      # report missing indexes and check lookup plans
+  python3 catalog_access.py --create-indexes     # create missing indexes (CONCURRENTLY), then check
+  python3 catalog_access.py --layer flu          # sample layer used for the plan check
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import threading
+import weakref
+
+import psycopg2
+import psycopg2.extras
+
+from layers_helpers import PG_CONNECTION, format_name
+
+CATALOG_TABLE = 'm_gis_data_catalog_main'
+
+# Live (non-deleted) rows; the partial entity index uses the same predicate
+LIVE_PREDICATE = "status IS DISTINCT FROM 'DELETE'"
+
+# Supporting indexes: name -> CREATE statement (run with CONCURRENTLY by ensure_catalog_indexes)
+CATALOG_INDEXES = {
+    'm_gis_data_catalog_main_title_trgm_idx': (
+        f"CREATE INDEX {{concurrently}} IF NOT EXISTS m_gis_data_catalog_main_title_trgm_idx "
+        f"ON {CATALOG_TABLE} USING gin (lower(title) gin_trgm_ops)"
+    ),
+    'm_gis_data_catalog_main_entity_live_idx': (
+        f"CREATE INDEX {{concurrently}} IF NOT EXISTS m_gis_data_catalog_main_entity_live_idx "
+        f"ON {CATALOG_TABLE} (layer_subgroup, lower(county), lower(city)) WHERE {LIVE_PREDICATE}"
+    ),
+}
+
+# Extensions the indexes need: index name -> extension
+CATALOG_EXTENSIONS = {'m_gis_data_catalog_main_title_trgm_idx': 'pg_trgm'}
+
+# A sequential scan is only reported when the lookup is estimated to return less than this
+# share of the catalog; above it (e.g. every row of a large layer) a scan is the right plan
+SEQ_SCAN_MAX_FRACTION = 0.05
+
+# ---------------------------------------------------------------------------
+# Catalog Lookups
+# ---------------------------------------------------------------------------
+
+# Records whose title mentions the layer (prescrape DETECT/FILL)
+SQL_RECORDS_BY_TITLE = f"""
+    SELECT * FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+    AND (lower(title) LIKE %s OR lower(title) LIKE %s)
+    ORDER BY title
+"""
+
+# parcel_geo also matches "Parcel Polygons" / "Parcel Geometry" titles
+SQL_RECORDS_BY_TITLE_PARCELS = f"""
+    SELECT * FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+    AND (lower(title) LIKE %s OR lower(title) LIKE %s OR lower(title) LIKE %s OR lower(title) LIKE %s)
+    ORDER BY title
+"""
+
+# Live rows of one layer
+SQL_LAYER_ROWS = f"""
+    SELECT * FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+    AND layer_subgroup = %s
+"""
+
+# Live rows of one layer with a source URL (opendata_to_ags)
+SQL_LAYER_ROWS_WITH_URL = f"""
+    SELECT * FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+    AND layer_subgroup = %s
+    AND src_url_file IS NOT NULL
+    AND src_url_file != ''
+    ORDER BY title
+"""
+
+# Live rows of several layers with their field transforms (table_to_catalog)
+SQL_LAYERS_TRANSFORMS = f"""
+    SELECT ogc_fid, layer_subgroup, state, county, city, fields_obj_transform
+    FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+    AND layer_subgroup = ANY(%s)
+"""
+
+# Title and location of every live row (prescrape entity discovery reads the whole catalog)
+SQL_LIVE_TITLES = f"""
+    SELECT title, state, county, city
+    FROM {CATALOG_TABLE}
+    WHERE {LIVE_PREDICATE}
+"""
+
+_PLACEHOLDER = re.compile(r'%s')
+
+# Statement names already prepared, per connection
+_prepared: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+# Statement names whose plan was checked in this process
+_plan_checked: set[str] = set()
+_lock = threading.Lock()
+
+
+def statement_name(sql: str) -> str:
+    """Stable prepared-statement name for a SQL text."""
+    return 'catalog_' + hashlib.sha1(' '.join(sql.split()).encode('utf-8')).hexdigest()[:16]
+
+
+def _to_positional(sql: str) -> tuple[str, int]:
+    """Rewrite %s placeholders as $1..$n for PREPARE; returns (sql, n)."""
+    count = 0
+
+    def _next(_match):
+        nonlocal count
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(_next, sql), count
+
+
+def _seq_scans(plan: dict, table: str = CATALOG_TABLE) -> list[dict]:
+    """Seq Scan nodes on `table` anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') == table:
+        found.append(plan)
+    for child in plan.get('Plans', ()):
+        found.extend(_seq_scans(child, table))
+    return found
+
+
+def explain_statement(cur, sql: str, params=()) -> dict:
+    """Return the top plan node of a catalog lookup (EXPLAIN only, the query is not run)."""
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    row = cur.fetchone()
+    plan = row[0] if not isinstance(row, dict) else next(iter(row.values()))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def _catalog_rows(cur) -> float:
+    """Planner's row estimate for the catalog table."""
+    cur.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", (CATALOG_TABLE,))
+    row = cur.fetchone()
+    value = row[0] if not isinstance(row, dict) else next(iter(row.values()))
+    return max(float(value or 0), 0.0)
+
+
+def check_plan(cur, sql: str, params=(), name: str | None = None) -> bool:
+    """Warn if the lookup's plan sequentially scans the catalog for a selective lookup.
+
+    Returns True when the plan is fine (no catalog Seq Scan, or one estimated to return at
+    least SEQ_SCAN_MAX_FRACTION of the table).
+    """
+    scans = _seq_scans(explain_statement(cur, sql, params))
+    if scans:
+        table_rows = _catalog_rows(cur)
+        scans = [scan for scan in scans if scan.get('Plan Rows', 0) < SEQ_SCAN_MAX_FRACTION * table_rows]
+    for scan in scans:
+        logging.warning(
+            f"Catalog lookup {name or statement_name(sql)} plans a sequential scan of {CATALOG_TABLE}"
+            f" (filter: {str(scan.get('Filter', 'none'))[:200]}); check the indexes with: python3 catalog_access.py"
+        )
+    return not scans
+
+
+def catalog_execute(cur, sql: str, params=(), expect_full_scan: bool = False):
+    """Run a parameterized catalog lookup as a prepared statement on the cursor's connection.
+
+    The statement is PREPAREd the first time its SQL text is seen on a connection and run
+    with EXECUTE afterwards. Unless expect_full_scan (the lookup reads the whole live
+    catalog by design), its plan is checked once per process with check_plan().
+    """
+    params = tuple(params or ())
+    name = statement_name(sql)
+    conn = cur.connection
+    with _lock:
+        prepared = _prepared.setdefault(conn, set())
+        needs_prepare = name not in prepared
+        needs_check = not expect_full_scan and name not in _plan_checked
+        if needs_check:
+            _plan_checked.add(name)
+    if needs_prepare:
+        positional, count = _to_positional(sql)
+        if count != len(params):
+            raise ValueError(f"Catalog lookup expects {count} parameters, got {len(params)}")
+        cur.execute(f"PREPARE {name} AS {positional}")
+        with _lock:
+            prepared.add(name)
+    execute_sql = f"EXECUTE {name}" + (" (" + ", ".join(["%s"] * len(params)) + ")" if params else "")
+    if needs_check:
+        check_plan(cur, execute_sql, params, name)
+    cur.execute(execute_sql, params)
+    return cur
+
+
+def catalog_fetchall(cur, sql: str, params=(), expect_full_scan: bool = False) -> list:
+    return catalog_execute(cur, sql, params, expect_full_scan).fetchall()
+
+
+def catalog_fetchone(cur, sql: str, params=(), expect_full_scan: bool = False):
+    return catalog_execute(cur, sql, params, expect_full_scan).fetchone()
+
+# ---------------------------------------------------------------------------
+# Index Management
+# ---------------------------------------------------------------------------
+
+def missing_catalog_indexes(cur) -> list[str]:
+    """Names from CATALOG_INDEXES that do not exist on the catalog table."""
+    cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (CATALOG_TABLE,))
+    existing = {row[0] for row in cur.fetchall()}
+    return [name for name in CATALOG_INDEXES if name not in existing]
+
+
+def ensure_catalog_indexes(conn, create: bool = False) -> list[str]:
+    """Report (and with create=True, build) the missing supporting indexes.
+
+    Indexes are built with CREATE INDEX CONCURRENTLY so the catalog stays writable;
+    that needs autocommit, which is switched on for the duration.
+    Returns the names still missing afterwards.
+    """
+    with conn.cursor() as cur:
+        missing = missing_catalog_indexes(cur)
+    if not missing or not create:
+        return missing
+
+    autocommit = conn.autocommit
+    conn.rollback()
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for name in missing:
+                logging.info(f"Creating index {name}...")
+                try:
+                    if name in CATALOG_EXTENSIONS:
+                        cur.execute(f"CREATE EXTENSION IF NOT EXISTS {CATALOG_EXTENSIONS[name]}")
+                    cur.execute(CATALOG_INDEXES[name].format(concurrently='CONCURRENTLY'))
+                except psycopg2.Error as exc:
+                    # A failed CONCURRENTLY build leaves an INVALID index behind; drop it so a rerun retries
+                    logging.error(f"Could not create index {name}: {str(exc).strip()}")
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            cur.execute(f"ANALYZE {CATALOG_TABLE}")
+            return missing_catalog_indexes(cur)
+    finally:
+        conn.autocommit = autocommit
+
+
+def sample_lookups(layer: str) -> list[tuple[str, str, tuple]]:
+    """(label, sql, params) for the catalog lookups routed through this module."""
+    layer_internal = format_name(layer, 'layer', external=False)
+    layer_external = format_name(layer, 'layer', external=True).lower()
+    return [
+        ('records by title', SQL_RECORDS_BY_TITLE, (f'%{layer_internal}%', f'%{layer_external}%')),
+        ('parcel records by title', SQL_RECORDS_BY_TITLE_PARCELS,
+         ('%parcel_geo%', '%parcel geometry%', '%parcel polygons%', '%parcel geometry%')),
+        ('layer rows', SQL_LAYER_ROWS, (layer_internal,)),
+        ('layer rows with url', SQL_LAYER_ROWS_WITH_URL, (layer_internal,)),
+        ('layer transforms', SQL_LAYERS_TRANSFORMS, ([layer_internal],)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify (or create) the catalog indexes and check lookup plans.")
+    parser.add_argument("--create-indexes", action="store_true", help="Create missing indexes (CONCURRENTLY)")
+    parser.add_argument("--layer", default="zoning", help="Sample layer for the plan check (default: zoning)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+    conn = psycopg2.connect(PG_CONNECTION)
+    try:
+        missing = ensure_catalog_indexes(conn, create=args.create_indexes)
+        for name in missing:
+            logging.warning(f"Missing index {name}: {CATALOG_INDEXES[name].format(concurrently='CONCURRENTLY')}")
+        if not missing:
+            logging.info("All catalog indexes present")
+
+        failures = 0
+        with conn.cursor() as cur:
+            for label, sql, params in sample_lookups(args.layer):
+                plan = explain_statement(cur, sql, params)
+                ok = check_plan(cur, sql, params, label)
+                failures += not ok
+                print(f"  {'ok ' if ok else 'SEQ'}  {label:<25} {plan['Node Type']} (est. {plan.get('Plan Rows')} rows)")
+        conn.rollback()
+        if missing or failures:
+            raise SystemExit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -32,11 +32,17 @@ import datetime
 import logging
 import xml.etree.ElementTree as ET
 import io
+import json
+import os
+import threading
 import argparse
 import psycopg2  # Install with: pip install psycopg2-binary
 import psycopg2.extras
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, List, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlencode, urlparse
+from urllib3.util.retry import Retry
 import sys
 
 # Configure logging
@@ -46,6 +52,9 @@ logger = logging.getLogger(__name__)
 # Database connection string (same as ags_extract_data2.py)
 PG_CONNECTION = 'host=localhost port=5432 dbname=gisdev user=postgres password=galactic529'
 
+# Metadata revalidation cache used by the command line (see MetadataClient)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'ags_metadata_cache.json')
+
 class DateFinding:
     """Represents a date found by one of the methods"""
     def __init__(self, method: str, source: str, raw_value: str, converted_date: Optional[str] = None, 
@@ -213,12 +222,137 @@ def to_date_string(ms) -> Optional[str]:
         logger.warning(f"Failed to convert timestamp {ms}: {e}")
         return None
 
+class MetadataClient:
+    """Pooled HTTP client for service/layer metadata documents.
+
+    - One keep-alive session (connection pool, retry/backoff on 429/5xx) shared by all methods
+    - Each document is fetched once per run: concurrent callers asking for the same
+      URL wait for the first request, and errors are remembered for the run as well
+    - With a cache file, documents that carry an ETag/Last-Modified are kept across runs
+      and revalidated with If-None-Match/If-Modified-Since (a 304 reuses the stored body)
+    - At most `host_limit` requests are in flight per host
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, pool_size: int = 16, host_limit: int = 4):
+        self.cache_path = cache_path
+        self.host_limit = max(1, host_limit)
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._host_slots = {}
+        self._documents = {}  # key -> ('ok', body) | ('error', exception) for this run
+        self._stored = self._load_cache()  # key -> {'kind', 'etag', 'last_modified', 'body'}
+        self._dirty = False
+        self.stats = {'requests': 0, 'revalidated': 0, 'memo_hits': 0}
+
+    # -- persistent cache -------------------------------------------------
+
+    def _load_cache(self) -> dict:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the revalidation cache (temp file + rename)."""
+        if not self.cache_path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        with self._lock:
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._stored, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+    # -- fetching -----------------------------------------------------------
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict]) -> str:
+        if not params:
+            return url
+        return url + '?' + urlencode(sorted((k, str(v)) for k, v in params.items()))
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            return self._host_slots.setdefault(host, threading.BoundedSemaphore(self.host_limit))
+
+    def _fetch(self, key: str, url: str, params: Optional[dict], headers: Optional[dict], timeout: int, kind: str):
+        request_headers = dict(headers or {})
+        stored = self._stored.get(key)
+        if stored and stored.get('kind') == kind:
+            if stored.get('etag'):
+                request_headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                request_headers['If-Modified-Since'] = stored['last_modified']
+        else:
+            stored = None
+        with self._host_slot(url):
+            with self._lock:
+                self.stats['requests'] += 1
+            response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and stored:
+            logger.debug(f"Not modified since last run: {key}")
+            with self._lock:
+                self.stats['revalidated'] += 1
+            return stored['body']
+        response.raise_for_status()  # Raises HTTPError for bad status codes
+        body = response.json() if kind == 'json' else response.text
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if self.cache_path and (etag or last_modified):
+            with self._lock:
+                self._stored[key] = {'kind': kind, 'etag': etag, 'last_modified': last_modified, 'body': body}
+                self._dirty = True
+        return body
+
+    def _get(self, url: str, params: Optional[dict], headers: Optional[dict], timeout: int, kind: str):
+        key = self._key(url, params)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._documents:
+                with self._lock:
+                    self.stats['memo_hits'] += 1
+            else:
+                try:
+                    self._documents[key] = ('ok', self._fetch(key, url, params, headers, timeout, kind))
+                except Exception as e:
+                    self._documents[key] = ('error', e)
+            status, value = self._documents[key]
+        if status == 'error':
+            raise value
+        return value
+
+    def get_json(self, url: str, params: Optional[dict] = None, timeout: int = 30):
+        """Return the parsed JSON document (shared between callers, do not modify)."""
+        return self._get(url, params, None, timeout, 'json')
+
+    def get_text(self, url: str, headers: Optional[dict] = None, timeout: int = 30) -> str:
+        """Return the response text (e.g. XML metadata)."""
+        return self._get(url, None, headers, timeout, 'text')
+
+# Client used by all detection methods (see use_metadata_client)
+METADATA_CLIENT = MetadataClient()
+
+def use_metadata_client(client: MetadataClient) -> MetadataClient:
+    """Make `client` the one used by the detection methods; returns the previous client."""
+    global METADATA_CLIENT
+    previous, METADATA_CLIENT = METADATA_CLIENT, client
+    return previous
+
 def make_request(url: str, params: Optional[dict] = None, timeout: int = 30) -> Optional[dict]:
-    """Make HTTP request with proper error handling"""
+    """Make HTTP request with proper error handling (through the shared METADATA_CLIENT)"""
     try:
-        response = requests.get(url, params=params, timeout=timeout)
-        response.raise_for_status()  # Raises HTTPError for bad status codes
-        return response.json()
+        return METADATA_CLIENT.get_json(url, params=params, timeout=timeout)
     except requests.exceptions.Timeout:
         logger.error(f"Request timeout for URL: {url}")
         return None
@@ -528,16 +662,15 @@ def get_metadata_xml_date(layer_url: str) -> List[DateFinding]:
     
     try:
         # Make request with XML accept header
-        response = requests.get(metadata_url, headers={"Accept": "application/xml"}, timeout=30)
-        response.raise_for_status()
+        xml_text = METADATA_CLIENT.get_text(metadata_url, headers={"Accept": "application/xml"}, timeout=30)
         
-        logger.debug(f"Method 5: Received XML response, length: {len(response.text)} characters")
+        logger.debug(f"Method 5: Received XML response, length: {len(xml_text)} characters")
         
         # Parse XML with namespace awareness using iterparse
         try:
             # Extract namespaces dynamically
             namespaces = {}
-            xml_string = io.StringIO(response.text)
+            xml_string = io.StringIO(xml_text)
             
             # Use iterparse to extract namespaces
             for event, elem in ET.iterparse(xml_string, events=['start-ns']):
@@ -548,7 +681,7 @@ def get_metadata_xml_date(layer_url: str) -> List[DateFinding]:
             logger.debug(f"Method 5: Namespaces found: {namespaces}")
             
             # Parse the XML again to get the root element
-            root = ET.fromstring(response.text)
+            root = ET.fromstring(xml_text)
             
         except ET.ParseError as e:
             logger.warning(f"Method 5: Failed to parse XML metadata: {e}")
@@ -724,6 +857,14 @@ def validate_arcgis_url(url: str) -> bool:
     required_patterns = ['/rest/services/', '/MapServer/']
     return any(pattern in url for pattern in required_patterns)
 
+def _query_date_fields(layer_url: str) -> Tuple[List[str], List[DateFinding]]:
+    """Method 1: find candidate date fields and query max() of each (one field per request)."""
+    date_fields = find_date_field(layer_url)
+    findings = []
+    for field in date_fields:
+        findings.extend(query_max_date_field(layer_url, field))
+    return date_fields, findings
+
 def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFinding]]:
     """
     Determine the last update date of ArcGIS layer data using all available methods.
@@ -741,18 +882,26 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
     logger.info(f"=== Checking ArcGIS layer: {layer_url} ===")
     logger.info(f"Running all methods to collect comprehensive date information...")
     
+    # The methods are independent: run them concurrently (the layer ?f=json document they
+    # share is fetched once by METADATA_CLIENT), then report them in method order
+    with ThreadPoolExecutor(max_workers=5, thread_name_prefix='date-method') as pool:
+        method1 = pool.submit(_query_date_fields, layer_url)
+        method2 = pool.submit(get_editing_info_date, layer_url)
+        method3 = pool.submit(get_service_metadata_date, layer_url)
+        method4 = pool.submit(get_service_item_date, layer_url)
+        method5 = pool.submit(get_metadata_xml_date, layer_url)
+
     all_findings = []
     
     # Method 1: Try known date fields
-    logger.info(f"\n--- METHOD 1: Query date fields ---")
-    date_fields = find_date_field(layer_url)
+    date_fields, method1_findings = method1.result()
     if date_fields:
         for field in date_fields:
-            method1_findings = query_max_date_field(layer_url, field)
-            all_findings.extend(method1_findings)
+            field_findings = [f for f in method1_findings if f.source == field]
+            all_findings.extend(field_findings)
             
             # Log results for this field
-            reliable_findings = [f for f in method1_findings if f.reliable]
+            reliable_findings = [f for f in field_findings if f.reliable]
             if reliable_findings:
                 logger.info(f"✓ METHOD 1 SUCCESS: Found max({field}) = {reliable_findings[0].converted_date}")
             else:
@@ -761,8 +910,7 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
         logger.warning(f"✗ METHOD 1 FAILED: No suitable date fields found")
 
     # Method 2: Try editingInfo > lastEditDate
-    logger.info(f"\n--- METHOD 2: Check editing info ---")
-    method2_findings = get_editing_info_date(layer_url)
+    method2_findings = method2.result()
     all_findings.extend(method2_findings)
     
     reliable_findings = [f for f in method2_findings if f.reliable]
@@ -772,8 +920,7 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
         logger.warning(f"✗ METHOD 2 FAILED: No valid lastEditDate in editingInfo")
 
     # Method 3: Try service-level documentInfo > LastSaved
-    logger.info(f"\n--- METHOD 3: Check service metadata ---")
-    method3_findings = get_service_metadata_date(layer_url)
+    method3_findings = method3.result()
     all_findings.extend(method3_findings)
     
     reliable_findings = [f for f in method3_findings if f.reliable]
@@ -783,8 +930,7 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
         logger.warning(f"✗ METHOD 3 FAILED: No valid LastSaved in service documentInfo")
 
     # Method 4: Try ArcGIS.com service item metadata
-    logger.info(f"\n--- METHOD 4: Check service item metadata ---")
-    method4_findings = get_service_item_date(layer_url)
+    method4_findings = method4.result()
     all_findings.extend(method4_findings)
     
     reliable_findings = [f for f in method4_findings if f.reliable]
@@ -794,8 +940,7 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
         logger.warning(f"✗ METHOD 4 FAILED: No valid date found in service item metadata")
 
     # Method 5: Try XML metadata
-    logger.info(f"\n--- METHOD 5: Check XML metadata ---")
-    method5_findings = get_metadata_xml_date(layer_url)
+    method5_findings = method5.result()
     all_findings.extend(method5_findings)
     
     reliable_findings = [f for f in method5_findings if f.reliable]
@@ -818,6 +963,29 @@ def get_arcgis_data_date(layer_url: str) -> Tuple[Optional[str], List[DateFindin
     
     return most_reliable_date, all_findings
 
+def get_arcgis_data_dates(layer_urls: List[str], max_workers: int = 8) -> Dict[str, Tuple[Optional[str], List[DateFinding]]]:
+    """
+    Date many layers in one call.
+    
+    Layers run `max_workers` at a time (each running its methods concurrently) over the
+    shared METADATA_CLIENT, so service documents common to several layers are fetched once
+    and requests per host stay within the client's host limit.
+    
+    Returns:
+        {layer_url: (most_reliable_date, all_findings)} for every URL given
+    """
+    unique_urls = list(dict.fromkeys(u for u in layer_urls if u))
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='date-layer') as pool:
+        futures = {url: pool.submit(get_arcgis_data_date, url) for url in unique_urls}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logger.error(f"Date detection failed for {url}: {e}")
+                results[url] = (None, [])
+    return results
+
 def lookup_layer_url(county: Optional[str] = None, city: Optional[str] = None, table_name: Optional[str] = None) -> Optional[str]:
     """
     Look up layer URL from m_gis_data_catalog_main table based on search criteria
@@ -897,6 +1065,40 @@ def lookup_layer_url(county: Optional[str] = None, city: Optional[str] = None, t
         except:
             pass
 
+def lookup_layer_urls(table_names: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Look up the layer URLs of many catalog records in one query
+    
+    Args:
+        table_names: Table names to look up; None selects every AGS-format record
+        
+    Returns:
+        {table_name: src_url_file} for records that have a URL
+    """
+    connection = None
+    try:
+        connection = psycopg2.connect(PG_CONNECTION)
+        with connection.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
+            if table_names:
+                cursor.execute(
+                    "SELECT table_name, src_url_file FROM m_gis_data_catalog_main "
+                    "WHERE LOWER(table_name) = ANY(%s) ORDER BY table_name",
+                    ([t.lower() for t in table_names],),
+                )
+            else:
+                cursor.execute(
+                    "SELECT table_name, src_url_file FROM m_gis_data_catalog_main "
+                    "WHERE LOWER(format) = 'ags' ORDER BY table_name"
+                )
+            rows = cursor.fetchall()
+    except psycopg2.Error as e:
+        logger.error(f"Database error: {e}")
+        return {}
+    finally:
+        if connection is not None:
+            connection.close()
+    return {row['table_name']: row['src_url_file'] for row in rows if row['src_url_file']}
+
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(
@@ -911,6 +1113,10 @@ Examples:
   %(prog)s --county "palm beach" 
   %(prog)s --city "boca raton"
   %(prog)s --county "broward" --city "fort lauderdale"
+  
+  # Batch mode (one summary line per layer)
+  %(prog)s --tables zoning_fl_lake_unincorporated flu_fl_lake_unincorporated
+  %(prog)s --all-ags --workers 16
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -921,9 +1127,15 @@ Examples:
     
     # Database lookup group  
     url_group.add_argument("--table", help="Table name to lookup in database")
+    url_group.add_argument("--tables", nargs="+", help="Batch mode: table names to date in one run")
+    url_group.add_argument("--all-ags", action="store_true", help="Batch mode: date every AGS-format catalog record")
     
     parser.add_argument("--county", help="County name for database lookup")
     parser.add_argument("--city", help="City name for database lookup") 
+    parser.add_argument("--workers", type=int, default=8, help="Batch mode: layers dated concurrently (default 8)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help="Metadata revalidation cache (ETag/Last-Modified) kept across runs")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the metadata cache")
     parser.add_argument("--debug", action="store_true", help="Enable detailed debug logging")
     
     args = parser.parse_args()
@@ -931,6 +1143,28 @@ Examples:
     # Set up logging level
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
+    elif args.tables or args.all_ags:
+        # Per-method progress for hundreds of layers is noise; keep warnings and errors
+        logging.getLogger().setLevel(logging.WARNING)
+    
+    use_metadata_client(MetadataClient(cache_path=None if args.no_cache else args.cache))
+    
+    if args.tables or args.all_ags:
+        layer_urls = lookup_layer_urls(args.tables)
+        if not layer_urls:
+            print("ERROR: No layer URLs found")
+            sys.exit(1)
+        print(f"Dating {len(layer_urls)} layer(s) with {args.workers} worker(s)...")
+        results = get_arcgis_data_dates(list(layer_urls.values()), max_workers=args.workers)
+        METADATA_CLIENT.save()
+        width = max(len(t) for t in layer_urls)
+        for table_name, url in layer_urls.items():
+            date, _ = results.get(url, (None, []))
+            print(f"{table_name:<{width}}  {date or 'UNKNOWN':<26}  {url}")
+        stats = METADATA_CLIENT.stats
+        print(f"\n{stats['requests']} request(s), {stats['revalidated']} not modified since last run, "
+              f"{stats['memo_hits']} served from this run's cache")
+        sys.exit(0)
     
     # Determine the layer URL
     layer_url = None
@@ -957,6 +1191,7 @@ Examples:
     
     # Run the detection
     result, all_findings = get_arcgis_data_date(layer_url)
+    METADATA_CLIENT.save()
     
     print(("="*60))
     
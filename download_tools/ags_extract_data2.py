@@ -1,134 +1,916 @@
 #!/usr/bin/python
 # ags_extract_data.py
-# 
+#
 # History:
 #   original code: 2016 time frame?
-# 
+#   in-process extractor: pages the layer's query endpoint directly (no esri2geojson/ogr2ogr)
+#
 # USAGE: ./ags_extract_data.py <layer_table_name> {delete|nodelete} {delay in seconds} {field_names}
+#                              [--format geojson,shp] [--workers 4] [--page-size N]
+#                              [--url LAYER_URL --out-dir DIR] [--incremental [--full-refresh] [--pending-watermark]]
+#
+#   delay: minimum seconds between request starts to the AGS server (0 = no limit)
+#   --format: comma-separated outputs, any of geojson, geojsonseq, fgb, gpkg, shp
+#             (default geojson,shp = the files layers_scrape.py validates and processes)
+#   --incremental: fetch only features changed since the watermark stored by the last run;
+#                  prints "No new data available from server" when nothing changed
+#   --pending-watermark: leave the new watermark as .<layer>.ags_watermark.pending.json;
+#                  the caller promotes it once the downloaded data was fully processed
 #
 # PREREQUISITE:
 #
 #  Update m_gis_data_catalog_main:
 #   - Add / update record for the layer to be downloaded.
 #   - Fill in required fields (review previously entered county for example).
-# 
+#
 #
 
 # Import needed modules
-import sys,os,fileinput,string,math,psycopg2,io,datetime,urllib.request,urllib.parse,urllib.error,urllib.request,urllib.error,urllib.parse,json,shutil,time
-import psycopg2.extras
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# GDAL/OGR bindings write FlatGeobuf/GPKG/shapefile in-process; without them those
+# formats are converted from the streamed GeoJSON with ogr2ogr afterwards
+try:
+    from osgeo import ogr, osr
+    ogr.UseExceptions()
+    osr.UseExceptions()
+except Exception:
+    ogr = None
+    osr = None
+
+msgUsage = 'ags_extract_data.py <layer_table_name> {delete|nodelete} {delay in seconds} {field_names}'
+
+pg_connection = os.getenv('PG_CONNECTION', 'host=localhost port=5432 dbname=gisdev user=postgres password=galactic529')
+
+USER_AGENT = 'Mozilla/5.0 (compatible; ags_extract_data/2.0)'
+REQUEST_TIMEOUT = 120
+DEFAULT_PAGE_SIZE = 1000
+
+# Output format -> (file extension, OGR driver)
+OUTPUT_FORMATS = {
+    'geojson': ('.geojson', None),
+    'geojsonseq': ('.geojsons', None),
+    'fgb': ('.fgb', 'FlatGeobuf'),
+    'gpkg': ('.gpkg', 'GPKG'),
+    'shp': ('.shp', 'ESRI Shapefile'),
+}
+
+
+#-----------------------------------------------------------------------------------------
+# HTTP: keep-alive session + rate limiter
+#-----------------------------------------------------------------------------------------
+
+class RateLimiter:
+    """Spaces request starts at least `min_interval` seconds apart across all threads."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, float(min_interval or 0.0))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def make_session(pool_size: int) -> requests.Session:
+    """requests session with keep-alive connection pooling and retry/backoff for 429/5xx."""
+    session = requests.Session()
+    retry = Retry(total=5, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET', 'POST']), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(2, pool_size), max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class AGSClient:
+    """Minimal ArcGIS REST client for one layer (MapServer/FeatureServer .../<id>)."""
+
+    def __init__(self, layer_url: str, session: requests.Session, limiter: RateLimiter):
+        self.layer_url = layer_url.rstrip('/')
+        self.session = session
+        self.limiter = limiter
+        self.supports_geojson = True  # cleared after the first failed f=geojson query
+
+    def _request(self, path: str, params: dict) -> dict:
+        params = dict(params, f=params.get('f', 'json'))
+        url = self.layer_url + path
+        self.limiter.wait()
+        # POST keeps long where/objectIds clauses out of the URL
+        resp = self.session.post(url, data=params, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+        if isinstance(data, dict) and 'error' in data:
+            err = data['error']
+            raise RuntimeError(f"AGS error {err.get('code')}: {err.get('message')} {err.get('details') or ''}".strip())
+        return data
+
+    def info(self) -> dict:
+        return self._request('', {})
+
+    def object_ids(self, where: str = '1=1') -> tuple[str, list[int]]:
+        data = self._request('/query', {'where': where, 'returnIdsOnly': 'true'})
+        return data.get('objectIdFieldName'), sorted(data.get('objectIds') or [])
+
+    def count(self, where: str = '1=1') -> int:
+        return int(self._request('/query', {'where': where, 'returnCountOnly': 'true'}).get('count', 0))
+
+    def _query(self, params: dict) -> tuple[list[dict], bool]:
+        """One query request; returns (GeoJSON features, exceededTransferLimit)."""
+        if self.supports_geojson:
+            try:
+                data = self._request('/query', dict(params, f='geojson'))
+                if data.get('type') == 'FeatureCollection':
+                    # f=geojson reports the flag at the top level or under "properties"
+                    exceeded = data.get('exceededTransferLimit') or (data.get('properties') or {}).get('exceededTransferLimit')
+                    return data.get('features') or [], bool(exceeded)
+            except (RuntimeError, ValueError, requests.HTTPError):
+                pass
+            self.supports_geojson = False
+        data = self._request('/query', params)
+        geometry_type = data.get('geometryType')
+        features = [esri_to_geojson_feature(f, geometry_type) for f in data.get('features') or []]
+        return features, bool(data.get('exceededTransferLimit'))
+
+    def query_features(self, params: dict, out_fields: str) -> list[dict]:
+        """Return one page as GeoJSON features (asks for f=geojson, converts Esri JSON if needed).
+
+        An offset page the server cut short (exceededTransferLimit before resultRecordCount
+        features) is continued from where it stopped, so no features are silently lost.
+        """
+        base = {'outFields': out_fields, 'returnGeometry': 'true', 'outSR': '4326', **params}
+        features, exceeded = self._query(base)
+        if 'resultOffset' not in base:
+            if exceeded:
+                print(f" WARNING: server truncated a page (exceededTransferLimit): {base.get('where')}")
+            return features
+        offset = int(base['resultOffset'])
+        wanted = int(base.get('resultRecordCount') or 0)
+        while exceeded and features and (not wanted or len(features) < wanted):
+            rest = dict(base, resultOffset=str(offset + len(features)))
+            if wanted:
+                rest['resultRecordCount'] = str(wanted - len(features))
+            more, exceeded = self._query(rest)
+            if not more:
+                break
+            features.extend(more)
+        return features
+
+
+#-----------------------------------------------------------------------------------------
+# Esri JSON -> GeoJSON
+#-----------------------------------------------------------------------------------------
+
+def _ring_area(ring) -> float:
+    return sum(x0 * y1 - x1 * y0 for (x0, y0, *_), (x1, y1, *_) in zip(ring, ring[1:]))
+
+
+def _point_in_ring(pt, ring) -> bool:
+    x, y = pt[0], pt[1]
+    inside = False
+    for (x0, y0, *_), (x1, y1, *_) in zip(ring, ring[1:]):
+        if (y0 > y) != (y1 > y) and x < (x1 - x0) * (y - y0) / (y1 - y0) + x0:
+            inside = not inside
+    return inside
+
+
+def _esri_rings_to_geojson(rings):
+    # Esri outer rings are clockwise (negative shoelace area), holes counter-clockwise
+    outers, holes = [], []
+    for ring in rings:
+        if len(ring) < 4:
+            continue
+        (outers if _ring_area(ring) < 0 else holes).append(ring)
+    polygons = [[list(reversed(o))] for o in outers]  # GeoJSON wants CCW outer rings
+    for hole in holes:
+        for outer, poly in zip(outers, polygons):
+            if _point_in_ring(hole[0], outer):
+                poly.append(list(reversed(hole)))
+                break
+        else:
+            polygons.append([hole])  # orphan hole: keep it as its own polygon
+    if not polygons:
+        return None
+    if len(polygons) == 1:
+        return {'type': 'Polygon', 'coordinates': polygons[0]}
+    return {'type': 'MultiPolygon', 'coordinates': polygons}
+
+
+def esri_to_geojson_geometry(geom: dict, geometry_type: str = None):
+    if not geom:
+        return None
+    if 'x' in geom:
+        if geom.get('x') is None or geom.get('y') is None:
+            return None
+        return {'type': 'Point', 'coordinates': [geom['x'], geom['y']]}
+    if 'points' in geom:
+        return {'type': 'MultiPoint', 'coordinates': geom['points']}
+    if 'paths' in geom:
+        paths = geom['paths']
+        if len(paths) == 1:
+            return {'type': 'LineString', 'coordinates': paths[0]}
+        return {'type': 'MultiLineString', 'coordinates': paths}
+    if 'rings' in geom:
+        return _esri_rings_to_geojson(geom['rings'])
+    return None
+
+
+def esri_to_geojson_feature(feature: dict, geometry_type: str = None) -> dict:
+    return {
+        'type': 'Feature',
+        'properties': feature.get('attributes') or {},
+        'geometry': esri_to_geojson_geometry(feature.get('geometry'), geometry_type),
+    }
+
+
+#-----------------------------------------------------------------------------------------
+# Streaming writers
+#-----------------------------------------------------------------------------------------
+
+class GeoJSONWriter:
+    """Streams features into a FeatureCollection file (temp file, renamed on close)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.part'
+        self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        self.f.write('{"type": "FeatureCollection", "features": [\n')
+        self.count = 0
+
+    def write(self, features):
+        for feature in features:
+            if self.count:
+                self.f.write(',\n')
+            self.f.write(json.dumps(feature, ensure_ascii=False, separators=(',', ':')))
+            self.count += 1
+
+    def close(self):
+        self.f.write('\n]}\n')
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.f.close()
+        _remove(self.tmp_path)
+
+
+class GeoJSONSeqWriter(GeoJSONWriter):
+    """Streams features as newline-delimited GeoJSON (GeoJSONSeq)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.part'
+        self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, features):
+        for feature in features:
+            self.f.write(json.dumps(feature, ensure_ascii=False, separators=(',', ':')))
+            self.f.write('\n')
+            self.count += 1
+
+    def close(self):
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+
+# AGS field type -> OGR field type
+_OGR_FIELD_TYPES = {
+    'esriFieldTypeOID': 'OFTInteger64',
+    'esriFieldTypeInteger': 'OFTInteger64',
+    'esriFieldTypeSmallInteger': 'OFTInteger',
+    'esriFieldTypeDouble': 'OFTReal',
+    'esriFieldTypeSingle': 'OFTReal',
+    'esriFieldTypeDate': 'OFTDateTime',
+}
+
+
+class OGRWriter:
+    """Streams features into an OGR datasource (FlatGeobuf, GPKG, shapefile) in EPSG:4326.
+
+    Written under a temp name (<name>.part<ext>, with shapefile sidecars) and renamed over
+    the previous output on close, so a failed extract leaves the last good one in place.
+    """
+
+    def __init__(self, path: str, driver_name: str, layer_name: str, fields: list[dict], geometry_type: str = None):
+        self.path = path
+        stem, ext = os.path.splitext(path)
+        self.tmp_path = stem + '.part' + ext
+        self.count = 0
+        self.driver = driver = ogr.GetDriverByName(driver_name)
+        if os.path.exists(self.tmp_path):
+            driver.DeleteDataSource(self.tmp_path)
+        self.ds = driver.CreateDataSource(self.tmp_path)
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(4326)
+        srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        # Shapefiles hold a single geometry type; the other drivers accept mixed layers
+        geom_name = _ESRI_TO_OGR_GEOM.get(geometry_type) if driver_name == 'ESRI Shapefile' else None
+        self.layer = self.ds.CreateLayer(layer_name, srs, getattr(ogr, geom_name) if geom_name else ogr.wkbUnknown)
+        self.date_fields = set()
+        self.field_map = {}
+        for field in fields:
+            name = field['name']
+            ftype = _OGR_FIELD_TYPES.get(field.get('type'), 'OFTString')
+            defn = ogr.FieldDefn(name, getattr(ogr, ftype))
+            if ftype == 'OFTString' and field.get('length'):
+                defn.SetWidth(min(int(field['length']), 254 if driver_name == 'ESRI Shapefile' else int(field['length'])))
+            self.layer.CreateField(defn)
+            if ftype == 'OFTDateTime':
+                self.date_fields.add(name)
+        # The driver may have laundered names (e.g. shapefile 10-char limit): map by position
+        layer_defn = self.layer.GetLayerDefn()
+        for i, field in enumerate(fields):
+            self.field_map[field['name']] = layer_defn.GetFieldDefn(i).GetName()
+        self.defn = layer_defn
+        self.transactional = driver_name == 'GPKG'
+        if self.transactional:
+            self.layer.StartTransaction()
+
+    def write(self, features):
+        for feature in features:
+            out = ogr.Feature(self.defn)
+            for name, value in (feature.get('properties') or {}).items():
+                target = self.field_map.get(name)
+                if target is None or value is None:
+                    continue
+                if name in self.date_fields and isinstance(value, (int, float)):
+                    dt = datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=value)
+                    out.SetField(target, dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, 100)
+                else:
+                    out.SetField(target, value)
+            geometry = feature.get('geometry')
+            if geometry:
+                out.SetGeometry(ogr.CreateGeometryFromJson(json.dumps(geometry)))
+            self.layer.CreateFeature(out)
+            self.count += 1
+            if self.transactional and self.count % 10000 == 0:
+                self.layer.CommitTransaction()
+                self.layer.StartTransaction()
+
+    def close(self):
+        if self.transactional:
+            self.layer.CommitTransaction()
+        self.layer = None
+        self.ds = None
+        # Replace the previous output (all its sidecar files) with the finished temp one
+        if os.path.exists(self.path):
+            self.driver.DeleteDataSource(self.path)
+        tmp_stem = os.path.splitext(self.tmp_path)[0]
+        stem = os.path.splitext(self.path)[0]
+        for name in glob.glob(glob.escape(tmp_stem) + '.*'):
+            os.replace(name, stem + name[len(tmp_stem):])
+
+    def abort(self):
+        self.layer = None
+        self.ds = None
+        if os.path.exists(self.tmp_path):
+            self.driver.DeleteDataSource(self.tmp_path)
+
+
+_ESRI_TO_OGR_GEOM = {
+    'esriGeometryPoint': 'wkbPoint',
+    'esriGeometryMultipoint': 'wkbMultiPoint',
+    'esriGeometryPolyline': 'wkbMultiLineString',
+    'esriGeometryPolygon': 'wkbMultiPolygon',
+}
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def open_writers(formats: list[str], out_dir: str, base_name: str, info: dict) -> tuple[list, list]:
+    """Return (writers, deferred) for the requested formats.
+
+    OGR formats are written in-process when the GDAL bindings are available; otherwise
+    they are returned in `deferred` as (fmt, path) to be converted with ogr2ogr.
+    """
+    writers, deferred = [], []
+    fields = info.get('fields') or []
+    for fmt in formats:
+        ext, driver = OUTPUT_FORMATS[fmt]
+        path = os.path.join(out_dir, base_name + ext)
+        if fmt == 'geojson':
+            writers.append(GeoJSONWriter(path))
+        elif fmt == 'geojsonseq':
+            writers.append(GeoJSONSeqWriter(path))
+        elif ogr is not None:
+            writers.append(OGRWriter(path, driver, base_name, fields, info.get('geometryType')))
+        else:
+            deferred.append((fmt, path))
+    return writers, deferred
 
+
+#-----------------------------------------------------------------------------------------
+# Extraction
+#-----------------------------------------------------------------------------------------
+
+def _oid_field_name(info: dict, reported: str = None) -> str:
+    return reported or info.get('objectIdField') or next(
+        (f['name'] for f in info.get('fields') or [] if f.get('type') == 'esriFieldTypeOID'), None)
+
+
+def _page_size(info: dict, page_size: int) -> int:
+    max_records = int(info.get('maxRecordCount') or page_size)
+    return max(1, min(page_size, max_records))
+
+
+def plan_pages(client: AGSClient, info: dict, page_size: int, where: str = '1=1', oids: tuple = None) -> list[dict]:
+    """Return query params for every page: objectId ranges when possible, else resultOffset.
+
+    `oids` is an already fetched (oid_field, sorted ids) pair, to save the returnIdsOnly call.
+    """
+    size = _page_size(info, page_size)
+    if oids is None:
+        try:
+            oids = client.object_ids(where)
+        except (RuntimeError, ValueError, requests.RequestException):
+            oids = (None, [])
+    oid_field, ids = _oid_field_name(info, oids[0]), oids[1]
+    if oid_field and ids:
+        pages = []
+        for i in range(0, len(ids), size):
+            chunk = ids[i:i + size]
+            # ids are sorted, so the range holds exactly this chunk
+            pages.append({'where': f"({where}) AND {oid_field} >= {chunk[0]} AND {oid_field} <= {chunk[-1]}"})
+        return pages
+
+    supports_paging = (info.get('advancedQueryCapabilities') or {}).get('supportsPagination')
+    if supports_paging:
+        total = client.count(where)
+        order = {'orderByFields': oid_field} if oid_field else {}
+        return [dict(order, where=where, resultOffset=str(offset), resultRecordCount=str(size))
+                for offset in range(0, total, size)]
+
+    print(' WARNING: layer supports neither objectId paging nor resultOffset; single request may be truncated')
+    return [{'where': where}]
+
+
+def fetch_pages(client: AGSClient, pages: list[dict], out_fields: str, workers: int):
+    """Yield each page's features in page order, fetching up to 2*workers pages ahead."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        window = max(1, workers) * 2
+        futures = []
+        next_page = 0
+        while next_page < len(pages) or futures:
+            while next_page < len(pages) and len(futures) < window:
+                futures.append(pool.submit(client.query_features, pages[next_page], out_fields))
+                next_page += 1
+            yield futures.pop(0).result()
+
+
+def write_outputs(batches, formats: list[str], out_dir: str, base_name: str, info: dict) -> tuple[int, list[str]]:
+    """Stream feature batches to every requested output; return (feature count, output paths)."""
+    writers, deferred = open_writers(formats, out_dir, base_name, info)
+    if deferred and not any(isinstance(w, GeoJSONWriter) for w in writers):
+        # ogr2ogr needs a source file; stream a GeoJSONSeq alongside
+        seq_path = os.path.join(out_dir, base_name + OUTPUT_FORMATS['geojsonseq'][0])
+        writers.append(GeoJSONSeqWriter(seq_path))
+    total = 0
+    try:
+        for features in batches:
+            for writer in writers:
+                writer.write(features)
+            total += len(features)
+        for writer in writers:
+            writer.close()
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    outputs = [w.path for w in writers]
+    for fmt, path in deferred:
+        source = next(w.path for w in writers if isinstance(w, GeoJSONWriter))
+        ogr2ogr_convert(source, path, OUTPUT_FORMATS[fmt][1])
+        outputs.append(path)
+    return total, outputs
+
+
+def extract_layer(layer_url: str, out_dir: str, base_name: str, formats: list[str], out_fields: str = '*',
+                  delay: float = 0.0, workers: int = 4, page_size: int = DEFAULT_PAGE_SIZE,
+                  where: str = '1=1', session: requests.Session = None, client: AGSClient = None,
+                  info: dict = None, oids: tuple = None) -> dict:
+    """Page through an AGS layer and stream every feature to the requested outputs.
+
+    Pages are fetched `workers` at a time over one keep-alive session, with request
+    starts spaced by `delay` seconds, and written in page order as they arrive, so at
+    most ~2*workers pages are held in memory. Returns {'features', 'pages', 'outputs'}.
+    """
+    client = client or AGSClient(layer_url, session or make_session(workers), RateLimiter(delay))
+    info = info or client.info()
+    pages = plan_pages(client, info, page_size, where, oids=oids)
+    print(f' {len(pages)} page(s) to fetch with {workers} worker(s), delay {client.limiter.min_interval}s')
+    total, outputs = write_outputs(fetch_pages(client, pages, out_fields, workers), formats, out_dir, base_name, info)
+    return {'features': total, 'pages': len(pages), 'outputs': outputs}
+
+
+#-----------------------------------------------------------------------------------------
+# Incremental sync (watermarks)
+#-----------------------------------------------------------------------------------------
 #
-# retrieve the required parameters
+# A watermark is stored next to the outputs after every successful extract. It is first
+# written as a pending watermark; with --pending-watermark it is only promoted (by the
+# caller, e.g. layers_scrape.py once the whole entity succeeded, via commit_watermark) so
+# a failure in a later stage does not turn the next run into a false NND:
+#   last_edit_date  editingInfo.lastEditDate (epoch ms, may be null)
+#   date_field      per-feature edit date field used to select changed features
+#   max_date        max(date_field) (epoch ms)
+#   count / max_oid / oid_checksum / oid_ranges   the layer's object ids
 #
-msgUsage = 'ags_extract_data.py <layer_table_name> {delete|nodelete} {delay in seconds} {field_names}'
+# On the next run only the metadata, the id list and max(date_field) are requested.
+# Identical ids and dates -> no new data. Otherwise only new ids and features with
+# date_field within EDIT_QUERY_MARGIN_MS of the previous max or later are fetched and merged
+# into the existing GeoJSON.
+# A full refresh happens when there is no usable watermark, the ids were mostly
+# replaced (layer rebuilt/republished), or there is no date field to find edits with.
 
-try:
-    layer = sys.argv[1].lower()
-    
+WATERMARK_VERSION = 1
+
+# Edit date fields in the order they are preferred (after editFieldsInfo.editDateField)
+DATE_FIELD_CANDIDATES = [
+    'last_edited_date', 'edit_date', 'dt_chg', 'mod_date', 'modified_date', 'update_date',
+]
+
+# Share of ids added or removed beyond which the layer is treated as rebuilt
+REBUILD_CHURN = 0.5
+
+# How far before the stored max(date_field) the edit query starts. Dates come back as UTC epoch
+# ms, but ArcGIS reads timestamp literals in the layer's dateFieldsTimeReference zone (e.g.
+# "Eastern Standard Time", a Windows zone name), so a UTC cutoff can land hours late there.
+# A day covers every UTC offset; the extra refetched features are replaced, not duplicated.
+EDIT_QUERY_MARGIN_MS = 24 * 60 * 60 * 1000
+
+NND_MESSAGE = 'No new data available from server'
+
+
+def watermark_path(out_dir: str, base_name: str) -> str:
+    return os.path.join(out_dir, f'.{base_name}.ags_watermark.json')
+
+
+def pending_watermark_path(out_dir: str, base_name: str) -> str:
+    return os.path.join(out_dir, f'.{base_name}.ags_watermark.pending.json')
+
+
+def commit_watermark(out_dir: str, base_name: str) -> bool:
+    """Promote the pending watermark to the one the next sync compares against."""
     try:
-        delete_existing = sys.argv[2].upper()
-    except:
-        delete_existing = 'FALSE'
+        os.replace(pending_watermark_path(out_dir, base_name), watermark_path(out_dir, base_name))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def load_watermark(path: str) -> dict | None:
     try:
-        delay = float(sys.argv[3])
-    except:
-        delay = 15
+        with open(path, 'r', encoding='utf-8') as f:
+            watermark = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return watermark if watermark.get('version') == WATERMARK_VERSION else None
+
+
+def save_watermark(path: str, watermark: dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(watermark, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def oid_ranges(oids: list[int]) -> list[list[int]]:
+    """Compress sorted ids into [start, end] runs (object ids are mostly contiguous)."""
+    ranges = []
+    for oid in oids:
+        if ranges and oid == ranges[-1][1] + 1:
+            ranges[-1][1] = oid
+        else:
+            ranges.append([oid, oid])
+    return ranges
+
+
+def expand_oid_ranges(ranges: list[list[int]]) -> set[int]:
+    return {oid for start, end in ranges for oid in range(start, end + 1)}
+
+
+def oid_checksum(oids: list[int]) -> str:
+    return hashlib.blake2b(array('q', oids).tobytes(), digest_size=16).hexdigest()
+
+
+def pick_date_field(info: dict) -> tuple[str | None, bool]:
+    """Return (date field, tracked) where tracked means it is the editor-tracking field."""
+    edit_field = (info.get('editFieldsInfo') or {}).get('editDateField')
+    date_fields = {f.get('name', '').lower(): f.get('name') for f in info.get('fields') or []
+                   if f.get('type') == 'esriFieldTypeDate'}
+    if edit_field and edit_field.lower() in date_fields:
+        return date_fields[edit_field.lower()], True
+    for candidate in DATE_FIELD_CANDIDATES:
+        if candidate in date_fields:
+            return date_fields[candidate], False
+    return None, False
+
+
+def max_date_value(client: AGSClient, field: str) -> int | None:
+    """max(field) as epoch ms, via outStatistics (falls back to ORDER BY field DESC)."""
+    stats = json.dumps([{'statisticType': 'max', 'onStatisticField': field, 'outStatisticFieldName': 'max_value'}])
     try:
-        field_names = sys.argv[4].upper()
-    except:
-        field_names = '*'
-    
-except:
-    print(msgUsage)
-    sys.exit(0)
+        data = client._request('/query', {'where': '1=1', 'outStatistics': stats})
+        attributes = (data.get('features') or [{}])[0].get('attributes') or {}
+        value = next(iter(attributes.values()), None)
+    except (RuntimeError, ValueError, requests.HTTPError):
+        data = client._request('/query', {'where': f'{field} IS NOT NULL', 'outFields': field, 'orderByFields': f'{field} DESC',
+                                          'resultRecordCount': '1', 'returnGeometry': 'false'})
+        value = ((data.get('features') or [{}])[0].get('attributes') or {}).get(field)
+    return int(value) if isinstance(value, (int, float)) else None
 
 
-pg_connection = 'host=localhost port=5432 dbname=gisdev user=postgres password=galactic529'
-pg_psql = 'psql -h localhost -p 5432 -d gisdev -U postgres -c '
+def take_watermark(client: AGSClient, info: dict) -> tuple[dict, list[int]]:
+    """Read the layer's current watermark; returns (watermark, sorted object ids)."""
+    oid_field, oids = client.object_ids()
+    oid_field = _oid_field_name(info, oid_field)
+    date_field, tracked = pick_date_field(info)
+    watermark = {
+        'version': WATERMARK_VERSION,
+        'layer_url': client.layer_url,
+        'taken_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'last_edit_date': (info.get('editingInfo') or {}).get('lastEditDate'),
+        'oid_field': oid_field,
+        'count': len(oids),
+        'max_oid': oids[-1] if oids else None,
+        'oid_checksum': oid_checksum(oids),
+        'oid_ranges': oid_ranges(oids),
+        'date_field': date_field,
+        'date_field_tracked': tracked,
+        'max_date': max_date_value(client, date_field) if date_field else None,
+    }
+    return watermark, oids
 
 
-# connect to database
-connection = psycopg2.connect(pg_connection)
+def plan_sync(previous: dict | None, current: dict, current_oids: list[int]) -> tuple[str, str, set, set]:
+    """Compare watermarks; return (action, reason, added ids, removed ids).
 
-# arg to cursor allows selection by column name
-cursor = connection.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    action is 'nnd', 'incremental' or 'full'.
+    """
+    if previous is None:
+        return 'full', 'no previous watermark', set(), set()
+    if previous.get('layer_url') != current['layer_url'] or previous.get('oid_field') != current['oid_field'] \
+            or not current['oid_field']:
+        return 'full', 'layer URL or object id field changed', set(), set()
 
-# pump up the memory
-sql = """set work_mem = '2000MB';"""
-#print sql    
-cursor.execute(sql)
-connection.commit()
+    same_ids = previous.get('oid_checksum') == current['oid_checksum'] and previous.get('count') == current['count']
+    same_date_field = previous.get('date_field') == current['date_field']
+    same_max_date = same_date_field and current['date_field'] and previous.get('max_date') == current['max_date']
+    same_edit = current['last_edit_date'] is not None and previous.get('last_edit_date') == current['last_edit_date']
+    if same_ids and (same_edit or same_max_date) and (same_edit or current['last_edit_date'] is None):
+        return 'nnd', 'object ids and edit dates unchanged', set(), set()
 
-print(" ")
-print(" START layer extract from AGS \n")
+    previous_oids = expand_oid_ranges(previous.get('oid_ranges') or [])
+    oids = set(current_oids)
+    added, removed = oids - previous_oids, previous_oids - oids
+    if (current['max_oid'] or 0) < (previous.get('max_oid') or 0) and not (oids & previous_oids):
+        return 'full', 'object ids were renumbered (layer rebuilt)', added, removed
+    if len(removed) > REBUILD_CHURN * max(1, previous.get('count') or 0) or len(added) > REBUILD_CHURN * max(1, len(oids)):
+        return 'full', f'{len(added)} ids added / {len(removed)} removed (layer rebuilt)', added, removed
+    if not current['date_field'] or not same_date_field or previous.get('max_date') is None:
+        return 'full', 'no edit date field to select changed features', added, removed
+    if not current['date_field_tracked'] and not same_edit and current['last_edit_date'] is not None \
+            and same_max_date and not added and not removed:
+        # Edited, but the (non editor-tracked) date field did not move: edits are invisible to it
+        return 'full', f"layer edited without {current['date_field']} changing", added, removed
+    return 'incremental', f'{len(added)} ids added, {len(removed)} removed', added, removed
 
-#-----------------------------------------------------------------------------------------
-# Get data info from m_gis_data_catalog_main table
-#-----------------------------------------------------------------------------------------    
-sql = """SELECT * FROM m_gis_data_catalog_main WHERE table_name = '""" + layer + """';  """
-#print " "
-#print sql
-cursor.execute(sql)
-connection.commit()
-
-# initialize variables that have info about the SHP from parcel_shp_fields
-rows = cursor.fetchall()
-for row in rows:
-    #shp_name = row['sys_raw_file']
-    #print 'shp_name:',shp_name
-    layer_url = row['src_url_file']
-    temp_table_name = row['table_name']
-    sys_raw_folder = row['sys_raw_folder']
-    #columns_transform = row['fields_obj_transform']
-    srs_epsg = str(row['srs_epsg']) 
-    
-    #shp_date = str(row['shp_date'])
-    #shp_pin_clean = row['shp_pin_clean']
-    #import_fields = row['import_fields']
-
-# close communication with the database
-cursor.close()
-connection.close()
-
-
-# Set working directory
-    
-os.chdir(sys_raw_folder)
-print('CWD: ', os.getcwd())
 
+def iter_geojson_features(path: str):
+    """Yield features from a GeoJSON written by GeoJSONWriter (one feature per line) or GeoJSONSeq.
+
+    Raises ValueError for any other layout (e.g. a file from an older extractor).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if path.endswith(OUTPUT_FORMATS['geojsonseq'][0]):
+            lines = [first]
+        elif first.startswith('{"type": "FeatureCollection", "features": ['):
+            lines = []
+        else:
+            raise ValueError(f'{os.path.basename(path)} is not in the streamed one-feature-per-line layout')
+        for line in [*lines, *f]:
+            line = line.strip().rstrip(',')
+            if not line or line == ']}':
+                continue
+            yield json.loads(line)
+
+
+def _feature_oid(feature: dict, oid_field: str):
+    properties = feature.get('properties') or {}
+    oid = properties.get(oid_field)
+    return oid if oid is not None else feature.get('id')
 
-#-----------------------------------------------------------------------------------------
-# 
-#-----------------------------------------------------------------------------------------
 
-url = layer_url
-out_file_file = temp_table_name
-out_file = out_file_file + ".geojson"
+def _iso_timestamp(ms: int) -> str:
+    return (datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=ms)).strftime('%Y-%m-%d %H:%M:%S')
 
-# esri2geojson http://cookviewer1.cookcountyil.gov/ArcGIS/rest/services/cookVwrDynmc/MapServer/11 cookcounty.geojson
-# esri2geojson https://gis.lakecountyfl.gov/lakegis/rest/services/LocalGov/CityFLU/MapServer/9 flu_minneola.geojson
 
-#if delete_existing == 'DELETE' and not (os.path.isfile(out_file)):
+def sync_layer(layer_url: str, out_dir: str, base_name: str, formats: list[str], out_fields: str = '*',
+               delay: float = 0.0, workers: int = 4, page_size: int = DEFAULT_PAGE_SIZE,
+               full_refresh: bool = False, session: requests.Session = None, defer_commit: bool = False) -> dict:
+    """Extract a layer incrementally against the watermark stored from the previous run.
+
+    Returns the extract_layer result plus 'action' ('nnd', 'incremental' or 'full') and
+    'reason'. The new watermark is written as pending once the outputs were written and
+    promoted right away, or, with defer_commit, left for the caller's commit_watermark().
+    """
+    client = AGSClient(layer_url, session or make_session(workers), RateLimiter(delay))
+    info = client.info()
+    wm_path = watermark_path(out_dir, base_name)
+    current, oids = take_watermark(client, info)
+    previous = None if full_refresh else load_watermark(wm_path)
+    action, reason, added, removed = plan_sync(previous, current, oids)
+
+    source = next((os.path.join(out_dir, base_name + OUTPUT_FORMATS[fmt][0]) for fmt in ('geojson', 'geojsonseq')
+                   if fmt in formats), None)
+    oid_field = current['oid_field']
+    if action != 'full':
+        missing = [fmt for fmt in formats if not os.path.exists(os.path.join(out_dir, base_name + OUTPUT_FORMATS[fmt][0]))]
+        if missing:
+            action, reason = 'full', f"missing previous output(s): {', '.join(missing)}"
+        elif source is None:
+            action, reason = 'full', 'incremental merge needs a geojson or geojsonseq output'
+        elif out_fields != '*' and oid_field not in [f.strip() for f in out_fields.split(',')]:
+            action, reason = 'full', f'field list does not include {oid_field}'
+    print(f' Sync: {action} ({reason})')
+
+    if action == 'nnd':
+        return {'action': action, 'reason': reason, 'features': current['count'], 'pages': 0, 'outputs': []}
+
+    if action == 'full':
+        result = extract_layer(layer_url, out_dir, base_name, formats, out_fields=out_fields, workers=workers,
+                               page_size=page_size, client=client, info=info, oids=(oid_field, oids))
+    else:
+        since = _iso_timestamp(previous['max_date'] - EDIT_QUERY_MARGIN_MS)
+        date_field = current['date_field']
+        time_zone = (info.get('dateFieldsTimeReference') or {}).get('timeZone')
+        if time_zone and time_zone.upper() != 'UTC':
+            print(f" Date fields are in {time_zone}; edit query starts a day before the stored max")
+        # Edits since (max - margin): refetched features are replaced, not duplicated
+        _, edited = client.object_ids(f"{date_field} > timestamp '{since}'")
+        fetch_ids = sorted(set(edited) | added)
+        size = _page_size(info, page_size)
+        pages = [{'objectIds': ','.join(str(oid) for oid in fetch_ids[i:i + size])} for i in range(0, len(fetch_ids), size)]
+        print(f' {len(fetch_ids)} changed/new feature(s) in {len(pages)} page(s), {len(removed)} removed')
+        replaced = set(fetch_ids) | removed
+
+        # Fetch the (small) changed set first so a failed request leaves the outputs untouched
+        fetched = [features for features in fetch_pages(client, pages, out_fields, workers)]
+
+        def merged():
+            batch = []
+            for feature in iter_geojson_features(source):
+                if _feature_oid(feature, oid_field) in replaced:
+                    continue
+                batch.append(feature)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            yield from fetched
+
+        try:
+            total, outputs = write_outputs(merged(), formats, out_dir, base_name, info)
+        except ValueError as e:
+            print(f' Incremental merge not possible ({e}); running a full refresh')
+            action, reason = 'full', str(e)
+            result = extract_layer(layer_url, out_dir, base_name, formats, out_fields=out_fields, workers=workers,
+                                   page_size=page_size, client=client, info=info, oids=(oid_field, oids))
+        else:
+            result = {'features': total, 'pages': len(pages), 'outputs': outputs}
+            if total != current['count']:
+                print(f" WARNING: merged {total} features but the layer reports {current['count']}")
+
+    save_watermark(pending_watermark_path(out_dir, base_name), current)
+    if not defer_commit:
+        commit_watermark(out_dir, base_name)
+    return dict(result, action=action, reason=reason)
+
+
+def ogr2ogr_convert(source: str, target: str, driver: str):
+    """Fallback conversion when the GDAL Python bindings are not installed."""
+    cmd = ['ogr2ogr', '-overwrite', '-a_srs', 'EPSG:4326', '-f', driver, target, source]
+    print(' '.join(cmd))
+    subprocess.run(cmd, check=True)
+
+
+def catalog_row_for(table_name: str) -> dict:
+    """Read the catalog row for a table_name (layer URL, raw folder)."""
+    import psycopg2
+    import psycopg2.extras
+    connection = psycopg2.connect(pg_connection)
+    try:
+        with connection.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
+            cursor.execute(
+                "SELECT src_url_file, table_name, sys_raw_folder FROM m_gis_data_catalog_main WHERE table_name = %s",
+                (table_name,),
+            )
+            row = cursor.fetchone()
+    finally:
+        connection.close()
+    if row is None:
+        raise SystemExit(f"No m_gis_data_catalog_main record with table_name '{table_name}'")
+    return dict(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(usage=msgUsage + ' [options]')
+    parser.add_argument('layer', help='table_name of the m_gis_data_catalog_main record')
+    parser.add_argument('delete_existing', nargs='?', default='FALSE', help='DELETE to remove existing outputs first')
+    parser.add_argument('delay', nargs='?', default='0', help='minimum seconds between requests (rate limit)')
+    parser.add_argument('field_names', nargs='?', default='*', help='comma-separated outFields (default *)')
+    parser.add_argument('--format', default='geojson,shp', help='comma-separated: ' + ', '.join(OUTPUT_FORMATS))
+    parser.add_argument('--workers', type=int, default=4, help='pages fetched concurrently (default 4)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='features per request (capped at maxRecordCount)')
+    parser.add_argument('--url', help='layer URL (skip the catalog lookup)')
+    parser.add_argument('--out-dir', help='output directory (default: catalog sys_raw_folder)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='sync against the stored watermark: fetch only changed features, exit with NND when unchanged')
+    parser.add_argument('--full-refresh', action='store_true', help='with --incremental: ignore the stored watermark')
+    parser.add_argument('--pending-watermark', action='store_true',
+                        help='with --incremental: leave the new watermark pending for the caller to commit')
+    args = parser.parse_args()
+
+    layer = args.layer.lower()
+    try:
+        delay = float(args.delay)
+    except ValueError:
+        delay = 0.0
+    formats = [f.strip().lower() for f in args.format.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    print(" ")
+    print(" START layer extract from AGS \n")
 
-# Get the data
-print('\n Grabbing GeoJson data from AGS - ' + layer_url + ' ... \n')
-myCmd = 'esri2geojson ' + layer_url + ' ' + out_file 
-print(myCmd)
-os.system(myCmd)
-print('\n Finished Grabbing Data. \n')
+    if args.url and args.out_dir:
+        layer_url, out_dir = args.url, args.out_dir
+    else:
+        row = catalog_row_for(layer)
+        layer_url = args.url or row['src_url_file']
+        out_dir = args.out_dir or row['sys_raw_folder']
 
+    os.makedirs(out_dir, exist_ok=True)
+    print('CWD: ', out_dir)
 
+    # Incremental sync merges into the existing outputs (which are replaced atomically anyway)
+    if args.delete_existing.upper() == 'DELETE' and not args.incremental:
+        for fmt in formats:
+            base = os.path.join(out_dir, layer)
+            if fmt == 'shp':
+                for ext in ('.shp', '.shx', '.dbf', '.prj', '.cpg'):
+                    _remove(base + ext)
+            else:
+                _remove(base + OUTPUT_FORMATS[fmt][0])
 
-  
-# Convert json to shp
-# Note: esri2geojson is always going to spit out 4326 projection, because it follows the geojson standard.
-print('\n Converting json to shapefile... \n')
-myCmd = 'ogr2ogr -overwrite -a_srs "EPSG:4326" -F "ESRI Shapefile" ' + out_file_file + '.shp ' + out_file_file + '.geojson ' 
-print(myCmd)
-os.system(myCmd)
-print('\n Finished converting json to shapefile... \n')
-    
-    
+    out_fields = '*' if args.field_names.strip() in ('', '*') else args.field_names
+    print('\n Grabbing data from AGS - ' + layer_url + ' ... \n')
+    started = time.monotonic()
+    if args.incremental:
+        result = sync_layer(layer_url, out_dir, layer, formats, out_fields=out_fields, delay=delay,
+                            workers=args.workers, page_size=args.page_size, full_refresh=args.full_refresh,
+                            defer_commit=args.pending_watermark)
+        if result['action'] == 'nnd':
+            print(f"\n {NND_MESSAGE} ({result['reason']}); {time.monotonic() - started:.1f}s\n")
+            return
+    else:
+        result = extract_layer(layer_url, out_dir, layer, formats, out_fields=out_fields, delay=delay,
+                               workers=args.workers, page_size=args.page_size)
+    print(f"\n Finished: {result['features']} features in {result['pages']} page(s), "
+          f"{time.monotonic() - started:.1f}s -> {', '.join(os.path.basename(p) for p in result['outputs'])}\n")
 
 
+if __name__ == '__main__':
+    main()
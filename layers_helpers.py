@@ -9,6 +9,9 @@ This module contains all common functionality used by both scripts:
 - Shared constants and configurations
 """
 
+import bisect
+import fnmatch
+import functools
 import os
 import re
 from pathlib import Path
@@ -452,6 +455,132 @@ def validate_state_abbreviation(state_value: str) -> Optional[str]:
     return None
 
 
+# ---------------------------------------------------------------------------
+# Entity Pattern Index
+# ---------------------------------------------------------------------------
+
+_GLOB_CHARS_RE = re.compile(r'[*?\[]')
+
+
+def glob_literal_prefix(pattern: str) -> str:
+    """Return the literal part of an fnmatch pattern before its first wildcard."""
+    m = _GLOB_CHARS_RE.search(pattern)
+    return pattern[:m.start()] if m else pattern
+
+
+@functools.lru_cache(maxsize=256)
+def compile_entity_patterns(patterns: tuple, case_sensitive: bool = True) -> Optional['re.Pattern']:
+    """Compile fnmatch patterns into one combined regex (None if there are no patterns).
+
+    `compiled.match(name)` is true when any pattern matches the whole name, like
+    `any(fnmatch.fnmatchcase(name, p) for p in patterns)` but in a single pass.
+    """
+    if not patterns:
+        return None
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns), flags)
+
+
+class EntityPatternIndex:
+    """Index of entity ids for include/exclude pattern filtering.
+
+    Ids are kept sorted, so a pattern that is a literal id or a literal prefix plus a
+    trailing '*' (e.g. 'zoning_fl_lake_*', 'flu_*') resolves by binary search. Other
+    globs are narrowed to the range of their literal prefix the same way and then
+    matched with a single combined regex. Build once and reuse for many patterns.
+    """
+
+    def __init__(self, entities, case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+        pairs = sorted({(self._key(e), e) for e in entities})
+        self._keys = [k for k, _ in pairs]
+        self._entities = [e for _, e in pairs]
+        self._exact = {}
+        for k, e in pairs:
+            self._exact.setdefault(k, []).append(e)
+
+    def __len__(self):
+        return len(self._entities)
+
+    def _key(self, value: str) -> str:
+        return value if self.case_sensitive else value.lower()
+
+    @staticmethod
+    def _is_prefix_pattern(pattern: str) -> bool:
+        """True for patterns without wildcards or with a single trailing '*'."""
+        m = _GLOB_CHARS_RE.search(pattern)
+        return m is None or (m.start() == len(pattern) - 1 and pattern.endswith('*'))
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Return the ids starting with prefix (all ids for an empty prefix)."""
+        key = self._key(prefix)
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + '\U0010ffff', lo)
+        return self._entities[lo:hi]
+
+    def match(self, pattern: str) -> list[str]:
+        """Return the ids matching one fnmatch pattern."""
+        if not _GLOB_CHARS_RE.search(pattern):
+            return list(self._exact.get(self._key(pattern), []))
+        candidates = self.with_prefix(glob_literal_prefix(pattern))
+        if self._is_prefix_pattern(pattern):
+            return list(candidates)
+        regex = compile_entity_patterns((pattern,), self.case_sensitive)
+        return [e for e in candidates if regex.match(e)]
+
+    def prefix_owners(self, name: str) -> list[str]:
+        """Return the ids that are '_'-delimited prefixes of name, shortest first
+        (e.g. layer 'zoning' for 'zoning_fl_lake_*')."""
+        owners = []
+        for i, ch in enumerate(name):
+            if ch == '_':
+                owners.extend(self._exact.get(self._key(name[:i]), []))
+        return owners
+
+    def select(self, include_patterns: list[str] = None, exclude_patterns: list[str] = None) -> tuple[list[str], dict]:
+        """Apply include then exclude patterns.
+
+        Returns (sorted ids, counts) where counts maps ('include', pattern) to the number
+        of ids the pattern matched and ('exclude', pattern) to the number it removed.
+        """
+        counts = {}
+        if include_patterns:
+            selected = set()
+            general = []
+            for pattern in include_patterns:
+                if self._is_prefix_pattern(pattern):
+                    matches = self.match(pattern)
+                    counts[('include', pattern)] = len(matches)
+                    selected.update(matches)
+                else:
+                    general.append(pattern)
+            if general:
+                # One regex pass over the union of the general patterns' prefix ranges
+                prefixes = sorted({glob_literal_prefix(p) for p in general})
+                if '' in prefixes:
+                    candidates = self._entities
+                else:
+                    candidates = [e for prefix in prefixes for e in self.with_prefix(prefix)]
+                regex = compile_entity_patterns(tuple(general), self.case_sensitive)
+                matched = {e for e in candidates if regex.match(e)}
+                for pattern in general:
+                    single = compile_entity_patterns((pattern,), self.case_sensitive)
+                    counts[('include', pattern)] = sum(1 for e in matched if single.match(e))
+                selected.update(matched)
+        else:
+            selected = set(self._entities)
+
+        if exclude_patterns and selected:
+            regex = compile_entity_patterns(tuple(exclude_patterns), self.case_sensitive)
+            removed = {e for e in selected if regex.match(e)}
+            for pattern in exclude_patterns:
+                single = compile_entity_patterns((pattern,), self.case_sensitive)
+                counts[('exclude', pattern)] = sum(1 for e in removed if single.match(e))
+            selected -= removed
+
+        return sorted(selected), counts
+
+
 # ---------------------------------------------------------------------------
 # Database Utilities
 # ---------------------------------------------------------------------------
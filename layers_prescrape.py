@@ -15,13 +15,18 @@ manifest integration only for extracting preprocessing commands.
 """
 
 import argparse
+import asyncio
+import concurrent.futures
 import csv
 import json
 import logging
 import os
+import random
 import re
 import sys
-import fnmatch
+import tempfile
+import threading
+import time
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
@@ -30,14 +35,20 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import psycopg2
 import psycopg2.extras
+import requests
+import requests.adapters
 
 # Import shared utilities and constants
 from layers_helpers import (
     PG_CONNECTION, VALID_STATES, STATE_COUNTIES, INTEGRATED_STATES, LAYER_CONFIGS,
     format_name, parse_entity_pattern, safe_catalog_val, validate_state_abbreviation,
-    resolve_layer_name, resolve_layer_directory
+    resolve_layer_name, resolve_layer_directory,
+    EntityPatternIndex, compile_entity_patterns
 )
-from urllib.parse import urlparse
+from catalog_access import (
+    CATALOG_TABLE, SQL_LIVE_TITLES, SQL_RECORDS_BY_TITLE, SQL_RECORDS_BY_TITLE_PARCELS, catalog_fetchall
+)
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit, urlunsplit
 
 # ---------------------------------------------------------------------------
 # Configuration and Constants
@@ -239,6 +250,10 @@ class DB:
         self.cur.execute(sql, params)
         return self.cur.fetchall()
 
+    def catalog_fetchall(self, sql: str, params: Tuple[Any, ...] | None = None, expect_full_scan: bool = False):
+        """Catalog lookup as a prepared statement (see catalog_access)."""
+        return catalog_fetchall(self.cur, sql, params, expect_full_scan)
+
     def execute(self, sql: str, params: Tuple[Any, ...] | None = None):
         self.cur.execute(sql, params)
 
@@ -391,42 +406,203 @@ def entity_from_title_parse(layer: str, county_from_title: str, city_from_title:
 # Placeholder Helper Functions for Fill Mode
 # ---------------------------------------------------------------------------
 
-def validate_url_batch(urls: list[str], max_workers: int = 10) -> dict[str, tuple[bool, str]]:
-    """Validate multiple URLs concurrently for better performance.
-    
-    Args:
-        urls: List of URLs to validate
-        max_workers: Maximum number of concurrent validation threads
-        
-    Returns:
-        dict: {url: (is_valid, status_reason)} for each URL
-    """
-    import concurrent.futures
-    
-    if not urls:
-        return {}
-    
-    results = {}
-    
-    # Use ThreadPoolExecutor for concurrent URL validation
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all validation tasks
-        future_to_url = {executor.submit(validate_url, url): url for url in urls}
-        
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_url):
-            url = future_to_url[future]
+# URL validation reason codes that are retried (with jittered backoff) before being reported
+URL_RETRY_REASONS = {'TEMP_UNAVAILABLE', 'RATE_LIMITED'}
+
+# How long a cached URL validation result is trusted, per reason code (seconds; 0 = always re-probe)
+URL_CACHE_TTL = {
+    'OK': 6 * 3600,
+    'NOT_FOUND': 24 * 3600,
+    'AUTH_REQUIRED': 24 * 3600,
+    'FORBIDDEN': 24 * 3600,
+    'MOVED': 24 * 3600,
+    'INVALID_URL': 7 * 24 * 3600,
+    'SERVICE_ERROR': 3600,
+    'INVALID_METADATA': 3600,
+    'ERROR': 3600,
+    'DEPRECATED': 3600,
+    'TEMP_UNAVAILABLE': 0,
+    'RATE_LIMITED': 0,
+}
+
+URL_CACHE_PATH = Path(__file__).resolve().parent / "cache" / "url_validation_cache.json"
+
+_URL_USER_AGENT = 'Mozilla/5.0 (compatible; LayersPrescrape/1.0)'
+
+
+class UrlValidationCache:
+    """On-disk cache of URL validation results, each trusted for URL_CACHE_TTL[reason] seconds."""
+
+    def __init__(self, path: Path = URL_CACHE_PATH, ttl: Dict[str, int] | None = None):
+        self.path = Path(path)
+        self.ttl = dict(URL_CACHE_TTL if ttl is None else ttl)
+        self._entries: Dict[str, list] = {}  # url -> [is_valid, reason, checked_at]
+        self._dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, url: str) -> tuple[bool, str] | None:
+        entry = self._entries.get(url)
+        if not entry:
+            return None
+        is_valid, reason, checked_at = entry
+        if time.time() - checked_at > self.ttl.get(reason, 0):
+            return None
+        return bool(is_valid), reason
+
+    def put(self, url: str, is_valid: bool, reason: str):
+        if self.ttl.get(reason, 0) <= 0:
+            self._entries.pop(url, None)
+        else:
+            self._entries[url] = [bool(is_valid), reason, time.time()]
+        self._dirty = True
+
+    def save(self):
+        """Write the cache atomically, dropping expired entries."""
+        if not self._dirty:
+            return
+        now = time.time()
+        live = {u: e for u, e in self._entries.items() if now - e[2] <= self.ttl.get(e[1], 0)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + self.path.name + '.', suffix='.tmp', dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(live, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
             try:
-                # Rely on per-request timeouts inside validate_url for determinism
-                is_valid, reason = future.result()
-                results[url] = (is_valid, reason)
-            except Exception as e:
-                # If validation fails completely, mark as deprecated
-                results[url] = (False, "DEPRECATED")
-    
-    return results
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._entries = live
+        self._dirty = False
+
+
+_URL_SESSION = None
+_URL_SESSION_LOCK = threading.Lock()
+
+
+def _url_session(pool_size: int = 64) -> requests.Session:
+    """Shared keep-alive session for URL validation (retries are done by the callers)."""
+    global _URL_SESSION
+    with _URL_SESSION_LOCK:
+        if _URL_SESSION is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = _URL_USER_AGENT
+            _URL_SESSION = session
+        return _URL_SESSION
+
+
+def _normalize_validation_url(url: str) -> str | None:
+    """Strip the URL and add https:// when the scheme is missing; None if it cannot be valid."""
+    candidate = url.strip()
+    parsed = urlparse(candidate)
+    if not parsed.scheme:
+        # Try https:// fallback once
+        candidate = 'https://' + candidate
+        parsed = urlparse(candidate)
+    if parsed.scheme not in {'http', 'https'} or not parsed.netloc:
+        return None
+    return candidate
+
+
+def _reason_for_status(code: int) -> str:
+    if code == 401:
+        return 'AUTH_REQUIRED'
+    if code == 403:
+        return 'FORBIDDEN'
+    if code in (404, 410):
+        return 'NOT_FOUND'
+    if code == 429:
+        return 'RATE_LIMITED'
+    if code in (502, 503, 504):
+        return 'TEMP_UNAVAILABLE'
+    return 'ERROR'
+
+
+def _probe_arcgis_metadata(session: requests.Session, check_url: str) -> tuple[bool, str]:
+    parts = urlsplit(check_url)
+    query = dict(parse_qsl(parts.query))
+    query['f'] = 'json'
+    metadata_url = urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), urlencode(query), parts.fragment))
+    with session.get(metadata_url, timeout=10, stream=True) as response:
+        if response.status_code != 200:
+            return False, _reason_for_status(response.status_code)
+        content = response.raw.read(32768, decode_content=True).decode('utf-8', errors='ignore')  # 32KB
+    lower = content.lower()
+    if 'authentication' in lower or 'login required' in lower:
+        return False, 'AUTH_REQUIRED'
+    if '"error"' in content and 'code' in content:
+        return False, 'SERVICE_ERROR'
+    positive = ['"name":', '"type":', '"geometryType":', '"fields":', '"currentVersion":', '"serviceItemId":', '"defaultVisibility":', '"extent"']
+    if any(tok in content for tok in positive):
+        try:
+            metadata = json.loads(content)
+            if 'error' in metadata:
+                return False, 'SERVICE_ERROR'
+            if any(k in metadata for k in ['name', 'type', 'geometryType', 'fields', 'extent']):
+                return True, 'OK'
+            return False, 'INVALID_METADATA'
+        except json.JSONDecodeError:
+            # Truncated but looks valid
+            return True, 'OK'
+    return False, 'INVALID_METADATA'
+
+
+def _probe_url(url: str, session: requests.Session | None = None) -> tuple[bool, str]:
+    """One validation attempt (no retries) for an already normalized URL.
+
+    ArcGIS REST services are checked through their ?f=json metadata; other URLs with
+    HEAD (GET bytes=0-0 when HEAD is rejected), following up to 3 redirects.
+    """
+    session = session or _url_session()
+    check_url = url
+    try:
+        for _ in range(4):
+            if is_arcgis_service_url(check_url):
+                return _probe_arcgis_metadata(session, check_url)
+            with session.head(check_url, timeout=7, allow_redirects=False) as response:
+                status_code = response.status_code
+                headers = response.headers
+            if status_code in (301, 302, 303, 307, 308):
+                location = headers.get('location')
+                if not location:
+                    return False, 'MOVED'
+                check_url = urljoin(check_url, location)
+                continue
+            if status_code == 405:
+                # Some servers reject HEAD → retry with GET + Range
+                with session.get(check_url, timeout=7, headers={'Range': 'bytes=0-0'}, stream=True) as response:
+                    if response.status_code in (200, 206):
+                        return True, 'OK'
+                    return False, _reason_for_status(response.status_code) if response.status_code >= 400 else 'ERROR'
+            if status_code == 200:
+                content_length = headers.get('content-length')
+                if content_length and content_length.isdigit() and int(content_length) < 50:
+                    return False, 'ERROR'
+                return True, 'OK'
+            return False, _reason_for_status(status_code)
+        return False, 'MOVED'
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        # Includes SSL errors
+        return False, 'TEMP_UNAVAILABLE'
+    except Exception:
+        return False, 'ERROR'
+
+
+def _retry_delay(attempt: int, base: float = 0.5) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, base * (2 ** attempt))
+
 
-def validate_url(url: str) -> tuple[bool, str]:
+def validate_url(url: str, attempts: int = 2) -> tuple[bool, str]:
     """Check if URL serves accessible, fresh geospatial data and return a richer reason code.
 
     Returns tuple (is_valid, reason), where:
@@ -436,202 +612,92 @@ def validate_url(url: str) -> tuple[bool, str]:
                           "RATE_LIMITED","INVALID_URL","SERVICE_ERROR","INVALID_METADATA",
                           "MOVED","ERROR"} provides more detail
     """
-    import urllib.parse
-    import urllib.request
-    import json
-    import socket
-    import ssl
-    from urllib.error import HTTPError, URLError
-
     if not url or not url.strip():
         return False, "MISSING"
+    normalized = _normalize_validation_url(url)
+    if normalized is None:
+        return False, 'INVALID_URL'
+    for attempt in range(attempts):
+        is_valid, reason = _probe_url(normalized)
+        if reason not in URL_RETRY_REASONS or attempt == attempts - 1:
+            return is_valid, reason
+        time.sleep(_retry_delay(attempt))
+    return False, 'TEMP_UNAVAILABLE'
+
+
+async def _validate_urls_async(urls: list[str], concurrency: int, host_limit: int,
+                               attempts: int) -> dict[str, tuple[bool, str]]:
+    """Probe URLs concurrently: `concurrency` in flight overall, `host_limit` per host.
 
-    original_url = url.strip()
-
-    # Helper to safely append/merge f=json
-    def build_metadata_url(base_url: str) -> str:
-        from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
-        parts = urlsplit(base_url)
-        query = dict(parse_qsl(parts.query))
-        query['f'] = 'json'
-        return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), urlencode(query), parts.fragment))
-
-    # Normalize scheme if missing and validate structure
-    def normalize_url_if_needed(u: str) -> tuple[str, bool]:
-        parsed = urllib.parse.urlparse(u)
-        if not parsed.scheme:
-            # Try https:// fallback once
-            return 'https://' + u, True
-        if parsed.scheme not in { 'http', 'https' } or not parsed.netloc:
-            return u, False
-        return u, True
-
-    # Follow limited redirects manually when required and resolve relative locations
-    def resolve_redirect(current_url: str, location: str) -> str:
-        from urllib.parse import urljoin
-        return urljoin(current_url, location)
-
-    def make_request(req: urllib.request.Request, timeout_seconds: int):
-        return urllib.request.urlopen(req, timeout=timeout_seconds)
-
-    def validate_internal(check_url: str, redirect_depth: int = 0) -> tuple[bool, str]:
-        # ArcGIS REST services: validate via metadata endpoint
-        if is_arcgis_service_url(check_url):
-            for attempt in range(2):
+    Requests run on a thread pool over one keep-alive session; retry backoff is an
+    asyncio sleep taken outside the concurrency slots, so waiting URLs never hold one.
+    """
+    loop = asyncio.get_running_loop()
+    session = _url_session(pool_size=max(concurrency, 10))
+    slots = asyncio.Semaphore(concurrency)
+    host_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(host_limit))
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='url-probe')
+
+    async def check(url: str) -> tuple[str, tuple[bool, str]]:
+        if not url or not url.strip():
+            return url, (False, 'MISSING')
+        normalized = _normalize_validation_url(url)
+        if normalized is None:
+            return url, (False, 'INVALID_URL')
+        host = urlparse(normalized).netloc.lower()
+        result = (False, 'TEMP_UNAVAILABLE')
+        for attempt in range(attempts):
+            async with host_slots[host], slots:
                 try:
-                    metadata_url = build_metadata_url(check_url)
-                    metadata_req = urllib.request.Request(metadata_url)
-                    metadata_req.add_header('User-Agent', 'Mozilla/5.0 (compatible; LayersPrescrape/1.0)')
-                    with make_request(metadata_req, timeout_seconds=10) as response:
-                        code = response.getcode()
-                        if code == 200:
-                            content = response.read(32768).decode('utf-8', errors='ignore')  # 32KB
-                            lower = content.lower()
-                            if 'authentication' in lower or 'login required' in lower:
-                                return False, 'AUTH_REQUIRED'
-                            if '"error"' in content and 'code' in content:
-                                return False, 'SERVICE_ERROR'
-                            positive = ['"name":', '"type":', '"geometryType":', '"fields":', '"currentVersion":', '"serviceItemId":', '"defaultVisibility":', '"extent"']
-                            if any(tok in content for tok in positive):
-                                try:
-                                    metadata = json.loads(content)
-                                    if 'error' in metadata:
-                                        return False, 'SERVICE_ERROR'
-                                    if any(k in metadata for k in ['name','type','geometryType','fields','extent']):
-                                        return True, 'OK'
-                                    return False, 'INVALID_METADATA'
-                                except json.JSONDecodeError:
-                                    # Truncated but looks valid
-                                    return True, 'OK'
-                            return False, 'INVALID_METADATA'
-                        elif code in (401,):
-                            return False, 'AUTH_REQUIRED'
-                        elif code in (403,):
-                            return False, 'FORBIDDEN'
-                        elif code in (404, 410):
-                            return False, 'NOT_FOUND'
-                        elif code in (429,):
-                            return False, 'RATE_LIMITED'
-                        elif code in (502, 503, 504):
-                            # transient server errors → retry once
-                            if attempt == 0:
-                                continue
-                            return False, 'TEMP_UNAVAILABLE'
-                        else:
-                            return False, 'ERROR'
-                except HTTPError as e:
-                    if e.code == 401:
-                        return False, 'AUTH_REQUIRED'
-                    if e.code == 403:
-                        return False, 'FORBIDDEN'
-                    if e.code in (404, 410):
-                        return False, 'NOT_FOUND'
-                    if e.code == 429:
-                        return False, 'RATE_LIMITED'
-                    if e.code in (502, 503, 504):
-                        if attempt == 0:
-                            continue
-                        return False, 'TEMP_UNAVAILABLE'
-                    return False, 'ERROR'
-                except (URLError, socket.timeout, ssl.SSLError, ConnectionError):
-                    if attempt == 0:
-                        continue
-                    return False, 'TEMP_UNAVAILABLE'
+                    result = await loop.run_in_executor(executor, _probe_url, normalized, session)
                 except Exception:
-                    return False, 'ERROR'
-            # If both attempts failed with transient issues, we reached here
-            return False, 'TEMP_UNAVAILABLE'
+                    # If validation fails completely, mark as deprecated
+                    result = (False, 'DEPRECATED')
+            if result[1] not in URL_RETRY_REASONS or attempt == attempts - 1:
+                break
+            await asyncio.sleep(_retry_delay(attempt))
+        return url, result
 
-        # Non-ArcGIS or fallback: try HEAD first
-        for attempt in range(2):
-            try:
-                head_req = urllib.request.Request(check_url)
-                head_req.add_header('User-Agent', 'Mozilla/5.0 (compatible; LayersPrescrape/1.0; +http://gis-data-scraper)')
-                head_req.get_method = lambda: 'HEAD'
-                with make_request(head_req, timeout_seconds=7) as response:
-                    status_code = response.getcode()
-                    if status_code == 200:
-                        content_length = response.headers.get('content-length')
-                        if content_length and int(content_length) < 50:
-                            return False, 'ERROR'
-                        return True, 'OK'
-                    elif status_code in (301, 302, 303, 307, 308):
-                        location = response.headers.get('location')
-                        if location and redirect_depth < 3:
-                            return validate_internal(resolve_redirect(check_url, location), redirect_depth + 1)
-                        return False, 'MOVED'
-                    elif status_code in (404, 410):
-                        return False, 'NOT_FOUND'
-                    elif status_code == 401:
-                        return False, 'AUTH_REQUIRED'
-                    elif status_code == 403:
-                        return False, 'FORBIDDEN'
-                    elif status_code == 429:
-                        return False, 'RATE_LIMITED'
-                    else:
-                        return False, 'ERROR'
-            except HTTPError as e:
-                # Some servers reject HEAD with 405 → retry with GET + Range
-                if e.code == 405:
-                    try:
-                        get_req = urllib.request.Request(check_url)
-                        get_req.add_header('User-Agent', 'Mozilla/5.0 (compatible; LayersPrescrape/1.0)')
-                        get_req.add_header('Range', 'bytes=0-0')
-                        with make_request(get_req, timeout_seconds=7) as response:
-                            if response.getcode() in (200, 206):
-                                return True, 'OK'
-                            return False, 'ERROR'
-                    except HTTPError as ge:
-                        if ge.code == 401:
-                            return False, 'AUTH_REQUIRED'
-                        if ge.code == 403:
-                            return False, 'FORBIDDEN'
-                        if ge.code in (404, 410):
-                            return False, 'NOT_FOUND'
-                        if ge.code == 429:
-                            return False, 'RATE_LIMITED'
-                        if ge.code in (502, 503, 504):
-                            if attempt == 0:
-                                continue
-                            return False, 'TEMP_UNAVAILABLE'
-                        return False, 'ERROR'
-                    except (URLError, socket.timeout, ssl.SSLError, ConnectionError):
-                        if attempt == 0:
-                            continue
-                        return False, 'TEMP_UNAVAILABLE'
-                    except Exception:
-                        return False, 'ERROR'
-                elif e.code in (301, 302, 303, 307, 308):
-                    location = e.headers.get('location') if hasattr(e, 'headers') else None
-                    if location and redirect_depth < 3:
-                        return validate_internal(resolve_redirect(check_url, location), redirect_depth + 1)
-                    return False, 'MOVED'
-                elif e.code == 401:
-                    return False, 'AUTH_REQUIRED'
-                elif e.code == 403:
-                    return False, 'FORBIDDEN'
-                elif e.code in (404, 410):
-                    return False, 'NOT_FOUND'
-                elif e.code == 429:
-                    return False, 'RATE_LIMITED'
-                else:
-                    return False, 'ERROR'
-            except (URLError, socket.timeout, ssl.SSLError, ConnectionError):
-                if attempt == 0:
-                    continue
-                return False, 'TEMP_UNAVAILABLE'
-            except Exception:
-                return False, 'ERROR'
-        # Both attempts failed with transient issues
-        return False, 'TEMP_UNAVAILABLE'
+    try:
+        return dict(await asyncio.gather(*(check(url) for url in urls)))
+    finally:
+        executor.shutdown(wait=False)
 
-    # Normalize and try validation
-    normalized, ok = normalize_url_if_needed(original_url)
-    if not ok:
-        return False, 'INVALID_URL'
-    if normalized != original_url:
-        return validate_internal(normalized, redirect_depth=0)
-    return validate_internal(original_url, redirect_depth=0)
+
+def validate_url_batch(urls: list[str], max_workers: int = 32, host_limit: int = 4, attempts: int = 3,
+                       cache: UrlValidationCache | None = None) -> dict[str, tuple[bool, str]]:
+    """Validate multiple URLs concurrently for better performance.
+
+    Args:
+        urls: List of URLs to validate
+        max_workers: Maximum number of URLs probed at once
+        host_limit: Maximum number of URLs probed at once per host
+        attempts: Attempts per URL for TEMP_UNAVAILABLE / RATE_LIMITED results
+        cache: Optional on-disk result cache; fresh entries are not re-probed
+
+    Returns:
+        dict: {url: (is_valid, status_reason)} for each URL
+    """
+    if not urls:
+        return {}
+
+    results = {}
+    to_probe = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        else:
+            to_probe.append(url)
+
+    if to_probe:
+        probed = asyncio.run(_validate_urls_async(to_probe, max(1, max_workers), max(1, host_limit), max(1, attempts)))
+        results.update(probed)
+        if cache is not None:
+            for url, (is_valid, reason) in probed.items():
+                if reason != 'MISSING':
+                    cache.put(url, is_valid, reason)
+    return results
 
 def get_format_from_url(url: str) -> str:
     """Determine format from URL patterns, focusing on AGS vs non-AGS distinction.
@@ -776,6 +842,22 @@ def _get_best_format_detection(url: str, work_dir: str) -> str:
 # Minimal Manifest Integration (for preprocessing commands only)
 # ---------------------------------------------------------------------------
 
+_MANIFEST_CACHE: Dict[str, Any] = {}
+
+
+def _load_manifest() -> Dict[str, Any] | None:
+    """Parsed MANIFEST_PATH (None if missing), re-read only when the file changes."""
+    try:
+        mtime = MANIFEST_PATH.stat().st_mtime
+    except OSError:
+        return None
+    if _MANIFEST_CACHE.get('mtime') != mtime:
+        with open(MANIFEST_PATH, 'r') as f:
+            _MANIFEST_CACHE['data'] = json.load(f)
+        _MANIFEST_CACHE['mtime'] = mtime
+    return _MANIFEST_CACHE['data']
+
+
 def extract_manifest_commands(layer: str, entity: str) -> tuple[str, str]:
     """Extract pre-metadata and post-metadata commands from manifest.
     
@@ -789,12 +871,10 @@ def extract_manifest_commands(layer: str, entity: str) -> tuple[str, str]:
         - processing_comments: commands between ogrinfo and update
     """
     try:
-        if not MANIFEST_PATH.exists():
+        manifest_data = _load_manifest()
+        if manifest_data is None:
             return "", ""
             
-        with open(MANIFEST_PATH, 'r') as f:
-            manifest_data = json.load(f)
-            
         if layer not in manifest_data or 'entities' not in manifest_data[layer]:
             return "", ""
         
@@ -996,6 +1076,505 @@ def generate_expected_values(layer: str, state: str | None, county: str | None,
         'sys_raw_folder': sys_raw_folder,
     }
 
+# ---------------------------------------------------------------------------
+# FILL Mode Entity Context and Field Checks
+# ---------------------------------------------------------------------------
+
+# City tokens that are really county designations (zoning_fl_broward_unincorporated)
+COUNTY_SUFFIXES = {"unincorporated", "unified", "incorporated", "countywide"}
+
+# Layers whose records carry no county/city
+NO_COUNTY_LAYERS = ('fdot_tc', 'sunbiz', 'flood_zones')
+
+# Records per process-pool task in FILL mode
+FILL_CHUNK_SIZE = 64
+
+
+@dataclass
+class EntityContext:
+    """Everything FILL derives from an entity and its record, built once and shared by every field check.
+
+    `expected` holds the target value of each pattern-derived field; `error` is set when the
+    layer or entity cannot be checked (every field but manual overrides is then reported healthy).
+    """
+    entity: str
+    layer: str
+    expected: Dict[str, Any]
+    overrides: Dict[str, Any]
+    layer_level: str | None = None
+    entity_type: str = "unknown"
+    state: str | None = None
+    county: str | None = None
+    city: str | None = None  # city token as parsed from the entity
+    layer_internal: str = ""
+    county_internal: str = ""
+    city_internal: str = ""
+    error: str | None = None
+    _best_format: str | None = None
+
+    def best_format(self, record: Dict[str, Any]) -> str:
+        """_get_best_format_detection for the record's URL and raw folder (lists the folder once)."""
+        if self._best_format is None:
+            self._best_format = _get_best_format_detection(record.get('src_url_file') or '', record.get('sys_raw_folder') or '')
+        return self._best_format
+
+
+def build_entity_context(layer: str, entity: str, record: Dict[str, Any],
+                         overrides: Dict[str, Any] | None = None) -> EntityContext:
+    """Parse the entity and precompute the expected FILL values for one record.
+
+    Args:
+        layer: Layer being checked (key of LAYER_CONFIGS)
+        entity: Entity generated from the record (layer_state_county_city)
+        record: Catalog record; its county backs up unrecognised counties on county-level layers
+        overrides: Manual overrides for this entity ({field: value})
+    """
+    ctx = EntityContext(entity=entity, layer=layer, expected={}, overrides=overrides or {})
+    ctx.layer_internal = format_name(layer, 'layer', external=False)
+    layer_external = format_name(layer, 'layer', external=True)
+
+    # Get layer configuration to determine expected fields
+    layer_config = LAYER_CONFIGS.get(layer, {})
+    if not layer_config:
+        ctx.error = f"Layer '{layer}' not found in LAYER_CONFIGS"
+        return ctx
+    layer_level = ctx.layer_level = layer_config.get('level')
+    if not layer_level:
+        ctx.error = f"Layer '{layer}' missing 'level' field in LAYER_CONFIGS"
+        return ctx
+
+    # Parse entity to get actual values
+    try:
+        _, state, county, city = parse_entity_pattern(entity)
+    except Exception as e:
+        ctx.error = f"Could not parse entity '{entity}': {e}"
+        return ctx
+    ctx.city = city
+
+    # Determine entity type based on layer level and parsed values
+    if layer_level == 'state_county_city':
+        # For city-level layers, check if the "city" is actually a special county suffix
+        entity_type = city if city and city in COUNTY_SUFFIXES else "city"
+    elif layer_level == 'state_county':
+        entity_type = "county"
+    elif layer_level == 'state':
+        entity_type = "state"
+    elif layer_level == 'national':
+        entity_type = "national"
+    else:
+        ctx.error = f"Unknown layer level '{layer_level}' for layer '{layer}'"
+        return ctx
+
+    # Handle countywide alias for all layer types
+    if entity_type == "countywide":
+        entity_type = "unified"
+        city_std = "unified"
+    else:
+        city_std = city
+
+    # Intelligent fallback for county-level layers: if parsed county is missing or not recognized,
+    # use the database county field instead of treating the token as a city.
+    if layer_level == 'state_county':
+        state_key = (state or '').lower()
+        known = STATE_COUNTIES.get(state_key, set()) if state_key else set()
+        if not (county in known if county else False):
+            db_county_val = record.get('county') or ''
+            if db_county_val:
+                # Convert to internal and attempt to snap to a known county by compact match
+                candidate_internal = format_name(db_county_val, 'county', external=False)
+                if state_key and known:
+                    def _compact(s: str) -> str:
+                        return re.sub(r'[^a-z0-9]+', '', s or '')
+                    cand_compact = _compact(candidate_internal)
+                    county = next((k for k in known if _compact(k) == cand_compact), None) or candidate_internal
+                else:
+                    county = candidate_internal
+                # For county-level layers, ignore any mistakenly parsed city
+                city_std = None
+
+    ctx.entity_type = entity_type
+    ctx.state = state
+    ctx.county = county
+    county_external = format_name(county, 'county', external=True)
+    county_internal = ctx.county_internal = format_name(county, 'county', external=False)
+    city_external = format_name(city_std, 'city', external=True)
+    city_internal = ctx.city_internal = format_name(city_std, 'city', external=False)
+    layer_internal = ctx.layer_internal
+    expected = ctx.expected
+
+    # new_title: "Future Land Use - City of Gainesville FL" / "Zoning - Broward Unincorporated FL" / "Streets - Broward County FL"
+    state_abbrev = format_name(state, 'state', external=True) if state else 'FL'
+    if entity_type == "city":
+        # Determine municipality type (City/Town/Village/etc.), inferring from the original title
+        actual_title = record.get('title') or ''
+        title_prefix = (record.get('municipality_type') or '').strip()
+        if not title_prefix and actual_title:
+            if "Town of" in actual_title:
+                title_prefix = "Town"
+            elif "Village of" in actual_title:
+                title_prefix = "Village"
+        title_prefix = title_prefix or "City"
+        expected['new_title'] = f"{layer_external} - {title_prefix} of {city_external} {state_abbrev}"
+    elif entity_type in ["unincorporated", "unified", "incorporated"]:
+        expected['new_title'] = f"{layer_external} - {county_external} {entity_type.capitalize()} {state_abbrev}"
+    elif entity_type == "county" or layer_level == 'state_county':
+        expected['new_title'] = f"{layer_external} - {county_external} County {state_abbrev}"
+    elif county_external and not city_external:
+        # Fallback - if we have county but no city, use county format
+        expected['new_title'] = f"{layer_external} - {county_external} County {state_abbrev}"
+    else:
+        expected['new_title'] = f"{layer_external} - {city_external} {state_abbrev}"
+
+    # state: county/city level layers require it (None = invalid), state-level layers default to FL
+    if layer_level in ('state_county_city', 'state_county'):
+        expected['state'] = format_name(state, 'state', external=True) if state else None
+    elif layer_level == 'state':
+        expected['state'] = 'FL'
+
+    expected['county'] = county_external
+    expected['city'] = city_external
+
+    # resource (non-AGS formats only): /data/<layer>[/<county>[/<city>]]
+    if layer_level in ('state', 'national'):
+        expected['resource'] = f"/data/{layer_internal}"
+    elif layer_level == 'state_county' or entity_type == "county":
+        expected['resource'] = f"/data/{layer_internal}/{county_internal}"
+    else:
+        expected['resource'] = f"/data/{layer_internal}/{county_internal}/{city_internal}"
+
+    expected['layer_group'] = layer_config.get('layer_group', '')
+    expected['category'] = layer_config.get('category', '')
+    expected['layer_subgroup'] = layer_internal
+    expected['sys_raw_folder'] = resolve_layer_directory(layer, state, county_internal, city_internal)
+
+    # table_name now includes state for better uniqueness
+    state_lower = state.lower() if state else 'fl'
+    if layer_level == 'state':
+        expected['table_name'] = f"{layer_internal}_{state_lower}"
+    elif layer_level == 'national':
+        expected['table_name'] = f"{layer_internal}"
+    elif entity_type == "city":
+        expected['table_name'] = f"{layer_internal}_{state_lower}_{county_internal}_{city_internal}"
+    elif entity_type in ["unincorporated", "unified", "incorporated"]:
+        expected['table_name'] = f"{layer_internal}_{state_lower}_{county_internal}_{entity_type}"
+    elif layer_level == 'state_county' or entity_type == "county":
+        expected['table_name'] = f"{layer_internal}_{state_lower}_{county_internal}"
+    elif city_internal and city_internal not in ["unincorporated", "unified", "incorporated"]:
+        expected['table_name'] = f"{layer_internal}_{state_lower}_{county_internal}_{city_internal}"
+    elif county_internal:
+        expected['table_name'] = f"{layer_internal}_{state_lower}_{county_internal}"
+    else:
+        expected['table_name'] = f"{layer_internal}_{state_lower}"
+
+    if layer.lower() in ['zoning', 'flu']:
+        expected['source_comments'], expected['processing_comments'] = extract_manifest_commands(layer, entity)
+
+    return ctx
+
+
+@dataclass
+class FieldCheckState:
+    """Results FILL field checks accumulate outside the record: manual markers, preserved comments, URL results."""
+    missing_fields: Dict[str, Dict[str, str]]
+    distrib_comments_updates: Dict[str, str]
+    url_results: Dict[str, tuple[bool, str]]
+    existing_titles_lower: set | None = None
+    url_disk_cache: UrlValidationCache | None = None
+
+
+def preserve_to_distrib_comments(state: FieldCheckState, record: Dict[str, Any], entity: str,
+                                 comment_type: str, value: str):
+    """Preserve existing source/processing comments to distrib_comments field."""
+    updates = state.distrib_comments_updates
+    # Start with existing distrib_comments from database (only once per entity)
+    if entity not in updates:
+        updates[entity] = record.get('distrib_comments', '') or ''
+
+    current_distrib = updates[entity]
+
+    # Comment type already exists - don't add duplicate
+    if f"{comment_type}:" in current_distrib:
+        return
+
+    if current_distrib and current_distrib.strip():
+        # Existing content - add newline separator
+        updates[entity] = f"{current_distrib}\n\n{comment_type}:\n{value}"
+    else:
+        updates[entity] = f"{comment_type}:\n{value}"
+
+
+def is_valid_transform_pattern(value: str) -> bool:
+    """Check if fields_obj_transform matches expected pattern: '<key>: <value>'"""
+    if not value or not value.strip():
+        return False
+
+    # Simple pattern check: should contain at least one colon
+    return ':' in value
+
+
+def _check_url_field(current_value: str, entity: str, state: FieldCheckState) -> str:
+    if not current_value:
+        state.missing_fields[entity]["src_url_file"] = "MANUAL_REQUIRED"
+        return "***MISSING***"
+
+    # Use cached validation result if available, otherwise validate on-demand
+    if current_value in state.url_results:
+        is_valid, status_reason = state.url_results[current_value]
+    else:
+        cached = state.url_disk_cache.get(current_value) if state.url_disk_cache is not None else None
+        is_valid, status_reason = cached or validate_url(current_value)
+        state.url_results[current_value] = (is_valid, status_reason)
+        if cached is None and state.url_disk_cache is not None:
+            state.url_disk_cache.put(current_value, is_valid, status_reason)
+
+    if is_valid:
+        return ""
+    # Map detailed reasons into markers while preserving existing DB markers
+    if status_reason in ("MISSING", "INVALID_URL"):
+        state.missing_fields[entity]["src_url_file"] = "MANUAL_REQUIRED"
+        return "***MISSING***"
+    if status_reason in ("TEMP_UNAVAILABLE", "RATE_LIMITED"):
+        # Keep value as deprecated marker in DB, but annotate as temporary in report
+        state.missing_fields[entity]["src_url_file"] = "URL_TEMP_UNAVAILABLE"
+        return "***DEPRECATED***"
+    # NOT_FOUND, AUTH_REQUIRED, FORBIDDEN, SERVICE_ERROR, INVALID_METADATA, MOVED, ERROR and anything else
+    state.missing_fields[entity]["src_url_file"] = "URL_DEPRECATED"
+    return "***DEPRECATED***"
+
+
+def check_field_health(record: Dict[str, Any], ctx: EntityContext, field: str, state: FieldCheckState) -> str:
+    """Check field health and return correction value or empty string if healthy.
+
+    Returns:
+        - Empty string if field is healthy
+        - Correction value if field needs fixing (auto-correctable)
+        - "***MISSING***" if field requires manual input
+    """
+    current_value = record.get(field) or ''
+    entity = ctx.entity
+
+    # Check for manual override first
+    manual_override = ctx.overrides.get(field)
+    if manual_override is not None:
+        # Manual override exists - return it if different from current value
+        return manual_override if current_value != manual_override else ""
+
+    if ctx.error:
+        return ""
+
+    expected = ctx.expected.get(field)
+    layer_level = ctx.layer_level
+
+    if field == "new_title":
+        # If expected equals an existing original title anywhere in dataset, suppress to avoid duplicates
+        if expected and state.existing_titles_lower and expected.strip().lower() in state.existing_titles_lower:
+            return ""
+        return expected if (record.get('title') or '') != expected else ""
+
+    elif field == "state":
+        if layer_level == 'national':
+            # National layer - state should be null/empty
+            return ""
+        if expected:
+            return expected if current_value != expected else ""
+        # Invalid state - mark as manual field
+        state.missing_fields[entity]["state"] = "MANUAL_REQUIRED"
+        return "***MISSING***"
+
+    elif field == "county":
+        if ctx.layer in NO_COUNTY_LAYERS:
+            # State/national level layers should have null county
+            return ""
+        return expected if current_value != expected else ""
+
+    elif field == "city":
+        if ctx.layer in NO_COUNTY_LAYERS or layer_level == 'state_county' or ctx.entity_type == "county":
+            # State/national/county level layers should have null city
+            return ""
+        # City-level layers (zoning, flu, etc.)
+        return expected if current_value != expected else ""
+
+    elif field == "src_url_file":
+        return _check_url_field(current_value, entity, state)
+
+    elif field == "format":
+        # Auto-generate format from download method policy
+        # - If download == AGS -> format = AGS
+        # - If download == SELENIUM -> format = SHP
+        # - If download == WGET -> default to SHP but do not overwrite an existing non-empty value
+        download_val = (record.get('download_method') or '').strip().upper()
+        existing = (current_value or '').strip()
+
+        if download_val == 'AGS':
+            return 'AGS' if existing.upper() != 'AGS' else ""
+        elif download_val == 'SELENIUM':
+            return 'SHP' if existing.upper() != 'SHP' else ""
+        elif download_val == 'WGET':
+            # Only fill if empty; otherwise preserve user's existing format (PDF/GDB/etc.)
+            return 'SHP' if not existing else ""
+        # Fallback to legacy detection when download is not yet set
+        url = record.get('src_url_file') or ''
+        if not existing:
+            # Prefer SHP for OpenData/Hub pages
+            detected = 'SHP' if is_opendata_portal(url) else get_format_from_url(url)
+            return detected if detected else "***MISSING***"
+        # Validate current format with best detection for sanity, but don't force overwrite
+        detected = ctx.best_format(record)
+        if detected and str(existing).upper() != detected.upper():
+            return detected
+        return ""
+
+    elif field == "download_method":
+        # Determine download method when missing (non-manual):
+        # 1) If format is set:
+        #    - AGS -> AGS
+        #    - Otherwise -> SELENIUM if opendata URL, else WGET
+        # 2) If format is missing, infer from URL (AGS/opendata/WGET)
+        if (current_value or '').strip():
+            return ""  # keep existing value
+
+        fmt_val = (record.get('format') or '').strip().upper()
+        url = (record.get('src_url_file') or '').strip()
+
+        if fmt_val == 'AGS':
+            return 'AGS'
+        if not url:
+            # No format and no URL; can't infer
+            return ""
+        if is_arcgis_service_url(url):
+            return 'AGS'
+        if is_opendata_portal(url):
+            # Special-case: OpenData links that directly point to a ZIP should use WGET
+            url_lower = url.lower()
+            try:
+                path_only = (urlparse(url).path or '').lower()
+            except Exception:
+                path_only = url_lower
+            direct_zip = path_only.endswith('.zip') or ('.zip?' in url_lower) or ('.zip&' in url_lower)
+            return 'WGET' if direct_zip else 'SELENIUM'
+        return 'WGET'
+
+    elif field == "resource":
+        # Resource field should only be populated for non-AGS formats (no URL or format: skip)
+        if not record.get('src_url_file'):
+            return ""
+        expected_format = ctx.best_format(record)
+        if not expected_format or str(expected_format).upper() == 'AGS':
+            # AGS format doesn't need resource field - should be empty/null
+            return ""
+        return expected if current_value != expected else ""
+
+    elif field in ("layer_group", "category", "layer_subgroup", "sys_raw_folder", "table_name"):
+        return expected if current_value != expected else ""
+
+    elif field == "fields_obj_transform":
+        # Check fields_obj_transform exists and matches pattern (MANUAL)
+        if not current_value or not is_valid_transform_pattern(current_value):
+            state.missing_fields[entity]["fields_obj_transform"] = "MANUAL_REQUIRED"
+            return "***MISSING***"
+        return ""
+
+    elif field == "source_org":
+        # Check source_org has value (MANUAL, optional condition)
+        if not current_value:
+            state.missing_fields[entity]["source_org"] = "MANUAL_REQUIRED"
+            return "***MISSING***"
+        return ""
+
+    elif field in ("source_comments", "processing_comments"):
+        # From the manifest, preserving existing values to distrib_comments
+        if expected is None:
+            return ""
+        if current_value and current_value.strip() and current_value != expected:
+            comment_type = 'SOURCE COMMENTS' if field == "source_comments" else 'PROCESSING COMMENTS'
+            preserve_to_distrib_comments(state, record, entity, comment_type, current_value)
+        return expected if current_value != expected else ""
+
+    elif field == "distrib_comments":
+        # Show the updated distrib_comments with preserved values
+        return state.distrib_comments_updates.get(entity, "")
+
+    # sub_category / format_subtype (TODO: pattern checking) and unknown fields
+    return ""
+
+
+def check_fill_records(layer: str, items: List[tuple[str, Dict[str, Any]]], fields: List[str],
+                       state: FieldCheckState, overrides: Dict[str, Dict[str, Any]],
+                       skip_city_records: bool = False) -> List[tuple[str | None, str | None, Dict[str, str]]]:
+    """Run the FILL field checks for (entity, record) pairs.
+
+    Returns one (skip_reason, context_error, {field: correction}) per pair; skipped pairs
+    (city-level records in a county-level layer, when skip_city_records) have no corrections.
+    """
+    results = []
+    for entity, record in items:
+        ctx = build_entity_context(layer, entity, record, overrides.get(entity))
+        if (skip_city_records and ctx.layer_level == 'state_county'
+                and ctx.city and ctx.city not in COUNTY_SUFFIXES):
+            results.append((f"Entity '{entity}' has city component '{ctx.city}' but layer '{layer}' is county-level. "
+                            "Skipping erroneous record in fill mode.", ctx.error, {}))
+            continue
+        corrections = {field: check_field_health(record, ctx, field, state) for field in fields}
+        results.append((None, ctx.error, corrections))
+    return results
+
+
+_FILL_WORKER: Dict[str, Any] = {}
+
+
+def _init_fill_worker(layer: str, fields: List[str], overrides: Dict[str, Dict[str, Any]],
+                      existing_titles_lower: set, skip_city_records: bool):
+    _FILL_WORKER.update(layer=layer, fields=fields, overrides=overrides,
+                        existing_titles_lower=existing_titles_lower, skip_city_records=skip_city_records)
+
+
+def _check_fill_chunk(items: List[tuple[str, Dict[str, Any]]], url_results: Dict[str, tuple[bool, str]]):
+    """Process-pool task: check a chunk and return its results plus the state it accumulated."""
+    state = FieldCheckState(defaultdict(dict), {}, url_results, _FILL_WORKER['existing_titles_lower'])
+    results = check_fill_records(_FILL_WORKER['layer'], items, _FILL_WORKER['fields'], state,
+                                 _FILL_WORKER['overrides'], _FILL_WORKER['skip_city_records'])
+    return results, dict(state.missing_fields), state.distrib_comments_updates, state.url_results
+
+
+# ---------------------------------------------------------------------------
+# CREATE Mode Catalog Index
+# ---------------------------------------------------------------------------
+
+# Columns identifying a catalog entity (layer_subgroup, state, county, city)
+CATALOG_KEY_FIELDS = ('layer_subgroup', 'state', 'county', 'city')
+
+
+class CatalogKeyIndex:
+    """In-memory lookups over catalog rows loaded once for CREATE mode duplicate checks.
+
+    find_title mirrors `status IS DISTINCT FROM 'DELETE' AND lower(title) = %s`;
+    find_key mirrors `layer_subgroup = %s AND state = %s AND county = %s AND city = %s`
+    (any status; NULL never matches).
+    """
+
+    def __init__(self, rows=()):
+        self.by_title: Dict[str, Dict[str, Any]] = {}
+        self.by_key: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            self.add(row)
+
+    def add(self, row: Dict[str, Any]):
+        if row.get('status') != 'DELETE' and row.get('title') is not None:
+            self.by_title.setdefault(str(row['title']).lower(), row)
+        key = tuple(row.get(k) for k in CATALOG_KEY_FIELDS)
+        if None not in key:
+            self.by_key[key].append(row)
+
+    def find_title(self, title: str) -> Optional[Dict[str, Any]]:
+        return self.by_title.get(title.lower())
+
+    def find_key(self, layer_subgroup: str | None, state: str | None, county: str | None,
+                 city: str | None) -> List[Dict[str, Any]]:
+        key = (layer_subgroup, state, county, city)
+        if None in key:
+            return []
+        return list(self.by_key.get(key, ()))
+
 # ---------------------------------------------------------------------------
 # Configuration Class
 # ---------------------------------------------------------------------------
@@ -1018,6 +1597,10 @@ class Config:
     apply_manual: bool = False  # Apply manual field changes  
     manual_file: str = "missing_fields.json"
     fill_all: bool = False  # Include optional conditions in fill mode
+    url_cache: bool = True  # Reuse URL validation results from URL_CACHE_PATH (TTL per reason)
+    url_concurrency: int = 32  # URLs probed at once
+    url_host_limit: int = 4  # URLs probed at once per host
+    fill_workers: int = 1  # Processes running FILL field checks
 
 # ---------------------------------------------------------------------------
 # Main Processing Class
@@ -1053,8 +1636,12 @@ class LayersPrescrape:
         # Track distrib_comments updates for preservation logic
         self.distrib_comments_updates: Dict[str, str] = {}
         
-        # URL validation cache for performance
+        # CREATE mode records waiting for the batched INSERT
+        self._pending_creates: List[Dict[str, Any]] = []
+        
+        # URL validation cache for performance (plus on-disk results shared across runs)
         self.url_validation_cache: Dict[str, tuple[bool, str]] = {}
+        self.url_disk_cache = UrlValidationCache() if cfg.url_cache else None
 
     def _autofill_create_fields(self, entity: str, record: Dict[str, Any]) -> Dict[str, Any]:
         """Autofill fields for CREATE mode using the same logic as FILL.
@@ -1146,6 +1733,10 @@ class LayersPrescrape:
         else:
             raise ValueError(f"Unknown mode: {self.cfg.mode}")
         
+        # URL checks only mark the disk cache dirty; write it once per run
+        if self.url_disk_cache is not None:
+            self.url_disk_cache.save()
+        
         # Write missing fields JSON if any issues found (fill modes only)
         if self.missing_fields and self.cfg.mode in {"fill", "create", "detect_and_fill"}:
             self.logger.info(f"Writing missing field report → {self.cfg.manual_file}")
@@ -1166,29 +1757,9 @@ class LayersPrescrape:
         """Find all records containing the layer and output their data in CSV format."""
         self.logger.info(f"Running DETECT mode - finding all records for layer '{self.cfg.layer}'.")
         
-        # Find all records containing the layer (check both internal and external formats)
-        layer_internal = format_name(self.cfg.layer, 'layer', external=False)
-        layer_external = format_name(self.cfg.layer, 'layer', external=True)
-        
-        # Build SQL query with appropriate title patterns
-        if self.cfg.layer == 'parcel_geo':
-            # Special case for parcel_geo - look for "Parcel Polygons" titles
-            sql = """
-                SELECT * FROM m_gis_data_catalog_main 
-                WHERE status IS DISTINCT FROM 'DELETE' 
-                AND (lower(title) LIKE %s OR lower(title) LIKE %s OR lower(title) LIKE %s)
-                ORDER BY title
-            """
-            records = self.db.fetchall(sql, (f'%{layer_internal}%', f'%{layer_external.lower()}%', '%parcel polygons%'))
-        else:
-            # Standard case for other layers
-            sql = """
-                SELECT * FROM m_gis_data_catalog_main 
-                WHERE status IS DISTINCT FROM 'DELETE' 
-                AND (lower(title) LIKE %s OR lower(title) LIKE %s)
-                ORDER BY title
-            """
-            records = self.db.fetchall(sql, (f'%{layer_internal}%', f'%{layer_external.lower()}%'))
+        # Find all records containing the layer (check both internal and external formats);
+        # parcel_geo also matches "Parcel Polygons" titles
+        records = self._fetch_records_by_title('%parcel polygons%', '%parcel polygons%')
         
         if not records:
             self.logger.warning(f"No records found for layer '{self.cfg.layer}'")
@@ -1376,29 +1947,9 @@ class LayersPrescrape:
         mode_desc = "with optional conditions" if self.cfg.fill_all else "core conditions only"
         self.logger.info(f"Running FILL mode - health checking all records ({mode_desc}).")
         
-        # Find all records using same logic as detect mode
-        layer_internal = format_name(self.cfg.layer, 'layer', external=False)
-        layer_external = format_name(self.cfg.layer, 'layer', external=True)
-        
-        # Build SQL query with appropriate title patterns
-        if self.cfg.layer == 'parcel_geo':
-            # Special case for parcel_geo - look for both "Parcel Polygons" and "Parcel Geometry" titles
-            sql = """
-                SELECT * FROM m_gis_data_catalog_main 
-                WHERE status IS DISTINCT FROM 'DELETE' 
-                AND (lower(title) LIKE %s OR lower(title) LIKE %s OR lower(title) LIKE %s OR lower(title) LIKE %s)
-                ORDER BY title
-            """
-            records = self.db.fetchall(sql, (f'%{layer_internal}%', f'%{layer_external.lower()}%', '%parcel polygons%', '%parcel geometry%'))
-        else:
-            # Standard case for other layers
-            sql = """
-                SELECT * FROM m_gis_data_catalog_main 
-                WHERE status IS DISTINCT FROM 'DELETE' 
-                AND (lower(title) LIKE %s OR lower(title) LIKE %s)
-                ORDER BY title
-            """
-            records = self.db.fetchall(sql, (f'%{layer_internal}%', f'%{layer_external.lower()}%'))
+        # Find all records using same logic as detect mode;
+        # parcel_geo also matches both "Parcel Polygons" and "Parcel Geometry" titles
+        records = self._fetch_records_by_title('%parcel polygons%', '%parcel geometry%')
         
         if not records:
             self.logger.warning(f"No records found for layer '{self.cfg.layer}'")
@@ -1406,22 +1957,21 @@ class LayersPrescrape:
         
         self.logger.info(f"Found {len(records)} total records for layer '{self.cfg.layer}'")
         
-        # Filter by include/exclude entities and title if provided
-        if self.cfg.include_entities or self.cfg.exclude_entities or self.cfg.target_title:
-            filtered_records = []
-            
-            for record in records:
-                # Check title filter first
-                if not self._should_include_record_by_title(record):
-                    continue
-                
-                # Check entity filter
-                entity = self._generate_entity_from_record(record)
-                if self._should_include_entity(entity):
-                    filtered_records.append(record)
-            
+        # Generate each record's entity once; filtering, grouping and the field checks all reuse it
+        filtering = bool(self.cfg.include_entities or self.cfg.exclude_entities or self.cfg.target_title)
+        entity_records = []
+        for record in records:
+            # Check title filter first
+            if filtering and not self._should_include_record_by_title(record):
+                continue
+            entity = self._generate_entity_from_record(record)
+            if filtering and not self._should_include_entity(entity):
+                continue
+            entity_records.append((entity, record))
+        
+        if filtering:
             filter_desc = self._get_filter_description()
-            records = filtered_records
+            records = [record for _, record in entity_records]
             self.logger.info(f"Filtered to {len(records)} records matching filters {filter_desc}")
             
             if not records:
@@ -1430,8 +1980,7 @@ class LayersPrescrape:
         
         # Group records by entity and filter out duplicates/errors
         entity_groups = defaultdict(list)
-        for record in records:
-            entity = self._generate_entity_from_record(record)
+        for entity, record in entity_records:
             entity_groups[entity].append(record)
         
         # Filter out duplicates and errors
@@ -1478,33 +2027,33 @@ class LayersPrescrape:
         except Exception:
             self._existing_titles_lower = set()
 
+        # Sort valid_records by entity for alphabetical CSV output
+        valid_records.sort(key=lambda x: x[0])  # Sort by entity name
+        
+        # Conduct health checks once per record; the CSV report and the apply phase share the corrections
+        checked_fields = [field for field in headers[1:] if field != "og_title" and self._should_include_field(field)]
+        started = time.monotonic()
+        check_results = self._check_fill_records(valid_records, checked_fields)
+        elapsed = time.monotonic() - started
+        rate = f", {len(valid_records) / elapsed:.0f} records/s" if elapsed > 0 else ""
+        self.logger.info(f"Field checks complete ({elapsed:.1f}s{rate})")
+        
         # Process each valid record
         csv_rows = [headers]
         healthy_counts = {field: 0 for field in headers[1:]}  # Skip 'entity' 
         total_records = len(valid_records)
+        checked_records = []
         
-        # Sort valid_records by entity for alphabetical CSV output
-        valid_records.sort(key=lambda x: x[0])  # Sort by entity name
-        
-        for entity, record in valid_records:
-            # Check for erroneous city-level records in county-level layers (fill mode only)
-            if self.cfg.mode == "fill":
-                # Parse entity to check for city component
-                try:
-                    parsed_layer, state, county, city = parse_entity_pattern(entity)
-                    layer_config = LAYER_CONFIGS.get(self.cfg.layer, {})
-                    layer_level = layer_config.get('level')
-                    
-                    # Check if this is an erroneous city-level record in a county-level layer
-                    if (layer_level == 'state_county' and 
-                        city and city not in {"unincorporated", "unified", "incorporated", "countywide"}):
-                        self.logger.warning(f"Entity '{entity}' has city component '{city}' but layer '{self.cfg.layer}' is county-level. Skipping erroneous record in fill mode.")
-                        skipped_count += 1
-                        continue
-                except Exception as e:
-                    self.logger.debug(f"Could not parse entity '{entity}' for validation: {e}")
+        for (entity, record), (skip_reason, context_error, corrections) in zip(valid_records, check_results):
+            # Erroneous city-level records in county-level layers (fill mode only)
+            if skip_reason:
+                self.logger.warning(skip_reason)
+                skipped_count += 1
+                continue
+            if context_error:
+                self.logger.warning(context_error)
+            checked_records.append((entity, record, corrections))
             
-            # Conduct health checks and generate corrections
             row_values = [entity]
             
             for field in headers[1:]:
@@ -1513,21 +2062,18 @@ class LayersPrescrape:
                     row_values.append(record.get('title') or '')
                     # og_title is always "healthy" since it's just showing original data
                     healthy_counts[field] += 1
+                elif field in corrections:
+                    correction = corrections[field]
+                    row_values.append(correction)
+                    
+                    # Count as healthy if no correction needed (empty cell)
+                    if not correction:
+                        healthy_counts[field] += 1
                 else:
-                    # Check if field should be included based on field filters
-                    if self._should_include_field(field):
-                        correction = self._check_field_health(record, entity, field)
-                        row_values.append(correction)
-                        
-                        # Count as healthy if no correction needed (empty cell)
-                        if not correction:
-                            healthy_counts[field] += 1
-                    else:
-                        # Field is excluded - show current value without checking health
-                        row_values.append(record.get(field) or '')
-                        # Don't count excluded fields in health statistics
-                        if field in healthy_counts:
-                            healthy_counts[field] += 1
+                    # Field is excluded - show current value without checking health
+                    row_values.append(record.get(field) or '')
+                    # Don't count excluded fields in health statistics
+                    healthy_counts[field] += 1
             
             csv_rows.append(row_values)
         
@@ -1554,22 +2100,16 @@ class LayersPrescrape:
             applied_manual = 0
             skipped_auto = 0
             skipped_manual = 0
+            manual_overrides = self._get_manual_overrides()
             
-            for entity, record in valid_records:
+            for entity, record, corrections in checked_records:
                 updates = {}
+                entity_overrides = manual_overrides.get(entity, {})
                 
-                for field in headers[1:]:
-                    if field == "og_title":  # Skip the original title display field
-                        continue
-                    
-                    # Check if field should be included based on field filters
-                    if not self._should_include_field(field):
-                        continue  # Skip excluded fields
-                        
-                    correction = self._check_field_health(record, entity, field)
+                for field, correction in corrections.items():
                     if correction and not correction.startswith("***"):  # Has correction and not a manual marker
                         is_manual = self._is_manual_field(field)
-                        has_manual_override = self._get_manual_override(entity, field) is not None
+                        has_manual_override = entity_overrides.get(field) is not None
                         
                         # Determine if this should be applied based on flags and field type
                         should_apply_manual = (is_manual or has_manual_override) and self.cfg.apply_manual
@@ -1608,6 +2148,50 @@ class LayersPrescrape:
         total_issues = sum(total_records - healthy_counts[field] for field in headers[1:])
         self.logger.info(f"Fill complete: {len(valid_records)} records checked, {total_issues} total issues found")
     
+    def _check_fill_records(self, valid_records: List[tuple[str, Dict[str, Any]]],
+                            fields: List[str]) -> List[tuple[str | None, str | None, Dict[str, str]]]:
+        """Run the FILL field checks (see check_fill_records), across cfg.fill_workers processes when > 1.
+
+        Workers get the batch URL results and return the markers, preserved comments and
+        on-demand URL results they produced, which are merged back into this run's state.
+        """
+        overrides = self._get_manual_overrides()
+        skip_city_records = self.cfg.mode == "fill"
+        state = self._field_check_state()
+        workers = min(self.cfg.fill_workers, -(-len(valid_records) // FILL_CHUNK_SIZE))
+        
+        if workers <= 1:
+            results = check_fill_records(self.cfg.layer, valid_records, fields, state, overrides, skip_city_records)
+        else:
+            chunks = [valid_records[i:i + FILL_CHUNK_SIZE] for i in range(0, len(valid_records), FILL_CHUNK_SIZE)]
+            chunk_urls = [
+                {url: self.url_validation_cache[url] for url in {r.get('src_url_file') for _, r in chunk}
+                 if url in self.url_validation_cache}
+                for chunk in chunks
+            ]
+            # psycopg2 rows become plain dicts so they pickle cheaply
+            chunks = [[(entity, dict(record)) for entity, record in chunk] for chunk in chunks]
+            chunk_overrides = {entity: overrides[entity] for entity, _ in valid_records if entity in overrides}
+            self.logger.info(f"Checking {len(valid_records)} records across {workers} processes")
+            
+            results = []
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_fill_worker,
+                initargs=(self.cfg.layer, fields, chunk_overrides, state.existing_titles_lower or set(), skip_city_records),
+            ) as pool:
+                for chunk_results, missing, distrib, url_results in pool.map(_check_fill_chunk, chunks, chunk_urls):
+                    results.extend(chunk_results)
+                    for entity, markers in missing.items():
+                        self.missing_fields[entity].update(markers)
+                    self.distrib_comments_updates.update(distrib)
+                    for url, result in url_results.items():
+                        if url not in self.url_validation_cache and self.url_disk_cache is not None:
+                            self.url_disk_cache.put(url, *result)
+                        self.url_validation_cache[url] = result
+        
+        return results
+    
     def _validate_create_inputs(self) -> bool:
         """Validate layer, state, and county inputs for CREATE mode."""
         errors = []
@@ -1771,6 +2355,9 @@ class LayersPrescrape:
                 self.logger.error(f"Failed to read CSV: {e}")
                 return
             
+            # Load the layer's catalog rows once; duplicate checks below are resolved in memory
+            catalog_index = self._load_catalog_index([info['entity'] for info in entities_to_process])
+            
             # Process each matching entity
             for entity_info in entities_to_process:
                 entity = entity_info['entity']
@@ -1786,13 +2373,13 @@ class LayersPrescrape:
                     entity_type = "city"
                 
                 # Check if record already exists
-                existing = self._find_record_by_entity(entity)
+                existing = self._find_record_by_entity(entity, catalog_index)
                 if existing:
                     self.logger.warning(f"Record for {entity} already exists - skipping")
                     continue
                 
                 # Check for any records that might match this entity (broader search)
-                matching_records = self._find_matching_records(entity)
+                matching_records = self._find_matching_records(entity, catalog_index)
                 if matching_records:
                     self.logger.warning(f"Found {len(matching_records)} existing record(s) that might match {entity}:")
                     for record in matching_records:
@@ -1839,9 +2426,8 @@ class LayersPrescrape:
                 if advisories:
                     self.logger.warning(f"[CREATE] {entity}: " + "; ".join(advisories))
                 
-                # Create the record
-                self._create_record(expected)
-                self.logger.info(f"Created record for {entity}")
+                # Queue the record; all new rows are inserted together below
+                self._create_record(expected, catalog_index)
                 
                 # Track if this entity was successfully created (for CSV cleanup)
                 created_records.append({
@@ -1849,6 +2435,10 @@ class LayersPrescrape:
                     'record': expected,
                     'created': True
                 })
+            
+            self._flush_created_records()
+            for item in created_records:
+                self.logger.info(f"Created record for {item['entity']}")
         else:
             # Single entity processing (current behavior)
             # Generate entity name from positional arguments
@@ -1867,13 +2457,14 @@ class LayersPrescrape:
                 entity = f"{self.cfg.layer}_{state}_{county}_{city}"
             
             # Check if record already exists
-            existing = self._find_record_by_entity(entity)
+            catalog_index = self._load_catalog_index([entity])
+            existing = self._find_record_by_entity(entity, catalog_index)
             if existing:
                 self.logger.warning(f"Record for {entity} already exists - skipping")
                 return
             
             # Check for any records that might match this entity (broader search)
-            matching_records = self._find_matching_records(entity)
+            matching_records = self._find_matching_records(entity, catalog_index)
             if matching_records:
                 self.logger.warning(f"Found {len(matching_records)} existing record(s) that might match {entity}:")
                 for record in matching_records:
@@ -1975,7 +2566,8 @@ class LayersPrescrape:
             
             # Create the record
             if self.cfg.apply_changes or self.cfg.apply_manual:
-                self._create_record(expected)
+                self._create_record(expected, catalog_index)
+                self._flush_created_records()
                 self.logger.info(f"Created record for {entity}")
             else:
                 self.logger.info(f"Would create record for {entity}")
@@ -2087,6 +2679,18 @@ class LayersPrescrape:
     
     # Helper methods
     
+    def _fetch_records_by_title(self, *parcel_patterns: str) -> list:
+        """Live catalog records whose title mentions the layer's internal or external name.
+        
+        For parcel_geo, titles matching either of the two parcel_patterns are included too.
+        """
+        layer_internal = format_name(self.cfg.layer, 'layer', external=False)
+        layer_external = format_name(self.cfg.layer, 'layer', external=True)
+        patterns = (f'%{layer_internal}%', f'%{layer_external.lower()}%')
+        if self.cfg.layer == 'parcel_geo':
+            return self.db.catalog_fetchall(SQL_RECORDS_BY_TITLE_PARCELS, patterns + parcel_patterns)
+        return self.db.catalog_fetchall(SQL_RECORDS_BY_TITLE, patterns)
+    
     def _batch_validate_urls(self, valid_records: list[tuple[str, dict]]) -> None:
         """Pre-validate all URLs in batch for better performance."""
         # Collect all unique URLs from records
@@ -2098,47 +2702,46 @@ class LayersPrescrape:
         
         if urls_to_validate:
             self.logger.info(f"Batch validating {len(urls_to_validate)} URLs...")
-            # Validate all URLs concurrently
-            # Use conservative thread count (max 4 on smaller systems, 8 on larger)
-            cpu_count = os.cpu_count() or 4
-            max_workers = min(8, max(2, cpu_count // 2))  # Use half of available cores, max 8
-            results = validate_url_batch(list(urls_to_validate), max_workers=max_workers)
-            # Cache the results
+            started = time.monotonic()
+            # Probe concurrently (per-host limits, keep-alive); fresh on-disk results are reused
+            results = validate_url_batch(
+                list(urls_to_validate),
+                max_workers=self.cfg.url_concurrency,
+                host_limit=self.cfg.url_host_limit,
+                cache=self.url_disk_cache,
+            )
+            # Cache the results (the disk cache is saved once, at the end of run())
             self.url_validation_cache.update(results)
-            self.logger.info(f"URL validation complete")
+            self.logger.info(f"URL validation complete ({time.monotonic() - started:.1f}s)")
     
     def _should_include_entity(self, entity: str) -> bool:
         """Check if entity should be included based on include/exclude filters."""
-        entity_lower = entity.lower()
-        
         # If include filters are specified, entity must match at least one
         if self.cfg.include_entities:
-            include_match = any(fnmatch.fnmatch(entity_lower, pattern.lower()) for pattern in self.cfg.include_entities)
-            if not include_match:
+            include_regex = compile_entity_patterns(tuple(self.cfg.include_entities), case_sensitive=False)
+            if not include_regex.match(entity):
                 return False
         
         # If exclude filters are specified, entity must not match any
         if self.cfg.exclude_entities:
-            exclude_match = any(fnmatch.fnmatch(entity_lower, pattern.lower()) for pattern in self.cfg.exclude_entities)
-            if exclude_match:
+            exclude_regex = compile_entity_patterns(tuple(self.cfg.exclude_entities), case_sensitive=False)
+            if exclude_regex.match(entity):
                 return False
         
         return True
     
     def _should_include_field(self, field: str) -> bool:
         """Check if field should be included based on include/exclude filters."""
-        field_lower = field.lower()
-        
         # If include filters are specified, field must match at least one
         if self.cfg.include_fields:
-            include_match = any(fnmatch.fnmatch(field_lower, pattern.lower()) for pattern in self.cfg.include_fields)
-            if not include_match:
+            include_regex = compile_entity_patterns(tuple(self.cfg.include_fields), case_sensitive=False)
+            if not include_regex.match(field):
                 return False
         
         # If exclude filters are specified, field must not match any
         if self.cfg.exclude_fields:
-            exclude_match = any(fnmatch.fnmatch(field_lower, pattern.lower()) for pattern in self.cfg.exclude_fields)
-            if exclude_match:
+            exclude_regex = compile_entity_patterns(tuple(self.cfg.exclude_fields), case_sensitive=False)
+            if exclude_regex.match(field):
                 return False
         
         return True
@@ -2177,461 +2780,25 @@ class LayersPrescrape:
         }
         return field in manual_fields
     
-    def _check_field_health(self, record: Dict[str, Any], entity: str, field: str) -> str:
-        """Check field health and return correction value or empty string if healthy.
-        
-        Returns:
-            - Empty string if field is healthy
-            - Correction value if field needs fixing (auto-correctable)
-            - "***MISSING***" if field requires manual input
-        """
-        current_value = record.get(field) or ''
-        
-        # Check for manual override first
-        manual_override = self._get_manual_override(entity, field)
-        if manual_override is not None:
-            # Manual override exists - return it if different from current value
-            return manual_override if current_value != manual_override else ""
-        
-        # Initialize all variables with default values to prevent UnboundLocalError
-        state = None
-        county = None
-        city = None
-        entity_type = "unknown"
-        layer_internal = format_name(self.cfg.layer, 'layer', external=False)
-        layer_external = format_name(self.cfg.layer, 'layer', external=True)
-        county_external = ""
-        county_internal = ""
-        city_external = ""
-        city_internal = ""
-        city_std = None
-        
-        # Get layer configuration to determine expected fields
-        layer_config = LAYER_CONFIGS.get(self.cfg.layer, {})
-        if not layer_config:
-            self.logger.error(f"Layer '{self.cfg.layer}' not found in LAYER_CONFIGS")
-            return ""
-        
-        layer_level = layer_config.get('level')
-        if not layer_level:
-            self.logger.error(f"Layer '{self.cfg.layer}' missing 'level' field in LAYER_CONFIGS")
-            return ""
-        
-        # Parse entity to get actual values
-        try:
-            parsed_layer, state, county, city = parse_entity_pattern(entity)
-        except Exception as e:
-            self.logger.warning(f"Could not parse entity '{entity}': {e}")
-            return ""
-        
-        # Determine entity type based on layer level and parsed values
-        if layer_level == 'state_county_city':
-            # For city-level layers, check if the "city" is actually a special county suffix
-            if city and city in {"unincorporated", "unified", "incorporated", "countywide"}:
-                entity_type = city  # Use the special suffix as entity type
-            else:
-                entity_type = "city"
-        elif layer_level == 'state_county':
-            # For county-level layers, treat as county-level
-            entity_type = "county"
-        elif layer_level == 'state':
-            entity_type = "state"
-        elif layer_level == 'national':
-            entity_type = "national"
-        else:
-            self.logger.error(f"Unknown layer level '{layer_level}' for layer '{self.cfg.layer}'")
-            return ""
-            
-        # Handle countywide alias for all layer types
-        if entity_type == "countywide":
-            entity_type = "unified"
-            city_std = "unified"
-        else:
-            city_std = city
-
-        # Intelligent fallback for county-level layers: if parsed county is missing or not recognized,
-        # use the database county field instead of treating the token as a city.
-        if layer_level == 'state_county':
-            state_key = (state or '').lower()
-            known = STATE_COUNTIES.get(state_key, set()) if state_key else set()
-            county_is_valid = (county in known) if county else False
-            if not county_is_valid:
-                db_county_val = record.get('county') or ''
-                if db_county_val:
-                    # Convert to internal and attempt to snap to a known county by compact match
-                    candidate_internal = format_name(db_county_val, 'county', external=False)
-                    if state_key and known:
-                        def _compact(s: str) -> str:
-                            return re.sub(r'[^a-z0-9]+', '', s or '')
-                        cand_compact = _compact(candidate_internal)
-                        best = None
-                        for k in known:
-                            if _compact(k) == cand_compact:
-                                best = k
-                                break
-                        county = best or candidate_internal
-                    else:
-                        county = candidate_internal
-                    # For county-level layers, ignore any mistakenly parsed city
-                    city_std = None
-        
-        # Generate expected values for all layer types
-        layer_internal = format_name(self.cfg.layer, 'layer', external=False)
-        layer_external = format_name(self.cfg.layer, 'layer', external=True)
-        county_external = format_name(county, 'county', external=True)
-        county_internal = format_name(county, 'county', external=False)
-        city_external = format_name(city_std, 'city', external=True)
-        city_internal = format_name(city_std, 'city', external=False)
-        
-        # Field-specific health checks
-        if field == "new_title":
-            # Check title format with state abbreviation and "County" suffix
-            # Get the actual title value from the database for comparison
-            actual_title = record.get('title') or ''
-            state_abbrev = format_name(state, 'state', external=True) if state else 'FL'
-            
-            if entity_type == "city":
-                # Determine municipality type (City/Town/Village/etc.)
-                title_prefix = (record.get('municipality_type') or '').strip()
-                if not title_prefix:
-                    # Try to infer from original title if present
-                    if actual_title:
-                        if "Town of" in actual_title:
-                            title_prefix = "Town"
-                        elif "Village of" in actual_title:
-                            title_prefix = "Village"
-                if not title_prefix:
-                    title_prefix = "City"
-                
-                # City-level: "Future Land Use - City of Gainesville FL"
-                expected = f"{layer_external} - {title_prefix} of {city_external} {state_abbrev}"
-            elif entity_type in ["unincorporated", "unified", "incorporated"]:
-                # City-level with special designations: "Zoning - Broward Unincorporated FL"
-                expected = f"{layer_external} - {county_external} {entity_type.capitalize()} {state_abbrev}"
-            elif entity_type == "county" or layer_level == 'state_county':
-                # Standard county-level: "Streets - Broward County FL"
-                expected = f"{layer_external} - {county_external} County {state_abbrev}"
-            else:
-                # Fallback - if we have county but no city, use county format
-                if county_external and not city_external:
-                    expected = f"{layer_external} - {county_external} County {state_abbrev}"
-                else:
-                    expected = f"{layer_external} - {city_external} {state_abbrev}"
-            # If expected equals an existing original title anywhere in dataset, suppress to avoid duplicates
-            try:
-                if expected and hasattr(self, '_existing_titles_lower'):
-                    if expected.strip().lower() in self._existing_titles_lower:
-                        return ""
-            except Exception:
-                pass
-            
-            return expected if actual_title != expected else ""
-        
-        elif field == "state":
-            # Use layer level to determine expected state value
-            if layer_level == 'state_county_city' or layer_level == 'state_county':
-                # County/city level layers require state
-                expected_state = format_name(state, 'state', external=True) if state else None
-                if expected_state:
-                    return expected_state if current_value != expected_state else ""
-                else:
-                    # Invalid state - mark as manual field
-                    self.missing_fields[entity]["state"] = "MANUAL_REQUIRED"
-                    return "***MISSING***"
-            elif layer_level == 'state':
-                # State-level layers default to FL
-                expected_state = 'FL'
-                return expected_state if current_value != expected_state else ""
-            elif layer_level == 'national':
-                # National layer - state should be null/empty
-                return "" if not current_value else ""
-            else:
-                # Unknown layer level - error
-                self.logger.error(f"Unknown layer level '{layer_level}' for state field validation")
-                return ""
-        
-        elif field == "county":
-            # Special handling for state-level and national-level layers
-            if self.cfg.layer in ['fdot_tc', 'sunbiz', 'flood_zones']:
-                # State/national level layers should have null county
-                return "" if not current_value else ""
-            else:
-                # Standard county/city level layers
-                expected = county_external
-                return expected if current_value != expected else ""
-        
-        elif field == "city":
-            # Special handling for state-level and national-level layers
-            if self.cfg.layer in ['fdot_tc', 'sunbiz', 'flood_zones']:
-                # State/national level layers should have null city
-                return "" if not current_value else ""
-            elif layer_level == 'state_county' or entity_type == "county":
-                # County-level layers should have null city
-                return "" if current_value else ""
-            else:
-                # City-level layers (zoning, flu, etc.)
-                expected = city_external
-                return expected if current_value != expected else ""
-        
-        elif field == "src_url_file":
-            # Check URL exists and is valid using cached results
-            if not current_value:
-                self.missing_fields[entity]["src_url_file"] = "MANUAL_REQUIRED"
-                return "***MISSING***"
-            
-            # Use cached validation result if available, otherwise validate on-demand
-            if current_value in self.url_validation_cache:
-                is_valid, status_reason = self.url_validation_cache[current_value]
-            else:
-                is_valid, status_reason = validate_url(current_value)
-                self.url_validation_cache[current_value] = (is_valid, status_reason)
-            
-            if not is_valid:
-                if status_reason == "MISSING":
-                    self.missing_fields[entity]["src_url_file"] = "MANUAL_REQUIRED"
-                    return "***MISSING***"
-                else:
-                    # Map detailed reasons into markers while preserving existing DB markers
-                    temp_reasons = {"TEMP_UNAVAILABLE", "RATE_LIMITED"}
-                    manual_reasons = {"INVALID_URL"}
-                    deprecated_reasons = {
-                        "NOT_FOUND", "AUTH_REQUIRED", "FORBIDDEN", "SERVICE_ERROR",
-                        "INVALID_METADATA", "MOVED", "ERROR"
-                    }
-                    if status_reason in manual_reasons:
-                        self.missing_fields[entity]["src_url_file"] = "MANUAL_REQUIRED"
-                        return "***MISSING***"
-                    elif status_reason in temp_reasons:
-                        # Keep value as deprecated marker in DB, but annotate as temporary in report
-                        self.missing_fields[entity]["src_url_file"] = "URL_TEMP_UNAVAILABLE"
-                        return "***DEPRECATED***"
-                    elif status_reason in deprecated_reasons:
-                        self.missing_fields[entity]["src_url_file"] = "URL_DEPRECATED"
-                        return "***DEPRECATED***"
-                    else:
-                        # Fallback
-                        self.missing_fields[entity]["src_url_file"] = "URL_DEPRECATED"
-                        return "***DEPRECATED***"
-            return ""
-        
-        elif field == "format":
-            # Auto-generate format from download method policy
-            # - If download == AGS -> format = AGS
-            # - If download == SELENIUM -> format = SHP
-            # - If download == WGET -> default to SHP but do not overwrite an existing non-empty value
-            download_val = (record.get('download_method') or '').strip().upper()
-            existing = (current_value or '').strip()
-
-            if download_val == 'AGS':
-                expected = 'AGS'
-                return expected if existing.upper() != expected else ""
-            elif download_val == 'SELENIUM':
-                expected = 'SHP'
-                return expected if existing.upper() != expected else ""
-            elif download_val == 'WGET':
-                # Only fill if empty; otherwise preserve user's existing format (PDF/GDB/etc.)
-                if not existing:
-                    return 'SHP'
-                return ""
-            else:
-                # Fallback to legacy detection when download is not yet set
-                if not existing:
-                    url = (record.get('src_url_file') or '')
-                    # Prefer SHP for OpenData/Hub pages
-                    if is_opendata_portal(url):
-                        expected = 'SHP'
-                    else:
-                        expected = get_format_from_url(url)
-                    return expected if expected else "***MISSING***"
-                # Validate current format with best detection for sanity, but don't force overwrite
-                url = record.get('src_url_file') or ''
-                expected = _get_best_format_detection(url, record.get('sys_raw_folder') or '')
-                if expected and str(existing).upper() != expected.upper():
-                    return expected
-                return ""
-        
-        elif field == "download_method":
-            # Determine download method when missing (non-manual):
-            # 1) If format is set:
-            #    - AGS -> AGS
-            #    - Otherwise -> SELENIUM if opendata URL, else WGET
-            # 2) If format is missing, infer from URL (AGS/opendata/WGET)
-            existing = (current_value or '').strip().upper()
-            if existing:
-                return ""  # keep existing value
-
-            fmt_val = (record.get('format') or '').strip().upper()
-            url = (record.get('src_url_file') or '').strip()
-
-            if fmt_val == 'AGS':
-                expected = 'AGS'
-            elif url:
-                url_lower = url.lower()
-                if is_arcgis_service_url(url):
-                    expected = 'AGS'
-                elif is_opendata_portal(url):
-                    # Special-case: OpenData links that directly point to a ZIP should use WGET
-                    try:
-                        parsed = urlparse(url)
-                        path_only = (parsed.path or '').lower()
-                    except Exception:
-                        path_only = url_lower
-                    direct_zip = path_only.endswith('.zip') or ('.zip?' in url_lower) or ('.zip&' in url_lower)
-                    expected = 'WGET' if direct_zip else 'SELENIUM'
-                else:
-                    expected = 'WGET'
-            else:
-                # No format and no URL; can't infer
-                return ""
+    def _entity_context(self, entity: str, record: Dict[str, Any]) -> EntityContext:
+        """Build the FILL context for one record, logging when its entity cannot be checked."""
+        ctx = build_entity_context(self.cfg.layer, entity, record, self._get_manual_overrides().get(entity))
+        if ctx.error:
+            self.logger.warning(ctx.error)
+        return ctx
+
+    def _field_check_state(self) -> FieldCheckState:
+        return FieldCheckState(
+            missing_fields=self.missing_fields,
+            distrib_comments_updates=self.distrib_comments_updates,
+            url_results=self.url_validation_cache,
+            existing_titles_lower=getattr(self, '_existing_titles_lower', None),
+            url_disk_cache=self.url_disk_cache,
+        )
 
-            return expected
-        
-        elif field == "resource":
-            # Resource field should only be populated for non-AGS formats
-            # Use expected format (same logic as format field validation)
-            url = record.get('src_url_file') or ''
-            
-            # First check if URL exists (same as format field validation)
-            if not url:
-                return ""  # No URL, skip resource validation
-            
-            expected_format = _get_best_format_detection(url, record.get('sys_raw_folder') or '')
-            
-            # Skip resource generation if format is missing due to missing URL
-            if not expected_format:
-                return ""  # No format detected, skip resource validation
-            
-            if str(expected_format).upper() == 'AGS':
-                # AGS format doesn't need resource field - should be empty/null
-                return "" if not current_value else ""
-            else:
-                # For non-AGS formats, check resource matches pattern based on layer type
-                if layer_level == 'state':
-                    # State-level layers: "/data/<layer>"
-                    expected = f"/data/{layer_internal}"
-                elif layer_level == 'national':
-                    # National-level layers: "/data/<layer>"
-                    expected = f"/data/{layer_internal}"
-                elif layer_level == 'state_county' or entity_type == "county":
-                    # County-level layers: "/data/<layer>/<county>"
-                    expected = f"/data/{layer_internal}/{county_internal}"
-                else:
-                    # City-level layers: "/data/<layer>/<county>/<city>"
-                    expected = f"/data/{layer_internal}/{county_internal}/{city_internal}"
-                return expected if current_value != expected else ""
-        
-        elif field == "layer_group":
-            # Check layer_group is correct using mapping
-            config = LAYER_CONFIGS.get(self.cfg.layer, {})
-            expected = config.get('layer_group', '')
-            return expected if current_value != expected else ""
-        
-        elif field == "category":
-            # Check category is correct using mapping
-            config = LAYER_CONFIGS.get(self.cfg.layer, {})
-            expected = config.get('category', '')
-            return expected if current_value != expected else ""
-        
-        elif field == "sys_raw_folder":
-            # Check sys_raw_folder matches pattern; do not create directories here
-            expected = resolve_layer_directory(self.cfg.layer, state, county_internal, city_internal)
-            return expected if current_value != expected else ""
-        
-        elif field == "table_name":
-            # Check table_name matches pattern - now includes state for better uniqueness
-            state_abbrev = state.lower() if state else 'fl'
-            
-            if layer_level == 'state':
-                # State-level layers: "<layer>_<state>"
-                expected = f"{layer_internal}_{state_abbrev}"
-            elif layer_level == 'national':
-                # National-level layers: "<layer>"
-                expected = f"{layer_internal}"
-            elif entity_type == "city":
-                # City-level layers: "<layer>_<state>_<county>_<city>"
-                expected = f"{layer_internal}_{state_abbrev}_{county_internal}_{city_internal}"
-            elif entity_type in ["unincorporated", "unified", "incorporated"]:
-                # County suffixes: "<layer>_<state>_<county>_<suffix>"
-                expected = f"{layer_internal}_{state_abbrev}_{county_internal}_{entity_type}"
-            elif layer_level == 'state_county' or entity_type == "county":
-                # County-level layers: "<layer>_<state>_<county>"
-                expected = f"{layer_internal}_{state_abbrev}_{county_internal}"
-            else:
-                # Fallback - determine based on available components
-                if city_internal and city_internal not in ["unincorporated", "unified", "incorporated"]:
-                    expected = f"{layer_internal}_{state_abbrev}_{county_internal}_{city_internal}"
-                elif county_internal:
-                    expected = f"{layer_internal}_{state_abbrev}_{county_internal}"
-                else:
-                    expected = f"{layer_internal}_{state_abbrev}"
-            
-            return expected if current_value != expected else ""
-        
-        elif field == "fields_obj_transform":
-            # Check fields_obj_transform exists and matches pattern (MANUAL)
-            if not current_value or not self._is_valid_transform_pattern(current_value):
-                self.missing_fields[entity]["fields_obj_transform"] = "MANUAL_REQUIRED"
-                return "***MISSING***"
-            return ""
-        
-        elif field == "layer_subgroup":
-            # Check layer_subgroup has layer in internal format
-            expected = layer_internal
-            return expected if current_value != expected else ""
-        
-        elif field == "source_comments":
-            # Check source_comments from manifest, preserving existing values to distrib_comments
-            if self.cfg.layer.lower() in ['zoning', 'flu']:
-                expected_source, _ = extract_manifest_commands(self.cfg.layer, entity)
-                # Preserve existing value to distrib_comments if it exists and is different
-                if current_value and current_value.strip() and current_value != expected_source:
-                    self._preserve_to_distrib_comments(record, entity, 'SOURCE COMMENTS', current_value)
-                # Return expected value only if different from current
-                return expected_source if current_value != expected_source else ""
-            return ""
-        
-        elif field == "processing_comments":
-            # Check processing_comments from manifest, preserving existing values to distrib_comments
-            if self.cfg.layer.lower() in ['zoning', 'flu']:
-                _, expected_processing = extract_manifest_commands(self.cfg.layer, entity)
-                # Preserve existing value to distrib_comments if it exists and is different
-                if current_value and current_value.strip() and current_value != expected_processing:
-                    self._preserve_to_distrib_comments(record, entity, 'PROCESSING COMMENTS', current_value)
-                # Return expected value only if different from current
-                return expected_processing if current_value != expected_processing else ""
-            return ""
-        
-        elif field == "distrib_comments":
-            # Show the updated distrib_comments with preserved values
-            return self._get_updated_distrib_comments(record, entity)
-        
-        # Optional conditions (only checked with --fill-all)
-        elif field == "sub_category":
-            # TODO: Implement sub_category pattern checking
-            return ""  # Placeholder
-        
-        elif field == "source_org":
-            # Check source_org has value (MANUAL)
-            if not current_value:
-                self.missing_fields[entity]["source_org"] = "MANUAL_REQUIRED"
-                return "***MISSING***"
-            return ""
-        
-        elif field == "format_subtype":
-            # TODO: Implement format_subtype pattern checking
-            return ""  # Placeholder
-        
-        else:
-            # Unknown field
-            return ""
-    
-    def _is_valid_transform_pattern(self, value: str) -> bool:
-        """Check if fields_obj_transform matches expected pattern: '<key>: <value>'"""
-        if not value or not value.strip():
-            return False
-        
-        # Simple pattern check: should contain at least one colon
-        return ':' in value
+    def _check_field_health(self, record: Dict[str, Any], entity: str, field: str) -> str:
+        """Check one field of a record (see check_field_health); FILL mode builds the context once per record instead."""
+        return check_field_health(record, self._entity_context(entity, record), field, self._field_check_state())
     
     def _generate_entity_from_record(self, record: Dict[str, Any]) -> str:
         """Generate entity name from database record title and fields.
@@ -2724,12 +2891,7 @@ class LayersPrescrape:
     
     def _discover_entities_from_db(self) -> List[str]:
         """Discover entities for the layer by examining database titles."""
-        sql = """
-            SELECT title, state, county, city 
-            FROM m_gis_data_catalog_main 
-            WHERE status IS DISTINCT FROM 'DELETE'
-        """
-        rows = self.db.fetchall(sql) or []
+        rows = self.db.catalog_fetchall(SQL_LIVE_TITLES, expect_full_scan=True) or []
         
         entities = set()
         
@@ -2783,29 +2945,41 @@ class LayersPrescrape:
         
         return sorted(entities)
     
-    def _find_record_by_entity(self, entity: str) -> Optional[Dict[str, Any]]:
-        """Find database record by matching entity to expected title."""
+    def _expected_title_for_entity(self, entity: str) -> Optional[str]:
+        """Title a record for this entity would have (None if the entity cannot be split)."""
         try:
             state, county, city = split_entity(entity)
         except ValueError:
             return None
         
-        # Generate expected title patterns for this entity
         entity_type = "city" if city not in {"unincorporated", "unified", "incorporated", "countywide"} else city
-        expected = generate_expected_values(self.cfg.layer, state, county, city, entity_type)
-        expected_title = expected['title']
-        
-        # Search for record with matching title
-        sql = """
-            SELECT * FROM m_gis_data_catalog_main 
-            WHERE status IS DISTINCT FROM 'DELETE' 
-            AND lower(title) = %s
-        """
+        return generate_expected_values(self.cfg.layer, state, county, city, entity_type)['title']
+    
+    def _load_catalog_index(self, entities: List[str]) -> CatalogKeyIndex:
+        """Load, in one query, every catalog row CREATE mode may match for these entities.
         
-        record = self.db.fetchone(sql, (expected_title.lower(),))
-        return record
+        That is the layer's rows (for layer_subgroup/state/county/city matches) plus any
+        live row whose title equals one of the entities' expected titles.
+        """
+        titles = sorted({t.lower() for t in map(self._expected_title_for_entity, entities) if t})
+        sql = f"""
+            SELECT * FROM {CATALOG_TABLE} 
+            WHERE layer_subgroup = %s 
+            OR (status IS DISTINCT FROM 'DELETE' AND lower(title) = ANY(%s))
+        """
+        rows = self.db.catalog_fetchall(sql, (self.cfg.layer, titles)) or []
+        index = CatalogKeyIndex(dict(row) for row in rows)
+        self.logger.debug(f"Loaded {len(rows)} catalog rows for duplicate checks")
+        return index
+    
+    def _find_record_by_entity(self, entity: str, index: CatalogKeyIndex) -> Optional[Dict[str, Any]]:
+        """Find database record by matching entity to expected title."""
+        expected_title = self._expected_title_for_entity(entity)
+        if expected_title is None:
+            return None
+        return index.find_title(expected_title)
     
-    def _find_matching_records(self, entity: str) -> List[Dict[str, Any]]:
+    def _find_matching_records(self, entity: str, index: CatalogKeyIndex) -> List[Dict[str, Any]]:
         """Find any records that might match this entity (broader search)."""
         # Parse entity to get the correct state, county, city
         parts = entity.split('_')
@@ -2818,28 +2992,22 @@ class LayersPrescrape:
         county = parts[2]
         city = '_'.join(parts[3:]) if len(parts) > 3 else None
         
-        # Convert to external format for database query
+        # Convert to external format for database lookup
         state_external = format_name(state, 'state', external=True) if state else None
         county_external = format_name(county, 'county', external=True) if county else None
         city_external = format_name(city, 'city', external=True) if city else None
         
-        # Handle None city properly for database query
+        # Handle None city properly for database lookup
         if city_external is None:
             city_external = ''  # Empty string for NULL city values
         
-        # Search for records with same layer, state, county, and city
-        sql = """
-        SELECT * FROM m_gis_data_catalog_main 
-        WHERE layer_subgroup = %s AND state = %s AND county = %s AND city = %s
-        """
-        params = (layer, state_external, county_external, city_external)
-        
+        # Records with same layer, state, county, and city
         self.logger.debug(f"Searching for records with: layer={layer}, state={state_external}, county={county_external}, city={city_external}")
-        results = self.db.fetchall(sql, params) or []
+        results = index.find_key(layer, state_external, county_external, city_external)
         self.logger.debug(f"Found {len(results)} matching records")
         
         # Also check for exact entity match using _find_record_by_entity
-        exact_match = self._find_record_by_entity(entity)
+        exact_match = self._find_record_by_entity(entity, index)
         if exact_match:
             self.logger.debug(f"Found exact match for entity: {entity}")
             results.append(exact_match)
@@ -2871,59 +3039,39 @@ class LayersPrescrape:
         
         self.db.execute(sql, params)
     
-    def _preserve_to_distrib_comments(self, record: Dict[str, Any], entity: str, comment_type: str, value: str):
-        """Preserve existing source/processing comments to distrib_comments field."""
-        # Start with existing distrib_comments from database (only once per entity)
-        if entity not in self.distrib_comments_updates:
-            # First time for this entity - initialize with existing distrib_comments
-            self.distrib_comments_updates[entity] = record.get('distrib_comments', '') or ''
-        
-        current_distrib = self.distrib_comments_updates[entity]
-        
-        # Check if this comment type already exists in the distrib_comments
-        comment_header = f"{comment_type}:"
-        if comment_header in current_distrib:
-            # Comment type already exists - don't add duplicate
-            return
-        
-        # Add the new preserved comment
-        if current_distrib and current_distrib.strip():
-            # Existing content - add newline separator
-            new_distrib = f"{current_distrib}\n\n{comment_type}:\n{value}"
-        else:
-            # No existing content - start fresh
-            new_distrib = f"{comment_type}:\n{value}"
+    def _create_record(self, record_data: Dict[str, Any], index: CatalogKeyIndex | None = None):
+        """Queue a new database record (inserted by _flush_created_records).
         
-        # Store the updated distrib_comments for this entity
-        self.distrib_comments_updates[entity] = new_distrib
-    
-    def _get_updated_distrib_comments(self, record: Dict[str, Any], entity: str) -> str:
-        """Get the updated distrib_comments with any preserved values."""
-        # Check if we have preserved comments for this entity
-        if entity in self.distrib_comments_updates:
-            return self.distrib_comments_updates[entity]
-        
-        # No preserved comments - return empty (no changes needed)
-        return ""
-    
-    def _create_record(self, record_data: Dict[str, Any]):
-        """Create new database record."""
+        The record is added to `index` right away so later entities in the same run
+        see it as existing, as they would after a one-row INSERT.
+        """
         # Add default fields
         record_data.update({
             'publish_date': get_today_str(),
             'download': 'AUTO',
             'status': 'ACTIVE'
         })
+        self._pending_creates.append(record_data)
+        if index is not None:
+            index.add(record_data)
+    
+    def _flush_created_records(self):
+        """Insert all queued records with one execute_values statement (in the run's transaction).
         
-        # Build INSERT statement
-        fields = list(record_data.keys())
-        placeholders = ', '.join(['%s'] * len(fields))
-        field_names = ', '.join(fields)
+        Columns a record does not set are sent as DEFAULT, as a per-record INSERT would leave them.
+        """
+        if not self._pending_creates:
+            return
         
-        sql = f"INSERT INTO m_gis_data_catalog_main ({field_names}) VALUES ({placeholders})"
-        params = tuple(record_data.values())
+        fields = list(dict.fromkeys(k for record in self._pending_creates for k in record))
+        default = psycopg2.extensions.AsIs('DEFAULT')
+        rows = [tuple(record.get(k, default) for k in fields)
+                for record in self._pending_creates]
         
-        self.db.execute(sql, params)
+        sql = f"INSERT INTO m_gis_data_catalog_main ({', '.join(fields)}) VALUES %s"
+        psycopg2.extras.execute_values(self.db.cur, sql, rows, page_size=500)
+        self.logger.debug(f"Inserted {len(rows)} catalog records in one batch")
+        self._pending_creates = []
     
     def _load_manual_overrides(self) -> Dict[str, Dict[str, Any]]:
         """Load manual field overrides from JSON file.
@@ -2972,11 +3120,13 @@ class LayersPrescrape:
         Returns:
             Override value if exists, None otherwise
         """
+        return self._get_manual_overrides().get(entity, {}).get(field)
+
+    def _get_manual_overrides(self) -> Dict[str, Dict[str, Any]]:
+        """All manual overrides ({entity: {field: value}}), loaded from the manual file once."""
         if not hasattr(self, '_manual_overrides'):
             self._manual_overrides = self._load_manual_overrides()
-        
-        entity_overrides = self._manual_overrides.get(entity, {})
-        return entity_overrides.get(field)
+        return self._manual_overrides
     
     def _write_missing_fields_preserving_existing(self):
         """Write missing fields to JSON file while preserving existing entries.
@@ -3196,6 +3346,7 @@ def extract_layers_from_patterns(include_patterns: list[str] = None, exclude_pat
     
     layers = set()
     excluded_layers = set()
+    layer_index = EntityPatternIndex(LAYER_CONFIGS.keys())
     
     # Extract layers from include patterns
     if include_patterns:
@@ -3210,34 +3361,23 @@ def extract_layers_from_patterns(include_patterns: list[str] = None, exclude_pat
                 # - ? (single character)
                 # - [abc] (character class)
                 # - [!abc] (negated character class)
-                wildcard_match = False
-                for layer_name in LAYER_CONFIGS.keys():
-                    if fnmatch.fnmatch(layer_name, pattern):
-                        layers.add(layer_name)
-                        wildcard_match = True
+                wildcard_matches = layer_index.match(pattern)
+                layers.update(wildcard_matches)
                 
                 # If no wildcard match and pattern contains '_', try entity pattern parsing
-                if not wildcard_match and '_' in pattern:
-                    # Entity format is layer_state_county_city, so layer is first component
-                    # Try to find the longest matching layer name
-                    found_layer = None
-                    for layer_name in LAYER_CONFIGS.keys():
-                        if pattern.startswith(layer_name + '_'):
-                            found_layer = layer_name
-                            break
-                    
-                    if found_layer:
-                        layers.add(found_layer)
+                if not wildcard_matches and '_' in pattern:
+                    # Entity format is layer_state_county_city, so layer is first component;
+                    # take the longest layer name followed by '_' in the pattern
+                    owners = layer_index.prefix_owners(pattern)
+                    if owners:
+                        layers.add(owners[-1])
     else:
         layers = LAYER_CONFIGS.keys()
     
     # Extract layers from exclude patterns
     if exclude_patterns:
-        for pattern in exclude_patterns:
-            # Check if pattern matches any layer names
-            for layer in LAYER_CONFIGS.keys():
-                if fnmatch.fnmatch(layer.lower(), pattern.lower()):
-                    excluded_layers.add(layer)
+        excluded, _ = EntityPatternIndex(LAYER_CONFIGS.keys(), case_sensitive=False).select(exclude_patterns)
+        excluded_layers.update(excluded)
     
     # Remove excluded layers from the set
     layers = layers - excluded_layers
@@ -3301,6 +3441,14 @@ def build_arg_parser() -> argparse.ArgumentParser:
                        help="Include optional conditions in FILL mode")
     parser.add_argument("--no-csv", dest="generate_csv", action="store_false",
                        help="Skip CSV report generation")
+    parser.add_argument("--no-url-cache", dest="url_cache", action="store_false",
+                       help="Re-probe every URL instead of reusing cached validation results")
+    parser.add_argument("--url-concurrency", type=int, default=32,
+                       help="URLs validated at once (default 32)")
+    parser.add_argument("--url-host-limit", type=int, default=4,
+                       help="URLs validated at once per host (default 4)")
+    parser.add_argument("--fill-workers", type=int, default=1,
+                       help="Processes running FILL field checks (default 1)")
 
     return parser
 
@@ -3444,7 +3592,11 @@ def main():
             apply_changes=args.apply,
             apply_manual=args.apply_manual,
             manual_file=args.manual_file,
-            fill_all=args.fill_all
+            fill_all=args.fill_all,
+            url_cache=args.url_cache,
+            url_concurrency=args.url_concurrency,
+            url_host_limit=args.url_host_limit,
+            fill_workers=args.fill_workers
         )
 
         # Run the processor for this layer
@@ -3490,7 +3642,11 @@ def main():
                 apply_changes=args.apply,
                 apply_manual=args.apply_manual,
                 manual_file=args.manual_file,
-                fill_all=args.fill_all
+                fill_all=args.fill_all,
+                url_cache=args.url_cache,
+                url_concurrency=args.url_concurrency,
+                url_host_limit=args.url_host_limit,
+                fill_workers=args.fill_workers
             )
             
             # Run the processor for this layer
@@ -25,12 +25,22 @@ import csv
 import json
 import re
 from typing import Optional
-import fnmatch
+import hashlib
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 from pathlib import Path
 import shutil
 import shlex
+import pickle
+import posixpath
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
 
 # Import modular Selenium OpenData downloader (optional)
 try:
@@ -44,9 +54,24 @@ except Exception:
     _selenium_shutdown = None
     _selenium_download_opendata = None
 
+# In-process shapefile metadata readers (optional; pyshp is the fallback)
+try:
+    from osgeo import ogr as _ogr, osr as _osr
+    _ogr.UseExceptions()
+    _osr.UseExceptions()
+except Exception:
+    _ogr = None
+    _osr = None
+try:
+    from pyproj import CRS as _PyprojCRS
+except Exception:
+    _PyprojCRS = None
+
 # Shared Selenium state across layers
 _SELENIUM_DRIVER = None
 _SELENIUM_REMAINING = set()
+# Serializes use of the shared driver (and the remaining-set bookkeeping) under --workers
+_SELENIUM_LOCK = threading.RLock()
 
 # ---------------------------------------------------------------------------
 # Layer Configuration
@@ -253,6 +278,7 @@ from layers_helpers import (
     PG_CONNECTION, VALID_STATES, FL_COUNTIES, LAYER_CONFIGS,
     FULL_PIPELINE_FORMATS, METADATA_ONLY_FORMATS,
     format_name, safe_catalog_val, 
+    EntityPatternIndex, glob_literal_prefix,
     resolve_layer_name, resolve_layer_directory,
     DATA_ROOT, TOOLS_DIR,
     # Date helpers
@@ -260,6 +286,9 @@ from layers_helpers import (
     # Backwards compatibility aliases
     counties, layers
 )
+from catalog_access import (
+    CATALOG_TABLE, LIVE_PREDICATE, SQL_LAYER_ROWS, catalog_fetchall, catalog_fetchone
+)
 
 # All constants now imported from layers_helpers.py
 
@@ -282,7 +311,16 @@ class Config:
                  run_upload: bool = True,
                  generate_summary: bool = True,
                  process_anyway: bool = False,
-                 slow_threshold_seconds: int | None = None):
+                 slow_threshold_seconds: int | None = None,
+                 workers: int = 1,
+                 host_concurrency: int = 2,
+                 host_delay_seconds: float = 1.0,
+                 host_limits: dict | None = None,
+                 batch_upload: bool = False,
+                 metadata_workers: int = 0,
+                 full_unzip: bool = False,
+                 catalog_cache: bool = True,
+                 ags_full_refresh: bool = False):
         self.test_mode = test_mode
         self.debug = debug
         self.isolate_logs = isolate_logs
@@ -298,6 +336,29 @@ class Config:
         self.generate_summary = generate_summary
         self.process_anyway = process_anyway
         self.slow_threshold_seconds = slow_threshold_seconds
+        
+        # Concurrency: number of entity lanes run at once (1 = sequential)
+        self.workers = max(1, int(workers or 1))
+        
+        # Download politeness: per-host concurrent downloads and minimum spacing between starts
+        self.host_concurrency = max(1, int(host_concurrency or 1))
+        self.host_delay_seconds = max(0.0, float(host_delay_seconds or 0.0))
+        self.host_limits = dict(host_limits or {})
+        
+        # Upload: queue catalog updates and commit them once per layer
+        self.batch_upload = batch_upload
+        
+        # Metadata: processes used to prefetch shapefile metadata for a layer (0/1 = off)
+        self.metadata_workers = max(0, int(metadata_workers or 0))
+        
+        # Download: extract every zip member instead of only those relevant to the format
+        self.full_unzip = full_unzip
+        
+        # Entity discovery: read catalog rows through the local snapshot cache
+        self.catalog_cache = catalog_cache
+        
+        # AGS downloads: ignore the incremental-sync watermark and re-extract whole layers
+        self.ags_full_refresh = ags_full_refresh
 
 # Global config object
 CONFIG = Config()
@@ -332,6 +393,256 @@ class SkipEntityError(LayerProcessingError):
     """Exception for when an entity should be skipped."""
     pass
 
+# ---------------------------------------------------------------------------
+# Download Host Scheduler
+# ---------------------------------------------------------------------------
+
+class DownloadHostScheduler:
+    """Per-host politeness gate for downloads.
+
+    Downloads are grouped by the host of the entity's `src_url_file`. Each host gets
+    at most `limit` downloads in flight and consecutive download starts on the same host
+    are spaced at least `min_interval` seconds apart. Different hosts never block each
+    other, so with --workers the total bandwidth is still spread across all hosts.
+
+    Per-host stats (requests, peak queue depth, wait time) are kept for the run summary.
+    """
+
+    def __init__(self, default_limit: int = 2, min_interval: float = 1.0, host_limits: dict | None = None):
+        self.default_limit = max(1, int(default_limit))
+        self.min_interval = max(0.0, float(min_interval))
+        self.host_limits = {str(k).lower(): max(1, int(v)) for k, v in (host_limits or {}).items()}
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    @staticmethod
+    def host_for_url(url: str | None) -> str | None:
+        """Return the lowercase host for a URL, or None when it has none."""
+        if not url:
+            return None
+        try:
+            host = urlparse(str(url).strip()).hostname
+        except ValueError:
+            return None
+        return host.lower() if host else None
+
+    def _host_state(self, host: str) -> dict:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = {
+                    'cond': threading.Condition(),
+                    'limit': self.host_limits.get(host, self.default_limit),
+                    'active': 0,
+                    'waiting': 0,
+                    'next_start': 0.0,
+                    'requests': 0,
+                    'max_queue_depth': 0,
+                    'total_wait': 0.0,
+                    'max_wait': 0.0,
+                }
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url: str | None):
+        """Hold a download slot for the URL's host for the duration of the block."""
+        host = self.host_for_url(url)
+        if host is None:
+            yield
+            return
+        state = self._host_state(host)
+        cond = state['cond']
+        queued_at = time.monotonic()
+        with cond:
+            state['waiting'] += 1
+            state['max_queue_depth'] = max(state['max_queue_depth'], state['waiting'])
+            while state['active'] >= state['limit']:
+                cond.wait()
+            state['waiting'] -= 1
+            state['active'] += 1
+            # Reserve the next start time on this host so spacing holds across workers
+            start_at = max(time.monotonic(), state['next_start'])
+            state['next_start'] = start_at + self.min_interval
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        waited = time.monotonic() - queued_at
+        with cond:
+            state['requests'] += 1
+            state['total_wait'] += waited
+            state['max_wait'] = max(state['max_wait'], waited)
+        try:
+            yield
+        finally:
+            with cond:
+                state['active'] -= 1
+                cond.notify()
+
+    def stats(self) -> dict[str, dict]:
+        """Return per-host stats: requests, limit, max_queue_depth, total_wait_s, max_wait_s."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        out = {}
+        for host, state in sorted(hosts.items()):
+            with state['cond']:
+                out[host] = {
+                    'requests': state['requests'],
+                    'limit': state['limit'],
+                    'max_queue_depth': state['max_queue_depth'],
+                    'total_wait_s': round(state['total_wait'], 1),
+                    'max_wait_s': round(state['max_wait'], 1),
+                }
+        return out
+
+# Global download scheduler (rebuilt from CLI options in main)
+DOWNLOAD_SCHEDULER = DownloadHostScheduler()
+
+# ---------------------------------------------------------------------------
+# Download Manifest
+# ---------------------------------------------------------------------------
+
+# Fast content hash for the download manifest: xxhash or BLAKE3 when installed, else BLAKE2b
+try:
+    import xxhash as _xxhash
+    _CONTENT_HASH_ALGO = 'xxh3_128'
+    _new_content_hasher = _xxhash.xxh3_128
+except ImportError:
+    try:
+        import blake3 as _blake3
+        _CONTENT_HASH_ALGO = 'blake3'
+        _new_content_hasher = _blake3.blake3
+    except ImportError:
+        _CONTENT_HASH_ALGO = 'blake2b-128'
+        _new_content_hasher = lambda: hashlib.blake2b(digest_size=16)
+
+def _hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the hex content hash of a file, read in fixed-size chunks."""
+    hasher = _new_content_hasher()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+class DownloadManifest:
+    """Persistent per-work_dir record of downloaded ZIP content hashes.
+
+    Stored as MANIFEST_FILE in the work_dir. It remembers the hash of the last ZIP that
+    made it all the way through the pipeline (`last_zip`), which lets layer_download
+    short-circuit a byte-identical re-download to NND before unzipping. Only the ZIP is
+    hashed; the unzipped files are never re-scanned.
+    """
+
+    MANIFEST_FILE = '.download_manifest.json'
+
+    def __init__(self, work_dir: str, data: dict | None = None):
+        self.work_dir = work_dir
+        data = data or {}
+        if data.get('hash_algo') != _CONTENT_HASH_ALGO:
+            # Hashes from another algorithm are not comparable; start over
+            data = {}
+        self.files = data.get('files', {})            # zip name -> {size, mtime_ns, hash}
+        self.last_zip = data.get('last_zip')          # {name, size, hash} of last fully processed ZIP
+        self.pending_zip = data.get('pending_zip')    # ZIP downloaded by the run in progress
+
+    @classmethod
+    def load(cls, work_dir: str) -> 'DownloadManifest':
+        try:
+            with open(os.path.join(work_dir, cls.MANIFEST_FILE), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        return cls(work_dir, data if isinstance(data, dict) else {})
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        data = {
+            'hash_algo': _CONTENT_HASH_ALGO,
+            'files': self.files,
+            'last_zip': self.last_zip,
+            'pending_zip': self.pending_zip,
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix=self.MANIFEST_FILE + '.', suffix='.tmp', dir=self.work_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, os.path.join(self.work_dir, self.MANIFEST_FILE))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def fingerprint(self, name: str) -> dict:
+        """Return {size, mtime_ns, hash} for a file, reusing the stored hash if size/mtime match."""
+        st = os.stat(os.path.join(self.work_dir, name))
+        known = self.files.get(name)
+        if known and known.get('size') == st.st_size and known.get('mtime_ns') == st.st_mtime_ns:
+            return known
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': _hash_file(os.path.join(self.work_dir, name))}
+
+    def zip_matches_last(self, zip_name: str) -> bool:
+        """Record zip_name as the pending ZIP and return True if it is byte-identical to last_zip."""
+        fp = self.fingerprint(zip_name)
+        self.files = {zip_name: fp}
+        self.pending_zip = {'name': zip_name, 'size': fp['size'], 'hash': fp['hash']}
+        last = self.last_zip or {}
+        return last.get('hash') == fp['hash'] and last.get('size') == fp['size']
+
+    def commit_pending_zip(self) -> bool:
+        """Promote the pending ZIP to last_zip (call once the entity succeeded)."""
+        if not self.pending_zip:
+            return False
+        self.last_zip = self.pending_zip
+        self.pending_zip = None
+        return True
+
+def _check_zip_unchanged(zip_file: str, work_dir: str, logger, layer: str, entity: str, entity_components: dict = None):
+    """Raise SkipEntityError (NND) if the downloaded ZIP is byte-identical to the last processed one.
+
+    Always records the ZIP hash as pending in the work_dir manifest; --process-anyway
+    still records it but never short-circuits.
+    """
+    manifest = DownloadManifest.load(work_dir)
+    unchanged = manifest.zip_matches_last(zip_file)
+    try:
+        manifest.save()
+    except OSError as e:
+        logger.debug(f"Could not update download manifest in {work_dir}: {e}")
+    if not unchanged:
+        return
+    if CONFIG.process_anyway:
+        logger.warning(f"{zip_file} is identical to the last processed download, but continuing due to process_anyway=True")
+        return
+    _update_csv_status(layer, entity, 'download', 'NND', error_msg='Download: ZIP identical to last download', entity_components=entity_components)
+    raise SkipEntityError(f"No new data available ({zip_file} identical to last download)", layer=layer, entity=entity)
+
+# Left in the work_dir by ags_extract_data2.py --pending-watermark
+AGS_PENDING_WATERMARK_SUFFIX = '.ags_watermark.pending.json'
+
+def _commit_download_manifest(work_dir: str, logger, table_name: str | None = None):
+    """Mark the pending ZIP / AGS watermark in the work_dir as processed after an entity succeeded.
+
+    Only table_name's watermark is promoted: work_dirs can be shared between entities
+    (e.g. zoning duval/unified and duval/jacksonville) that may still be running or have failed.
+    """
+    try:
+        manifest = DownloadManifest.load(work_dir)
+        if manifest.commit_pending_zip():
+            manifest.save()
+    except OSError as e:
+        logger.debug(f"Could not commit download manifest in {work_dir}: {e}")
+    if not table_name:
+        return
+    pending = os.path.join(work_dir, f'.{table_name}{AGS_PENDING_WATERMARK_SUFFIX}')
+    try:
+        os.replace(pending, os.path.join(work_dir, f'.{table_name}.ags_watermark.json'))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Could not commit AGS watermark {pending}: {e}")
+
 # ---------------------------------------------------------------------------
 # Utility Functions (Reused from original)
 # ---------------------------------------------------------------------------
@@ -404,6 +715,9 @@ def resolve_work_dir(layer: str, entity: str, entity_components: dict = None):
         pass
     return work_dir
 
+# Download tools whose output/exit code can signal "no new data" (-> NND)
+NND_AWARE_COMMANDS = ('download_data.py', 'ags_extract_data2.py')
+
 def _run_command_live(command, work_dir, logger):
     """Run a shell command with live output streaming."""
     if CONFIG.test_mode:
@@ -438,8 +752,8 @@ def _run_command_live(command, work_dir, logger):
     # Wait for process to complete and get return code
     return_code = process.wait()
     
-    # Handle download_data.py no-new-data vs error conditions
-    if len(command) > 1 and 'download_data.py' in command[1]:
+    # Handle download_data.py / ags_extract_data2.py no-new-data vs error conditions
+    if len(command) > 1 and os.path.basename(command[1]) in NND_AWARE_COMMANDS:
         stdout_combined = '\n'.join(stdout_lines)
         stdout_lower = stdout_combined.lower()
         nnd_phrases = [
@@ -453,17 +767,17 @@ def _run_command_live(command, work_dir, logger):
             # Only treat rc=1 as NND if output contains a known NND phrase; otherwise fall through to error handling
             if any(phrase in stdout_lower for phrase in nnd_phrases):
                 if CONFIG.process_anyway:
-                    logger.warning("download_data.py returned exit code 1 - no new data available, but continuing due to process_anyway=True")
+                    logger.warning(f"{os.path.basename(command[1])} returned exit code 1 - no new data available, but continuing due to process_anyway=True")
                     return stdout_combined
                 else:
-                    logger.info("download_data.py returned exit code 1 - no new data available - skipping entity")
+                    logger.info(f"{os.path.basename(command[1])} returned exit code 1 - no new data available - skipping entity")
                     raise SkipEntityError("No new data available from server", layer=None, entity=None)
         elif return_code == 0:
             if any(phrase in stdout_lower for phrase in nnd_phrases):
                 if CONFIG.process_anyway:
-                    logger.warning("download_data.py indicates no new data available, but continuing due to process_anyway=True")
+                    logger.warning(f"{os.path.basename(command[1])} indicates no new data available, but continuing due to process_anyway=True")
                 else:
-                    logger.info("download_data.py indicates no new data available - skipping entity")
+                    logger.info(f"{os.path.basename(command[1])} indicates no new data available - skipping entity")
                     raise SkipEntityError("No new data available from server", layer=None, entity=None)
 
     if return_code != 0:
@@ -513,8 +827,8 @@ def _run_command_regular(command, work_dir, logger):
     
     process = subprocess.run(command, cwd=work_dir, capture_output=True, text=True)
 
-    # Handle download_data.py no-new-data vs error conditions
-    if len(command) > 1 and 'download_data.py' in command[1]:
+    # Handle download_data.py / ags_extract_data2.py no-new-data vs error conditions
+    if len(command) > 1 and os.path.basename(command[1]) in NND_AWARE_COMMANDS:
         combined_lower = f"{process.stdout}\n{process.stderr}".lower()
         nnd_phrases = [
             '304 not modified',
@@ -527,17 +841,17 @@ def _run_command_regular(command, work_dir, logger):
             # Only treat rc=1 as NND if output contains a known NND phrase; otherwise let general error handling proceed
             if any(phrase in combined_lower for phrase in nnd_phrases):
                 if CONFIG.process_anyway:
-                    logger.warning("download_data.py returned exit code 1 - no new data available, but continuing due to process_anyway=True")
+                    logger.warning(f"{os.path.basename(command[1])} returned exit code 1 - no new data available, but continuing due to process_anyway=True")
                     return process.stdout
                 else:
-                    logger.info("download_data.py returned exit code 1 - no new data available - skipping entity")
+                    logger.info(f"{os.path.basename(command[1])} returned exit code 1 - no new data available - skipping entity")
                     raise SkipEntityError("No new data available from server", layer=None, entity=None)
         elif process.returncode == 0:
             if any(phrase in combined_lower for phrase in nnd_phrases):
                 if CONFIG.process_anyway:
-                    logger.warning("download_data.py indicates no new data available, but continuing due to process_anyway=True")
+                    logger.warning(f"{os.path.basename(command[1])} indicates no new data available, but continuing due to process_anyway=True")
                 else:
-                    logger.info("download_data.py indicates no new data available - skipping entity")
+                    logger.info(f"{os.path.basename(command[1])} indicates no new data available - skipping entity")
                     raise SkipEntityError("No new data available from server", layer=None, entity=None)
 
     if process.returncode != 0:
@@ -643,52 +957,204 @@ def _run_source_comments(source_comments: str, work_dir: str, logger):
                 logger.error(f"Failed to execute source comment command '{cmd_str}': {e}")
                 raise ProcessingError(f"Failed to execute source comment command: {e}", layer=None, entity=None)
 
+# ---------------------------------------------------------------------------
+# Catalog Writer
+# ---------------------------------------------------------------------------
+
+class CatalogWriter:
+    """Pooled, parameterized writer for m_gis_data_catalog_main updates.
+
+    Replaces the psql subprocess path in layer_upload: each update is a single
+    `UPDATE ... RETURNING id` round trip over a pooled connection (no process spawn,
+    no fresh connection, no string-formatted SQL). Updates can also be queued per
+    layer and committed together by flush() using execute_values in one transaction.
+
+    Rows are matched the same way the psql path matched them:
+    layer_subgroup = layer AND county = county AND city = city (external names).
+    """
+
+    TABLE = 'm_gis_data_catalog_main'
+    KEY_COLUMNS = ('layer_subgroup', 'county', 'city')
+
+    def __init__(self, dsn: str | None = None, maxconn: int = 4, rollback_only: bool = False):
+        self.dsn = dsn if dsn is not None else PG_CONNECTION
+        self.maxconn = max(1, int(maxconn))
+        # Roll back instead of committing (used by benchmark_catalog_writer.py)
+        self.rollback_only = rollback_only
+        self._pool = None
+        self._lock = threading.Lock()
+        # ThreadedConnectionPool.getconn() raises PoolError when every connection is out;
+        # callers wait here for a free one instead (entity, layer and catalog-read threads share it)
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._column_types = None
+        self._pending = {}  # layer -> list of (entity, county, city, fields, data_date)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = psycopg2.pool.ThreadedConnectionPool(1, self.maxconn, self.dsn)
+            return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection (waiting for a free one); commits on success, rolls back on error."""
+        pool = self._get_pool()
+        with self._slots:
+            conn = pool.getconn()
+            try:
+                yield conn
+                if self.rollback_only:
+                    conn.rollback()
+                else:
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
+
+    @staticmethod
+    def _validate_columns(columns):
+        for col in columns:
+            if not re.fullmatch(r'[a-z_][a-z0-9_]*', col):
+                raise ValueError(f"Invalid catalog column name: {col!r}")
+
+    def update_entity(self, layer: str, county: str, city: str, fields: dict) -> dict | None:
+        """Update one catalog row; return the updated values (with id) or None if no row matched."""
+        columns = list(fields)
+        self._validate_columns(columns)
+        sql = (
+            f"UPDATE {self.TABLE} SET "
+            + ", ".join(f"{col} = %s" for col in columns)
+            + " WHERE layer_subgroup = %s AND county = %s AND city = %s "
+            + "RETURNING id, " + ", ".join(columns)
+        )
+        params = [fields[col] for col in columns] + [layer, county, city]
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(sql, params)
+                row = cur.fetchone()
+        return dict(row) if row else None
+
+    # -- batched updates ---------------------------------------------------
+
+    def queue_update(self, layer: str, entity: str, county: str, city: str, fields: dict, data_date: str = ''):
+        """Queue an update to be committed with the rest of the layer by flush(layer)."""
+        self._validate_columns(fields)
+        with self._lock:
+            self._pending.setdefault(layer, []).append((entity, county, city, dict(fields), data_date))
+
+    def pending_entities(self, layer: str) -> list[str]:
+        with self._lock:
+            return [item[0] for item in self._pending.get(layer, [])]
+
+    def _load_column_types(self, cur) -> dict:
+        if self._column_types is None:
+            cur.execute(
+                "SELECT column_name, udt_name FROM information_schema.columns WHERE table_name = %s",
+                (self.TABLE,),
+            )
+            self._column_types = {name: udt for name, udt in cur.fetchall()}
+        return self._column_types
+
+    def flush(self, layer: str) -> dict[str, tuple[str | None, str]]:
+        """Commit all queued updates for a layer in one transaction.
+
+        Updates are grouped by column set and each group is sent as a single
+        `UPDATE ... FROM (VALUES ...) RETURNING` via execute_values.
+        Returns {entity: (error_message_or_None, data_date)}.
+        """
+        with self._lock:
+            queued = self._pending.pop(layer, [])
+        if not queued:
+            return {}
+
+        groups = {}
+        for item in queued:
+            groups.setdefault(tuple(item[3]), []).append(item)
+
+        outcomes = {}
+        try:
+            with self.connection() as conn:
+                with conn.cursor() as cur:
+                    column_types = self._load_column_types(cur)
+                    for columns, items in groups.items():
+                        value_cols = ['k_' + k for k in self.KEY_COLUMNS] + list(columns)
+                        casts = [column_types.get(k, 'text') for k in self.KEY_COLUMNS] + [column_types.get(c, 'text') for c in columns]
+                        template = "(" + ", ".join(f"%s::{t}" for t in casts) + ")"
+                        sql = (
+                            f"UPDATE {self.TABLE} AS m SET "
+                            + ", ".join(f"{col} = v.{col}" for col in columns)
+                            + " FROM (VALUES %s) AS v(" + ", ".join(value_cols) + ") "
+                            + "WHERE m.layer_subgroup = v.k_layer_subgroup AND m.county = v.k_county AND m.city = v.k_city "
+                            + "RETURNING v.k_layer_subgroup, v.k_county, v.k_city"
+                        )
+                        rows = [(layer, county, city, *[fields[c] for c in columns]) for _, county, city, fields, _ in items]
+                        matched = {tuple(r) for r in psycopg2.extras.execute_values(cur, sql, rows, template=template, fetch=True)}
+                        for entity, county, city, _, data_date in items:
+                            if (layer, county, city) in matched:
+                                outcomes[entity] = (None, data_date)
+                            else:
+                                outcomes[entity] = (
+                                    f"No matching record found in database for layer='{layer}', county='{county}', city='{city}'",
+                                    data_date,
+                                )
+        except Exception as e:
+            # The whole batch rolled back; every queued entity failed
+            return {entity: (f"Batch catalog update failed: {e}", data_date) for entity, _, _, _, data_date in queued}
+        return outcomes
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+# Global catalog writer (rebuilt from CLI options in main)
+CATALOG_WRITER = CatalogWriter()
+
 # ---------------------------------------------------------------------------
 # Database Functions
 # ---------------------------------------------------------------------------
 
 def _fetch_catalog_row(layer: str, state: str, county: str, city: str):
-    """Return catalog row for the given layer/state/county/city or None if missing."""
-    conn = psycopg2.connect(PG_CONNECTION)
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-    try:
-        # Convert internal format names to external format for database query
-        # Note: layer_subgroup is stored in internal format in database, so don't convert layer
-        state_external = format_name(state, 'state', external=True) if state else None
-        county_external = format_name(county, 'county', external=True) if county else None
-        city_external = format_name(city, 'city', external=True) if city else None
-        
-        # Build SQL query based on which fields are provided
-        sql_parts = ["SELECT * FROM m_gis_data_catalog_main WHERE lower(layer_subgroup) = %s"]
-        params = [layer.lower()]
-        
-        # Add state condition
-        if state_external:
-            sql_parts.append("AND (state = %s OR state IS NULL)")
-            params.append(state_external)
-        
-        # Add county condition
-        if county_external:
-            sql_parts.append("AND lower(county) = %s")
-            params.append(county_external.lower())
-        else:
-            sql_parts.append("AND county IS NULL")
+    """Return the live catalog row for the given layer/state/county/city or None if missing."""
+    # Convert internal format names to external format for database query
+    # Note: layer_subgroup is stored in internal format in database, so don't convert layer
+    state_external = format_name(state, 'state', external=True) if state else None
+    county_external = format_name(county, 'county', external=True) if county else None
+    city_external = format_name(city, 'city', external=True) if city else None
+    
+    # Build SQL query based on which fields are provided
+    sql_parts = [f"SELECT * FROM {CATALOG_TABLE} WHERE {LIVE_PREDICATE} AND layer_subgroup = %s"]
+    params = [layer.lower()]
+    
+    # Add state condition
+    if state_external:
+        sql_parts.append("AND (state = %s OR state IS NULL)")
+        params.append(state_external)
+    
+    # Add county condition
+    if county_external:
+        sql_parts.append("AND lower(county) = %s")
+        params.append(county_external.lower())
+    else:
+        sql_parts.append("AND county IS NULL")
+    
+    # Add city condition  
+    if city_external:
+        # Check for both the specific city and NULL (for default city cases)
+        sql_parts.append("AND (lower(city) = %s OR city IS NULL)")
+        params.append(city_external.lower())
+    else:
+        sql_parts.append("AND city IS NULL")
         
-        # Add city condition  
-        if city_external:
-            # Check for both the specific city and NULL (for default city cases)
-            sql_parts.append("AND (lower(city) = %s OR city IS NULL)")
-            params.append(city_external.lower())
-        else:
-            sql_parts.append("AND city IS NULL")
-            
-        sql = " ".join(sql_parts) + " LIMIT 1"
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        return dict(row) if row else None
-    finally:
-        cur.close()
-        conn.close()
+    sql = " ".join(sql_parts) + " LIMIT 1"
+    # Pooled connection, so the prepared lookup is reused across entities
+    with CATALOG_WRITER.connection() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            row = catalog_fetchone(cur, sql, params)
+    return dict(row) if row else None
 
 def _debug_main(message: str, logger):
     """Log main function debug messages to console when --debug is enabled, otherwise to entity logger."""
@@ -744,27 +1210,18 @@ def _get_existing_data_date(layer: str, entity: str, entity_components: dict = N
 def _fetch_entities_from_db(layer: str) -> list[str]:
     """Return list of entity strings for layer from database."""
     entities = []
-    conn = psycopg2.connect(PG_CONNECTION)
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
     try:
-        sql = (
-            "SELECT state, county, city FROM m_gis_data_catalog_main "
-            "WHERE status IS DISTINCT FROM 'DELETE' "
-            "AND lower(layer_subgroup) = %s"
-        )
-        cur.execute(sql, (layer.lower(),))
-        rows = cur.fetchall()
+        with CATALOG_WRITER.connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                rows = catalog_fetchall(cur, SQL_LAYER_ROWS, (layer.lower(),))
         for row in rows:
             entity = _entity_from_parts(layer, row['state'], row['county'], row['city'])
             entities.append(entity)
     except Exception as exc:
         logging.error(f"DB entity fetch failed: {exc}")
-    finally:
-        cur.close()
-        conn.close()
     return list(dict.fromkeys(entities))  # de-dupe preserving order
 
-# Old pattern-based entity fetching removed - now using get_filtered_entities with fnmatch
+# Old pattern-based entity fetching removed - now using get_filtered_entities with EntityPatternIndex
 
 def _entity_from_parts(layer: str, state: str | None, county: str, city: str | None) -> str:
     """Return entity id from raw DB values in appropriate format based on layer level."""
@@ -938,6 +1395,64 @@ def _run_processing_comment_commands(catalog_row: dict, work_dir: str, logger, l
 # Main Pipeline Functions
 # ---------------------------------------------------------------------------
 
+def _is_arcgis_hub_opendata(u: str | None) -> bool:
+    """Detect ArcGIS Hub/OpenData dataset pages (which need the Selenium downloader)."""
+    if not u:
+        return False
+    u_low = u.lower()
+    # Common Hub/OpenData domains and path hints
+    if 'opendata.arcgis.com' in u_low or 'hub.arcgis.com' in u_low:
+        # Exclude direct API download endpoints and direct ZIPs → handle via WGET
+        if '/api/download/' in u_low or u_low.endswith('.zip'):
+            return False
+        return True
+    if 'arcgis.com' in u_low and '/datasets/' in u_low:
+        return True
+    return False
+
+def _select_download_method(catalog_row: dict, logger=None, label: str = '') -> str:
+    """Return the download method ('AGS', 'WGET', 'SELENIUM' or the raw field value) for a catalog row.
+
+    Prefers the `download_method` field (legacy 'download' is AUTO and ignored) and falls back
+    to format/URL auto-detection. Shared by layer_download and the parallel scheduler so that
+    entities needing the shared Selenium driver are identified the same way in both places.
+    """
+    fmt = (catalog_row.get('format') or '').lower()
+    method_field = (catalog_row.get('download_method') or '').strip().upper()
+    resource = catalog_row.get('resource') or catalog_row.get('src_url_file')
+    src_url_file_lower = ((catalog_row.get('src_url_file') or '').strip().lower())
+
+    if method_field in {"AGS", "WGET", "SELENIUM"}:
+        # Safety override: if explicitly marked SELENIUM but the URL is a direct ZIP or Hub API download, use WGET
+        if method_field == 'SELENIUM':
+            is_direct_zip = src_url_file_lower.endswith('.zip') or ('.zip?' in src_url_file_lower) or ('.zip&' in src_url_file_lower)
+            is_hub_api = '/api/download/' in src_url_file_lower or src_url_file_lower.startswith('https://hub.arcgis.com/api/download') or src_url_file_lower.startswith('http://hub.arcgis.com/api/download')
+            if is_direct_zip or is_hub_api:
+                if logger:
+                    _debug_main(f"[DOWNLOAD] Overriding SELENIUM → WGET for direct download URL: {resource}", logger)
+                return 'WGET'
+        return method_field
+
+    if fmt == 'ags':
+        return 'AGS'
+    # Auto-detect using ONLY src_url_file (download URL)
+    hub_candidate = (catalog_row.get('src_url_file') or '').strip()
+    if fmt == 'selenium' or _is_arcgis_hub_opendata(hub_candidate):
+        if logger:
+            _debug_main(f"[DOWNLOAD] Auto-detected ArcGIS Hub/OpenData URL; using SELENIUM for {label}", logger)
+        return 'SELENIUM'
+    return 'WGET'
+
+def _download_slot(catalog_row: dict, logger):
+    """Return the DOWNLOAD_SCHEDULER slot for the entity's source host (no-op in test mode)."""
+    if CONFIG.test_mode:
+        return nullcontext()
+    url = (catalog_row.get('src_url_file') or catalog_row.get('resource') or '').strip()
+    host = DownloadHostScheduler.host_for_url(url)
+    if host:
+        logger.debug(f"[DOWNLOAD] Waiting for download slot on host {host}")
+    return DOWNLOAD_SCHEDULER.slot(url)
+
 def layer_download(layer: str, entity: str, state: str, county: str, city: str, catalog_row: dict, work_dir: str, logger, entity_components: dict = None):
     """Handle the download phase for an entity.
     
@@ -949,54 +1464,21 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
     """
     if not CONFIG.run_download:
         logger.debug(f"[DOWNLOAD] Skipping download for {layer}/{entity} (disabled in config)")
+        # Still sanity-check an existing AGS extract (cached by size/mtime, so re-runs are free)
+        table_name = catalog_row.get('table_name')
+        if table_name and (catalog_row.get('format') or '').lower() in {'ags', 'arcgis', 'esri', 'ags_extract'} \
+                and os.path.exists(os.path.join(work_dir, f"{table_name}.geojson")):
+            try:
+                _validate_ags_download(work_dir, table_name, logger)
+            except DownloadError as e:
+                logger.warning(f"Existing AGS extract for {layer}/{entity} failed validation: {e}")
         return None, None
 
     fmt = (catalog_row.get('format') or '').lower()
-    # Use download_method exclusively (legacy 'download' is AUTO and ignored)
-    method_field = (catalog_row.get('download_method') or '').strip().upper()
     resource = catalog_row.get('resource') or catalog_row.get('src_url_file')
-    src_url_file_lower = ((catalog_row.get('src_url_file') or '').strip().lower())
     table_name = catalog_row.get('table_name')
 
-    # Helper: detect ArcGIS Hub/OpenData pages
-    def _is_arcgis_hub_opendata(u: str | None) -> bool:
-        if not u:
-            return False
-        u_low = u.lower()
-        # Common Hub/OpenData domains and path hints
-        if 'opendata.arcgis.com' in u_low or 'hub.arcgis.com' in u_low:
-            # Exclude direct API download endpoints and direct ZIPs → handle via WGET
-            if '/api/download/' in u_low or u_low.endswith('.zip'):
-                return False
-            return True
-        if 'arcgis.com' in u_low and '/datasets/' in u_low:
-            return True
-        return False
-
-    # Determine download method (prefer download_method; else fallback by format/URL)
-    if method_field in {"AGS", "WGET", "SELENIUM"}:
-        # Safety override: if explicitly marked SELENIUM but the URL is a direct ZIP or Hub API download, use WGET
-        if method_field == 'SELENIUM':
-            is_direct_zip = src_url_file_lower.endswith('.zip') or ('.zip?' in src_url_file_lower) or ('.zip&' in src_url_file_lower)
-            is_hub_api = '/api/download/' in src_url_file_lower or src_url_file_lower.startswith('https://hub.arcgis.com/api/download') or src_url_file_lower.startswith('http://hub.arcgis.com/api/download')
-            if is_direct_zip or is_hub_api:
-                selected_method = 'WGET'
-                _debug_main(f"[DOWNLOAD] Overriding SELENIUM → WGET for direct download URL: {resource}", logger)
-            else:
-                selected_method = method_field
-        else:
-            selected_method = method_field
-    else:
-        if fmt == 'ags':
-            selected_method = 'AGS'
-        else:
-            # Auto-detect using ONLY src_url_file (download URL)
-            hub_candidate = (catalog_row.get('src_url_file') or '').strip()
-            if fmt == 'selenium' or _is_arcgis_hub_opendata(hub_candidate):
-                selected_method = 'SELENIUM'
-                _debug_main(f"[DOWNLOAD] Auto-detected ArcGIS Hub/OpenData URL; using SELENIUM for {layer}/{entity}", logger)
-            else:
-                selected_method = 'WGET'
+    selected_method = _select_download_method(catalog_row, logger, f"{layer}/{entity}")
 
     # Build command based on selected method
     if selected_method == 'AGS':
@@ -1007,8 +1489,19 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
             os.path.join(TOOLS_DIR, 'ags_extract_data2.py'),
             table_name,
             'delete',
-            '15'
+            # Minimum seconds between AGS requests (the extractor rate-limits its page requests)
+            '0.5',
+            # Sync against the watermark from the last run; prints NND when the layer is unchanged
+            '--incremental',
+            # The new watermark stays pending until the entity succeeded (_commit_download_manifest)
+            '--pending-watermark',
         ]
+        if CONFIG.ags_full_refresh:
+            command.append('--full-refresh')
+        ags_url = (catalog_row.get('src_url_file') or '').strip()
+        if ags_url:
+            # The catalog row is already loaded; spare the extractor its own catalog lookup
+            command.extend(['--url', ags_url, '--out-dir', work_dir])
         _debug_main(f"[DOWNLOAD] Running AGS download for {layer}/{entity} (table: {table_name})", logger)
     elif selected_method == 'WGET':
         if not resource:
@@ -1038,35 +1531,39 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
             raise DownloadError('Missing src_url_file for Selenium download', layer, entity)
         target_dir = work_dir  # use resolved work_dir as target
 
-        # Initialize shared driver lazily (per process)
-        global _SELENIUM_DRIVER
-        if _SELENIUM_DRIVER is None:
-            try:
-                headless = True  # always headless in pipeline
-                _SELENIUM_DRIVER = _selenium_init(download_dir="/srv/datascrub/_batch_downloads", headless=headless, chromium=True, debug=CONFIG.debug)
-                logger.debug("Initialized shared Selenium driver for batch")
-            except Exception as e:
-                raise DownloadError(f"Failed to initialize Selenium driver: {e}", layer, entity)
+        # The driver is shared by every SELENIUM entity; hold the lock for init + download
+        # so parallel workers never drive it concurrently.
+        with _SELENIUM_LOCK:
+            # Initialize shared driver lazily (per process)
+            global _SELENIUM_DRIVER
+            if _SELENIUM_DRIVER is None:
+                try:
+                    headless = True  # always headless in pipeline
+                    _SELENIUM_DRIVER = _selenium_init(download_dir="/srv/datascrub/_batch_downloads", headless=headless, chromium=True, debug=CONFIG.debug)
+                    logger.debug("Initialized shared Selenium driver for batch")
+                except Exception as e:
+                    raise DownloadError(f"Failed to initialize Selenium driver: {e}", layer, entity)
 
-        # Perform Selenium download (module handles waiting + basic validation + transfer)
-        try:
-            # Provide existing catalog data_date (if available) to enable NND shortcut
-            existing_date = None
+            # Perform Selenium download (module handles waiting + basic validation + transfer)
             try:
-                existing_date = str(catalog_row.get('data_date') or '').strip() or None
-            except Exception:
-                existing_date = None
-            result = _selenium_download_opendata(
-                _SELENIUM_DRIVER,
-                entity=entity,
-                url=sel_url,
-                target_dir=target_dir,
-                catalog_data_date=existing_date,
-                transfer=True,
-                debug=CONFIG.debug,
-            )
-        except Exception as e:
-            raise DownloadError(f"Selenium error: {e}", layer, entity)
+                with _download_slot(catalog_row, logger):
+                    # Provide existing catalog data_date (if available) to enable NND shortcut
+                    existing_date = None
+                    try:
+                        existing_date = str(catalog_row.get('data_date') or '').strip() or None
+                    except Exception:
+                        existing_date = None
+                    result = _selenium_download_opendata(
+                        _SELENIUM_DRIVER,
+                        entity=entity,
+                        url=sel_url,
+                        target_dir=target_dir,
+                        catalog_data_date=existing_date,
+                        transfer=True,
+                        debug=CONFIG.debug,
+                    )
+            except Exception as e:
+                raise DownloadError(f"Selenium error: {e}", layer, entity)
 
         status = (result or {}).get('status', 'FAILED')
         if status == 'SKIPPED_NND':
@@ -1081,15 +1578,6 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
         transferred = result.get('transferred_files', []) or []
         changed_files = [os.path.basename(f) for f in transferred]
 
-        # Validate via existing validation step to keep behavior consistent
-        before_state = _get_directory_state(work_dir)
-        after_state = {**before_state}
-        for name in changed_files:
-            try:
-                after_state[name] = os.path.getmtime(os.path.join(work_dir, name))
-            except Exception:
-                pass
-
         # Run data validation against the new files
         fmt_lower = fmt
         zip_file = None
@@ -1111,15 +1599,11 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
                 newest_zip = max(changed_zip_candidates, key=lambda n: os.path.getmtime(os.path.join(work_dir, n)))
                 zip_file = newest_zip  # basename
                 _debug_main(f"[DOWNLOAD] Found zip file among Selenium changes: {zip_file}", logger)
-                data_date = zip_processing(zip_file, work_dir, logger)
-
-            # Data validation on changed files (including extracted/modified from zip if any)
-            if zip_file:
-                post_unzip_state = _get_directory_state(work_dir)
-                extracted_or_modified = []
-                for name, mtime in post_unzip_state.items():
-                    if name not in before_state or before_state.get(name) != mtime:
-                        extracted_or_modified.append(name)
+                # Byte-identical to the last processed ZIP -> NND before unzipping
+                _check_zip_unchanged(zip_file, work_dir, logger, layer, entity, entity_components)
+                data_date, extracted = zip_processing(zip_file, work_dir, logger, fmt_lower)
+                # Data validation on changed files (including those extracted from the zip)
+                extracted_or_modified = _top_level_entries(extracted)
                 changed_files = list({*changed_files, *[os.path.join(work_dir, f) for f in extracted_or_modified]})
             try:
                 _validate_data_files([os.path.basename(p) for p in changed_files], fmt_lower, work_dir, logger)
@@ -1157,11 +1641,13 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
 
     logger.debug(f"Running download for {layer}/{entity}")
 
-    # Capture directory state before download for validation
+    # Capture directory state before download: mtimes only show which files the command wrote;
+    # whether a ZIP is new data is decided by its content hash (DownloadManifest)
     before_state = _get_directory_state(work_dir)
 
     try:
-        _run_command(command, work_dir, logger)
+        with _download_slot(catalog_row, logger):
+            _run_command(command, work_dir, logger)
     except SkipEntityError as e:
         # Handle "no new data" case - from download command
         _update_csv_status(layer, entity, 'download', 'NND', error_msg='Download command: no new data', entity_components=entity_components)
@@ -1200,25 +1686,19 @@ def layer_download(layer: str, entity: str, state: str, county: str, city: str,
                 )
                 zip_file = newest_zip
 
-                # snapshot before unzip (after download)
-                pre_unzip_state = dict(after_state)
                 _debug_main(f"[DOWNLOAD] Found zip file among changes: {zip_file}", logger)
-                data_date = zip_processing(zip_file, work_dir, logger)
-                # capture files created by unzip
-                post_unzip_state = _get_directory_state(work_dir)
-                # include files that are new OR modified by the unzip operation
-                extracted_or_modified = []
-                for name, mtime in post_unzip_state.items():
-                    if name not in pre_unzip_state or pre_unzip_state.get(name) != mtime:
-                        extracted_or_modified.append(name)
-                # include extracted/modified files in changed files for data validation
+                # Byte-identical to the last processed ZIP -> NND before unzipping
+                _check_zip_unchanged(zip_file, work_dir, logger, layer, entity, entity_components)
+                data_date, extracted = zip_processing(zip_file, work_dir, logger, fmt)
+                extracted_or_modified = _top_level_entries(extracted)
+                # include extracted files in changed files for data validation
                 changed_files = list({*changed_files, *extracted_or_modified})
 
             # Run data validation on the changed files
             try:
                 _validate_data_files(changed_files, fmt, work_dir, logger)
             except DownloadError:
-                # Fallback: mtime-based change detection may miss files if unzip preserves timestamps
+                # Fallback: the expected files may predate this download (e.g. zip extracted earlier)
                 fallback_candidates = _collect_files_matching_format(work_dir, fmt)
                 if fallback_candidates:
                     logger.debug(f"[DOWNLOAD] Fallback format scan found: {fallback_candidates}")
@@ -1545,7 +2025,12 @@ def layer_processing(layer: str, entity: str, state: str, county: str, city: str
         raise ProcessingError(f"Processing failed: {e}", layer, entity) from e
 
 def layer_upload(layer: str, entity: str, state: str, county: str, city: str, catalog_row: dict, work_dir: str, logger, metadata: dict, raw_zip_name: str = None, entity_components: dict = None):
-    """Handle the upload phase for an entity."""
+    """Handle the upload phase for an entity.
+
+    Writes the catalog update through CATALOG_WRITER (pooled connection, parameterized
+    UPDATE ... RETURNING). With --batch-upload the update is queued instead and committed
+    with the rest of the layer by _flush_catalog_updates.
+    """
     if not CONFIG.run_upload:
         logger.debug(f"[UPLOAD] Skipping upload for {layer}/{entity} (disabled in config)")
         return
@@ -1553,178 +2038,165 @@ def layer_upload(layer: str, entity: str, state: str, county: str, city: str, ca
     _debug_main(f"[UPLOAD] Updating catalog metadata for {layer}/{entity}", logger)
 
     fmt = (catalog_row.get('format') or '').lower()
-    
-    # Build SQL dynamically based on available metadata
+
+    # Build the column set dynamically based on available metadata
     # Always update publish_date
     publish_date = datetime.now().strftime('%Y-%m-%d')
-    
-    # Start building SET clauses with fields we always want to update
-    set_clauses = []
-    placeholders = {
-        'layer': layer,
-        'county': format_name(county, 'county', external=True),
-        'city': format_name(city, 'city', external=True),
-        'publish_date': publish_date,
-    }
-    
-    # Always update publish_date
-    set_clauses.append("publish_date = '{publish_date}'")
-    
+    fields = {'publish_date': publish_date}
+
     # Add metadata fields only if they have meaningful values
     if metadata.get('data_date'):
-        set_clauses.append("data_date = '{data_date}'")
-        placeholders['data_date'] = metadata['data_date']
-    
+        fields['data_date'] = metadata['data_date']
+
     if metadata.get('epsg'):
-        set_clauses.append("srs_epsg = '{epsg}'")
-        placeholders['epsg'] = metadata['epsg']
-    
+        fields['srs_epsg'] = metadata['epsg']
+
     if metadata.get('shp'):
-        set_clauses.append("sys_raw_file = '{shp}'")
-        placeholders['shp'] = metadata['shp']
-    
+        fields['sys_raw_file'] = metadata['shp']
+
     if metadata.get('field_names'):
-        set_clauses.append("field_names = '{field_names}'")
-        placeholders['field_names'] = metadata['field_names']
-    
+        fields['field_names'] = metadata['field_names']
+
     # Add raw_zip field for non-AGS formats if zip file exists
     if fmt not in {'ags', 'arcgis', 'esri', 'ags_extract'} and raw_zip_name:
-        set_clauses.append("sys_raw_file_zip = '{raw_zip}'")
-        placeholders['raw_zip'] = raw_zip_name
-    
-    # Build final SQL
-    sql_update = (
-        "UPDATE m_gis_data_catalog_main SET "
-        + ", ".join(set_clauses) + " "
-        "WHERE layer_subgroup = '{layer}' "
-        "AND county = '{county}' "
-        "AND city = '{city}';"
-    )
-    
+        fields['sys_raw_file_zip'] = raw_zip_name
+
+    county_external = format_name(county, 'county', external=True)
+    city_external = format_name(city, 'city', external=True)
+    data_date = metadata.get('data_date', publish_date)
+
     # Log what fields will be updated
-    updating_fields = [clause.split(' = ')[0] for clause in sql_update.split('SET ')[1].split(' WHERE')[0].split(', ')]
-    logger.debug(f"Updating fields: {', '.join(updating_fields)}")
+    logger.debug(f"Updating fields: {', '.join(fields)}")
     logger.debug(f"Upload placeholders - data_date: {metadata.get('data_date', 'not_set')}, publish_date: {publish_date}")
 
-    # Substitute placeholders
-    final_sql = sql_update.format(**placeholders)
-    
-    command = ['psql', '-d', 'gisdev', '-U', 'postgres', '-c', final_sql]
-    
-    logger.debug(f"Running upload command for {layer}/{entity}")
+    if CONFIG.test_mode:
+        logger.info(f"[TEST MODE] CATALOG UPDATE SKIPPED for {layer}/{entity}: {', '.join(fields)}")
+        _update_csv_status(layer, entity, 'upload', 'SUCCESS', data_date=data_date, entity_components=entity_components)
+        return
+
+    if CONFIG.batch_upload:
+        CATALOG_WRITER.queue_update(layer, entity, county_external, city_external, fields, data_date=data_date)
+        _debug_main(f"[UPLOAD] Queued catalog update for {layer}/{entity} (batch commit at end of layer)", logger)
+        return
+
+    logger.debug(f"Running upload for {layer}/{entity}")
     try:
-        output = _run_command(command, work_dir, logger)
-        
-        # Check if the UPDATE actually affected any rows
-        if output and 'UPDATE 0' in output:
-            # It's possible that 0 rows were affected because the record already matches
-            # the intended values. Verify by selecting the target row and comparing fields.
-            try:
-                fields_to_check = [clause.split(' = ')[0] for clause in set_clauses]
-
-                # Map column name -> expected value from placeholders used in UPDATE
-                column_to_expected_value = {}
-                for column_name in fields_to_check:
-                    if column_name == 'publish_date':
-                        column_to_expected_value[column_name] = placeholders.get('publish_date', '')
-                    elif column_name == 'data_date':
-                        column_to_expected_value[column_name] = placeholders.get('data_date', '')
-                    elif column_name == 'srs_epsg':
-                        column_to_expected_value[column_name] = placeholders.get('epsg', '')
-                    elif column_name == 'sys_raw_file':
-                        column_to_expected_value[column_name] = placeholders.get('shp', '')
-                    elif column_name == 'field_names':
-                        column_to_expected_value[column_name] = placeholders.get('field_names', '')
-                    elif column_name == 'sys_raw_file_zip':
-                        column_to_expected_value[column_name] = placeholders.get('raw_zip', '')
-                    else:
-                        # Fallback: do not check unknown columns
-                        column_to_expected_value[column_name] = None
-
-                select_sql = (
-                    "SELECT " + ", ".join(fields_to_check) + " FROM m_gis_data_catalog_main "
-                    "WHERE layer_subgroup = '{layer}' AND county = '{county}' AND city = '{city}';"
-                ).format(**placeholders)
-
-                # Use unaligned, tuples-only output with a safe delimiter for parsing
-                verify_cmd = ['psql', '-d', 'gisdev', '-U', 'postgres', '-t', '-A', '-F', '|', '-c', select_sql]
-                verify_output = _run_command(verify_cmd, work_dir, logger) or ''
-                verify_output = verify_output.strip()
-
-                if not verify_output:
-                    # No row matched the WHERE clause; this is a genuine failure
-                    error_msg = (
-                        f"No matching record found in database for layer='{layer}', county='{county}', city='{city}'"
-                    )
-                    logger.error(error_msg)
-                    _update_csv_status(layer, entity, 'upload', 'FAILED', error_msg, entity_components=entity_components)
-                    raise UploadError(error_msg, layer, entity)
-
-                # If multiple rows come back (unexpected), just take the first line
-                first_line = verify_output.splitlines()[0]
-                db_values = first_line.split('|') if first_line else []
-
-                # Compare values (string comparison); skip columns where expected value is None
-                all_match = True
-                for idx, column_name in enumerate(fields_to_check):
-                    expected_value = column_to_expected_value.get(column_name)
-                    if expected_value is None:
-                        continue
-                    db_value = db_values[idx] if idx < len(db_values) else ''
-                    if str(db_value) != str(expected_value):
-                        all_match = False
-                        logger.debug(
-                            f"[UPLOAD] Mismatch for column '{column_name}': db='{db_value}' vs expected='{expected_value}'"
-                        )
-                        break
+        row = CATALOG_WRITER.update_entity(layer, county_external, city_external, fields)
+        if row is None:
+            # No row matched the WHERE clause; this is a genuine failure
+            error_msg = (
+                f"No matching record found in database for layer='{layer}', county='{county}', city='{city}'"
+            )
+            logger.error(error_msg)
+            raise UploadError(error_msg, layer, entity)
 
-                if all_match:
-                    # Treat as success: record already up to date
-                    info_msg = (
-                        f"No changes applied for {layer}/{entity}: targeted record already up to date"
-                    )
-                    logger.info(info_msg)
-                    data_date = metadata.get('data_date', publish_date)
-                    _update_csv_status(layer, entity, 'upload', 'SUCCESS', data_date=data_date, entity_components=entity_components)
-                    _debug_main(f"[UPLOAD] Catalog metadata already current for {layer}/{entity}", logger)
-                    return
-                else:
-                    # Row exists but values differ — treat as failure
-                    error_msg = (
-                        f"UPDATE 0 for layer='{layer}', county='{county}', city='{city}', and values differ from intended update"
-                    )
-                    logger.error(error_msg)
-                    _update_csv_status(layer, entity, 'upload', 'FAILED', error_msg, entity_components=entity_components)
-                    raise UploadError(error_msg, layer, entity)
-
-            except Exception as inner_e:
-                # Any verification error should be treated as upload failure
-                error_msg = f"Upload verification failed: {inner_e}"
-                logger.error(error_msg)
-                _update_csv_status(layer, entity, 'upload', 'FAILED', error_msg, entity_components=entity_components)
-                raise UploadError(error_msg, layer, entity) from inner_e
-        
-        data_date = metadata.get('data_date', publish_date)
         _update_csv_status(layer, entity, 'upload', 'SUCCESS', data_date=data_date, entity_components=entity_components)
         _debug_main(f"[UPLOAD] Catalog metadata updated successfully for {layer}/{entity}", logger)
     except Exception as e:
         _update_csv_status(layer, entity, 'upload', 'FAILED', str(e), entity_components=entity_components)
         raise UploadError(f"Upload failed: {e}", layer, entity) from e
 
+def _flush_catalog_updates(layer: str, results: list[dict], entity_components: dict = None):
+    """Commit the layer's queued catalog updates (--batch-upload) and fold outcomes into results.
+
+    Entities whose update matched no catalog row (or whose batch failed) are marked
+    FAILED in the summary and their result entry is turned into an upload failure.
+    NND publish_date updates only log a warning on failure, as in the unbatched path.
+    """
+    if not (CONFIG.batch_upload and CONFIG.run_upload) or CONFIG.test_mode:
+        return
+    queued = CATALOG_WRITER.pending_entities(layer)
+    if not queued:
+        return
+    outcomes = CATALOG_WRITER.flush(layer)
+    by_entity = {r['entity']: r for r in results}
+    failed = 0
+    for entity, (error_msg, data_date) in outcomes.items():
+        result = by_entity.get(entity)
+        is_success_entry = result is not None and result.get('status') == 'success'
+        if error_msg is None:
+            if is_success_entry:
+                _update_csv_status(layer, entity, 'upload', 'SUCCESS', data_date=data_date, entity_components=entity_components)
+                if CONFIG.run_metadata and CONFIG.run_processing:
+                    try:
+                        _commit_download_manifest(resolve_work_dir(layer, entity, entity_components), logging.getLogger(__name__),
+                                                  result.get('table_name'))
+                    except ValueError:
+                        pass
+            continue
+        failed += 1
+        if is_success_entry:
+            _update_csv_status(layer, entity, 'upload', 'FAILED', error_msg, entity_components=entity_components)
+            result.clear()
+            result.update({
+                'layer': layer, 'entity': entity, 'status': 'failure',
+                'error': f"Upload failed: {error_msg}", 'data_date': None, 'runtime_seconds': 0
+            })
+        else:
+            logging.warning(f"Failed to update publish_date for {entity}: {error_msg}")
+    logging.info(f"Committed {len(outcomes) - failed}/{len(outcomes)} batched catalog updates for layer '{layer}'")
+
 # ---------------------------------------------------------------------------
 # Helper Functions (from original script)
 # ---------------------------------------------------------------------------
 
-def zip_processing(zip_file: str, work_dir: str, logger) -> str:
-    """Process a downloaded zip file: unzip it and extract data date.
+# Primary member extensions per catalog format for selective unzip; members sharing a
+# primary member's stem (.shx/.dbf/.prj/.cpg, .tfw/.aux.xml, ...) come along with it.
+_ZIP_FORMAT_EXTENSIONS = {
+    'shp': ('.shp',), 'shapefile': ('.shp',),
+    'geojson': ('.geojson', '.json'), 'json': ('.geojson', '.json'),
+    'pdf': ('.pdf',),
+    'jpg': ('.jpg', '.jpeg', '.png', '.gif'), 'jpeg': ('.jpg', '.jpeg', '.png', '.gif'),
+    'png': ('.jpg', '.jpeg', '.png', '.gif'), 'gif': ('.jpg', '.jpeg', '.png', '.gif'),
+    'image': ('.jpg', '.jpeg', '.png', '.gif'),
+    'kml': ('.kml', '.kmz'), 'kmz': ('.kml', '.kmz'),
+    'csv': ('.csv',),
+    'xlsx': ('.xlsx', '.xls'), 'xls': ('.xlsx', '.xls'),
+    'tif': ('.tif', '.tiff'), 'tiff': ('.tif', '.tiff'), 'geotiff': ('.tif', '.tiff'),
+    'mdb': ('.mdb', '.accdb'), 'accdb': ('.mdb', '.accdb'),
+    'txt': ('.txt',),
+}
+_ZIP_GDB_FORMATS = {'gdb', 'filegdb', 'file geodatabase', 'geodatabase', 'fgdb'}
+
+def _member_stem(name: str) -> str:
+    """Lowercase member path without its extension(s): 'a/Parcels.shp.xml' -> 'a/parcels'."""
+    directory, base = posixpath.split(name.lower())
+    return posixpath.join(directory, base.split('.', 1)[0])
+
+def _select_zip_members(members: list[zipfile.ZipInfo], fmt: str | None) -> list[zipfile.ZipInfo]:
+    """Return the file members relevant to the catalog format (all files if the format is unknown
+    or nothing matches)."""
+    files = [m for m in members if not m.is_dir()]
+    fmt_lower = (fmt or '').lower()
+    if fmt_lower in _ZIP_GDB_FORMATS:
+        selected = [m for m in files if any(part.lower().endswith('.gdb') for part in m.filename.split('/')[:-1])]
+    elif fmt_lower in _ZIP_FORMAT_EXTENSIONS:
+        extensions = _ZIP_FORMAT_EXTENSIONS[fmt_lower]
+        stems = {_member_stem(m.filename) for m in files if m.filename.lower().endswith(extensions)}
+        selected = [m for m in files if _member_stem(m.filename) in stems]
+    else:
+        return files
+    return selected or files
+
+def zip_processing(zip_file: str, work_dir: str, logger, fmt: str | None = None) -> tuple[str, list[str]]:
+    """Process a downloaded zip file: extract it and derive the data date.
+    
+    Members are streamed to disk with zipfile (bounded memory), keeping the archive's
+    directory hierarchy (so *.gdb directories remain intact) and member timestamps, as
+    `unzip -o` did. When `fmt` is a known catalog format only the relevant members are
+    extracted (see _select_zip_members) unless --full-unzip is set.
+    
+    The data date is the newest member date in the central directory; the zip is then
+    renamed to {stem}_{date}.zip (the zip_rename_date.sh convention).
     
     Args:
         zip_file: Name of the zip file to process
         work_dir: Working directory where the zip file is located
         logger: Logger instance for logging
+        fmt: Catalog format used to select members (None = extract everything)
         
     Returns:
-        Data date in YYYY-MM-DD format extracted from zip_rename_date.sh
+        (data date in YYYY-MM-DD format, extracted paths relative to work_dir)
         
     Raises:
         ProcessingError: If zip processing fails
@@ -1736,60 +2208,64 @@ def zip_processing(zip_file: str, work_dir: str, logger) -> str:
     
     logger.debug(f"Processing zip file: {zip_file}")
     
-    # Step 1: Unzip the file
+    if CONFIG.test_mode:
+        logger.info(f"[TEST MODE] UNZIP SKIPPED IN {work_dir}: {zip_file}")
+        # Return a test date for test mode
+        return datetime.now().strftime('%Y-%m-%d'), []
+    
+    root = os.path.realpath(work_dir)
+    extracted = []
     try:
-        # Preserve directory hierarchy so *.gdb directories remain intact
-        unzip_command = ['unzip', '-o', zip_file]
-        logger.debug(f"Running unzip command: {' '.join(unzip_command)}")
-        
-        if CONFIG.test_mode:
-            logger.info(f"[TEST MODE] UNZIP COMMAND SKIPPED IN {work_dir}: {' '.join(unzip_command)}")
-        else:
-            process = subprocess.run(unzip_command, cwd=work_dir, capture_output=True, text=True)
+        with zipfile.ZipFile(zip_path) as zf:
+            members = zf.infolist()
+            if not members:
+                raise ProcessingError(f"Zip file is empty: {zip_file}", layer=None, entity=None)
             
-            if process.returncode != 0:
-                logger.error(f"Unzip command failed: {' '.join(unzip_command)}")
-                logger.error(f"STDERR: {process.stderr}")
-                raise ProcessingError(f"Unzip failed with exit code {process.returncode}: {process.stderr.strip()}", layer=None, entity=None)
+            # Data date: newest member timestamp (directories included, like `unzip -l`)
+            newest = max(m.date_time for m in members)
+            data_date = f"{newest[0]:04d}-{newest[1]:02d}-{newest[2]:02d}"
             
-            logger.debug(f"Unzip completed successfully")
-            if process.stdout:
-                logger.debug(f"Unzip output: {process.stdout}")
-                
-    except Exception as e:
+            selected = members if CONFIG.full_unzip else _select_zip_members(members, fmt)
+            logger.debug(f"Extracting {len(selected)}/{len(members)} members of {zip_file} (format: {fmt or 'any'})")
+            
+            for member in selected:
+                target = os.path.realpath(os.path.join(root, member.filename))
+                if target != root and not target.startswith(root + os.sep):
+                    logger.warning(f"Skipping zip member outside work_dir: {member.filename}")
+                    continue
+                if member.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                # Keep the member timestamp, as unzip does
+                try:
+                    ts = datetime(*member.date_time).timestamp()
+                    os.utime(target, (ts, ts))
+                except (ValueError, OverflowError, OSError):
+                    pass
+                extracted.append(os.path.relpath(target, root))
+    except ProcessingError:
+        raise
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, OSError, RuntimeError) as e:
         raise ProcessingError(f"Failed to unzip {zip_file}: {e}", layer=None, entity=None)
     
-    # Step 2: Run zip_rename_date.sh to extract data date
+    logger.debug(f"Unzip completed successfully: {len(extracted)} files extracted")
+    
+    # Rename the zip with its data date ({stem}_{date}.zip), as zip_rename_date.sh did
+    renamed = f"{os.path.splitext(zip_file)[0]}_{data_date}.zip"
     try:
-        rename_command = ['zip_rename_date.sh', zip_file]
-        logger.debug(f"Running zip_rename_date.sh: {' '.join(rename_command)}")
-        
-        if CONFIG.test_mode:
-            logger.info(f"[TEST MODE] ZIP_RENAME_DATE COMMAND SKIPPED IN {work_dir}: {' '.join(rename_command)}")
-            # Return a test date for test mode
-            return datetime.now().strftime('%Y-%m-%d')
-        else:
-            process = subprocess.run(rename_command, cwd=work_dir, capture_output=True, text=True)
-            
-            if process.returncode != 0:
-                logger.error(f"zip_rename_date.sh command failed: {' '.join(rename_command)}")
-                logger.error(f"STDERR: {process.stderr}")
-                raise ProcessingError(f"zip_rename_date.sh failed with exit code {process.returncode}: {process.stderr.strip()}", layer=None, entity=None)
-            
-            # Extract data date from stdout (should be in YYYY-MM-DD format)
-            data_date = process.stdout.strip()
-            
-            # Validate the date format
-            try:
-                datetime.strptime(data_date, '%Y-%m-%d')
-                logger.debug(f"Extracted data date from zip: {data_date}")
-                return data_date
-            except ValueError:
-                logger.error(f"Invalid date format from zip_rename_date.sh: '{data_date}'")
-                raise ProcessingError(f"zip_rename_date.sh returned invalid date format: '{data_date}'", layer=None, entity=None)
-                
-    except Exception as e:
-        raise ProcessingError(f"Failed to run zip_rename_date.sh on {zip_file}: {e}", layer=None, entity=None)
+        os.replace(zip_path, os.path.join(work_dir, renamed))
+    except OSError as e:
+        raise ProcessingError(f"Failed to rename {zip_file} to {renamed}: {e}", layer=None, entity=None)
+    
+    logger.debug(f"Extracted data date from zip: {data_date}")
+    return data_date, extracted
+
+def _top_level_entries(paths: list[str]) -> list[str]:
+    """Map extracted relative paths to their top-level work_dir entries ('x.gdb/a0000' -> 'x.gdb')."""
+    return sorted({p.replace(os.sep, '/').split('/', 1)[0] for p in paths})
 
 def _get_directory_state(work_dir):
     """Get snapshot of directory state (filenames and modification times)."""
@@ -1867,108 +2343,263 @@ def _extract_pdf_metadata_conservative(pdf_path, logger):
     logger.warning(f"No reasonable data date found for PDF: {pdf_path}")
     return None
 
-def _validate_ags_download(work_dir, table_name, logger):
-    """Validate AGS download by checking GeoJSON file content."""
-    geojson_file = os.path.join(work_dir, f"{table_name}.geojson")
-    
+class _JSONStreamReader:
+    """Minimal incremental JSON reader over a text file.
+
+    Only the structural characters of the enclosing object/array are handled here;
+    every member value is decoded with json.JSONDecoder.raw_decode on a buffer that is
+    refilled on demand, so memory stays bounded by the largest single value (one feature).
+    """
+
+    _WS = ' \t\n\r'
+
+    def __init__(self, f, chunk_size: int = 1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append at least one more chunk to the buffer; return False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self._WS:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos] if self.pos < len(self.buf) else ''
+
+    def expect(self, ch: str):
+        got = self.peek()
+        if got != ch:
+            raise json.JSONDecodeError(f"Expected {ch!r}, found {got or 'end of file'!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value may be split across chunks; grow the buffer geometrically and retry
+                if not self._fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A bare number/literal ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _extend_bbox(coords, bbox: list):
+    """Grow bbox [minx, miny, maxx, maxy] in place with a (nested) GeoJSON coordinate array."""
+    if not coords:
+        return
+    if isinstance(coords[0], (int, float)):
+        x, y = coords[0], coords[1]
+        if x < bbox[0]: bbox[0] = x
+        if y < bbox[1]: bbox[1] = y
+        if x > bbox[2]: bbox[2] = x
+        if y > bbox[3]: bbox[3] = y
+        return
+    for c in coords:
+        _extend_bbox(c, bbox)
+
+def _extend_bbox_geometry(geometry, bbox: list):
+    if not isinstance(geometry, dict):
+        return
+    if geometry.get('type') == 'GeometryCollection':
+        for g in geometry.get('geometries') or []:
+            _extend_bbox_geometry(g, bbox)
+    else:
+        _extend_bbox(geometry.get('coordinates'), bbox)
+
+def scan_geojson(path: str, full_scan: bool = False, chunk_size: int = 1 << 20) -> dict:
+    """Stream-check that a GeoJSON file is a FeatureCollection with at least one feature.
+
+    By default stops as soon as both `"type": "FeatureCollection"` and the first valid
+    Feature have been seen. With full_scan=True every feature is read (one at a time)
+    to count features and compute the bbox.
+
+    Returns {'type', 'feature_count', 'bbox', 'complete'}; `feature_count` is a lower
+    bound unless `complete` is True. Raises json.JSONDecodeError on malformed JSON and
+    ValueError if `features` is not an array.
+    """
+    bbox = [float('inf'), float('inf'), float('-inf'), float('-inf')]
+    result = {'type': None, 'feature_count': 0, 'bbox': None, 'complete': False}
+
+    def _done() -> bool:
+        return not full_scan and result['type'] == 'FeatureCollection' and result['feature_count'] > 0
+
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _JSONStreamReader(f, chunk_size)
+        if reader.peek() != '{':
+            # Not an object (e.g. a bare array or error text): no FeatureCollection type
+            reader.value()
+            result['complete'] = True
+            return result
+        reader.expect('{')
+        if reader.peek() != '}':
+            while True:
+                key = reader.value()
+                reader.expect(':')
+                if key == 'features':
+                    if reader.peek() != '[':
+                        raise ValueError("features member is not an array")
+                    reader.expect('[')
+                    if reader.peek() != ']':
+                        while True:
+                            feature = reader.value()
+                            if isinstance(feature, dict) and feature.get('type') == 'Feature':
+                                result['feature_count'] += 1
+                                if full_scan:
+                                    _extend_bbox_geometry(feature.get('geometry'), bbox)
+                                elif _done():
+                                    return result
+                            if reader.peek() == ',':
+                                reader.pos += 1
+                                continue
+                            reader.expect(']')
+                            break
+                    else:
+                        reader.expect(']')
+                else:
+                    value = reader.value()
+                    if key == 'type':
+                        result['type'] = value
+                        if _done():
+                            return result
+                if reader.peek() == ',':
+                    reader.pos += 1
+                    continue
+                reader.expect('}')
+                break
+        else:
+            reader.expect('}')
+
+    result['complete'] = True
+    if full_scan and bbox[0] <= bbox[2]:
+        result['bbox'] = bbox
+    return result
+
+# GeoJSON validation results keyed by path -> (size, mtime_ns, full_scan, result);
+# mirrored to AGS_VALIDATION_CACHE_FILE in each work_dir so re-runs skip the scan.
+AGS_VALIDATION_CACHE_FILE = '.ags_validation_cache.json'
+_AGS_VALIDATION_CACHE = {}
+_AGS_VALIDATION_LOCK = threading.Lock()
+
+def _load_ags_validation_cache(work_dir: str) -> dict:
+    try:
+        with open(os.path.join(work_dir, AGS_VALIDATION_CACHE_FILE), 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _cached_ags_validation(geojson_file: str, stat: os.stat_result, full_scan: bool) -> dict | None:
+    """Return a cached scan result for the file if its size/mtime are unchanged."""
+    key = os.path.abspath(geojson_file)
+    with _AGS_VALIDATION_LOCK:
+        entry = _AGS_VALIDATION_CACHE.get(key)
+    if entry is None:
+        entry = _load_ags_validation_cache(os.path.dirname(key)).get(os.path.basename(key))
+    if not isinstance(entry, dict):
+        return None
+    if entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    if full_scan and not entry.get('full_scan'):
+        return None
+    return entry.get('result')
+
+def _store_ags_validation(geojson_file: str, stat: os.stat_result, full_scan: bool, result: dict):
+    key = os.path.abspath(geojson_file)
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'full_scan': full_scan, 'result': result}
+    with _AGS_VALIDATION_LOCK:
+        _AGS_VALIDATION_CACHE[key] = entry
+    work_dir = os.path.dirname(key)
+    cache = _load_ags_validation_cache(work_dir)
+    cache[os.path.basename(key)] = entry
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=AGS_VALIDATION_CACHE_FILE + '.', suffix='.tmp', dir=work_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, os.path.join(work_dir, AGS_VALIDATION_CACHE_FILE))
+    except OSError as e:
+        logging.debug(f"Could not write AGS validation cache in {work_dir}: {e}")
+
+def _validate_ags_download(work_dir, table_name, logger, full_scan: bool | None = None):
+    """Validate AGS download by checking GeoJSON file content.
+
+    The file is streamed (see scan_geojson) rather than loaded, and the outcome is cached
+    by file size and mtime. full_scan (default: --debug) also counts features and
+    computes the bbox.
+    """
+    geojson_file = os.path.join(work_dir, f"{table_name}.geojson")
+    if full_scan is None:
+        full_scan = CONFIG.debug
+    
     if not os.path.exists(geojson_file):
         raise DownloadError(f"Expected GeoJSON file not found: {table_name}.geojson", layer=None, entity=None)
     
     try:
         # Check file size (empty or very small files are likely corrupted)
-        file_size = os.path.getsize(geojson_file)
+        stat = os.stat(geojson_file)
+        file_size = stat.st_size
         if file_size < 100:  # Less than 100 bytes is likely just headers
             raise DownloadError(f"GeoJSON file appears empty or corrupted (size: {file_size} bytes)", layer=None, entity=None)
         
-        # Check if it's valid JSON and has features
-        with open(geojson_file, 'r') as f:
+        result = _cached_ags_validation(geojson_file, stat, full_scan)
+        if result is not None:
+            logger.debug(f"AGS validation cache hit for {table_name}.geojson (size/mtime unchanged)")
+        else:
             try:
-                data = json.load(f)
-                
-                # Check basic GeoJSON structure
-                if not isinstance(data, dict) or data.get('type') != 'FeatureCollection':
-                    raise DownloadError("GeoJSON file has invalid structure (not a FeatureCollection)", layer=None, entity=None)
-                
-                # Check if features array exists and has content
-                features = data.get('features', [])
-                if not isinstance(features, list):
-                    raise DownloadError("GeoJSON file has invalid features array", layer=None, entity=None)
-                
-                if len(features) == 0:
-                    raise DownloadError("GeoJSON file contains no features (likely deprecated/inaccessible URL)", layer=None, entity=None)
-                
-                logger.debug(f"AGS validation passed: {len(features)} features found in {table_name}.geojson")
-                
+                result = scan_geojson(geojson_file, full_scan=full_scan)
             except json.JSONDecodeError as e:
-                raise DownloadError(f"GeoJSON file is corrupted (JSON decode error): {e}", layer=None, entity=None)
-                
+                result = {'error': f"GeoJSON file is corrupted (JSON decode error): {e}"}
+            except UnicodeDecodeError as e:
+                result = {'error': f"GeoJSON file is corrupted (not UTF-8 text): {e}"}
+            except ValueError:
+                result = {'error': "GeoJSON file has invalid features array"}
+            _store_ags_validation(geojson_file, stat, full_scan, result)
     except (OSError, IOError) as e:
         raise DownloadError(f"Could not read GeoJSON file: {e}", layer=None, entity=None)
 
-def _validate_download(work_dir, logger, before_state=None):
-    """Validate that a download occurred by comparing directory state."""
-    if before_state is not None:
-        current_state = _get_directory_state(work_dir)
-        changed_files = []
-        
-        for filename, current_mtime in current_state.items():
-            if filename not in before_state:
-                changed_files.append(f"{filename} (new)")
-            elif current_mtime != before_state[filename]:
-                changed_files.append(f"{filename} (modified)")
-        
-        if not changed_files:
-            if CONFIG.process_anyway:
-                logger.warning("No files changed during download, but continuing due to process_anyway=True")
-                return True
-            raise DownloadError("No files changed during download", layer=None, entity=None)
-        
-        # Validate that downloaded files are not HTML content (PDF viewer pages)
-        for filename in changed_files:
-            if filename.endswith(" (new)") or filename.endswith(" (modified)"):
-                actual_filename = filename.split(" (")[0]
-                file_path = os.path.join(work_dir, actual_filename)
-                if os.path.exists(file_path):
-                    _validate_file_content(file_path, actual_filename, logger)
-        
-        changed_files_str = ", ".join(changed_files[:3])
-        if len(changed_files) > 3:
-            changed_files_str += f" and {len(changed_files) - 3} more"
-        
-        logger.debug(f"Download validation passed - found changed files: {changed_files_str}")
-        return True
+    if result.get('error'):
+        raise DownloadError(result['error'], layer=None, entity=None)
+    
+    # Check basic GeoJSON structure
+    if result.get('type') != 'FeatureCollection':
+        raise DownloadError("GeoJSON file has invalid structure (not a FeatureCollection)", layer=None, entity=None)
+    
+    if result.get('feature_count', 0) == 0:
+        raise DownloadError("GeoJSON file contains no features (likely deprecated/inaccessible URL)", layer=None, entity=None)
+    
+    if result.get('complete'):
+        bbox = result.get('bbox')
+        bbox_text = f", bbox {', '.join(f'{v:.6f}' for v in bbox)}" if bbox else ''
+        logger.debug(f"AGS validation passed: {result['feature_count']} features found in {table_name}.geojson{bbox_text}")
     else:
-        # Fallback to 24-hour check
-        now = datetime.now()
-        day_ago = now - timedelta(days=1)
-
-        recent_downloads = []
-        for filename in os.listdir(work_dir):
-            file_path = os.path.join(work_dir, filename)
-            try:
-                mtime = os.path.getmtime(file_path)
-                mod_time = datetime.fromtimestamp(mtime)
-                if mod_time >= day_ago:
-                    recent_downloads.append((mod_time, filename))
-            except OSError:
-                continue
-
-        if not recent_downloads:
-            if CONFIG.process_anyway:
-                logger.warning("No files found modified within the last 24 hours, but continuing due to process_anyway=True")
-                return True
-            raise DownloadError("No files found modified within the last 24 hours", layer=None, entity=None)
-
-        if recent_downloads:
-            recent_files_str = ", ".join([f[1] for f in sorted(recent_downloads, key=lambda x: x[0], reverse=True)[:3]])
-            logger.debug(f"Download validation passed – found recent files: {recent_files_str}")
-        
-        return True
+        logger.debug(f"AGS validation passed: FeatureCollection with features in {table_name}.geojson (stopped at first feature)")
+    return result
 
 def _collect_files_matching_format(work_dir: str, fmt: str) -> list[str]:
     """Return filenames in work_dir that match the expected format.
 
-    Used as a fallback when mtime-based change detection misses files (e.g., unzip preserves timestamps).
+    Used as a fallback when the changed/extracted files do not include the expected format.
     """
     fmt_lower = (fmt or '').lower()
     try:
@@ -2316,8 +2947,197 @@ def _find_latest_zip(work_dir, logger):
     logger.debug(f"Detected newest zip file: {newest}")
     return newest
 
+# Legacy SRS-name lookup, used only when neither GDAL/OGR nor pyproj can identify the CRS
+_SRS_NAME_TO_EPSG = {
+    "gcs_wgs_1984": "4326",
+    "wgs_84": "4326",
+    "wgs_84_pseudo_mercator": "3857",
+    "nad_1983_stateplane_florida_east_fips_0901_feet": "2236",
+    "nad_1983_stateplane_florida_west_fips_0902_feet": "2237",
+    "nad_1983_stateplane_florida_north_fips_0903_feet": "2238",
+    "nad83_harn_florida_east_ftus": "2881",
+    "nad83_harn_florida_west_ftus": "2882",
+    "nad_1983_2011_stateplane_florida_west_fips_0902_ft_us": "6443",
+    "nad83_florida_east_ftus": "2236",
+    "nad83_florida_west_ftus": "2237",
+    "nad83_florida_north_ftus": "2238",
+}
+
+# Shapefile metadata memo: (abs path, sidecar size/mtime signature) -> read_shp_info() result
+_SHP_INFO_CACHE = {}
+_SHP_INFO_LOCK = threading.Lock()
+
+def _shp_signature(path: str) -> tuple:
+    """Cache key for a shapefile: its path plus (ext, size, mtime_ns) of the .shp/.dbf/.prj/.cpg files."""
+    base, _ = os.path.splitext(os.path.abspath(path))
+    parts = []
+    for ext in ('.shp', '.dbf', '.prj', '.cpg'):
+        for candidate in (base + ext, base + ext.upper()):
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            parts.append((ext, st.st_size, st.st_mtime_ns))
+            break
+    return (os.path.abspath(path), tuple(parts))
+
+def _epsg_from_name(wkt: str) -> str | None:
+    m = re.search(r'^\s*(?:PROJCS|GEOGCS|PROJCRS|GEOGCRS)\["([^"]+)"', wkt or '', re.MULTILINE)
+    if not m:
+        return None
+    return _SRS_NAME_TO_EPSG.get(re.sub(r'[^a-z0-9]+', '_', m.group(1).lower()).strip('_'))
+
+def _epsg_from_wkt(wkt: str) -> str | None:
+    """Identify the EPSG code of a (possibly ESRI-flavoured) WKT through an authority lookup."""
+    if not wkt or not wkt.strip():
+        return None
+    if _osr is not None:
+        try:
+            srs = _osr.SpatialReference()
+            if srs.SetFromUserInput(wkt) == 0:
+                if srs.AutoIdentifyEPSG() == 0:
+                    code = srs.GetAuthorityCode(None)
+                    if code:
+                        return str(code)
+                # FindMatches compares against the whole EPSG database (GDAL >= 2.3)
+                for match, confidence in (srs.FindMatches() or []):
+                    if confidence >= 70 and match.GetAuthorityName(None) == 'EPSG':
+                        return str(match.GetAuthorityCode(None))
+        except Exception:
+            pass
+    if _PyprojCRS is not None:
+        try:
+            code = _PyprojCRS.from_wkt(wkt).to_epsg(min_confidence=70)
+            if code:
+                return str(code)
+        except Exception:
+            pass
+    return _epsg_from_name(wkt)
+
+def _read_shp_info_ogr(path: str) -> dict:
+    ds = _ogr.Open(path, 0)
+    if ds is None:
+        raise OSError(f"OGR could not open {path}")
+    lyr = ds.GetLayer(0)
+    srs = lyr.GetSpatialRef()
+    defn = lyr.GetLayerDefn()
+    minx, maxx, miny, maxy = lyr.GetExtent()
+    dbf_date = lyr.GetMetadataItem('DBF_DATE_LAST_UPDATE')
+    return {
+        'reader': 'ogr',
+        'epsg': _epsg_from_wkt(srs.ExportToWkt()) if srs is not None else None,
+        'geometry_type': _ogr.GeometryTypeToName(lyr.GetGeomType()),
+        'feature_count': lyr.GetFeatureCount(),
+        'extent': [minx, miny, maxx, maxy],
+        'dbf_date': dbf_date or None,
+        'fields': [
+            {
+                'name': defn.GetFieldDefn(i).GetName(),
+                'type': defn.GetFieldDefn(i).GetTypeName(),
+                'width': defn.GetFieldDefn(i).GetWidth(),
+                'precision': defn.GetFieldDefn(i).GetPrecision(),
+            }
+            for i in range(defn.GetFieldCount())
+        ],
+    }
+
+def _read_shp_info_pyshp(path: str) -> dict:
+    base, _ = os.path.splitext(path)
+    wkt = None
+    for prj in (base + '.prj', base + '.PRJ'):
+        if os.path.exists(prj):
+            with open(prj, 'r', errors='replace') as f:
+                wkt = f.read()
+            break
+
+    dbf_date = None
+    for dbf in (base + '.dbf', base + '.DBF'):
+        if os.path.exists(dbf):
+            # dBASE header bytes 1-3: last update as YY (since 1900), MM, DD
+            with open(dbf, 'rb') as f:
+                header = f.read(4)
+            if len(header) == 4:
+                try:
+                    dbf_date = datetime(1900 + header[1], header[2], header[3]).strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
+            break
+
+    with shapefile.Reader(path) as sf:
+        return {
+            'reader': 'pyshp',
+            'epsg': _epsg_from_wkt(wkt),
+            'geometry_type': sf.shapeTypeName,
+            'feature_count': len(sf),
+            'extent': list(sf.bbox) if len(sf) else None,
+            'dbf_date': dbf_date,
+            'fields': [
+                {'name': f[0], 'type': f[1], 'width': f[2], 'precision': f[3]}
+                for f in sf.fields[1:]  # skip deletion flag
+            ],
+        }
+
+def read_shp_info(path: str) -> dict:
+    """Read shapefile metadata in-process with a single open (not memoized).
+
+    Uses the GDAL/OGR bindings when available and falls back to pyshp (+ pyproj for the
+    .prj). Returns {'reader', 'epsg', 'geometry_type', 'feature_count', 'extent', 'dbf_date',
+    'fields'}; extent is [minx, miny, maxx, maxy]. Module-level so it can run in a process pool.
+    """
+    if _ogr is not None:
+        try:
+            return _read_shp_info_ogr(path)
+        except Exception:
+            pass
+    return _read_shp_info_pyshp(path)
+
+def get_shp_info(path: str) -> dict:
+    """Memoized read_shp_info keyed by path, size and mtime."""
+    key = _shp_signature(path)
+    with _SHP_INFO_LOCK:
+        cached = _SHP_INFO_CACHE.get(key)
+    if cached is not None:
+        return cached
+    info = read_shp_info(path)
+    with _SHP_INFO_LOCK:
+        _SHP_INFO_CACHE[key] = info
+    return info
+
+def prefetch_shp_info(paths: list[str], max_workers: int) -> int:
+    """Read metadata for many shapefiles on a process pool and seed the memo.
+
+    Returns the number of shapefiles read (already-cached paths are skipped). Files
+    that fail to read are left for extract_shp_metadata to report per entity.
+    """
+    todo = {}
+    for path in paths:
+        key = _shp_signature(path)
+        with _SHP_INFO_LOCK:
+            if key in _SHP_INFO_CACHE:
+                continue
+        todo[key] = path
+    if not todo:
+        return 0
+    read = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+        futures = {pool.submit(read_shp_info, path): key for key, path in todo.items()}
+        for future in as_completed(futures):
+            try:
+                info = future.result()
+            except Exception as e:
+                logging.debug(f"Shapefile metadata prefetch failed for {todo[futures[future]]}: {e}")
+                continue
+            with _SHP_INFO_LOCK:
+                _SHP_INFO_CACHE[futures[future]] = info
+            read += 1
+    return read
+
 def extract_shp_metadata(shp_path, logger):
-    """Return metadata for a shapefile including EPSG code, data date, and field names."""
+    """Return metadata for a shapefile including EPSG code, data date, and field names.
+
+    Also returns geometry_type, feature_count, extent and the field schema (field_schema)
+    read in the same pass; see get_shp_info.
+    """
     metadata = {}
 
     # Resolve the actual shapefile path
@@ -2342,57 +3162,28 @@ def extract_shp_metadata(shp_path, logger):
     metadata["shp"] = os.path.basename(resolved_path)
 
     try:
-        result = subprocess.run(
-            ["ogrinfo", "-ro", "-al", "-so", resolved_path],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        logger.debug(f"OGRINFO output: {result.stdout}")
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        logger.warning(f"ogrinfo failed while reading {resolved_path}: {e}")
+        info = get_shp_info(resolved_path)
+        logger.debug(f"Shapefile info ({info['reader']}): {info['geometry_type']}, {info['feature_count']} features, "
+                     f"extent {info['extent']}, EPSG:{info['epsg']}, DBF date {info['dbf_date']}")
+    except Exception as e:
+        logger.warning(f"Could not read shapefile metadata from {resolved_path}: {e}")
         return metadata
 
-    # Extract EPSG code from WKT
-    projcs_match = re.search(
-        r'^(?:\s*)(PROJCS|GEOGCS|PROJCRS|GEOGCRS)\["([^\"]+)"',
-        result.stdout,
-        re.MULTILINE,
-    )
-    if projcs_match:
-        srs_type, srs_name = projcs_match.groups()
-        canonical_name = re.sub(r'[^a-z0-9]+', '_', srs_name.lower()).strip('_')
-
-        name_to_epsg = {
-            "gcs_wgs_1984": "4326",
-            "wgs_84": "4326",
-            "wgs_84_pseudo_mercator": "3857",
-            "nad_1983_stateplane_florida_east_fips_0901_feet": "2236",
-            "nad_1983_stateplane_florida_west_fips_0902_feet": "2237",
-            "nad_1983_stateplane_florida_north_fips_0903_feet": "2238",
-            "nad83_harn_florida_east_ftus": "2881",
-            "nad83_harn_florida_west_ftus": "2882",
-            "nad_1983_2011_stateplane_florida_west_fips_0902_ft_us": "6443",
-            "nad83_florida_east_ftus": "2236",
-            "nad83_florida_west_ftus": "2237",
-            "nad83_florida_north_ftus": "2238",
-        }
+    if info.get('epsg'):
+        metadata["epsg"] = info['epsg']
+    else:
+        logger.debug(f"Could not identify an EPSG code for {os.path.basename(resolved_path)}")
 
-        if canonical_name in name_to_epsg:
-            metadata["epsg"] = name_to_epsg[canonical_name]
-            logger.debug(f"Mapped {srs_type} name '{srs_name}' to EPSG:{metadata['epsg']}")
-        else:
-            logger.debug(f"SRS name '{srs_name}' not in lookup table; unable to map to EPSG.")
+    metadata["geometry_type"] = info.get('geometry_type')
+    metadata["feature_count"] = info.get('feature_count')
+    metadata["extent"] = info.get('extent')
 
-    # Extract data date (simplified version - could expand with full logic from original)
+    # Data date: DBF last-update date unless it is in the future
     today = datetime.now().date()
     data_date = today  # Default fallback
-    
-    # Try DBF_DATE_LAST_UPDATE
-    m = re.search(r"DBF_DATE_LAST_UPDATE=([0-9]{4}-[0-9]{2}-[0-9]{2})", result.stdout)
-    if m:
+    if info.get('dbf_date'):
         try:
-            candidate_date = datetime.strptime(m.group(1), "%Y-%m-%d").date()
+            candidate_date = datetime.strptime(info['dbf_date'], "%Y-%m-%d").date()
             if candidate_date <= today:
                 data_date = candidate_date
         except ValueError:
@@ -2401,16 +3192,10 @@ def extract_shp_metadata(shp_path, logger):
     metadata["data_date"] = data_date.strftime("%Y-%m-%d")
     metadata["update_date"] = datetime.now().date().strftime("%Y-%m-%d")
 
-    # Extract field names
-    field_names = []
-    try:
-        sf = shapefile.Reader(resolved_path)
-        field_names = [f[0] for f in sf.fields[1:]]  # skip deletion flag
-        logger.debug(f"Extracted {len(field_names)} field names via pyshp: {field_names}")
-    except Exception as e:
-        logger.debug(f"pyshp field extraction failed ({e})")
-
+    field_names = [f['name'] for f in info.get('fields') or []]
+    logger.debug(f"Extracted {len(field_names)} field names: {field_names}")
     metadata["field_names"] = json.dumps(field_names) if field_names else "[]"
+    metadata["field_schema"] = info.get('fields') or []
 
     return metadata
 
@@ -2424,267 +3209,332 @@ def extract_shp_metadata(shp_path, logger):
 # Main Processing Function
 # ---------------------------------------------------------------------------
 
-def process_layer(layer, queue, entity_components):
+def _is_selenium_entity(entity: str, entity_components: dict) -> bool:
+    """Return True if the entity downloads through the shared Selenium driver."""
+    comps = entity_components.get(entity, {})
+    cached = comps.get('db_fields') if isinstance(comps, dict) else None
+    if not cached:
+        return False
+    dl = cached.get('download') or ''
+    if str(dl).strip().upper() == 'SELENIUM':
+        return True
+    return _select_download_method(cached) == 'SELENIUM'
+
+def _mark_selenium_entity_done(entity: str, entity_components: dict):
+    """Mark a SELENIUM entity as finished and close the shared driver once none remain."""
+    try:
+        if not _is_selenium_entity(entity, entity_components):
+            return
+        with _SELENIUM_LOCK:
+            if entity in _SELENIUM_REMAINING:
+                _SELENIUM_REMAINING.discard(entity)
+                logging.debug(f"Marked SELENIUM entity complete: {entity}; remaining: {len(_SELENIUM_REMAINING)}")
+            # If none remain anywhere, shutdown the driver now
+            if _selenium_shutdown and _SELENIUM_DRIVER and len(_SELENIUM_REMAINING) == 0:
+                try:
+                    _selenium_shutdown(_SELENIUM_DRIVER)
+                except Exception:
+                    pass
+                finally:
+                    globals()['_SELENIUM_DRIVER'] = None
+                    logging.info("Closed shared Selenium driver (all SELENIUM entities completed)")
+    except Exception:
+        pass
+
+def _build_entity_lanes(layer: str, queue: list[str], entity_components: dict) -> list[list[str]]:
+    """Split a layer queue into lanes whose entities must run one after another.
+
+    - All SELENIUM entities share a single lane (they drive the shared _SELENIUM_DRIVER).
+    - Entities that resolve to the same work_dir share a lane so downloads/unzips never interleave.
+    - Every other entity gets a lane of its own.
+    Lanes preserve queue order; the SELENIUM lane (if any) is first.
+    """
+    selenium_lane = []
+    lanes_by_dir = {}
+    for entity in queue:
+        if _is_selenium_entity(entity, entity_components):
+            selenium_lane.append(entity)
+            continue
+        try:
+            lane_key = resolve_work_dir(layer, entity, entity_components)
+        except Exception:
+            lane_key = entity
+        lanes_by_dir.setdefault(lane_key, []).append(entity)
+    lanes = [selenium_lane] if selenium_lane else []
+    lanes.extend(lanes_by_dir.values())
+    return lanes
+
+def _run_entity_lane(layer: str, lane: list[str], entity_components: dict) -> list[dict]:
+    """Run every entity in a lane sequentially and return their results."""
+    return [_process_entity(layer, entity, entity_components) for entity in lane]
+
+def _prefetch_layer_shp_metadata(layer: str, queue: list[str], entity_components: dict):
+    """Read shapefile metadata for the whole queue on a process pool (--metadata-workers).
+
+    Only applies when downloads are disabled, i.e. the shapefiles layer_metadata will
+    read are already on disk; results land in the get_shp_info memo. Metadata-only
+    formats (PDF etc.) are skipped.
+    """
+    if CONFIG.metadata_workers <= 1 or CONFIG.run_download or not CONFIG.run_metadata or CONFIG.test_mode:
+        return
+    paths = []
+    for entity in queue:
+        comps = entity_components.get(entity, {})
+        fmt = ((comps.get('db_fields') or {}).get('format') or '').lower() if isinstance(comps, dict) else ''
+        if fmt in METADATA_ONLY_FORMATS:
+            continue
+        try:
+            work_dir = resolve_work_dir(layer, entity, entity_components)
+            paths.append(_find_shapefile(work_dir, logging.getLogger(__name__)))
+        except Exception:
+            continue
+    if len(paths) < 2:
+        return
+    start = time.monotonic()
+    read = prefetch_shp_info(paths, CONFIG.metadata_workers)
+    logging.info(f"Prefetched shapefile metadata for {read}/{len(paths)} entities of layer '{layer}' "
+                 f"in {time.monotonic() - start:.1f}s ({CONFIG.metadata_workers} processes)")
+
+def process_layer(layer, queue, entity_components, executor: ThreadPoolExecutor | None = None):
     """Process a layer for entities in the queue using the 4-stage pipeline.
 
     Queue adjustment: move SELENIUM entities to the front so they execute first
     within the layer, enabling us to initialize/close the Selenium driver only once
     across the entire run while still grouping by layer.
+
+    When an executor is provided (--workers > 1), entities are grouped into lanes
+    (see _build_entity_lanes) and the lanes run concurrently on the shared pool.
+    Results are returned in queue order either way.
     """
     if CONFIG.run_download:
         logging.info(f"Starting processing for layer '{layer}' with {len(queue)} entities")
     else:
         logging.info(f"Starting processing for layer '{layer}' (download disabled)")
-    
+
     # Initialize CSV status tracking for entities in queue
     _initialize_csv_status(layer, queue, entity_components)
-    
+
     # Reorder queue: SELENIUM-first within this layer
     try:
-        def _is_selenium_entity(ent: str) -> bool:
-            comps = entity_components.get(ent, {})
-            cached = comps.get('db_fields') if isinstance(comps, dict) else None
-            dl = (cached.get('download') if cached else None) or ''
-            return str(dl).strip().upper() == 'SELENIUM'
-        selenium_entities = [e for e in queue if _is_selenium_entity(e)]
-        non_selenium_entities = [e for e in queue if not _is_selenium_entity(e)]
+        selenium_entities = [e for e in queue if _is_selenium_entity(e, entity_components)]
+        non_selenium_entities = [e for e in queue if not _is_selenium_entity(e, entity_components)]
         queue = selenium_entities + non_selenium_entities
     except Exception:
         # If anything goes wrong, fall back to original order
         pass
 
-    results = []
     # Track SELENIUM entities from this layer; add to global remaining set
     try:
-        for e in queue:
-            comps = entity_components.get(e, {})
-            cached = comps.get('db_fields') if isinstance(comps, dict) else None
-            dl = (cached.get('download') if cached else None) or ''
-            if str(dl).strip().upper() == 'SELENIUM':
-                _SELENIUM_REMAINING.add(e)
+        with _SELENIUM_LOCK:
+            for e in queue:
+                if _is_selenium_entity(e, entity_components):
+                    _SELENIUM_REMAINING.add(e)
     except Exception:
         pass
 
-    for entity in queue:
-        entity_start_time = datetime.now()
-        try:
-            # Get entity components from dictionary
-            if entity not in entity_components:
-                raise RuntimeError(f"Entity '{entity}' not found in entity components")
-            
-            components = entity_components[entity]
-            state = components['state']
-            county = components['county']
-            city = components['city']
-            
-            # Setup
-            work_dir = resolve_work_dir(layer, entity, entity_components)
-            entity_logger = setup_entity_logger(layer, entity, work_dir)
-            
-            logging.info(f"--- Processing entity: {entity} ---")
-            
-            # Get catalog row (prefer cached dependent fields when available)
-            cached_row = components.get('db_fields') if isinstance(components, dict) else None
-            catalog_row = dict(cached_row) if cached_row else _fetch_catalog_row(layer, state, county, city)
-            if catalog_row is None:
-                raise RuntimeError(f"Catalog row not found for {layer}/{entity}")
-
-            # Check if entity should be processed based on format
-            should_process, process_reason = should_process_entity(catalog_row, entity)
-            if not should_process:
-                logging.info(f"Skipping entity {entity}: {process_reason}")
-                # Persist skip reason in summary error_message
-                try:
-                    _update_csv_status(layer, entity, 'download', 'SKIPPED', error_msg=process_reason, entity_components=entity_components)
-                except Exception:
-                    pass
-                results.append({
-                    'layer': layer, 'entity': entity, 'status': 'skipped',
-                    'warning': process_reason, 'data_date': None, 'runtime_seconds': 0
-                })
-                continue
-
-            logging.info(f"Processing entity {entity}: {process_reason}")
+    _prefetch_layer_shp_metadata(layer, queue, entity_components)
 
-            # Initialize variables
-            raw_zip_name = None
-            metadata = {}
+    if executor is None:
+        results = [_process_entity(layer, entity, entity_components) for entity in queue]
+    else:
+        lanes = _build_entity_lanes(layer, queue, entity_components)
+        logging.info(f"Running {len(queue)} entities for layer '{layer}' in {len(lanes)} lanes ({CONFIG.workers} workers)")
+        futures = [executor.submit(_run_entity_lane, layer, lane, entity_components) for lane in lanes]
+        by_entity = {}
+        for future in futures:
+            for result in future.result():
+                by_entity[result['entity']] = result
+        results = [by_entity[e] for e in queue if e in by_entity]
+
+    # Commit catalog updates queued by layer_upload (--batch-upload)
+    _flush_catalog_updates(layer, results, entity_components)
 
-            # Stage 1: Download
-            try:
-                raw_zip_name, data_date = layer_download(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, entity_components)
-            except SkipEntityError as e:
-                raise  # Re-raise to skip entire entity
+    # Calculate stats
+    total_entities = len(results)
+    successful_entities = len([r for r in results if r.get('status') == 'success'])
+    logging.info(f"{successful_entities}/{total_entities} entities processed successfully for {layer}")
+    return results
 
-            # Stage 2: Metadata
-            try:
-                metadata = layer_metadata(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, data_date)
-            except SkipEntityError as e:
-                # Handle metadata-based NND (data date unchanged)
-                if "data date unchanged" in str(e):
-                    _update_csv_status(layer, entity, 'download', 'NND', error_msg='Metadata check: data date unchanged', entity_components=entity_components)
-                raise  # Re-raise to skip entire entity
-
-            # Stage 3: Processing
-            processing_skipped = False
-            should_proc, proc_reason = should_run_processing(catalog_row)
-            if should_proc:
-                layer_processing(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, metadata, entity_components)
-            else:
-                entity_logger.info(f"[PROCESSING] Skipping processing for {layer}/{entity}: {proc_reason}")
-                _update_csv_status(layer, entity, 'processing', 'SKIPPED', error_msg=proc_reason, entity_components=entity_components)
-                processing_skipped = True
+def _process_entity(layer: str, entity: str, entity_components: dict) -> dict:
+    """Run the 4-stage pipeline for a single entity and return its result entry.
 
-            # If no raw_zip_name from download (e.g., download skipped), use catalog fallback when available
+    Each entity gets its own logger and work_dir, so this is safe to call from
+    worker threads (see process_layer).
+    """
+    entity_start_time = datetime.now()
+    try:
+        # Get entity components from dictionary
+        if entity not in entity_components:
+            raise RuntimeError(f"Entity '{entity}' not found in entity components")
+        
+        components = entity_components[entity]
+        state = components['state']
+        county = components['county']
+        city = components['city']
+        
+        # Setup
+        work_dir = resolve_work_dir(layer, entity, entity_components)
+        entity_logger = setup_entity_logger(layer, entity, work_dir)
+        
+        logging.info(f"--- Processing entity: {entity} ---")
+        
+        # Get catalog row (prefer cached dependent fields when available)
+        cached_row = components.get('db_fields') if isinstance(components, dict) else None
+        catalog_row = dict(cached_row) if cached_row else _fetch_catalog_row(layer, state, county, city)
+        if catalog_row is None:
+            raise RuntimeError(f"Catalog row not found for {layer}/{entity}")
+
+        # Check if entity should be processed based on format
+        should_process, process_reason = should_process_entity(catalog_row, entity)
+        if not should_process:
+            logging.info(f"Skipping entity {entity}: {process_reason}")
+            # Persist skip reason in summary error_message
             try:
-                if not raw_zip_name:
-                    cz = (catalog_row.get('sys_raw_file_zip') or '').strip()
-                    if cz:
-                        raw_zip_name = cz
-                        entity_logger.debug(f"[UPLOAD PREP] Using catalog sys_raw_file_zip as fallback: {raw_zip_name}")
+                _update_csv_status(layer, entity, 'download', 'SKIPPED', error_msg=process_reason, entity_components=entity_components)
             except Exception:
                 pass
-
-            # Stage 4: Upload
-            layer_upload(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, metadata, raw_zip_name, entity_components)
-
-            # Record success
-            entity_end_time = datetime.now()
-            entity_runtime = round((entity_end_time - entity_start_time).total_seconds())
-            result_entry = {
-                'layer': layer,
-                'entity': entity,
-                'status': 'success',
-                'data_date': metadata.get('data_date') or datetime.now().date(),
-                'runtime_seconds': f'{entity_runtime}s',
-                'runtime_seconds_int': entity_runtime,
-                'start_time_iso': entity_start_time.isoformat(),
-                'end_time_iso': entity_end_time.isoformat(),
-                'start_time_display': entity_start_time.strftime('%m/%d/%y %I:%M %p'),
+            return {
+                'layer': layer, 'entity': entity, 'status': 'skipped',
+                'warning': process_reason, 'data_date': None, 'runtime_seconds': 0
             }
-            # Flag slow entities if threshold configured
-            try:
-                if CONFIG.slow_threshold_seconds is not None and entity_runtime >= int(CONFIG.slow_threshold_seconds):
-                    result_entry['slow'] = True
-            except Exception:
-                pass
-            if processing_skipped:
-                result_entry['processing_skipped'] = True
-            if metadata.get('epsg'):
-                result_entry['epsg'] = metadata['epsg']
-            if metadata.get('shp'):
-                result_entry['shp_name'] = metadata['shp']
-            if metadata.get('_defaulted_today'):
-                warning_msg = 'data_date defaulted to current day'
-                entity_logger.warning(warning_msg)
-                result_entry['warning'] = warning_msg
-
-            # If slow threshold configured or default 30s, record a warning in summary error_message
-            try:
-                slow_threshold = int(CONFIG.slow_threshold_seconds) if CONFIG.slow_threshold_seconds is not None else 30
-                if entity_runtime >= slow_threshold:
-                    warn = f"WARNING: runtime exceeded {slow_threshold}s: {entity_runtime}s"
-                    result_entry['warning'] = warn
-                    # Write into CSV immediately via update status helper
-                    try:
-                        _update_csv_status(layer, entity, 'download', 'SUCCESS', error_msg=warn, entity_components=entity_components)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
 
-            results.append(result_entry)
-            logging.info(f"--- Successfully processed entity: {entity} ---")
+        logging.info(f"Processing entity {entity}: {process_reason}")
 
-            # If this entity was a SELENIUM entity, mark it as processed
-            try:
-                comps = entity_components.get(entity, {})
-                cached = comps.get('db_fields') if isinstance(comps, dict) else None
-                dl = (cached.get('download') if cached else None) or ''
-                if str(dl).strip().upper() == 'SELENIUM':
-                    if entity in _SELENIUM_REMAINING:
-                        _SELENIUM_REMAINING.discard(entity)
-                        logging.debug(f"Marked SELENIUM entity complete: {entity}; remaining: {len(_SELENIUM_REMAINING)}")
-                    # If none remain anywhere, shutdown the driver now
-                    if _selenium_shutdown and _SELENIUM_DRIVER and len(_SELENIUM_REMAINING) == 0:
-                        try:
-                            _selenium_shutdown(_SELENIUM_DRIVER)
-                        except Exception:
-                            pass
-                        finally:
-                            globals()['_SELENIUM_DRIVER'] = None
-                            logging.info("Closed shared Selenium driver (all SELENIUM entities completed)")
-            except Exception:
-                pass
+        # Initialize variables
+        raw_zip_name = None
+        metadata = {}
 
+        # Stage 1: Download
+        try:
+            raw_zip_name, data_date = layer_download(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, entity_components)
         except SkipEntityError as e:
-            # Handle NND cases with publish date update
-            logging.info(f"Skipping entity {entity} for layer {layer}: {e}")
-            
-            # If it's a "no new data" case, update publish_date to show we checked
-            if "No new data available" in str(e) or "data date unchanged" in str(e):
+            raise  # Re-raise to skip entire entity
+
+        # Stage 2: Metadata
+        try:
+            metadata = layer_metadata(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, data_date)
+        except SkipEntityError as e:
+            # Handle metadata-based NND (data date unchanged)
+            if "data date unchanged" in str(e):
+                _update_csv_status(layer, entity, 'download', 'NND', error_msg='Metadata check: data date unchanged', entity_components=entity_components)
+            raise  # Re-raise to skip entire entity
+
+        # Stage 3: Processing
+        processing_skipped = False
+        should_proc, proc_reason = should_run_processing(catalog_row)
+        if should_proc:
+            layer_processing(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, metadata, entity_components)
+        else:
+            entity_logger.info(f"[PROCESSING] Skipping processing for {layer}/{entity}: {proc_reason}")
+            _update_csv_status(layer, entity, 'processing', 'SKIPPED', error_msg=proc_reason, entity_components=entity_components)
+            processing_skipped = True
+
+        # If no raw_zip_name from download (e.g., download skipped), use catalog fallback when available
+        try:
+            if not raw_zip_name:
+                cz = (catalog_row.get('sys_raw_file_zip') or '').strip()
+                if cz:
+                    raw_zip_name = cz
+                    entity_logger.debug(f"[UPLOAD PREP] Using catalog sys_raw_file_zip as fallback: {raw_zip_name}")
+        except Exception:
+            pass
+
+        # Stage 4: Upload
+        layer_upload(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, metadata, raw_zip_name, entity_components)
+
+        # Only a ZIP that went through metadata, processing and upload counts as processed;
+        # later identical downloads are then NND. A run with a stage disabled leaves it pending.
+        # (with --batch-upload this happens once the batched catalog update committed)
+        if (not CONFIG.test_mode and CONFIG.run_metadata and CONFIG.run_processing and CONFIG.run_upload
+                and not CONFIG.batch_upload):
+            _commit_download_manifest(work_dir, entity_logger, catalog_row.get('table_name'))
+
+        # Record success
+        entity_end_time = datetime.now()
+        entity_runtime = round((entity_end_time - entity_start_time).total_seconds())
+        result_entry = {
+            'layer': layer,
+            'entity': entity,
+            'status': 'success',
+            'data_date': metadata.get('data_date') or datetime.now().date(),
+            'runtime_seconds': f'{entity_runtime}s',
+            'runtime_seconds_int': entity_runtime,
+            'start_time_iso': entity_start_time.isoformat(),
+            'end_time_iso': entity_end_time.isoformat(),
+            'start_time_display': entity_start_time.strftime('%m/%d/%y %I:%M %p'),
+            # AGS watermark to promote once a batched upload commits (_flush_catalog_updates)
+            'table_name': catalog_row.get('table_name'),
+        }
+        # Flag slow entities if threshold configured
+        try:
+            if CONFIG.slow_threshold_seconds is not None and entity_runtime >= int(CONFIG.slow_threshold_seconds):
+                result_entry['slow'] = True
+        except Exception:
+            pass
+        if processing_skipped:
+            result_entry['processing_skipped'] = True
+        if metadata.get('epsg'):
+            result_entry['epsg'] = metadata['epsg']
+        if metadata.get('shp'):
+            result_entry['shp_name'] = metadata['shp']
+        if metadata.get('_defaulted_today'):
+            warning_msg = 'data_date defaulted to current day'
+            entity_logger.warning(warning_msg)
+            result_entry['warning'] = warning_msg
+
+        # If slow threshold configured or default 30s, record a warning in summary error_message
+        try:
+            slow_threshold = int(CONFIG.slow_threshold_seconds) if CONFIG.slow_threshold_seconds is not None else 30
+            if entity_runtime >= slow_threshold:
+                warn = f"WARNING: runtime exceeded {slow_threshold}s: {entity_runtime}s"
+                result_entry['warning'] = warn
+                # Write into CSV immediately via update status helper
                 try:
-                    layer_upload(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, {})
-                    logging.info(f"Updated publish_date for {entity} (NND case)")
-                except Exception as publish_error:
-                    logging.warning(f"Failed to update publish_date for {entity}: {publish_error}")
-            
-            entity_end_time = datetime.now()
-            entity_runtime = (entity_end_time - entity_start_time).total_seconds()
-            results.append({
-                'layer': layer, 'entity': entity, 'status': 'skipped', 
-                'warning': str(e), 'data_date': None, 'runtime_seconds': entity_runtime
-            })
-            # On skip, also mark selenium completion if applicable
-            try:
-                comps = entity_components.get(entity, {})
-                cached = comps.get('db_fields') if isinstance(comps, dict) else None
-                dl = (cached.get('download') if cached else None) or ''
-                if str(dl).strip().upper() == 'SELENIUM':
-                    if entity in _SELENIUM_REMAINING:
-                        _SELENIUM_REMAINING.discard(entity)
-                    if _selenium_shutdown and _SELENIUM_DRIVER and len(_SELENIUM_REMAINING) == 0:
-                        try:
-                            _selenium_shutdown(_SELENIUM_DRIVER)
-                        except Exception:
-                            pass
-                        finally:
-                            globals()['_SELENIUM_DRIVER'] = None
-                            logging.info("Closed shared Selenium driver (all SELENIUM entities completed)")
-            except Exception:
-                pass
-        except LayerProcessingError as e:
-            logging.error(f"Failed to process entity {entity} for layer {layer}: {e}")
-            entity_end_time = datetime.now()
-            entity_runtime = (entity_end_time - entity_start_time).total_seconds()
-            results.append({
-                'layer': layer, 'entity': entity, 'status': 'failure', 
-                'error': str(e), 'data_date': None, 'runtime_seconds': entity_runtime
-            })
-            # On failure, also mark selenium completion if applicable
+                    _update_csv_status(layer, entity, 'download', 'SUCCESS', error_msg=warn, entity_components=entity_components)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+        logging.info(f"--- Successfully processed entity: {entity} ---")
+
+        # If this entity was a SELENIUM entity, mark it as processed
+        _mark_selenium_entity_done(entity, entity_components)
+        return result_entry
+
+    except SkipEntityError as e:
+        # Handle NND cases with publish date update
+        logging.info(f"Skipping entity {entity} for layer {layer}: {e}")
+        
+        # If it's a "no new data" case, update publish_date to show we checked
+        if "No new data available" in str(e) or "data date unchanged" in str(e):
             try:
-                comps = entity_components.get(entity, {})
-                cached = comps.get('db_fields') if isinstance(comps, dict) else None
-                dl = (cached.get('download') if cached else None) or ''
-                if str(dl).strip().upper() == 'SELENIUM':
-                    if entity in _SELENIUM_REMAINING:
-                        _SELENIUM_REMAINING.discard(entity)
-                    if _selenium_shutdown and _SELENIUM_DRIVER and len(_SELENIUM_REMAINING) == 0:
-                        try:
-                            _selenium_shutdown(_SELENIUM_DRIVER)
-                        except Exception:
-                            pass
-                        finally:
-                            globals()['_SELENIUM_DRIVER'] = None
-                            logging.info("Closed shared Selenium driver (all SELENIUM entities completed)")
-            except Exception:
-                pass
+                layer_upload(layer, entity, state, county, city, catalog_row, work_dir, entity_logger, {})
+                logging.info(f"Updated publish_date for {entity} (NND case)")
+            except Exception as publish_error:
+                logging.warning(f"Failed to update publish_date for {entity}: {publish_error}")
+        
+        entity_end_time = datetime.now()
+        entity_runtime = (entity_end_time - entity_start_time).total_seconds()
+        result_entry = {
+            'layer': layer, 'entity': entity, 'status': 'skipped', 
+            'warning': str(e), 'data_date': None, 'runtime_seconds': entity_runtime
+        }
+        # On skip, also mark selenium completion if applicable
+        _mark_selenium_entity_done(entity, entity_components)
+        return result_entry
+    except LayerProcessingError as e:
+        logging.error(f"Failed to process entity {entity} for layer {layer}: {e}")
+        entity_end_time = datetime.now()
+        entity_runtime = (entity_end_time - entity_start_time).total_seconds()
+        result_entry = {
+            'layer': layer, 'entity': entity, 'status': 'failure', 
+            'error': str(e), 'data_date': None, 'runtime_seconds': entity_runtime
+        }
+        # On failure, also mark selenium completion if applicable
+        _mark_selenium_entity_done(entity, entity_components)
+        return result_entry
 
-    # Calculate stats
-    total_entities = len(results)
-    successful_entities = len([r for r in results if r.get('status') == 'success'])
-    logging.info(f"{successful_entities}/{total_entities} entities processed successfully for {layer}")
-    return results
 
 # ---------------------------------------------------------------------------
 # Enhanced CSV Summary Generation
@@ -2696,19 +3546,13 @@ def generate_summary(results, entity_components: dict = None):
         return
 
     layer = results[0]['layer']
-    summary_filename = f"{layer}_summary.csv"  # No date in filename - living document
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    summaries_dir = os.path.join(script_dir, "summaries")
-    os.makedirs(summaries_dir, exist_ok=True)
-    summary_filepath = os.path.join(summaries_dir, summary_filename)
-    
-    # Use new format headers
-    headers = ['entity', 'data_date', 'download_status', 'processing_status', 
-               'upload_status', 'error_message', 'timestamp']
+    summary_filepath = _summary_filepath(layer)  # No date in filename - living document
+    headers = SUMMARY_HEADERS
     
     try:
-        # Fresh run: start with empty data
-        existing_data = {}
+        # Rows recorded by _update_csv_status during this run (seeded fresh by _initialize_csv_status)
+        existing_data = STATUS_STORE.get_rows(layer)
+        run_data = {}
 
         # Process results and build rows only from this run
         for result in results:
@@ -2726,8 +3570,9 @@ def generate_summary(results, entity_components: dict = None):
             # Use the original entity name as the key
             entity_key = entity
             
-            # Always create a new row for this run
+            # Start from the stage statuses recorded for this entity during the run
             row = {h: '' for h in headers}
+            row.update(existing_data.get(entity_key, {}))
             row['entity'] = entity
             
             # Update based on result status
@@ -2779,10 +3624,10 @@ def generate_summary(results, entity_components: dict = None):
             # Set per-entity timestamp from this run, if available
             ts = result.get('start_time_display')
             row['timestamp'] = ts or datetime.now().strftime('%m/%d/%y %I:%M %p')
-            existing_data[entity_key] = row
+            run_data[entity_key] = row
         
         # Sort data by entity
-        sorted_data = sorted(existing_data.values(), key=lambda x: x['entity'])
+        sorted_data = sorted(run_data.values(), key=lambda x: x['entity'])
         
         # Calculate summary statistics
         total_entities = len(sorted_data)
@@ -2828,23 +3673,39 @@ def generate_summary(results, entity_components: dict = None):
             'timestamp': runtime_str
         }
         
-        # Write the CSV file
-        with open(summary_filepath, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-            
-            # Write data rows sorted by entity
-            for row in sorted_data:
-                writer.writerow(row)
-            
-            # Write summary row
-            writer.writerow(summary_row)
+        # Write the CSV file (data rows sorted by entity, then the summary row) through the store
+        STATUS_STORE.replace_rows(layer, run_data, footer=summary_row)
+        STATUS_STORE.flush(layer)
         
         logging.info(f"Summary file updated: {summary_filepath} ({len(sorted_data)} entities)")
         
     except IOError as e:
         logging.error(f"Could not write summary file: {e}")
 
+def report_download_host_stats():
+    """Log per-host download queue depth and wait time; write summaries/download_hosts_summary.csv."""
+    stats = DOWNLOAD_SCHEDULER.stats()
+    if not stats:
+        return
+    logging.info("Download host stats (host: requests, limit, peak queue, total wait, max wait):")
+    for host, st in sorted(stats.items(), key=lambda kv: kv[1]['total_wait_s'], reverse=True):
+        logging.info(f"  {host}: {st['requests']} req, limit {st['limit']}, peak queue {st['max_queue_depth']}, "
+                     f"waited {st['total_wait_s']}s (max {st['max_wait_s']}s)")
+
+    if not CONFIG.generate_summary:
+        return
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    summaries_dir = os.path.join(script_dir, "summaries")
+    os.makedirs(summaries_dir, exist_ok=True)
+    summary_filepath = os.path.join(summaries_dir, "download_hosts_summary.csv")
+    headers = ['host', 'requests', 'limit', 'max_queue_depth', 'total_wait_s', 'max_wait_s']
+    with open(summary_filepath, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=headers)
+        writer.writeheader()
+        for host, st in sorted(stats.items()):
+            writer.writerow({'host': host, **st})
+    logging.info(f"Download host summary written: {summary_filepath}")
+
 def _determine_failure_stage(result):
     """Determine which stage failed based on the error message."""
     error_msg = str(result.get('error', '')).lower()
@@ -2880,66 +3741,56 @@ def _format_runtime_detailed(seconds):
     
     return f"{hours}hr {remaining_minutes}min {remaining_seconds}sec"
 
-def _initialize_csv_status(layer, queue, entity_components: dict = None):
-    """Initialize a fresh CSV with only the queued entities for this run."""
-    if not CONFIG.generate_summary:
-        return
-        
-    summary_filename = f"{layer}_summary.csv"
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    summaries_dir = os.path.join(script_dir, "summaries")
-    os.makedirs(summaries_dir, exist_ok=True)
-    summary_filepath = os.path.join(summaries_dir, summary_filename)
-    
-    # Use new format headers
-    headers = ['entity', 'data_date', 'download_status', 'processing_status', 
-               'upload_status', 'error_message', 'timestamp']
-    
-    try:
-        # Fresh CSV seeded only with queued entities
-        fresh_data = {}
-        for entity_name in queue:
-            row = {h: '' for h in headers}
-            row['entity'] = entity_name
-            fresh_data[entity_name] = row
-        _write_csv_file(summary_filepath, headers, fresh_data)
-        
-    except IOError as e:
-        logging.error(f"Could not initialize CSV status: {e}")
+SUMMARY_HEADERS = ['entity', 'data_date', 'download_status', 'processing_status',
+                   'upload_status', 'error_message', 'timestamp']
 
-def _update_csv_status(layer, entity, stage, status, error_msg='', data_date='', entity_components: dict = None):
-    """Update CSV status for a specific entity and stage (fresh-file model)."""
-    if not CONFIG.generate_summary:
-        return
-        
-    summary_filename = f"{layer}_summary.csv"
+def _summary_filepath(layer: str) -> str:
+    """Return summaries/{layer}_summary.csv next to this script (creating the directory)."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
     summaries_dir = os.path.join(script_dir, "summaries")
     os.makedirs(summaries_dir, exist_ok=True)
-    summary_filepath = os.path.join(summaries_dir, summary_filename)
-    
-    # Use new format headers
-    headers = ['entity', 'data_date', 'download_status', 'processing_status', 
-               'upload_status', 'error_message', 'timestamp']
-    
-    try:
-        # Fresh-file model: read current CSV (seeded by _initialize_csv_status) and update in place
-        existing_data = {}
-        if os.path.exists(summary_filepath):
-            with open(summary_filepath, 'r', newline='') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    if row.get('entity', '').startswith('LAST UPDATED:'):
-                        continue
-                    key = row.get('entity', '')
-                    existing_data[key] = row
-        
-        # Use the original entity name as the key
-        entity_key = entity
-        
-        if entity_key in existing_data:
-            row = existing_data[entity_key]
-            
+    return os.path.join(summaries_dir, f"{layer}_summary.csv")
+
+class SummaryStatusStore:
+    """In-process, thread-safe store for the per-layer summary rows.
+
+    `_initialize_csv_status`, `_update_csv_status` and `generate_summary` all work on
+    this store instead of re-reading/rewriting `{layer}_summary.csv` on every stage
+    transition. Dirty layers are flushed atomically (temp file + rename) when the
+    flush interval has elapsed, by a background timer while entities run, and
+    explicitly at layer boundaries. Rows can optionally be mirrored to a SQLite file
+    (table `entity_status`) so a dashboard can tail progress.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, sqlite_path: str | None = None):
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.sqlite_path = sqlite_path
+        self._lock = threading.RLock()
+        self._rows = {}      # layer -> {entity: row}
+        self._footers = {}   # layer -> 'LAST UPDATED:' summary row
+        self._dirty = set()  # layers with unflushed changes
+        self._dirty_entities = {}  # layer -> entities changed since the last SQLite mirror
+        self._last_flush = time.monotonic()
+        self._sqlite = None
+        self._timer = None
+        self._stop = threading.Event()
+
+    # -- row access -------------------------------------------------------
+
+    def seed(self, layer: str, entities: list[str]):
+        """Start a fresh set of rows for the layer containing only the given entities."""
+        with self._lock:
+            self._rows[layer] = {e: {h: '' for h in SUMMARY_HEADERS} | {'entity': e} for e in entities}
+            self._footers.pop(layer, None)
+            self._mark_dirty(layer, entities)
+
+    def update(self, layer: str, entity: str, stage: str, status: str, error_msg: str = '', data_date: str = ''):
+        """Apply a stage transition to an entity row (no-op for entities not seeded)."""
+        with self._lock:
+            row = self._rows.get(layer, {}).get(entity)
+            if row is None:
+                return
+
             # Update the specific stage status
             if stage == 'download':
                 row['download_status'] = status
@@ -2953,7 +3804,7 @@ def _update_csv_status(layer, entity, stage, status, error_msg='', data_date='',
                 row['upload_status'] = status
                 if status == 'SUCCESS' and data_date:
                     row['data_date'] = data_date
-            
+
             # Set error message based on status
             if status == 'FAILED' and error_msg:
                 row['error_message'] = str(error_msg)
@@ -2965,17 +3816,132 @@ def _update_csv_status(layer, entity, stage, status, error_msg='', data_date='',
                 row['error_message'] = str(error_msg)
             elif status == 'SUCCESS':
                 row['error_message'] = ''
-            
-            existing_data[entity_key] = row
-            
-            # Write back the updated CSV
-            _write_csv_file(summary_filepath, headers, existing_data)
-        
-    except IOError as e:
-        logging.error(f"Could not update CSV status: {e}")
 
-def _write_csv_file(filepath, headers, data_dict):
-    """Write CSV file with sorted data."""
+            self._mark_dirty(layer, [entity])
+        self.flush_if_due()
+
+    def get_rows(self, layer: str) -> dict[str, dict]:
+        """Return a copy of the layer's rows keyed by entity."""
+        with self._lock:
+            return {e: dict(r) for e, r in self._rows.get(layer, {}).items()}
+
+    def replace_rows(self, layer: str, rows: dict[str, dict], footer: dict | None = None):
+        """Replace the layer's rows (and optional summary footer row) and mark them dirty."""
+        with self._lock:
+            self._rows[layer] = {e: dict(r) for e, r in rows.items()}
+            if footer is not None:
+                self._footers[layer] = dict(footer)
+            self._mark_dirty(layer, rows.keys())
+
+    def _mark_dirty(self, layer: str, entities):
+        self._dirty.add(layer)
+        self._dirty_entities.setdefault(layer, set()).update(entities)
+
+    # -- flushing ---------------------------------------------------------
+
+    def flush_if_due(self):
+        """Flush dirty layers if the flush interval has elapsed since the last flush."""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self, layer: str | None = None):
+        """Write dirty layers (or just `layer`) to CSV atomically and mirror them to SQLite."""
+        with self._lock:
+            layers_to_write = [layer] if layer is not None else sorted(self._dirty)
+            for lyr in layers_to_write:
+                if lyr not in self._dirty:
+                    continue
+                try:
+                    _write_csv_file(_summary_filepath(lyr), SUMMARY_HEADERS, self._rows.get(lyr, {}), self._footers.get(lyr))
+                except IOError as e:
+                    logging.error(f"Could not write summary file for layer {lyr}: {e}")
+                    continue
+                self._mirror_to_sqlite(lyr)
+                self._dirty.discard(lyr)
+            self._last_flush = time.monotonic()
+
+    def _mirror_to_sqlite(self, layer: str):
+        if not self.sqlite_path:
+            self._dirty_entities.pop(layer, None)
+            return
+        entities = self._dirty_entities.pop(layer, set())
+        try:
+            if self._sqlite is None:
+                self._sqlite = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+                self._sqlite.execute(
+                    "CREATE TABLE IF NOT EXISTS entity_status ("
+                    "layer TEXT NOT NULL, entity TEXT NOT NULL, data_date TEXT, download_status TEXT, "
+                    "processing_status TEXT, upload_status TEXT, error_message TEXT, timestamp TEXT, "
+                    "updated_at TEXT NOT NULL, PRIMARY KEY (layer, entity))"
+                )
+            rows = self._rows.get(layer, {})
+            now = datetime.now().isoformat(timespec='seconds')
+            params = [
+                (layer, e, r.get('data_date', ''), r.get('download_status', ''), r.get('processing_status', ''),
+                 r.get('upload_status', ''), r.get('error_message', ''), r.get('timestamp', ''), now)
+                for e, r in ((e, rows[e]) for e in sorted(entities) if e in rows)
+            ]
+            with self._sqlite:
+                self._sqlite.executemany(
+                    "INSERT OR REPLACE INTO entity_status (layer, entity, data_date, download_status, "
+                    "processing_status, upload_status, error_message, timestamp, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    params,
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Could not mirror status rows to SQLite ({self.sqlite_path}): {e}")
+
+    # -- background timer -------------------------------------------------
+
+    def start(self):
+        """Start the background flush timer (idempotent)."""
+        if self._timer is not None or self.flush_interval <= 0:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(self.flush_interval):
+                self.flush()
+
+        self._timer = threading.Thread(target=_run, name='status-flush', daemon=True)
+        self._timer.start()
+
+    def close(self):
+        """Stop the timer, flush everything and close the SQLite mirror."""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join(timeout=self.flush_interval + 1)
+            self._timer = None
+        self.flush()
+        with self._lock:
+            if self._sqlite is not None:
+                self._sqlite.close()
+                self._sqlite = None
+
+# Global status store (rebuilt from CLI options in main)
+STATUS_STORE = SummaryStatusStore()
+
+def _initialize_csv_status(layer, queue, entity_components: dict = None):
+    """Initialize a fresh summary with only the queued entities for this run."""
+    if not CONFIG.generate_summary:
+        return
+
+    # Fresh rows seeded only with queued entities; written out immediately
+    STATUS_STORE.seed(layer, list(queue))
+    STATUS_STORE.flush(layer)
+
+def _update_csv_status(layer, entity, stage, status, error_msg='', data_date='', entity_components: dict = None):
+    """Update the summary status for a specific entity and stage (fresh-file model).
+
+    Updates the in-memory STATUS_STORE; the CSV is rewritten by the store's batched flush.
+    """
+    if not CONFIG.generate_summary:
+        return
+
+    STATUS_STORE.update(layer, entity, stage, status, error_msg=error_msg, data_date=data_date)
+
+def _write_csv_file(filepath, headers, data_dict, footer_row: dict | None = None):
+    """Write CSV file with sorted data (atomically: temp file in the same directory + rename)."""
     # Handle both old format (county/city) and new format (entity)
     if 'entity' in headers:
         # New format: sort by entity
@@ -2983,136 +3949,305 @@ def _write_csv_file(filepath, headers, data_dict):
     else:
         # Old format: sort by county, then city
         sorted_data = sorted(data_dict.values(), key=lambda x: (x.get('county', ''), x.get('city', '') or ''))
-    
-    with open(filepath, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader()
-        
-        # Write data rows (filter to only include valid header fields)
-        for row in sorted_data:
-            filtered_row = {k: v for k, v in row.items() if k in headers}
-            writer.writerow(filtered_row)
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(filepath) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=headers)
+            writer.writeheader()
+
+            # Write data rows (filter to only include valid header fields)
+            for row in sorted_data:
+                filtered_row = {k: v for k, v in row.items() if k in headers}
+                writer.writerow(filtered_row)
+
+            if footer_row:
+                writer.writerow({k: v for k, v in footer_row.items() if k in headers})
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 # ---------------------------------------------------------------------------
 # Entity Discovery and Filtering Functions  
 # ---------------------------------------------------------------------------
 
-def get_all_entities_from_db() -> dict[str, dict]:
-    """Get all entities from database with their component parts and dependent fields.
+# Local snapshot of the catalog rows used for entity discovery (see get_all_entities_from_db)
+CATALOG_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'catalog_snapshot.pickle')
+CATALOG_SNAPSHOT_VERSION = 1
+
+_CATALOG_BASE_WHERE = "status IS DISTINCT FROM 'DELETE' AND layer_subgroup IS NOT NULL"
+# Internal state as _entity_from_parts derives it (missing/NULL/NONE -> 'fl')
+_CATALOG_STATE_SQL = (
+    "(CASE WHEN upper(trim(coalesce(state, ''))) IN ('', 'NULL', 'NONE') THEN 'fl' "
+    "ELSE lower(trim(state)) END)"
+)
+# Internal county reduced to its letters/digits (format_name only adds/removes separators)
+_CATALOG_COUNTY_KEY_SQL = "regexp_replace(lower(coalesce(county, '')), '[^a-z0-9]', '', 'g')"
+
+def _known_layer_prefix(prefix: str) -> str | None:
+    """Return the longest configured layer L such that prefix starts with 'L_'."""
+    matches = [name for name in LAYER_CONFIGS if prefix.startswith(name + '_')]
+    return max(matches, key=len) if matches else None
+
+def _include_pattern_predicate(pattern: str) -> tuple[str, list] | None:
+    """Translate an --include pattern into a SQL predicate selecting a superset of its rows.
+
+    Only the literal prefix of the pattern is used, split along the entity grammar
+    (layer_state_county[_city]). Each component narrows the rows only where the
+    prefix fixes it completely, so rows the pattern could match are never dropped;
+    EntityPatternIndex still does the exact filtering afterwards. Returns None if the pattern
+    cannot narrow the catalog (e.g. it starts with a wildcard).
+    """
+    prefix = glob_literal_prefix(pattern)
+    if not prefix:
+        return None
+
+    # Layer: 'L_' starts with the prefix, or the prefix starts with 'L_'
+    sql = "(left(layer_subgroup || '_', %s) = %s OR left(%s, length(layer_subgroup) + 1) = layer_subgroup || '_')"
+    params = [len(prefix), prefix, prefix]
+
+    layer = _known_layer_prefix(prefix)
+    if layer is None:
+        return sql, params
+    rest = prefix[len(layer) + 1:]
+    if not rest:
+        return sql, params
+
+    # State (and county) narrow only rows of that layer
+    if '_' not in rest:
+        scoped = f"left({_CATALOG_STATE_SQL}, %s) = %s"
+        scoped_params = [len(rest), rest]
+    else:
+        state, county_rest = rest.split('_', 1)
+        scoped = f"({_CATALOG_STATE_SQL} = %s OR position('_' in {_CATALOG_STATE_SQL}) > 0)"
+        scoped_params = [state]
+        county_key = re.sub(r'[^a-z0-9]', '', county_rest.lower())
+        if county_key:
+            # county letters are a prefix of the remaining letters or vice versa
+            scoped += (
+                f" AND (left(%s, length({_CATALOG_COUNTY_KEY_SQL})) = {_CATALOG_COUNTY_KEY_SQL} "
+                f"OR left({_CATALOG_COUNTY_KEY_SQL}, %s) = %s)"
+            )
+            scoped_params += [county_key, len(county_key), county_key]
+    return f"({sql} AND (layer_subgroup <> %s OR ({scoped})))", params + [layer] + scoped_params
+
+def _exclude_pattern_predicate(pattern: str) -> tuple[str, list] | None:
+    """Translate an --exclude pattern into a SQL predicate for rows it certainly excludes.
+
+    Only 'layer_*' and 'layer_state_*' are translated (every row of that layer/state
+    matches them); anything else is left to EntityPatternIndex.
+    """
+    if not pattern.endswith('*') or re.search(r'[*?\[]', pattern[:-1]):
+        return None
+    prefix = pattern[:-1]
+    layer = _known_layer_prefix(prefix)
+    if layer is None:
+        return None
+    rest = prefix[len(layer) + 1:]
+    if not rest:
+        return "layer_subgroup = %s", [layer]
+    if rest.endswith('_') and '_' not in rest[:-1]:
+        return f"(layer_subgroup = %s AND {_CATALOG_STATE_SQL} = %s)", [layer, rest[:-1]]
+    return None
+
+def _catalog_where(include_patterns: list[str] = None, exclude_patterns: list[str] = None) -> tuple[str, list]:
+    """Build the WHERE clause (and params) for the catalog rows needed by the patterns."""
+    clauses = [_CATALOG_BASE_WHERE]
+    params = []
+    if include_patterns:
+        predicates = [_include_pattern_predicate(p) for p in include_patterns]
+        if all(predicates):
+            clauses.append("(" + " OR ".join(sql for sql, _ in predicates) + ")")
+            for _, p in predicates:
+                params.extend(p)
+    for pattern in exclude_patterns or []:
+        predicate = _exclude_pattern_predicate(pattern)
+        if predicate:
+            clauses.append(f"NOT {predicate[0]}")
+            params.extend(predicate[1])
+    return " AND ".join(clauses), params
+
+def _catalog_row_components(row: dict) -> tuple[str, dict]:
+    """Return (entity, components) for a catalog row."""
+    layer = row['layer_subgroup']
+    state = row['state']
+    county = row['county']
+    city = row['city']
+
+    # Convert to internal format for entity construction
+    state_internal = format_name(state, 'state', external=False) if state else None
+    county_internal = format_name(county, 'county', external=False) if county else None
+    city_internal = format_name(city, 'city', external=False) if city else None
+
+    # Build entity string
+    entity = _entity_from_parts(layer, state_internal, county_internal, city_internal)
+
+    # Store with component parts and full DB row for dependent fields
+    return entity, {
+        'layer': layer,
+        'state': state_internal,
+        'county': county_internal,
+        'city': city_internal,
+        'db_fields': dict(row),
+    }
+
+def _load_catalog_snapshot(path: str) -> dict:
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if isinstance(snapshot, dict) and snapshot.get('version') == CATALOG_SNAPSHOT_VERSION:
+            return snapshot
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+        pass
+    return {'version': CATALOG_SNAPSHOT_VERSION, 'rows': {}, 'scopes': {}}
+
+def _save_catalog_snapshot(path: str, snapshot: dict):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _fetch_catalog_snapshot(cur, where: str, params: list, snapshot_path: str) -> list[tuple[str, dict]]:
+    """Return (entity, components) for the rows matching `where`, via the local snapshot.
+
+    The snapshot stores, per catalog id, an md5 of the row text and the hydrated
+    components, plus per-WHERE-scope change tokens (row count + md5 over the row
+    hashes, computed server-side). An unchanged token means no rows are transferred;
+    otherwise only rows whose hash changed are fetched.
+    """
+    snapshot = _load_catalog_snapshot(snapshot_path)
+    scope = (where, tuple(params))
+
+    # The scope predicates select supersets of the patterns' rows and read the whole scope by design
+    count, digest = catalog_fetchone(
+        cur,
+        "SELECT count(*), md5(coalesce(string_agg(md5(c::text), '' ORDER BY c.id), '')) "
+        f"FROM {CATALOG_TABLE} c WHERE {where}",
+        params,
+        expect_full_scan=True,
+    )
+    token = f"{count}:{digest}"
+
+    rows = snapshot['rows']
+    cached_scope = snapshot['scopes'].get(scope)
+    if cached_scope and cached_scope[0] == token and all(i in rows for i in cached_scope[1]):
+        logging.debug(f"Catalog snapshot up to date ({count} rows, token {token})")
+        return [rows[i][1] for i in cached_scope[1]]
+
+    hashes = [(r[0], r[1]) for r in catalog_fetchall(
+        cur, f"SELECT c.id, md5(c::text) FROM {CATALOG_TABLE} c WHERE {where} ORDER BY c.id", params, expect_full_scan=True
+    )]
+    stale = [row_id for row_id, row_hash in hashes if rows.get(row_id, (None,))[0] != row_hash]
+    for start in range(0, len(stale), 1000):
+        for row in catalog_fetchall(
+            cur, f"SELECT c.*, md5(c::text) AS _row_md5 FROM {CATALOG_TABLE} c WHERE c.id = ANY(%s)", (stale[start:start + 1000],)
+        ):
+            row = dict(row)
+            row_hash = row.pop('_row_md5')
+            rows[row['id']] = (row_hash, _catalog_row_components(row))
+    logging.debug(f"Catalog snapshot refreshed: {len(stale)}/{len(hashes)} rows fetched")
+
+    ids = [row_id for row_id, _ in hashes]
+    if where == _CATALOG_BASE_WHERE:
+        # Unscoped refresh: drop rows that left the catalog
+        live = set(ids)
+        for row_id in [i for i in rows if i not in live]:
+            del rows[row_id]
+    snapshot['scopes'][scope] = (token, ids)
+    try:
+        _save_catalog_snapshot(snapshot_path, snapshot)
+    except OSError as e:
+        logging.warning(f"Could not save catalog snapshot {snapshot_path}: {e}")
+    return [rows[i][1] for i in ids if i in rows]
+
+def get_all_entities_from_db(include_patterns: list[str] = None, exclude_patterns: list[str] = None,
+                             use_cache: bool | None = None) -> dict[str, dict]:
+    """Get entities from database with their component parts and dependent fields.
+
+    With include/exclude patterns, only the catalog rows those patterns can match are
+    read (see _catalog_where); callers still apply the patterns exactly. Rows come from
+    the local catalog snapshot unless use_cache is False (default: CONFIG.catalog_cache).
 
     Returns:
         Dictionary mapping entity strings to their component parts plus cached DB fields.
     """
+    if use_cache is None:
+        use_cache = CONFIG.catalog_cache
+    where, params = _catalog_where(include_patterns, exclude_patterns)
     entity_dict = {}
-    conn = psycopg2.connect(PG_CONNECTION)
-    cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
     try:
-        # Get all valid records with populated layer_subgroup; fetch full rows for dependent field cache
-        sql = (
-            "SELECT * FROM m_gis_data_catalog_main "
-            "WHERE status IS DISTINCT FROM 'DELETE' "
-            "AND layer_subgroup IS NOT NULL"
-        )
-        cur.execute(sql)
-        rows = cur.fetchall()
+        with CATALOG_WRITER.connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                if use_cache:
+                    entries = _fetch_catalog_snapshot(cur, where, params, CATALOG_SNAPSHOT_PATH)
+                else:
+                    # Get valid records with populated layer_subgroup; fetch full rows for dependent field cache
+                    rows = catalog_fetchall(cur, f"SELECT * FROM {CATALOG_TABLE} WHERE {where} ORDER BY id", params,
+                                            expect_full_scan=True)
+                    entries = [_catalog_row_components(dict(row)) for row in rows]
         
-        logging.debug(f"Retrieved {len(rows)} entities from database")
+        logging.debug(f"Retrieved {len(entries)} entities from database")
         
-        for row in rows:
-            layer = row['layer_subgroup']
-            state = row['state']
-            county = row['county'] 
-            city = row['city']
-            
-            # Convert to internal format for entity construction
-            state_internal = format_name(state, 'state', external=False) if state else None
-            county_internal = format_name(county, 'county', external=False) if county else None
-            city_internal = format_name(city, 'city', external=False) if city else None
-            
-            # Build entity string
-            entity = _entity_from_parts(layer, state_internal, county_internal, city_internal)
-            
-            # Store with component parts and full DB row for dependent fields
-            entity_dict[entity] = {
-                'layer': layer,
-                'state': state_internal,
-                'county': county_internal, 
-                'city': city_internal,
-                'db_fields': dict(row),
-            }
+        for entity, components in entries:
+            entity_dict[entity] = components
             
     except Exception as exc:
         logging.error(f"DB entity fetch failed: {exc}")
-    finally:
-        cur.close()
-        conn.close()
     return entity_dict
 
+def _log_pattern_counts(include_patterns: list[str], exclude_patterns: list[str], counts: dict):
+    """Log per-pattern match counts returned by EntityPatternIndex.select."""
+    for pattern in include_patterns or []:
+        matched = counts.get(('include', pattern), 0)
+        if matched:
+            logging.info(f"Include pattern '{pattern}' matched {matched} entities")
+        else:
+            logging.warning(f"Include pattern '{pattern}' matched no entities")
+    for pattern in exclude_patterns or []:
+        excluded_count = counts.get(('exclude', pattern), 0)
+        if excluded_count > 0:
+            logging.info(f"Exclude pattern '{pattern}' excluded {excluded_count} entities")
+
 def apply_entity_filters(entities: list[str], include_patterns: list[str] = None, exclude_patterns: list[str] = None) -> list[str]:
     """Apply include/exclude filters to entity list."""
     if not entities:
         return []
     
-    # Apply include filters
-    if include_patterns:
-        included = set()
-        for pattern in include_patterns:
-            matches = fnmatch.filter(entities, pattern)
-            included.update(matches)
-            if matches:
-                logging.info(f"Include pattern '{pattern}' matched {len(matches)} entities")
-            else:
-                logging.warning(f"Include pattern '{pattern}' matched no entities")
-        entities = list(included)
-    
-    # Apply exclude filters
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            before_count = len(entities)
-            entities = [e for e in entities if not fnmatch.fnmatch(e, pattern)]
-            excluded_count = before_count - len(entities)
-            if excluded_count > 0:
-                logging.info(f"Exclude pattern '{pattern}' excluded {excluded_count} entities")
-    
-    return sorted(entities)
+    selected, counts = EntityPatternIndex(entities).select(include_patterns, exclude_patterns)
+    _log_pattern_counts(include_patterns, exclude_patterns, counts)
+    return selected
 
 def get_filtered_entities(include_patterns: list[str] = None, exclude_patterns: list[str] = None) -> tuple[list[str], dict[str, dict]]:
-    """Get entities from database with include/exclude filters applied using simple pattern matching.
+    """Get entities from database with include/exclude filters applied.
+    
+    Patterns are resolved through an EntityPatternIndex built once over the candidate
+    entities (prefix lookups for 'layer_state_county_*'-style patterns, one combined
+    regex for other globs).
     
     Returns:
         Tuple of (filtered_entities_list, entity_components_dict)
     """
-    # Get all entities with their component parts
-    all_entities_dict = get_all_entities_from_db()
-    all_entities = list(all_entities_dict.keys())
+    # Get candidate entities with their component parts (patterns narrow the SQL query)
+    all_entities_dict = get_all_entities_from_db(include_patterns, exclude_patterns)
     
-    logging.info(f"Found {len(all_entities)} total entities in database")
+    logging.info(f"Found {len(all_entities_dict)} candidate entities in database")
     
-    # Start with all entities
-    filtered_entities = set(all_entities)
-    
-    # Apply include filters
-    if include_patterns:
-        included = set()
-        for pattern in include_patterns:
-            matches = fnmatch.filter(all_entities, pattern)
-            included.update(matches)
-            if matches:
-                logging.info(f"Include pattern '{pattern}' matched {len(matches)} entities")
-            else:
-                logging.warning(f"Include pattern '{pattern}' matched no entities")
-        filtered_entities = included
-    
-    # Apply exclude filters
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            before_count = len(filtered_entities)
-            filtered_entities = {e for e in filtered_entities if not fnmatch.fnmatch(e, pattern)}
-            excluded_count = before_count - len(filtered_entities)
-            if excluded_count > 0:
-                logging.info(f"Exclude pattern '{pattern}' excluded {excluded_count} entities")
-    
-    filtered_entities_list = sorted(list(filtered_entities))
+    filtered_entities_list, counts = EntityPatternIndex(all_entities_dict).select(include_patterns, exclude_patterns)
+    _log_pattern_counts(include_patterns, exclude_patterns, counts)
     logging.info(f"After applying filters: {len(filtered_entities_list)} entities selected")
     
     # Return filtered entities and their components
@@ -3133,6 +4268,17 @@ def group_entities_by_layer(entities: list[str], entity_components: dict[str, di
     
     return groups
 
+def _process_and_summarize_layer(layer: str, entities: list[str], entity_components: dict, executor: ThreadPoolExecutor | None = None) -> list[dict]:
+    """Process one layer and write its summary; returns the layer results."""
+    logging.info(f"Processing layer '{layer}' with {len(entities)} entities")
+    layer_results = process_layer(layer, entities, entity_components, executor)
+    
+    # Generate summary for this layer's results
+    if layer_results:
+        generate_summary(layer_results, entity_components)
+    
+    return layer_results
+
 # ---------------------------------------------------------------------------
 # Main Function
 # ---------------------------------------------------------------------------
@@ -3156,9 +4302,27 @@ def main():
     parser.add_argument("--no-summary", action="store_true", help="Skip the summary generation.")
     parser.add_argument("--process-anyway", action="store_true", help="Continue processing even when download returns 'no new data'.")
     parser.add_argument("--slow-threshold", type=int, default=None, help="Flag entities taking >= this many seconds as slow in the summary.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of entities to run concurrently (default 1 = sequential). SELENIUM entities always share one serialized lane.")
+    parser.add_argument("--host-concurrency", type=int, default=2, help="Max concurrent downloads per source host (default 2).")
+    parser.add_argument("--host-delay", type=float, default=1.0, help="Minimum seconds between download starts on the same host (default 1.0).")
+    parser.add_argument("--host-limit", action='append', default=[], metavar='HOST=N', help="Per-host concurrency override, e.g. gis.lakecountyfl.gov=1 (repeatable).")
+    parser.add_argument("--no-catalog-cache", dest='catalog_cache', action='store_false', help="Read catalog rows straight from the database instead of the local snapshot cache.")
+    parser.add_argument("--ags-full-refresh", action="store_true", help="Re-extract AGS layers in full instead of syncing only features changed since the last run.")
+    parser.add_argument("--full-unzip", action="store_true", help="Extract every member of downloaded zips (default: only members relevant to the catalog format).")
+    parser.add_argument("--metadata-workers", type=int, default=0, help="With --no-download, read shapefile metadata for each layer on this many processes up front (default 0 = off).")
+    parser.add_argument("--batch-upload", action="store_true", help="Queue catalog updates and commit them in one batch at the end of each layer.")
+    parser.add_argument("--status-flush-interval", type=float, default=5.0, help="Seconds between batched summary CSV flushes (default 5; 0 = flush on every status change).")
+    parser.add_argument("--status-sqlite", default=None, metavar='PATH', help="Also mirror summary status rows into this SQLite file (table entity_status).")
     
     args = parser.parse_args()
 
+    host_limits = {}
+    for item in args.host_limit:
+        host, sep, limit = item.partition('=')
+        if not sep or not host.strip() or not limit.strip().isdigit():
+            parser.error(f"--host-limit expects HOST=N, got '{item}'")
+        host_limits[host.strip().lower()] = int(limit)
+
     # Initialize config
     global CONFIG
     CONFIG = Config(
@@ -3171,8 +4335,25 @@ def main():
         run_upload=not args.no_upload,
         generate_summary=not args.no_summary,
         process_anyway=args.process_anyway,
-        slow_threshold_seconds=args.slow_threshold
+        slow_threshold_seconds=args.slow_threshold,
+        workers=args.workers,
+        host_concurrency=args.host_concurrency,
+        host_delay_seconds=args.host_delay,
+        host_limits=host_limits,
+        batch_upload=args.batch_upload,
+        metadata_workers=args.metadata_workers,
+        full_unzip=args.full_unzip,
+        catalog_cache=args.catalog_cache,
+        ags_full_refresh=args.ags_full_refresh
     )
+    global DOWNLOAD_SCHEDULER
+    DOWNLOAD_SCHEDULER = DownloadHostScheduler(CONFIG.host_concurrency, CONFIG.host_delay_seconds, CONFIG.host_limits)
+    global CATALOG_WRITER
+    CATALOG_WRITER = CatalogWriter(maxconn=max(4, CONFIG.workers))
+    global STATUS_STORE
+    STATUS_STORE = SummaryStatusStore(flush_interval=args.status_flush_interval, sqlite_path=args.status_sqlite)
+    if CONFIG.generate_summary:
+        STATUS_STORE.start()
     
     initialize_logging(CONFIG.debug)
 
@@ -3201,24 +4382,27 @@ def main():
             _SELENIUM_REMAINING.clear()
             for layer_name, ents in entities_by_layer.items():
                 for e in ents:
-                    comps = entity_components.get(e, {})
-                    cached = comps.get('db_fields') if isinstance(comps, dict) else None
-                    dl = (cached.get('download') if cached else None) or ''
-                    if str(dl).strip().upper() == 'SELENIUM':
+                    if _is_selenium_entity(e, entity_components):
                         _SELENIUM_REMAINING.add(e)
         except Exception:
             pass
         
-        # Process each layer separately
-        for layer, entities in entities_by_layer.items():
-            logging.info(f"Processing layer '{layer}' with {len(entities)} entities")
-            layer_results = process_layer(layer, entities, entity_components)
-            
-            # Generate summary for this layer's results
-            if layer_results:
-                generate_summary(layer_results, entity_components)
-            
-            results.extend(layer_results)
+        if CONFIG.workers > 1:
+            # Layers run side by side; their entity lanes share one bounded pool so total
+            # concurrency never exceeds --workers. Layer coordinator threads only wait.
+            logging.info(f"Parallel mode: {CONFIG.workers} workers across {len(entities_by_layer)} layers")
+            with ThreadPoolExecutor(max_workers=CONFIG.workers, thread_name_prefix='entity') as entity_pool, \
+                 ThreadPoolExecutor(max_workers=len(entities_by_layer), thread_name_prefix='layer') as layer_pool:
+                layer_futures = {
+                    layer: layer_pool.submit(_process_and_summarize_layer, layer, entities, entity_components, entity_pool)
+                    for layer, entities in entities_by_layer.items()
+                }
+                for layer, future in layer_futures.items():
+                    results.extend(future.result())
+        else:
+            # Process each layer separately
+            for layer, entities in entities_by_layer.items():
+                results.extend(_process_and_summarize_layer(layer, entities, entity_components))
 
     except (ValueError, NotImplementedError) as e:
         logging.critical(f"A critical error occurred: {e}")
@@ -3235,6 +4419,19 @@ def main():
             logging.info(f"{total_success}/{total_processed} entities processed successfully across all layers")
         except Exception:
             pass
+        try:
+            report_download_host_stats()
+        except Exception as e:
+            logging.warning(f"Could not report download host stats: {e}")
+        try:
+            CATALOG_WRITER.close()
+        except Exception:
+            pass
+        # Flush any pending summary rows and stop the status flush timer
+        try:
+            STATUS_STORE.close()
+        except Exception as e:
+            logging.warning(f"Could not flush summary status: {e}")
         # Ensure Selenium driver is closed if still open
         try:
             if _selenium_shutdown and _SELENIUM_DRIVER:
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Declarative column mapping for county sales / owner / parcel converters.
+
+A converter is a mapping spec instead of a per-record loop: each standard output field names
+its source column (index or header name) and a chain of transforms. Rows are read in batches,
+turned into columns, and every transform runs over a whole column at once (map() over
+builtins, with a value cache for repetitive columns such as dates and codes). The result is
+written as COPY text format (tab delimited, '' = NULL, backslash/tab/newline escaped), ready
+for  \\copy <table> from '<file>' with delimiter as E'\\t' null as ''  or copy_raw_file().
+
+Example:
+
+    from column_mapping import ColumnMapping, Field, trim, money, date_mdy, year_mdy
+
+    SALES = ColumnMapping([
+        Field('pin', 0, trim),
+        Field('sale_amt', 3, trim, money),
+        Field('sale_year', 2, trim, year_mdy),
+        Field('sale_date', 2, trim, date_mdy),
+        Field('o_name1'),                       # no source: always ''
+    ])
+    SALES.convert_csv('source_data/sales_current.csv', 'parcels_sales.txt')
+
+Transforms take a column (list of str) and return a new column of the same length.
+"""
+
+import csv
+import sys
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+Column = List[str]
+Transform = Callable[[Column], Column]
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Big county exports have long free-text fields (legal descriptions)
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+# ---------------------------------------------------------------------------
+# Transforms (column in, column out)
+# ---------------------------------------------------------------------------
+
+def trim(col: Column) -> Column:
+    """Strip surrounding whitespace."""
+    return list(map(str.strip, col))
+
+
+def upper(col: Column) -> Column:
+    return list(map(str.upper, col))
+
+
+def remove(chars: str) -> Transform:
+    """Delete every character in `chars` (e.g. remove('-') for PIN_CLEAN)."""
+    table = str.maketrans('', '', chars)
+    return lambda col: [value.translate(table) for value in col]
+
+
+def cached(fn: Callable[[str], str], max_size: int = 200000) -> Transform:
+    """Column transform from a per-value function, computed once per distinct value.
+
+    Results are kept across batches (dates and codes repeat over the whole file);
+    the cache starts over once it holds max_size values.
+    """
+    results: Dict[str, str] = {}
+
+    def _transform(col: Column) -> Column:
+        missing = set(col).difference(results)
+        if len(results) + len(missing) > max_size:
+            results.clear()
+        for value in missing:
+            results[value] = fn(value)
+        return list(map(results.__getitem__, col))
+    return _transform
+
+
+_MONEY_TABLE = str.maketrans('', '', '$,\" ')
+
+
+def money(col: Column) -> Column:
+    """Whole dollars: drop cents, '$', ',', quotes and spaces ('$1,250.00' -> '1250')."""
+    return [value.split('.', 1)[0].translate(_MONEY_TABLE) for value in col]
+
+
+def _split_mdy(value: str):
+    parts = value.split('/')
+    if len(parts) != 3:
+        return None
+    month, day, year = parts
+    # m/d/yyyy only: anything else (e.g. an ISO date) is not reordered
+    if not (month.isdigit() and day.isdigit() and year.isdigit()
+            and len(month) <= 2 and len(day) <= 2 and len(year) == 4):
+        return None
+    return year, month.zfill(2), day.zfill(2)
+
+
+def _date_mdy(value: str) -> str:
+    parts = _split_mdy(value)
+    return '-'.join(parts) if parts else value
+
+
+def _year_mdy(value: str) -> str:
+    parts = _split_mdy(value)
+    return parts[0] if parts else ''
+
+
+date_mdy = cached(_date_mdy)
+date_mdy.__doc__ = "m/d/yyyy -> yyyy-mm-dd; any other value is passed through unchanged."
+year_mdy = cached(_year_mdy)
+year_mdy.__doc__ = "Year part of an m/d/yyyy date; '' when it does not parse."
+
+
+def lookup(codes: Dict[str, str], default: Optional[str] = None) -> Transform:
+    """Map codes through a table; unknown codes keep their value (or become `default`)."""
+    if default is None:
+        return cached(lambda value: codes.get(value, value))
+    return cached(lambda value: codes.get(value, default))
+
+
+# ---------------------------------------------------------------------------
+# Mapping spec
+# ---------------------------------------------------------------------------
+
+class Field:
+    """One output column: source column (index or header name, None = constant) + transforms."""
+
+    def __init__(self, target: str, source: Union[int, str, None] = None, *transforms: Transform, value: str = ''):
+        self.target = target
+        self.source = source
+        self.transforms = transforms
+        self.value = value
+
+
+class ColumnMapping:
+    """Ordered output fields; converts batches of rows column by column."""
+
+    def __init__(self, fields: Sequence[Field]):
+        self.fields = list(fields)
+        self.columns = [f.target for f in self.fields]
+
+    def _resolve(self, header: Optional[List[str]]) -> List[Optional[int]]:
+        indexes = []
+        lowered = [h.strip().lower() for h in header] if header else []
+        for f in self.fields:
+            if f.source is None or isinstance(f.source, int):
+                indexes.append(f.source)
+            elif f.source.strip().lower() in lowered:
+                indexes.append(lowered.index(f.source.strip().lower()))
+            else:
+                raise ValueError(f"Field '{f.target}': source column '{f.source}' not in header")
+        return indexes
+
+    def map_batch(self, rows: List[List[str]], indexes: List[Optional[int]]) -> List[tuple]:
+        """Map one batch of source rows to output rows."""
+        if not rows:
+            return []
+        width = max([i for i in indexes if i is not None] + [-1]) + 1
+        # Pad short rows so every source column has a value for every row
+        if width and min(map(len, rows)) < width:
+            rows = [row if len(row) >= width else row + [''] * (width - len(row)) for row in rows]
+        # Only the referenced source columns are pulled out, each once
+        source_columns = {i: list(map(itemgetter(i), rows)) for i in set(indexes) if i is not None}
+        out_columns = []
+        constant = None  # a run of constant fields is joined once and written as one column
+        for f, index in zip(self.fields, indexes):
+            if index is None:
+                value = copy_escape([f.value])[0]
+                constant = value if constant is None else constant + '\t' + value
+                continue
+            if constant is not None:
+                out_columns.append([constant] * len(rows))
+                constant = None
+            col = source_columns[index]
+            for transform in f.transforms:
+                col = transform(col)
+            out_columns.append(copy_escape(col))
+        if constant is not None:
+            out_columns.append([constant] * len(rows))
+        return list(zip(*out_columns))
+
+    def convert_rows(self, rows: Iterable[List[str]], out, header: Optional[List[str]] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Map rows in batches and write them to `out` in COPY text format; returns rows written."""
+        indexes = self._resolve(header)
+        rows = iter(rows)
+        written = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return written
+            written += write_copy_rows(out, self.map_batch(batch, indexes))
+
+    def convert_csv(self, src_path: str, dest_path: str, skip_rows: int = 1, delimiter: str = ',',
+                    encoding: str = 'utf-8', batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Convert a delimited source file; the last skipped row is used as the header."""
+        with open(src_path, 'r', newline='', encoding=encoding, errors='replace') as src, \
+                open(dest_path, 'w', newline='', encoding='utf-8') as dest:
+            reader = csv.reader(src, delimiter=delimiter)
+            header = None
+            for _ in range(skip_rows):
+                header = next(reader, None)
+            written = self.convert_rows(reader, dest, header=header, batch_size=batch_size)
+        print(f'{src_path} -> {dest_path}: {written} rows')
+        return written
+
+
+# COPY text format: backslash first, then the characters that would end a field or row
+_COPY_SPECIALS = ('\\', '\t', '\n', '\r')
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_escape(col: Column) -> Column:
+    """Escape a column for COPY text format (skipped when nothing in the column needs it)."""
+    joined = ''.join(col)
+    if not any(special in joined for special in _COPY_SPECIALS):
+        return col
+    return [value.translate(_COPY_ESCAPES) for value in col]
+
+
+def write_copy_rows(out, rows: List[tuple]) -> int:
+    """Write already escaped rows as tab-delimited lines; returns rows written."""
+    if rows:
+        out.write('\n'.join(map('\t'.join, rows)) + '\n')
+    return len(rows)
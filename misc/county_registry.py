@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+County registry for parcels_convert.py / parcels_convert_v2.py.
+
+county_registry.json (next to this file) holds, for every county, the ordered stages that
+do_all_mapwise runs and the parameters that pick them:
+  - process_raw / process_raw_args : raw converter function and the arguments it takes
+  - sales_source                   : where the raw sales come from (county, fdor, attom)
+  - agg_tables                     : update_agg_tables_<name> variants, in order
+  - dump_targets                   : dump_<name>_agg_tables variants, in order
+  - state, path                    : state code and working directory of the run
+  - skip_stages                    : stages this county does not run
+
+Entries only list what differs from "defaults". Adding a county is a one-line change to the
+JSON file; the converters resolve each step's function by name. Nothing here imports the
+converters, so a scheduler can plan, skip or split stages without loading them.
+
+Usage:
+    python3 county_registry.py broward        # print the planned steps for a county
+    python3 county_registry.py --list         # list registered counties
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'county_registry.json')
+
+# Names a step may take as arguments; the converter supplies their values
+STAGE_ARGS = ('county', 'state', 'state_upper', 'data_date')
+
+_registry_cache: Dict[str, tuple] = {}
+
+
+@dataclass
+class Step:
+    """One function call of a county run."""
+    stage: str
+    function: str
+    args: List[str]
+
+    def call_text(self) -> str:
+        return f"{self.function}({','.join(self.args)})"
+
+
+@dataclass
+class CountyPlan:
+    """The resolved stages and parameters of one county."""
+    county: str
+    state: str
+    path: str
+    sales_source: str
+    agg_tables: List[str]
+    dump_targets: List[str]
+    steps: List[Step]
+
+    @property
+    def stages(self) -> List[str]:
+        return list(dict.fromkeys(step.stage for step in self.steps))
+
+
+def normalize_county(county: str) -> str:
+    """Registry key for a county name (miami-dade -> miami_dade)."""
+    return county.strip().lower().replace('-', '_').replace(' ', '_')
+
+
+def load_registry(path: str = REGISTRY_PATH) -> dict:
+    """Load the registry JSON (cached until the file changes)."""
+    mtime = os.path.getmtime(path)
+    cached = _registry_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r') as f:
+        registry = json.load(f)
+    _registry_cache[path] = (mtime, registry)
+    return registry
+
+
+def counties(registry: Optional[dict] = None) -> List[str]:
+    """Registered counties, in registry order."""
+    registry = registry or load_registry()
+    return list(registry['counties'])
+
+
+def plan_county(county: str, registry: Optional[dict] = None,
+                skip: Iterable[str] = (), only: Iterable[str] = ()) -> CountyPlan:
+    """Resolve a county's ordered steps.
+
+    skip / only filter by stage name on top of the county's own skip_stages.
+    Raises KeyError for an unregistered county and ValueError for unknown stages or arguments.
+    """
+    registry = registry or load_registry()
+    key = normalize_county(county)
+    if key not in registry['counties']:
+        raise KeyError(f"County '{county}' is not in the registry")
+    params = dict(registry['defaults'])
+    params.update(registry['counties'][key])
+    # String parameters may use {county}; stage functions may use any string parameter and {item}
+    for name, value in params.items():
+        if isinstance(value, str):
+            params[name] = value.format(county=key)
+    template_values = {'county': key, **{k: v for k, v in params.items() if isinstance(v, str)}}
+
+    stage_defs = registry['stages']
+    skip = set(skip) | set(params.get('skip_stages', []))
+    only = set(only)
+    unknown = (skip | only) - set(stage_defs)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    steps: List[Step] = []
+    for stage, spec in stage_defs.items():
+        if stage in skip or (only and stage not in only):
+            continue
+        args = list(params[spec['args_from']]) if 'args_from' in spec else list(spec.get('args', []))
+        bad_args = [a for a in args if a not in STAGE_ARGS]
+        if bad_args:
+            raise ValueError(f"Stage '{stage}' for {key}: unknown argument(s) {bad_args}")
+        items = params[spec['each']] if 'each' in spec else [None]
+        for item in items:
+            function = spec['function'].format(item=item, **template_values)
+            steps.append(Step(stage=stage, function=function, args=args))
+
+    return CountyPlan(
+        county=key,
+        state=params['state'],
+        path=params['path'],
+        sales_source=params['sales_source'],
+        agg_tables=list(params['agg_tables']),
+        dump_targets=list(params['dump_targets']),
+        steps=steps,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the registered stages of a county conversion.")
+    parser.add_argument("county", nargs='?', help="County to plan (e.g. broward, miami-dade)")
+    parser.add_argument("--list", action="store_true", help="List registered counties")
+    parser.add_argument("--skip", default="", help="Comma-separated stages to leave out")
+    parser.add_argument("--only", default="", help="Comma-separated stages to keep")
+    args = parser.parse_args()
+
+    if args.list or not args.county:
+        for name in counties():
+            print(name)
+        return
+
+    split = lambda value: [s for s in value.split(',') if s]
+    plan = plan_county(args.county, skip=split(args.skip), only=split(args.only))
+    print(f"{plan.county} ({plan.state}) sales={plan.sales_source} agg={'+'.join(plan.agg_tables)} "
+          f"dumps={'+'.join(plan.dump_targets)}")
+    print(f"  path: {plan.path}")
+    for step in plan.steps:
+        print(f"  {step.stage:<26} {step.call_text()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@
 # Import needed modules
 import sys,os,fileinput,string,math,psycopg2,io,datetime
 import psycopg2.extras, smtplib, textwrap
+import county_registry
 
 
 # ----------------------------------- BEGIN FUNCTIONS -----------------------------------
@@ -29473,355 +29474,27 @@ if myFunction == 'do_all_mapwise' :
     #mycmd = '/srv/projects/Data_Development/05_Parcels/parcels/processes/scripts_county/polk/polk_3_download_attributes.bat'
     #print 'Executing: ', mycmd
     #os.system(mycmd)
-    
-    state_upper = 'FL'
-    state = 'FL'
-    
-    # change working directory
-    if county.lower() == 'a_ga_attom':
-        path = '/srv/mapwise_dev/county/a_GA_attom/current'
-        state_upper = 'GA'
-        state = 'GA'
-    else:
-        path = '/srv/mapwise_dev/county/' + county.lower() + '/processing/database/current'
-        
-    os.chdir(path)
-
-    drop_tables(county,state_upper)
-
-    # 8/31/2022 None of these use the county argument!
-    # deleting from the code
-    if (county.lower() == 'alachua') :
-        print('CALL FUNCTION process_raw_alachua()')
-        process_raw_alachua()
-        
-    if (county.lower() == 'baker') :
-        print('CALL FUNCTION process_raw_baker()')
-        process_raw_baker()
-
-    if (county.lower() == 'bay') :
-        print('CALL FUNCTION process_raw_bay()')
-        process_raw_bay()
-
-    if (county.lower() == 'bradford') :
-        print('CALL FUNCTION process_raw_bradford()')
-        process_raw_bradford()
-
-    if (county.lower() == 'brevard') :
-        print('CALL FUNCTION process_raw_brevard()')
-        process_raw_brevard()
-        
-    if (county.lower() == 'broward') :
-        print('CALL FUNCTION process_raw_broward()')
-        process_raw_broward()
-
-    if (county.lower() == 'calhoun') :
-        print('CALL FUNCTION process_raw_calhoun()')
-        process_raw_calhoun()        
-        
-    if (county.lower() == 'charlotte') :
-        print('CALL FUNCTION process_raw_charlotte()')
-        process_raw_charlotte()
-
-    if (county.lower() == 'citrus') :
-        print('CALL FUNCTION process_raw_citrus()')
-        process_raw_citrus()
-        
-    if (county.lower() == 'clay') :
-        print('CALL FUNCTION process_raw_clay()')
-        process_raw_clay()
-        
-    if (county.lower() == 'collier') :
-        print('CALL FUNCTION process_raw_collier()')
-        process_raw_collier()
-
-    if (county.lower() == 'columbia') :
-        print('CALL FUNCTION process_raw_columbia()')
-        process_raw_columbia()        
-
-    if (county.lower() == 'desoto') :
-        print('CALL FUNCTION process_raw_desoto()')
-        process_raw_desoto()     
-        
-    if (county.lower() == 'dixie') :
-        print('CALL FUNCTION process_raw_dixie()')
-        process_raw_dixie()     
-
-    if (county.lower() == 'duval') :
-        print('CALL FUNCTION process_raw_duval()')
-        process_raw_duval()
-
-    if (county.lower() == 'escambia') :
-        print('CALL FUNCTION process_raw_escambia()')
-        process_raw_escambia()
-
-    if (county.lower() == 'flagler') :
-        print('CALL FUNCTION process_raw_flagler()')
-        process_raw_flagler()
-        
-    if (county.lower() == 'franklin') :
-        print('CALL FUNCTION process_raw_franklin()')
-        #process_raw_franklin()
-        process_raw_fdor_franklin()
-
-    if (county.lower() == 'gadsden') :
-        print('CALL FUNCTION process_raw_gadsden()')
-        process_raw_gadsden()
-
-    if (county.lower() == 'gilchrist') :
-        print('CALL FUNCTION process_raw_gilchrist()')
-        process_raw_gilchrist()
-        
-    if (county.lower() == 'glades') :
-        print('CALL FUNCTION process_raw_glades()')
-        process_raw_glades()
-
-    if (county.lower() == 'gulf') :
-        print('CALL FUNCTION process_raw_gulf()')
-        process_raw_gulf()
-
-    if (county.lower() == 'hamilton') :
-        print('CALL FUNCTION process_raw_hamilton()')
-        process_raw_hamilton()        
-        
-    if (county.lower() == 'hardee') :
-        print('CALL FUNCTION process_raw_hardee()')
-        process_raw_hardee()
-
-    if (county.lower() == 'hendry') :
-        print('CALL FUNCTION process_raw_hendry()')
-        process_raw_hendry()
-
-    if (county.lower() == 'hernando') :
-        print('CALL FUNCTION process_raw_hernando()')
-        process_raw_hernando()        
-
-    if (county.lower() == 'highlands') :
-        print('CALL FUNCTION process_raw_highlands()')
-        process_raw_highlands()
-        
-    if (county.lower() == 'hillsborough') :
-        print('CALL FUNCTION process_raw_hillsborough()')
-        process_raw_hillsborough()
-
-    if (county.lower() == 'holmes') :
-        print('CALL FUNCTION process_raw_holmes()')
-        process_raw_holmes()
-
-    if (county.lower() == 'indian_river') :
-        print('CALL FUNCTION process_raw_indian_river()')
-        process_raw_indian_river()
-
-    if (county.lower() == 'jackson') :
-        print('CALL FUNCTION process_raw_jackson()')
-        process_raw_jackson()
-
-    if (county.lower() == 'jefferson') :
-        print('CALL FUNCTION process_raw_jefferson()')
-        process_raw_jefferson()
-
-    if (county.lower() == 'lafayette') :
-        print('CALL FUNCTION process_raw_lafayette()')
-        process_raw_lafayette()
-
-    if (county.lower() == 'lake') :
-        print('CALL FUNCTION process_raw_lake()')
-        process_raw_lake()       
-        
-    if (county.lower() == 'lee') :
-        print('CALL FUNCTION process_raw_lee()')
-        process_raw_lee()
-
-    if (county.lower() == 'leon') :
-        print('CALL FUNCTION process_raw_leon()')
-        process_raw_leon()
-
-    if (county.lower() == 'levy') :
-        print('CALL FUNCTION process_raw_levy()')
-        process_raw_levy()           
-
-    if (county.lower() == 'liberty') :
-        print('CALL FUNCTION process_raw_liberty()')
-        process_raw_liberty()         
-
-    if (county.lower() == 'madison') :
-        print('CALL FUNCTION process_raw_madison()')
-        process_raw_madison()              
-
-    if (county.lower() == 'manatee') :
-        print('CALL FUNCTION process_raw_manatee()')
-        process_raw_manatee()
-
-    if (county.lower() == 'marion') :
-        print('CALL FUNCTION process_raw_marion()')
-        process_raw_marion()        
-        
-    if (county.lower() == 'martin') :
-        print('CALL FUNCTION process_raw_martin()')
-        process_raw_martin()        
-
-    if (county.lower() == 'miami_dade') :
-        print('CALL FUNCTION process_raw_miami_dade()')
-        process_raw_miami_dade()
-        #print 'CALL FUNCTION process_raw_fdor_miami_dade()'
-        #process_raw_fdor_miami_dade()
-        
-    if (county.lower() == 'monroe') :
-        print('CALL FUNCTION process_raw_monroe()')
-        process_raw_monroe()
-
-    if (county.lower() == 'nassau') :
-        print('CALL FUNCTION process_raw_nassau()')
-        process_raw_nassau()
-
-    if (county.lower() == 'okaloosa') :
-        print('CALL FUNCTION process_raw_okaloosa()')
-        process_raw_okaloosa()        
-        
-    if (county.lower() == 'okeechobee') :
-        print('CALL FUNCTION process_raw_okeechobee()')
-        process_raw_okeechobee()
-
-    if (county.lower() == 'orange') :
-        print('CALL FUNCTION process_raw_orange()')
-        process_raw_orange()        
-
-    if (county.lower() == 'osceola') :
-        print('CALL FUNCTION process_raw_osceola()')
-        process_raw_osceola()        
-    
-    if (county.lower() == 'palm_beach') :
-        #print 'CALL FUNCTION process_raw_palm_beach_RAW()'
-        print('CALL FUNCTION process_raw_palm_beach()')
-        process_raw_palm_beach()
-        
-    if (county.lower() == 'pasco') :
-        print('CALL FUNCTION process_raw_pasco()')
-        process_raw_pasco()
-
-    if (county.lower() == 'pinellas') :
-        print('CALL FUNCTION process_raw_pinellas()')
-        process_raw_pinellas()        
-        
-    if (county.lower() == 'polk') :
-        print('CALL FUNCTION process_raw_polk()')
-        process_raw_polk()
-
-    if (county.lower() == 'putnam') :
-        print('CALL FUNCTION process_raw_putnam()')
-        process_raw_putnam()
-        
-    if (county.lower() == 'santa_rosa') :
-        print('CALL FUNCTION process_raw_santa_rosa()')
-        process_raw_santa_rosa()
-        
-    if (county.lower() == 'sarasota') :
-        print('CALL FUNCTION process_raw_sarasota()')
-        process_raw_sarasota()
-
-    if (county.lower() == 'seminole') :
-        print('CALL FUNCTION process_raw_seminole()')
-        process_raw_seminole()
-
-    if (county.lower() == 'st_johns') :
-        print('CALL FUNCTION process_raw_st_johns()')
-        process_raw_st_johns()             
-
-    if (county.lower() == 'st_lucie') :
-        print('CALL FUNCTION process_raw_st_lucie()')
-        process_raw_st_lucie()
-
-    if (county.lower() == 'sumter') :
-        print('CALL FUNCTION process_raw_sumter()')
-        process_raw_sumter()        
-
-    if (county.lower() == 'suwannee') :
-        print('CALL FUNCTION process_raw_suwannee()')
-        process_raw_suwannee()
-
-    if (county.lower() == 'taylor') :
-        print('CALL FUNCTION process_raw_taylor()')
-        process_raw_taylor()
 
-    if (county.lower() == 'union') :
-        print('CALL FUNCTION process_raw_union()')
-        process_raw_union()
-        
-    if (county.lower() == 'volusia') :
-        print('CALL FUNCTION process_raw_volusia()')
-        process_raw_volusia()
-
-    if (county.lower() == 'wakulla') :
-        print('CALL FUNCTION process_raw_wakulla()')
-        process_raw_wakulla()
-
-    if (county.lower() == 'walton') :
-        print('CALL FUNCTION process_raw_walton()')
-        process_raw_walton()         
-
-    if (county.lower() == 'washington') :
-        print('CALL FUNCTION process_raw_washington_fdor()')
-        process_raw_washington_fdor()
-        #print 'CALL FUNCTION process_raw_washington_scrape()'
-        #process_raw_washington_scrape()
+    # The stages, their order and the per-county parameters (raw converter, sales source,
+    # agg variants, dump targets, state, working directory) live in county_registry.json.
+    # Add a county there -- not here.
+    try:
+        county_plan = county_registry.plan_county(county)
+    except KeyError:
+        print(msgInvalidCounty, county)
+        # non-zero so processing_queue.py reports the job as failed
+        sys.exit(1)
 
-    if (county.lower() == 'sussex') :
-        print('CALL FUNCTION process_raw_sussex()')
-        process_raw_sussex()
+    state = county_plan.state
+    state_upper = state.upper()
 
-    if (county.lower() == 'a_ga_attom') :
-        print('CALL FUNCTION process_raw_attom(data_date)')
-        # 9/2/2022
-        process_raw_attom(data_date)
-    
-    #exit()
-    
-    load_join_process(county,state_upper)
+    # change working directory
+    os.chdir(county_plan.path)
 
+    stage_args = {'county': county, 'state': state, 'state_upper': state_upper, 'data_date': data_date}
+    for step in county_plan.steps:
+        print('CALL FUNCTION ' + step.call_text())
+        globals()[step.function](*[stage_args[arg] for arg in step.args])
 
-    #exit()
-    
-    update_production(state,county)
-    
     #update_sale1q(county)
-
-    #exit()
-
-    dump_parcels(county)
-
-    
-    # Update Aggregate tables
-    
-    # If not doing a_ga_attom, do saunders and mapwise.
-    if county.lower() != 'a_ga_attom' :
-        update_agg_tables_saunders(state,county)
-        update_agg_tables_mapwise(state,county)
-        
-    # If doing a_ga_attom, only do saunders.
-    if county.lower() == 'a_ga_attom' :
-        update_agg_tables_saunders(state,county)
-
-    # Update Aggregate tables
-    
-    # If not doing a_ga_attom, do saunders and mapwise.
-    if county.lower() != 'a_ga_attom' :
-        dump_saunders_agg_tables(state,county)
-        dump_mapwise_agg_tables(state,county)
-    
-    # If doing a_ga_attom, only do saunders.
-    if county.lower() == 'a_ga_attom' :
-        dump_saunders_agg_tables(state,county)
-
-
-    update_saunders_sales_new(county)
-
-    update_sunbiz_owners(county)
-
-    update_watch_list(county)    
-
-    dump_sunbiz_owners(county)
-
-    dump_saunders_sales_new(county)
-    
     #drop_temp_tables(state,county)
-    
@@ -17,10 +17,147 @@
 # Import needed modules
 import sys,os,fileinput,string,math,psycopg2,io,datetime
 import psycopg2.extras, smtplib, textwrap
+import county_registry
 
 
 # ----------------------------------- BEGIN FUNCTIONS -----------------------------------
 
+# =======================================================================================
+# STREAMING RAW INGEST
+# - reads a raw county export once and applies the text cleanup the sed / tr / sort
+#   commands used to do, line by line, in python
+# - copy_raw_file() pushes the cleaned rows straight into a raw table with
+#   COPY ... FROM STDIN (no intermediate files, no psql process per file)
+# - clean_raw_file() writes the cleaned rows to ONE output file, for raw files that
+#   are still read by the per-county scripts in /srv/tools/python/parcel_processing
+# - cleanup steps run in the order given, e.g. [ascii_only, backslash_to_slash]
+# =======================================================================================
+
+# tr -cd '\11\12\15\40-\133\135-\176'  -- keep tab, LF, CR and printable ASCII except backslash
+_ASCII_KEEP = set([9, 10, 13]) | set(range(0o40, 0o134)) | set(range(0o135, 0o177))
+_ASCII_DELETE = bytes(b for b in range(256) if b not in _ASCII_KEEP)
+
+def ascii_only(line):
+    # tr -cd '\11\12\15\40-\133\135-\176'
+    return line.translate(None, _ASCII_DELETE)
+
+def backslash_to_slash(line):
+    # sed -e 's:\\:/:g'
+    return line.replace(b'\\', b'/')
+
+def drop_backslashes(line):
+    # sed 's/\\//g'
+    return line.replace(b'\\', b'')
+
+def drop_tabs(line):
+    # sed 's/\t//g'  (the line break is kept)
+    return line.replace(b'\t', b'')
+
+def replace_text(*pairs):
+    """Return a cleanup step for sed 's:old:new:g;...' -- pairs of (old, new) strings."""
+    byte_pairs = [(old.encode(), new.encode()) for old, new in pairs]
+    def _replace(line):
+        for old, new in byte_pairs:
+            line = line.replace(old, new)
+        return line
+    return _replace
+
+
+def stream_raw_lines(path, cleanup=(), skip_lines=0):
+    """Yield the cleaned lines (bytes, newline terminated) of a raw file.
+
+    Keyword arguments:
+    cleanup -- cleanup steps applied to each line, in order
+    skip_lines -- leading lines to drop (sed '1d' / tail -n +2 == 1)
+    """
+    with open(path, 'rb') as raw:
+        for line_no, line in enumerate(raw):
+            if line_no < skip_lines:
+                continue
+            for step in cleanup:
+                line = step(line)
+            if not line.endswith(b'\n'):
+                line += b'\n'
+            yield line
+
+
+class _LineReader(object):
+    """File-like wrapper so cursor.copy_expert() can read from a line generator."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.buffer = bytearray()
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line
+        if size < 0:
+            size = len(self.buffer)
+        chunk = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return chunk
+
+
+def copy_raw_file(table, path, options="delimiter as E'\\t' null as ''", cleanup=(), skip_lines=0, unique=False, connection=None):
+    """COPY a raw file into table through the cleanup stream; returns rows loaded (-1 on failure).
+
+    options are the same WITH options the old psql \\copy commands used.
+    unique -- load only distinct rows (was sort | uniq): the file is copied into a temp
+    table and de-duplicated by the database with SELECT DISTINCT, which spills to disk
+    instead of holding every row in memory.
+    Like the old os.system() calls, a failed load (or connection) is reported and
+    processing continues.
+    """
+    target = '_copy_unique' if unique else table
+    sql = 'COPY ' + target + ' FROM STDIN WITH ' + options
+    print('\nCOPY: ', path, ' -> ', sql)
+
+    own_connection = connection is None
+    cursor = None
+    try:
+        if own_connection:
+            connection = psycopg2.connect(pg_connection)
+        cursor = connection.cursor()
+        if unique:
+            cursor.execute('CREATE TEMP TABLE _copy_unique (LIKE ' + table + ') ON COMMIT DROP')
+        lines = stream_raw_lines(path, cleanup, skip_lines)
+        cursor.copy_expert(sql, _LineReader(lines), size=1 << 20)
+        if unique:
+            cursor.execute('INSERT INTO ' + table + ' SELECT DISTINCT * FROM _copy_unique')
+        rows = cursor.rowcount
+        connection.commit()
+        print('COPY ', table, ': ', rows, ' rows')
+    except (psycopg2.Error, OSError) as e:
+        if connection is not None and not connection.closed:
+            connection.rollback()
+        print('COPY FAILED ', table, ' from ', path, ': ', e)
+        rows = -1
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if own_connection and connection is not None:
+            connection.close()
+    return rows
+
+
+def clean_raw_file(src_path, dest_path, cleanup=(), skip_lines=0):
+    """Write the cleaned lines of src_path to dest_path in one pass; returns lines written."""
+    print('CLEAN: ', src_path, ' -> ', dest_path)
+    count = 0
+    try:
+        with open(dest_path, 'wb') as dest:
+            for line in stream_raw_lines(src_path, cleanup, skip_lines):
+                dest.write(line)
+                count += 1
+    except OSError as e:
+        print('CLEAN FAILED ', src_path, ': ', e)
+        return -1
+    return count
+
+
 #----------------------------------------------------
 # strip unwanted junk from field
 #----------------------------------------------------
@@ -2298,22 +2435,12 @@ def process_raw_alachua() :
     #-----------------------------------------------------------------------------------------
     # convert any backslashes to forward slashes
     #-----------------------------------------------------------------------------------------
-    mycmd = ''.join(["sed -e 's:\\\:/:g' ",pathProcessing,'/source_data/Land.txt > ',pathProcessing,'/source_data/Land2.txt'])
-    #print 'Executing: ', mycmd
-    os.system(mycmd)
+    clean_raw_file(pathProcessing + '/source_data/Land.txt', pathProcessing + '/source_data/Land2.txt', [backslash_to_slash])
 
-    mycmd = ''.join(["sed -e 's:\\\:/:g' ",pathProcessing,'/source_data/Sales.txt > ',pathProcessing,'/source_data/Sales2.txt'])
-    #print 'Executing: ', mycmd
-    os.system(mycmd)
+    clean_raw_file(pathProcessing + '/source_data/Sales.txt', pathProcessing + '/source_data/Sales2.txt', [backslash_to_slash])
 
-    
-    mycmd = ''.join(["sed -e 's:\\\:/:g' ",pathProcessing,'/source_data/Legals.txt > ',pathProcessing,'/source_data/Legals2.txt'])
-    #print 'Executing: ', mycmd
-    os.system(mycmd)     
-
-    #tr -cd '\11\12\15\40-\133\135-\176' < Legals.txt > Legals2.txt
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' <",pathProcessing,'/source_data/Legals2.txt > ',pathProcessing,'/source_data/Legals3.txt'])
-    os.system(mycmd)
+    # sed + tr in one pass (Legals2.txt is no longer written)
+    clean_raw_file(pathProcessing + '/source_data/Legals.txt', pathProcessing + '/source_data/Legals3.txt', [backslash_to_slash, ascii_only])
     
     # remove 1st line, sort on 1st column (pin) and remove duplicate lines    
     mycmd = ''.join(["cat ",pathProcessing,"/source_data/Property.txt | sed '1d' |sort -u -t'\t' -k1,1 > ",pathProcessing,"/source_data/Property2.txt"])
@@ -2410,41 +2537,17 @@ def process_raw_alachua() :
     #-----------------------------------------------------------------------------------------
     # LOAD RAW FILES
     #-----------------------------------------------------------------------------------------
-    sql = "\\copy parcels_template_alachua from 'parcels_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('parcels_template_alachua', 'parcels_new.txt')
 
-    sql = "\\copy raw_alachua_history from 'parcels_valuations.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)    
+    copy_raw_file('raw_alachua_history', 'parcels_valuations.txt')
 
-    sql = "\\copy raw_alachua_owner from 'parcels_owner.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)     
+    copy_raw_file('raw_alachua_owner', 'parcels_owner.txt')
 
-    sql = "\\copy raw_alachua_legal_denormal from 'parcels_legal.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('raw_alachua_legal_denormal', 'parcels_legal.txt')
 
-    sql = "\\copy raw_alachua_landpub from 'parcels_landpub.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)    
+    copy_raw_file('raw_alachua_landpub', 'parcels_landpub.txt')
     
-    sql = "\\copy raw_alachua_bldg from 'parcels_bldg.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('raw_alachua_bldg', 'parcels_bldg.txt')
 
     #sql = "\\copy raw_alachua_sub from 'parcels_sub.txt' with delimiter as E'\\t' null as ''"
     #print 'SQL COMMAND: ', sql
@@ -2459,11 +2562,7 @@ def process_raw_alachua() :
     #print mycmd
 
     # load new sales table 
-    sql = "\\copy raw_alachua_sales from 'parcels_sales.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('raw_alachua_sales', 'parcels_sales.txt')
 
 
     # change to source_data directory for raw files    
@@ -3408,20 +3507,12 @@ def process_raw_brevard() :
     # remove backslashes
 	# python needs to escape backslash as well as sed
 	# no -e required for single command
-    mycmd = ''.join(["sed 's/\\\//g' ",pathSourceData,'/BCPAOWebData.csv/bcpao_WebProperties.csv > ',pathSourceData,'/BCPAOWebData.csv/bcpao_WebProperties2.csv'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-
     #-----------------------------------------------------------------------------------------
-    # ASCII CLEANSING
+    # ASCII CLEANSING (one pass: sed + tr, bcpao_WebProperties2.csv is no longer written)
     #----------------------------------------------------------------------------------------- 
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' < ",pathSourceData,'/BCPAOWebData.csv/bcpao_WebProperties2.csv > ',pathSourceData,'/BCPAOWebData.csv/bcpao_WebProperties3.csv'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
+    clean_raw_file(pathSourceData + '/BCPAOWebData.csv/bcpao_WebProperties.csv', pathSourceData + '/BCPAOWebData.csv/bcpao_WebProperties3.csv', [drop_backslashes, ascii_only])
 
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' < ",pathSourceData,'/BCPAOWebData.csv/bcpao_WebTransfers.csv > ',pathSourceData,'/BCPAOWebData.csv/bcpao_WebTransfers2.csv'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)     
+    clean_raw_file(pathSourceData + '/BCPAOWebData.csv/bcpao_WebTransfers.csv', pathSourceData + '/BCPAOWebData.csv/bcpao_WebTransfers2.csv', [ascii_only])
 
     #-----------------------------------------------------------------------------------------
     # PROCESS RAW FILES
@@ -3444,23 +3535,11 @@ def process_raw_brevard() :
     #-----------------------------------------------------------------------------------------
     # LOAD RAW FILES
     #-----------------------------------------------------------------------------------------
-    sql = "\\copy parcels_template_brevard from 'parcels_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('parcels_template_brevard', 'parcels_new.txt')
 
-    sql = "\\copy raw_brevard_sales from 'sales_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('raw_brevard_sales', 'sales_new.txt')
 
-    sql = "\\copy raw_brevard_buildings from 'buildings_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)    
+    copy_raw_file('raw_brevard_buildings', 'buildings_new.txt')
 
     # UPDATE PIN info
     # Brevard PA PIN example: 22-35-16-00-00003.0-0000.00 - this matches the raw file PIN
@@ -3871,14 +3950,8 @@ def process_raw_broward() :
     #os.system(mycmd)
     
     # Bypass cut
-    mycmd = ''.join(["sed 's/\\t//g' ",pathProcessing,'/source_data/export/bcpa_tax_roll.csv > ',pathProcessing,'/source_data/export/bcpa_tax_roll2.csv'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-    
-    #tr -cd '\11\12\15\40-\133\135-\176' < Legals.txt > Legals2.txt
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' <",pathProcessing,'/source_data/export/bcpa_tax_roll2.csv > ',pathProcessing,'/source_data/export/bcpa_tax_roll3.csv'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)     
+    # sed 's/\t//g' + tr in one pass (bcpa_tax_roll2.csv is no longer written)
+    clean_raw_file(pathProcessing + '/source_data/export/bcpa_tax_roll.csv', pathProcessing + '/source_data/export/bcpa_tax_roll3.csv', [drop_tabs, ascii_only])
     
     #-----------------------------------------------------------------------------------------
     # PROCESS RAW FILES
@@ -3900,17 +3973,9 @@ def process_raw_broward() :
     #-----------------------------------------------------------------------------------------
     # LOAD RAW FILES
     #-----------------------------------------------------------------------------------------
-    sql = "\\copy parcels_template_broward from 'parcels_new.txt' with delimiter as E'\\t' null as ''"
-    print('SQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('parcels_template_broward', 'parcels_new.txt')
 
-    sql = "\\copy raw_broward_bldg from 'parcels_bldg.txt' with delimiter as E'\\t' null as ''"
-    print('SQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)    
+    copy_raw_file('raw_broward_bldg', 'parcels_bldg.txt')
 
     #exit()
     
@@ -4356,24 +4421,12 @@ def process_raw_citrus() :
     # 10/2/24 - file formats changed and one now not updated, but strangley the "new file"
     # ACUALLY - ALL .DAT files are now old and the CSV versions are the fresh ones - WTF - their website says use .DAT
     # has the old format, whatever.
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' <",pathSourceData,'/VD_PARCELDATA.CSV > ',pathSourceData,'/vd_parceldata2.dat'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
+    # tr, then handle mult-comma problems (VILLA,TWNHSE,ETC) -- one pass, vd_parceldata2.dat is no longer written
+    clean_raw_file(pathSourceData + '/VD_PARCELDATA.CSV', pathSourceData + '/vd_parceldata3.dat',
+                   [ascii_only, replace_text(('VILLA,TWNHSE,ETC', 'VILLA TWNHSE ETC'), ('COSTA & SON INC, ', 'COSTA & SON INC'), ('SUGARMILL WOODS, ', 'SUGARMILL WOODS'))])
 
-    # handle mult-comma problems
-    # VILLA,TWNHSE,ETC
-    mycmd = ''.join(["sed 's:VILLA,TWNHSE,ETC:VILLA TWNHSE ETC:g;s:COSTA & SON INC, :COSTA & SON INC:g;s:SUGARMILL WOODS, :SUGARMILL WOODS:g' ",pathSourceData,'/vd_parceldata2.dat > ',pathSourceData,'/vd_parceldata3.dat'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-      
-    mycmd = ''.join(["sed 's/\\\//g' ",pathSourceData,'/VD_LEGAL.CSV > ',pathSourceData,'/vd_legal2.dat'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-
-    #tr -cd '\11\12\15\40-\133\135-\176' < Legals.txt > Legals2.txt
-    mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' <",pathSourceData,'/vd_legal2.dat > ',pathSourceData,'/vd_legal3.dat'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
+    # sed + tr in one pass (vd_legal2.dat is no longer written)
+    clean_raw_file(pathSourceData + '/VD_LEGAL.CSV', pathSourceData + '/vd_legal3.dat', [drop_backslashes, ascii_only])
 
 
     #-----------------------------------------------------------------------------------------
@@ -4423,18 +4476,10 @@ def process_raw_citrus() :
     #-----------------------------------------------------------------------------------------
     # LOAD RAW FILES
     #-----------------------------------------------------------------------------------------
-    sql = "\\copy parcels_template_citrus from 'parcels_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('parcels_template_citrus', 'parcels_new.txt')
     
 
-    sql = "\\copy raw_citrus_sales from 'sales_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_citrus_sales', 'sales_new.txt')
 
     #sql = "\\copy raw_citrus_owners_new from 'owners_new.txt' with delimiter as E'\\t' null as ''"
     #print '\nSQL COMMAND: ', sql
@@ -4442,23 +4487,11 @@ def process_raw_citrus() :
     #os.system(mycmd)
     #print mycmd   
 
-    sql = "\\copy raw_citrus_land from 'land_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_citrus_land', 'land_new.txt')
 
-    sql = "\\copy raw_citrus_legal from 'legal_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_citrus_legal', 'legal_new.txt')
 
-    sql = "\\copy raw_citrus_hist from 'hist_new.txt' with delimiter as E'\\t' null as ''"
-    print('\nSQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)   
+    copy_raw_file('raw_citrus_hist', 'hist_new.txt')
 
     #exit()
 
@@ -6511,13 +6544,6 @@ def process_raw_duval() :
     #print mycmd
     os.system(mycmd)
 
-    #-----------------------------------------------------------------------------------------
-    # REMOVE DUPLICATE LINES FROM sales_new.txt
-    #----------------------------------------------------------------------------------------- 
-    mycmd = 'sort sales_new.txt | uniq > sales_new2.txt'
-    print(mycmd)
-    os.system(mycmd)
-    
     #-----------------------------------------------------------------------------------------
     # create parcel, building, legal, sales tables
     #-----------------------------------------------------------------------------------------
@@ -6531,48 +6557,27 @@ def process_raw_duval() :
     # load data into tables
     #-----------------------------------------------------------------------------------------
     # from sales.dex
-    # AND get rid of duplicates command
-    sql = "\\copy raw_duval_sales from 'sales_new2.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    # AND get rid of duplicate lines (was sort | uniq > sales_new2.txt)
+    copy_raw_file('raw_duval_sales', 'sales_new.txt', unique=True)
 
     # from sales.dex
-    sql = "\\copy raw_duval_owner from 'owner_new.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_duval_owner', 'owner_new.txt')
 
     # from sales.dex
-    sql = "\\copy raw_duval_situs from 'situs.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_duval_situs', 'situs.txt')
 
     # from 2015_COMBINED_CERT.DEX
     #sql = "\\copy raw_duval_parcel from 'parcel.txt' with delimiter as E'\\t' null as ''"
-    sql = "\\copy parcels_template_duval from 'parcel.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)        
+    copy_raw_file('parcels_template_duval', 'parcel.txt')
 
     # building1 - year built, class, value, quality
-    sql = "\\copy raw_duval_building1 from 'building1.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_duval_building1', 'building1.txt')
     
     # building3 - beds, baths, stories rooms/units
-    sql = "\\copy raw_duval_building3 from 'building3.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_duval_building3', 'building3.txt')
     
     # building4 - sqft
-    sql = "\\copy raw_duval_building4 from 'building4.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_duval_building4', 'building4.txt')
     
     # from mary jane extract
     #sql = "\\copy raw_duval_building from 'parcels_building.txt' with delimiter as E'\\t' null as ''"
@@ -6581,10 +6586,7 @@ def process_raw_duval() :
     #os.system(mycmd)
 
     # legal
-    sql = "\\copy raw_duval_legal from 'legal.txt' with delimiter as E'\\t' null as ''"
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)    
+    copy_raw_file('raw_duval_legal', 'legal.txt')
 
     #exit()
 	
@@ -11440,13 +11442,7 @@ def process_raw_levy_scrape() :
     # tr -cd '\11\12\15\40-\133\135-\176' < ftp_legal.txt > ftp_legal2.txt
     # mycmd = ''.join(["tr -cd '\\11\\12\\15\\40-\\133\\135-\\176' <",pathProcessing,'\\source_data\\CERT.txt > ',pathProcessing,'\\source_data\\CERT2.txt'])
     # Cannot use tr because it does one for one search / replace or delete
-    mycmd = ''.join(["sed -e 's:\\\:/:g' ",pathProcessing,'/parcels.txt > ',pathProcessing,'/parcels2.txt'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-
-    mycmd = ''.join(["sed -e 's:\\\:/:g' ",pathProcessing,'/sales.txt > ',pathProcessing,'/sales2.txt'])
-    print('Executing: ', mycmd)
-    os.system(mycmd)    
+    # backslashes become forward slashes in the COPY stream below (parcels2.txt / sales2.txt are no longer written)
 
     
     # load data into tables    
@@ -11456,11 +11452,7 @@ def process_raw_levy_scrape() :
     #print mycmd
     #os.system(mycmd)
 
-    sql = "\\copy raw_levy_parcel from 'parcels2.txt' with delimiter as E'\\t' null as ''"
-    print('SQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    print(mycmd)
-    os.system(mycmd)
+    copy_raw_file('raw_levy_parcel', 'parcels.txt', cleanup=[backslash_to_slash])
     
     #sql = "\\copy raw_levy_land from 'land.txt' with delimiter as E'\\t' null as ''"
     #print 'SQL COMMAND: ', sql
@@ -11474,11 +11466,7 @@ def process_raw_levy_scrape() :
     #print mycmd
     #os.system(mycmd)
 
-    sql = "\\copy raw_levy_sales from 'sales2.txt' with delimiter as E'\\t' null as ''"
-    print('SQL COMMAND: ', sql)
-    mycmd = pg_psql + ' -c "' + sql + '"'
-    os.system(mycmd)
-    print(mycmd)
+    copy_raw_file('raw_levy_sales', 'sales.txt', cleanup=[backslash_to_slash])
 
     # Connect to postgres and open cursor
     connection = psycopg2.connect(pg_connection)
@@ -29468,355 +29456,27 @@ if myFunction == 'do_all_mapwise' :
     #mycmd = '/srv/projects/Data_Development/05_Parcels/parcels/processes/scripts_county/polk/polk_3_download_attributes.bat'
     #print 'Executing: ', mycmd
     #os.system(mycmd)
-    
-    state_upper = 'FL'
-    state = 'FL'
-    
-    # change working directory
-    if county.lower() == 'a_ga_attom':
-        path = '/srv/mapwise_dev/county/a_GA_attom/current'
-        state_upper = 'GA'
-        state = 'GA'
-    else:
-        path = '/srv/mapwise_dev/county/' + county.lower() + '/processing/database/current'
-        
-    os.chdir(path)
-
-    drop_tables(county,state_upper)
-
-    # 8/31/2022 None of these use the county argument!
-    # deleting from the code
-    if (county.lower() == 'alachua') :
-        print('CALL FUNCTION process_raw_alachua()')
-        process_raw_alachua()
-        
-    if (county.lower() == 'baker') :
-        print('CALL FUNCTION process_raw_baker()')
-        process_raw_baker()
-
-    if (county.lower() == 'bay') :
-        print('CALL FUNCTION process_raw_bay()')
-        process_raw_bay()
-
-    if (county.lower() == 'bradford') :
-        print('CALL FUNCTION process_raw_bradford()')
-        process_raw_bradford()
-
-    if (county.lower() == 'brevard') :
-        print('CALL FUNCTION process_raw_brevard()')
-        process_raw_brevard()
-        
-    if (county.lower() == 'broward') :
-        print('CALL FUNCTION process_raw_broward()')
-        process_raw_broward()
-
-    if (county.lower() == 'calhoun') :
-        print('CALL FUNCTION process_raw_calhoun()')
-        process_raw_calhoun()        
-        
-    if (county.lower() == 'charlotte') :
-        print('CALL FUNCTION process_raw_charlotte()')
-        process_raw_charlotte()
 
-    if (county.lower() == 'citrus') :
-        print('CALL FUNCTION process_raw_citrus()')
-        process_raw_citrus()
-        
-    if (county.lower() == 'clay') :
-        print('CALL FUNCTION process_raw_clay()')
-        process_raw_clay()
-        
-    if (county.lower() == 'collier') :
-        print('CALL FUNCTION process_raw_collier()')
-        process_raw_collier()
-
-    if (county.lower() == 'columbia') :
-        print('CALL FUNCTION process_raw_columbia()')
-        process_raw_columbia()        
-
-    if (county.lower() == 'desoto') :
-        print('CALL FUNCTION process_raw_desoto()')
-        process_raw_desoto()     
-        
-    if (county.lower() == 'dixie') :
-        print('CALL FUNCTION process_raw_dixie()')
-        process_raw_dixie()     
-
-    if (county.lower() == 'duval') :
-        print('CALL FUNCTION process_raw_duval()')
-        process_raw_duval()
-
-    if (county.lower() == 'escambia') :
-        print('CALL FUNCTION process_raw_escambia()')
-        process_raw_escambia()
-
-    if (county.lower() == 'flagler') :
-        print('CALL FUNCTION process_raw_flagler()')
-        process_raw_flagler()
-        
-    if (county.lower() == 'franklin') :
-        print('CALL FUNCTION process_raw_franklin()')
-        #process_raw_franklin()
-        process_raw_fdor_franklin()
-
-    if (county.lower() == 'gadsden') :
-        print('CALL FUNCTION process_raw_gadsden()')
-        process_raw_gadsden()
-
-    if (county.lower() == 'gilchrist') :
-        print('CALL FUNCTION process_raw_gilchrist()')
-        process_raw_gilchrist()
-        
-    if (county.lower() == 'glades') :
-        print('CALL FUNCTION process_raw_glades()')
-        process_raw_glades()
-
-    if (county.lower() == 'gulf') :
-        print('CALL FUNCTION process_raw_gulf()')
-        process_raw_gulf()
-
-    if (county.lower() == 'hamilton') :
-        print('CALL FUNCTION process_raw_hamilton()')
-        process_raw_hamilton()        
-        
-    if (county.lower() == 'hardee') :
-        print('CALL FUNCTION process_raw_hardee()')
-        process_raw_hardee()
-
-    if (county.lower() == 'hendry') :
-        print('CALL FUNCTION process_raw_hendry()')
-        process_raw_hendry()
-
-    if (county.lower() == 'hernando') :
-        print('CALL FUNCTION process_raw_hernando()')
-        process_raw_hernando()        
-
-    if (county.lower() == 'highlands') :
-        print('CALL FUNCTION process_raw_highlands()')
-        process_raw_highlands()
-        
-    if (county.lower() == 'hillsborough') :
-        print('CALL FUNCTION process_raw_hillsborough()')
-        process_raw_hillsborough()
-
-    if (county.lower() == 'holmes') :
-        print('CALL FUNCTION process_raw_holmes()')
-        process_raw_holmes()
-
-    if (county.lower() == 'indian_river') :
-        print('CALL FUNCTION process_raw_indian_river()')
-        process_raw_indian_river()
-
-    if (county.lower() == 'jackson') :
-        print('CALL FUNCTION process_raw_jackson()')
-        process_raw_jackson()
-
-    if (county.lower() == 'jefferson') :
-        print('CALL FUNCTION process_raw_jefferson()')
-        process_raw_jefferson()
-
-    if (county.lower() == 'lafayette') :
-        print('CALL FUNCTION process_raw_lafayette()')
-        process_raw_lafayette()
-
-    if (county.lower() == 'lake') :
-        print('CALL FUNCTION process_raw_lake()')
-        process_raw_lake()       
-        
-    if (county.lower() == 'lee') :
-        print('CALL FUNCTION process_raw_lee()')
-        process_raw_lee()
-
-    if (county.lower() == 'leon') :
-        print('CALL FUNCTION process_raw_leon()')
-        process_raw_leon()
-
-    if (county.lower() == 'levy') :
-        print('CALL FUNCTION process_raw_levy()')
-        process_raw_levy()           
-
-    if (county.lower() == 'liberty') :
-        print('CALL FUNCTION process_raw_liberty()')
-        process_raw_liberty()         
-
-    if (county.lower() == 'madison') :
-        print('CALL FUNCTION process_raw_madison()')
-        process_raw_madison()              
-
-    if (county.lower() == 'manatee') :
-        print('CALL FUNCTION process_raw_manatee()')
-        process_raw_manatee()
-
-    if (county.lower() == 'marion') :
-        print('CALL FUNCTION process_raw_marion()')
-        process_raw_marion()        
-        
-    if (county.lower() == 'martin') :
-        print('CALL FUNCTION process_raw_martin()')
-        process_raw_martin()        
-
-    if (county.lower() == 'miami_dade') :
-        print('CALL FUNCTION process_raw_miami_dade()')
-        process_raw_miami_dade()
-        #print 'CALL FUNCTION process_raw_fdor_miami_dade()'
-        #process_raw_fdor_miami_dade()
-        
-    if (county.lower() == 'monroe') :
-        print('CALL FUNCTION process_raw_monroe()')
-        process_raw_monroe()
-
-    if (county.lower() == 'nassau') :
-        print('CALL FUNCTION process_raw_nassau()')
-        process_raw_nassau()
-
-    if (county.lower() == 'okaloosa') :
-        print('CALL FUNCTION process_raw_okaloosa()')
-        process_raw_okaloosa()        
-        
-    if (county.lower() == 'okeechobee') :
-        print('CALL FUNCTION process_raw_okeechobee()')
-        process_raw_okeechobee()
-
-    if (county.lower() == 'orange') :
-        print('CALL FUNCTION process_raw_orange()')
-        process_raw_orange()        
-
-    if (county.lower() == 'osceola') :
-        print('CALL FUNCTION process_raw_osceola()')
-        process_raw_osceola()        
-    
-    if (county.lower() == 'palm_beach') :
-        #print 'CALL FUNCTION process_raw_palm_beach_RAW()'
-        print('CALL FUNCTION process_raw_palm_beach()')
-        process_raw_palm_beach()
-        
-    if (county.lower() == 'pasco') :
-        print('CALL FUNCTION process_raw_pasco()')
-        process_raw_pasco()
-
-    if (county.lower() == 'pinellas') :
-        print('CALL FUNCTION process_raw_pinellas()')
-        process_raw_pinellas()        
-        
-    if (county.lower() == 'polk') :
-        print('CALL FUNCTION process_raw_polk()')
-        process_raw_polk()
-
-    if (county.lower() == 'putnam') :
-        print('CALL FUNCTION process_raw_putnam()')
-        process_raw_putnam()
-        
-    if (county.lower() == 'santa_rosa') :
-        print('CALL FUNCTION process_raw_santa_rosa()')
-        process_raw_santa_rosa()
-        
-    if (county.lower() == 'sarasota') :
-        print('CALL FUNCTION process_raw_sarasota()')
-        process_raw_sarasota()
-
-    if (county.lower() == 'seminole') :
-        print('CALL FUNCTION process_raw_seminole()')
-        process_raw_seminole()
-
-    if (county.lower() == 'st_johns') :
-        print('CALL FUNCTION process_raw_st_johns()')
-        process_raw_st_johns()             
-
-    if (county.lower() == 'st_lucie') :
-        print('CALL FUNCTION process_raw_st_lucie()')
-        process_raw_st_lucie()
-
-    if (county.lower() == 'sumter') :
-        print('CALL FUNCTION process_raw_sumter()')
-        process_raw_sumter()        
-
-    if (county.lower() == 'suwannee') :
-        print('CALL FUNCTION process_raw_suwannee()')
-        process_raw_suwannee()
-
-    if (county.lower() == 'taylor') :
-        print('CALL FUNCTION process_raw_taylor()')
-        process_raw_taylor()
-
-    if (county.lower() == 'union') :
-        print('CALL FUNCTION process_raw_union()')
-        process_raw_union()
-        
-    if (county.lower() == 'volusia') :
-        print('CALL FUNCTION process_raw_volusia()')
-        process_raw_volusia()
-
-    if (county.lower() == 'wakulla') :
-        print('CALL FUNCTION process_raw_wakulla()')
-        process_raw_wakulla()
-
-    if (county.lower() == 'walton') :
-        print('CALL FUNCTION process_raw_walton()')
-        process_raw_walton()         
-
-    if (county.lower() == 'washington') :
-        print('CALL FUNCTION process_raw_washington_fdor()')
-        process_raw_washington_fdor()
-        #print 'CALL FUNCTION process_raw_washington_scrape()'
-        #process_raw_washington_scrape()
+    # The stages, their order and the per-county parameters (raw converter, sales source,
+    # agg variants, dump targets, state, working directory) live in county_registry.json.
+    # Add a county there -- not here.
+    try:
+        county_plan = county_registry.plan_county(county)
+    except KeyError:
+        print(msgInvalidCounty, county)
+        # non-zero so processing_queue.py reports the job as failed
+        sys.exit(1)
 
-    if (county.lower() == 'sussex') :
-        print('CALL FUNCTION process_raw_sussex()')
-        process_raw_sussex()
+    state = county_plan.state
+    state_upper = state.upper()
 
-    if (county.lower() == 'a_ga_attom') :
-        print('CALL FUNCTION process_raw_attom(data_date)')
-        # 9/2/2022
-        process_raw_attom(data_date)
-    
-    #exit()
-    
-    load_join_process(county,state_upper)
+    # change working directory
+    os.chdir(county_plan.path)
 
+    stage_args = {'county': county, 'state': state, 'state_upper': state_upper, 'data_date': data_date}
+    for step in county_plan.steps:
+        print('CALL FUNCTION ' + step.call_text())
+        globals()[step.function](*[stage_args[arg] for arg in step.args])
 
-    #exit()
-    
-    update_production(state,county)
-    
     #update_sale1q(county)
-
-    #exit()
-
-    dump_parcels(county)
-
-    
-    # Update Aggregate tables
-    
-    # If not doing a_ga_attom, do saunders and mapwise.
-    if county.lower() != 'a_ga_attom' :
-        update_agg_tables_saunders(state,county)
-        update_agg_tables_mapwise(state,county)
-        
-    # If doing a_ga_attom, only do saunders.
-    if county.lower() == 'a_ga_attom' :
-        update_agg_tables_saunders(state,county)
-
-    # Update Aggregate tables
-    
-    # If not doing a_ga_attom, do saunders and mapwise.
-    if county.lower() != 'a_ga_attom' :
-        dump_saunders_agg_tables(state,county)
-        dump_mapwise_agg_tables(state,county)
-    
-    # If doing a_ga_attom, only do saunders.
-    if county.lower() == 'a_ga_attom' :
-        dump_saunders_agg_tables(state,county)
-
-
-    update_saunders_sales_new(county)
-
-    update_sunbiz_owners(county)
-
-    update_watch_list(county)    
-
-    dump_sunbiz_owners(county)
-
-    dump_saunders_sales_new(county)
-    
     #drop_temp_tables(state,county)
-    
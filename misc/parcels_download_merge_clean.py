@@ -2,44 +2,39 @@
 # parcels_download_merge_clean.py
 # clean up and merge files downloaded from websites
 #
-# arguments: <county>
-# For a specified county, read all files with naming convention:
-#   L:\mapwise_dev\county\bay\processing\database\current\source_data\sales_2*
-#   - write the lines of each file to a file called sales_current.txt
+# arguments: <county> [--overlap-days N]
+# For a specified county, read all chunk files of the date-range downloads, e.g.
+#   /srv/mapwise_dev/county/bay/processing/database/current/source_data/Bay*.csv
+#   - write the lines of every chunk, in file name order, to one merged file
 #   - skip lines with the following characteristics:
 #       - empty line
-#       - header line, contains Sale Date
-#       - html line, contains <tr>
-# 
-# 3/22/2022 - THIS CAN BE REDUCED TO A FEW LINES OF CODE! No python required.
-# Just delete the header, blank lines and lines containing some html code
-# the whole script is just building a couple unix commands!
-# cat - merge files together
-# delete header, blank lines and lines containing some html code
-# dos2unix
-# 
-# that is all folks!
+#       - header line, contains the county's header field (e.g. Parcel ID), in any chunk
+#       - html line, starts with < (e.g. <tr>)
+#   - any line ending (CRLF, CR, LF) is written as LF, a UTF-8 BOM is dropped and
+#     lines that are not UTF-8 (cp1252 exports) are converted to UTF-8
+#   - sale records repeated at a chunk boundary (same parcel, sale date, book and page)
+#     are written once
+#
+# The merge is a single streaming pass. Only the duplicate keys of the newest
+# --overlap-days sale dates of the previous chunk are kept in memory, so memory
+# use does not grow with the county size.
 #
 # ----------------------------------------------------------------------
 #
 # Import needed modules
-import sys,os,fileinput
-
-try:
-    county = sys.argv[1].lower()
-    
-    county_upper = county.upper()
-    county_lower = county.lower()
-    county_capital = county_upper.capitalize() 
-
-except:
-    print('missing county')
-    sys.exit(0)
+import argparse
+import csv
+import glob
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 # /srv/mapwise_dev/county/walton/processing/database/current/source_data/
-# set main processing path
-pathProcessing = '/srv/mapwise_dev/county/' + county + '/processing/database/current/source_data/'
+SOURCE_PATH = '/srv/mapwise_dev/county/{county}/processing/database/current/source_data/'
 
+# Chunks are date-range downloads; a boundary date can be in two chunks
+DEFAULT_OVERLAP_DAYS = 7
 
 qpublic_counties = ['BAY','CALHOUN','DIXIE','FLAGLER','FRANKLIN',
     'GADSDEN','GILCHRIST','GLADES','GULF','HAMILTON','HARDEE','HENDRY','HOLMES',
@@ -50,90 +45,220 @@ qpublic_counties = ['BAY','CALHOUN','DIXIE','FLAGLER','FRANKLIN',
 grizzly_counties = ['BAKER','BRADFORD','COLUMBIA','DESOTO',
     'HENDRY','LAFAYETTE','OKEECHOBEE','PUTNAM','SUWANNEE','UNION']
 
-# cat /srv/mapwise_dev/county/bay/processing/database/current/source_data/Bay*.csv | sed '/Parcel ID/d' > /srv/mapwise_dev/county/bay/processing/database/current/source_data/sales_current.csv
-
-if (county_upper in qpublic_counties) :
-    
-    search_field = "Parcel ID"
-    
-    if (county_upper =='FRANKLIN') :
-        search_field = "Property ID"
-        
-    if (county_upper == 'FLAGLER') :
-        search_field = "Parcel  Number"
-    
-    if (county_upper == 'SANTA_ROSA') :
-        search_field = "Parcel"
-        # hack - change naming convention at some point
-        county_capital = 'SantaRosa'
-    
-    mycmd = ''.join(["cat ",pathProcessing,county_capital,"*.csv | sed '/",search_field,"/Id' > ",pathProcessing,"sales_current_temp.csv"])
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-    
-    # since work is being done on text files in MacOS, must convert files to unix for proper line endings
-    # mix and match of line endings - postgres loader no likey
-    mycmd = 'dos2unix -n ' + pathProcessing + 'sales_current_temp.csv ' + pathProcessing + 'sales_current.csv'
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-    
-    
-# cat /srv/mapwise_dev/county/columbia/processing/database/current/source_data/columbia_sales_2*.txt | sed '/Sale1_Date/d' > /srv/mapwise_dev/county/columbia/processing/database/current/source_data/sales_dnld_2014-01-01_current.txt
-# cat /srv/mapwise_dev/county/columbia/processing/database/current/source_data/columbia_mailing_2*.txt | sed '/Address1/d' > /srv/mapwise_dev/county/columbia/processing/database/current/source_data/sales_owner_mailing_dnld_2014-01-01_current.txt
-
-# TODO: make code more robust - inspect header and see what the sale date naming convention is
-if (county_upper in grizzly_counties) :
-
-    # Sales files fisrt
-    search_field = "Sale1_Date"
-    
-    if (county_upper in ['SUMTER']) :
-        search_field = "SaleDate"
-
-    if (county_upper in ['LAFAYETTE']) :
-        search_field = "Sale_Date" 
-        
-    if (county_upper in ['PUTNAM']) :
-        search_field = "Sale Price"
-        
-    if (county_upper in ['SUWANNEE','UNION']) :
-        search_field = "Sale1_Price"
-        
-    if (county_upper in ['LAFAYETTE','SUMTER']) :
-        mycmd = ''.join(["cat ",pathProcessing,county_lower,"_briefsales_2*.txt | sed '/",search_field,"/Id' > ",pathProcessing,"sales_dnld_2014-01-01_current_temp.txt"])
-    
-    elif (county_upper in ['PUTNAM']) :
-        mycmd = ''.join(["cat ",pathProcessing,county_lower,"_sales_2*.csv | sed '/",search_field,"/Id' > ",pathProcessing,"sales_dnld_2014-01-01_current_temp.txt"])
-    
-    else:
-        mycmd = ''.join(["cat ",pathProcessing,county_lower,"_sales_2*.txt | sed '/",search_field,"/Id' > ",pathProcessing,"sales_dnld_2014-01-01_current_temp.txt"])
-                
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-
-    # Now mailing files
-    search_field = "Address1"
-    
-    if (county_upper in ['PUTNAM']) :
-        search_field = "Address 1"
-        mycmd = ''.join(["cat ",pathProcessing,county_lower,"_mailing_2*.csv | sed '/",search_field,"/Id' > ",pathProcessing,"sales_owner_mailing_dnld_2014-01-01_current_temp.txt"])
-    else:
-        mycmd = ''.join(["cat ",pathProcessing,county_lower,"_mailing_2*.txt | sed '/",search_field,"/Id' > ",pathProcessing,"sales_owner_mailing_dnld_2014-01-01_current_temp.txt"])
-    
-    
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-
-    # since work is being done on text files in MacOS, must convert files to unix for proper line endings
-    # mix and match of line endings - postgres loader no likey
-    mycmd = 'dos2unix -n ' + pathProcessing + 'sales_dnld_2014-01-01_current_temp.txt ' + pathProcessing + 'sales_dnld_2014-01-01_current.txt'
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-    
-    mycmd = 'dos2unix -n ' + pathProcessing + 'sales_owner_mailing_dnld_2014-01-01_current_temp.txt ' + pathProcessing + 'sales_owner_mailing_dnld_2014-01-01_current.txt'
-    print('Executing: ', mycmd)
-    os.system(mycmd)
-    
-else:
-    pass
+# Header names (lower case, '_' as space) of the duplicate key columns, most specific first
+PARCEL_COLUMNS = ('parcel id', 'parcel number', 'property id', 'parcel', 'strap')
+DATE_COLUMNS = ('sale1 date', 'sale date', 'saledate', 'date')
+BOOK_COLUMNS = ('sale1 book', 'book')
+PAGE_COLUMNS = ('sale1 page', 'page')
+
+DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d', '%m/%d/%y', '%m-%d-%Y', '%Y%m%d')
+
+
+def read_lines(path):
+    """Yield the lines of a chunk file without line endings, as UTF-8 text."""
+    with open(path, 'r', encoding='utf-8-sig', errors='surrogateescape', newline=None) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            try:
+                line.encode('utf-8')
+            except UnicodeEncodeError:
+                # not UTF-8: the county exports are otherwise Windows-1252
+                line = line.encode('utf-8', 'surrogateescape').decode('cp1252', 'replace')
+            yield line
+
+
+def split_line(line, delimiter):
+    if delimiter == '\t':
+        return line.split('\t')
+    return next(csv.reader([line], delimiter=delimiter), [])
+
+
+def find_column(names, candidates):
+    """Index of a key column: an exact header name first, else the one header containing a candidate.
+
+    A candidate contained in several headers (e.g. 'parcel' in MAIL_PARCEL and OWNER_PARCEL_NO)
+    is ambiguous and never guessed; a wrong key column would drop real rows.
+    """
+    for candidate in candidates:
+        if candidate in names:
+            return names.index(candidate)
+    for candidate in candidates:
+        matches = [i for i, name in enumerate(names) if candidate in name]
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            return None
+    return None
+
+
+def find_key_columns(header):
+    """Indexes of (parcel, sale date[, book, page]) in a header; None without parcel and date."""
+    names = [' '.join(h.strip().lower().replace('_', ' ').split()) for h in header]
+    parcel = find_column(names, PARCEL_COLUMNS)
+    sale_date = find_column(names, DATE_COLUMNS)
+    if parcel is None or sale_date is None:
+        return None
+    book_page = [find_column(names, BOOK_COLUMNS), find_column(names, PAGE_COLUMNS)]
+    return [parcel, sale_date] + [i for i in book_page if i is not None]
+
+
+@lru_cache(maxsize=20000)
+def parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def merge_chunks(chunk_paths, dest_path, header_field, overlap_days=DEFAULT_OVERLAP_DAYS):
+    """Stream the chunk files into dest_path (no header) and return the line counts.
+
+    Every line containing header_field (case-insensitive) is a header. The first header
+    picks the delimiter and the duplicate key columns; without parcel and sale date
+    columns only the header, blank and html lines are dropped.
+    """
+    header_field = header_field.lower()
+    delimiter = ','
+    key_columns = None
+    previous_keys = set()  # duplicate keys of the newest overlap_days of the previous chunk
+    overlap = timedelta(days=overlap_days)
+    counts = Counter()
+
+    tmp_path = dest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as out:
+        for path in chunk_paths:
+            window = {}  # sale date -> keys, for the newest overlap_days of this chunk
+            newest = None
+            for line in read_lines(path):
+                if not line.strip():
+                    counts['blank'] += 1
+                    continue
+                if header_field in line.lower():
+                    if counts['header'] == 0:
+                        delimiter = '\t' if '\t' in line else ','
+                        header = split_line(line, delimiter)
+                        key_columns = find_key_columns(header)
+                        if key_columns is None:
+                            print('No unambiguous parcel and sale date columns in the header; boundary duplicates are kept')
+                        else:
+                            print(f"Duplicate key columns: {', '.join(header[i].strip() for i in key_columns)}")
+                    counts['header'] += 1
+                    continue
+                if line.lstrip().startswith('<'):
+                    counts['html'] += 1
+                    continue
+
+                if key_columns is not None:
+                    fields = split_line(line, delimiter)
+                    key = tuple(fields[i].strip() if i < len(fields) else '' for i in key_columns)
+                    if key in previous_keys:
+                        counts['duplicate'] += 1
+                        continue
+                    sale_date = parse_date(key[1])
+                    if sale_date is not None:
+                        if newest is None or sale_date > newest:
+                            newest = sale_date
+                            for old_date in [d for d in window if d <= newest - overlap]:
+                                del window[old_date]
+                        if sale_date > newest - overlap:
+                            window.setdefault(sale_date, set()).add(key)
+
+                out.write(line)
+                out.write('\n')
+                counts['rows'] += 1
+
+            previous_keys = set().union(*window.values())
+            print(f'{path}: merged ({counts["rows"]} rows so far)')
+
+    os.replace(tmp_path, dest_path)
+    print(f'Wrote {dest_path}: {counts["rows"]} rows; dropped {counts["header"]} header, '
+          f'{counts["blank"]} blank, {counts["html"]} html and {counts["duplicate"]} duplicate lines')
+    return counts
+
+
+def merge_pattern(pattern, dest_path, header_field, overlap_days):
+    chunk_paths = [p for p in sorted(glob.glob(pattern)) if os.path.abspath(p) != os.path.abspath(dest_path)]
+    if not chunk_paths:
+        print(f'No files match {pattern}')
+        return None
+    print(f'Merging {len(chunk_paths)} file(s) matching {pattern} (header field: {header_field})')
+    return merge_chunks(chunk_paths, dest_path, header_field, overlap_days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge and clean the chunked sales downloads of a county.')
+    parser.add_argument('county', help='County name, e.g. bay or santa_rosa')
+    parser.add_argument('--overlap-days', type=int, default=DEFAULT_OVERLAP_DAYS,
+                        help=f'Sale dates at the end of a chunk that the next chunk may repeat (default: {DEFAULT_OVERLAP_DAYS})')
+    args = parser.parse_args()
+
+    county = args.county.lower()
+    county_upper = county.upper()
+    county_lower = county.lower()
+    county_capital = county_upper.capitalize()
+
+    # set main processing path
+    pathProcessing = SOURCE_PATH.format(county=county)
+
+    if (county_upper in qpublic_counties) :
+
+        search_field = "Parcel ID"
+
+        if (county_upper =='FRANKLIN') :
+            search_field = "Property ID"
+
+        if (county_upper == 'FLAGLER') :
+            search_field = "Parcel  Number"
+
+        if (county_upper == 'SANTA_ROSA') :
+            search_field = "Parcel"
+            # hack - change naming convention at some point
+            county_capital = 'SantaRosa'
+
+        merge_pattern(pathProcessing + county_capital + '*.csv', pathProcessing + 'sales_current.csv',
+                      search_field, args.overlap_days)
+
+    # TODO: make code more robust - inspect header and see what the sale date naming convention is
+    if (county_upper in grizzly_counties) :
+
+        # Sales files fisrt
+        search_field = "Sale1_Date"
+
+        if (county_upper in ['SUMTER']) :
+            search_field = "SaleDate"
+
+        if (county_upper in ['LAFAYETTE']) :
+            search_field = "Sale_Date"
+
+        if (county_upper in ['PUTNAM']) :
+            search_field = "Sale Price"
+
+        if (county_upper in ['SUWANNEE','UNION']) :
+            search_field = "Sale1_Price"
+
+        if (county_upper in ['LAFAYETTE','SUMTER']) :
+            pattern = pathProcessing + county_lower + '_briefsales_2*.txt'
+        elif (county_upper in ['PUTNAM']) :
+            pattern = pathProcessing + county_lower + '_sales_2*.csv'
+        else:
+            pattern = pathProcessing + county_lower + '_sales_2*.txt'
+
+        merge_pattern(pattern, pathProcessing + 'sales_dnld_2014-01-01_current.txt', search_field, args.overlap_days)
+
+        # Now mailing files
+        search_field = "Address1"
+
+        if (county_upper in ['PUTNAM']) :
+            search_field = "Address 1"
+            pattern = pathProcessing + county_lower + '_mailing_2*.csv'
+        else:
+            pattern = pathProcessing + county_lower + '_mailing_2*.txt'
+
+        merge_pattern(pattern, pathProcessing + 'sales_owner_mailing_dnld_2014-01-01_current.txt',
+                      search_field, args.overlap_days)
+
 
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,15 @@ This module provides functions to:
 1. Detect if a URL points to an opendata portal
 2. Extract ArcGIS REST service URLs from opendata portal pages
 3. Validate and rank extracted ArcGIS URLs by relevance
+
+Each portal's dataset catalog (Hub DCAT feed / v3 API, CKAN package_search or
+/data.json) is fetched once per run into a PortalIndex (PORTAL_CACHE); records of
+that portal are matched against the index before any per-dataset request is made.
 """
 
+import contextlib
 import re
+import threading
 import urllib.request
 import urllib.parse
 from typing import List, Tuple, Optional
@@ -271,13 +277,16 @@ def validate_arcgis_url(url: str) -> Tuple[bool, str, dict]:
     except Exception as e:
         return False, f"ERROR_{type(e).__name__}", {}
 
-def rank_arcgis_urls_by_relevance(urls: List[str], target_keywords: List[str] = None) -> List[Tuple[str, float]]:
+def rank_arcgis_urls_by_relevance(urls: List[str], target_keywords: List[str] = None,
+                                  portal_index: 'PortalIndex' = None) -> List[Tuple[str, float]]:
     """
     Rank ArcGIS URLs by relevance to target keywords.
     
     Args:
         urls: List of ArcGIS URLs to rank
         target_keywords: Keywords to match against (e.g., ['zoning', 'parcels'])
+        portal_index: Optional portal catalog index; URLs it lists also score on the
+                      title and keywords of their dataset (no network access)
         
     Returns:
         List of (url, score) tuples sorted by relevance score
@@ -307,8 +316,15 @@ def rank_arcgis_urls_by_relevance(urls: List[str], target_keywords: List[str] =
         if re.search(r'/\d+$', url):
             score += 0.3
         
+        # Bonus for keywords in the title/keywords of the portal dataset serving the URL
+        if portal_index is not None:
+            score += portal_index.keyword_score(url, target_keywords)
+        
         scored_urls.append((url, score))
     
+    scored_urls.sort(key=lambda x: x[1], reverse=True)
+    return scored_urls
+
 
 def extract_arcgis_from_opendata(url: str, target_keywords: List[str] = None) -> List[Tuple[str, float, dict]]:
     """
@@ -398,6 +414,385 @@ def extract_via_api(url, layer_keywords):
     return []
 
 
+# Candidates scoring at least this matched a layer keyword (1.0 ArcGIS service + 2.0 keyword)
+HIGH_RELEVANCE_SCORE = 3.0
+
+# ---------------------------------------------------------------------------
+# Portal discovery cache
+# ---------------------------------------------------------------------------
+
+# Score added for a service URL of the very dataset the portal URL points at
+DATASET_MATCH_BONUS = 3.0
+
+# URL path words that say nothing about which dataset is meant
+_GENERIC_PATH_WORDS = {'datasets', 'dataset', 'opendata', 'data', 'home', 'item', 'html', 'explore',
+                       'about', 'maps', 'map', 'search', 'www', 'api'}
+
+# Page size and page cap for paginated portal catalog APIs
+PORTAL_PAGE_SIZE = 100
+PORTAL_MAX_PAGES = 50
+
+_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
+
+
+def _fetch_json(url, timeout=20):
+    """GET a JSON document; None on any failure."""
+    try:
+        request = urllib.request.Request(url, headers=_API_HEADERS)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.getcode() != 200:
+                return None
+            return json.loads(response.read().decode('utf-8', errors='ignore'))
+    except Exception as e:
+        print(f"Portal catalog request failed for {url}: {e}")
+        return None
+
+
+def dataset_keys(url):
+    """
+    Identifiers of the dataset a portal URL points at, lowercased.
+    
+    Hub item ids (with _<layer>), Hub /datasets/<org>::<slug> slugs, Socrata 4x4 ids and
+    CKAN /dataset/<name> names.
+    """
+    if not url:
+        return set()
+    url_lower = urllib.parse.unquote(str(url)).lower()
+    keys = set(re.findall(r'(?<![0-9a-f])[0-9a-f]{32}(?:_\d+)?(?![0-9a-f])', url_lower))
+    match = re.search(r'[?&]id=([0-9a-f]{32})(?:.*[?&]sublayer=(\d+))?', url_lower)
+    if match:
+        keys.add(match.group(1) + (f'_{match.group(2)}' if match.group(2) else ''))
+    for pattern in (r'/datasets/([^/?#]+)', r'/dataset/([^/?#]+)'):
+        match = re.search(pattern, url_lower)
+        if match:
+            keys.add(match.group(1))
+            if '::' in match.group(1):
+                keys.add(match.group(1).split('::', 1)[1])
+    keys.update(re.findall(r'/([a-z0-9]{4}-[a-z0-9]{4})(?=/|$|\?|#)', url_lower))
+    return keys
+
+
+class PortalDataset:
+    """One dataset of a portal catalog: title, keywords and ArcGIS service URLs."""
+    
+    def __init__(self, title, keywords, service_urls, keys):
+        self.title = title or ''
+        self.keywords = [k for k in (keywords or []) if isinstance(k, str)]
+        self.service_urls = service_urls
+        self.keys = keys
+        self.text = ' '.join([self.title] + self.keywords).lower()
+
+
+class PortalIndex:
+    """In-memory index of one portal's dataset catalog."""
+    
+    def __init__(self, root, source=None):
+        self.root = root
+        self.source = source  # catalog endpoint the index was built from (None: nothing found)
+        self.datasets = []
+        self._by_key = {}
+        self._by_service_url = {}
+    
+    def add(self, dataset):
+        if not dataset.service_urls:
+            return
+        self.datasets.append(dataset)
+        for key in dataset.keys:
+            self._by_key.setdefault(key, []).append(dataset)
+        for service_url in dataset.service_urls:
+            self._by_service_url.setdefault(service_url.rstrip('/').lower(), dataset)
+    
+    def __len__(self):
+        return len(self.datasets)
+    
+    def dataset_for(self, url):
+        """Datasets the portal URL points at (matched on dataset_keys)."""
+        found = []
+        for key in dataset_keys(url):
+            for dataset in self._by_key.get(key, ()):
+                if dataset not in found:
+                    found.append(dataset)
+        return found
+    
+    def keyword_score(self, service_url, keywords):
+        """2.0 per keyword in the title/keywords of the dataset serving service_url."""
+        dataset = self._by_service_url.get(str(service_url).rstrip('/').lower())
+        if dataset is None or not keywords:
+            return 0.0
+        return sum(2.0 for keyword in keywords if keyword and keyword.lower() in dataset.text)
+    
+    def keyword_match(self, url, keywords):
+        """
+        The one dataset mentioning a layer keyword that best matches the URL's path words.
+        
+        None when no dataset, or more than one equally good dataset, matches: a county
+        portal usually has several datasets of a layer and guessing would pick the wrong one.
+        """
+        wanted = [k.lower() for k in keywords or [] if k]
+        related = [d for d in self.datasets if any(k in d.text for k in wanted)]
+        if len(related) <= 1:
+            return related[0] if related else None
+        path_words = set(re.findall(r'[a-z0-9]+', urllib.parse.unquote(urllib.parse.urlparse(url).path).lower()))
+        path_words -= _GENERIC_PATH_WORDS
+        overlaps = [(len(path_words & set(re.findall(r'[a-z0-9]+', d.text))), d) for d in related]
+        best = max(overlap for overlap, _ in overlaps)
+        matches = [d for overlap, d in overlaps if overlap == best]
+        return matches[0] if best > 0 and len(matches) == 1 else None
+    
+    def candidates(self, url, keywords, limit=10):
+        """
+        (service_url, score) candidates for a portal URL, best first.
+        
+        Service URLs of the dataset the URL points at get DATASET_MATCH_BONUS; otherwise
+        the dataset picked by keyword_match() is ranked.
+        """
+        scores = {}
+        for dataset in self.dataset_for(url):
+            for service_url, score in rank_arcgis_urls_by_relevance(dataset.service_urls, keywords, self):
+                scores[service_url] = max(scores.get(service_url, 0.0), score + DATASET_MATCH_BONUS)
+        if not scores:
+            dataset = self.keyword_match(url, keywords)
+            if dataset is not None:
+                scores.update(rank_arcgis_urls_by_relevance(dataset.service_urls, keywords, self))
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+def portal_root(url):
+    parsed = urllib.parse.urlparse(url)
+    return f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}"
+
+
+def _service_urls(values):
+    urls = []
+    for value in values:
+        if isinstance(value, str) and is_arcgis_service_url(value) and value not in urls:
+            urls.append(value)
+    return urls
+
+
+def _index_dcat(index, catalog):
+    """Add the datasets of a DCAT-US (data.json) catalog; returns the number added."""
+    datasets = catalog.get('dataset') if isinstance(catalog, dict) else None
+    if not isinstance(datasets, list):
+        return 0
+    before = len(index)
+    for entry in datasets:
+        if not isinstance(entry, dict):
+            continue
+        distributions = [d for d in entry.get('distribution') or [] if isinstance(d, dict)]
+        links = [d.get('accessURL') or d.get('downloadURL') for d in distributions]
+        keys = set()
+        for value in [entry.get('identifier'), entry.get('landingPage')] + links:
+            keys |= dataset_keys(value)
+        keywords = entry.get('keyword') or []
+        index.add(PortalDataset(entry.get('title'), keywords if isinstance(keywords, list) else [keywords],
+                                _service_urls(links + extract_urls_from_json(entry)), keys))
+    return len(index) - before
+
+
+def _index_hub_v3(index, root):
+    """Add the datasets of an ArcGIS Hub site from its paginated v3 API; returns the number added."""
+    before = len(index)
+    next_url = f"{root}/api/v3/datasets?page[size]={PORTAL_PAGE_SIZE}"
+    for _ in range(PORTAL_MAX_PAGES):
+        page = _fetch_json(next_url)
+        if not isinstance(page, dict) or not isinstance(page.get('data'), list):
+            break
+        for entry in page['data']:
+            attrs = entry.get('attributes') or {}
+            keys = {str(entry.get('id', '')).lower()} | dataset_keys(attrs.get('slug') and f"/datasets/{attrs['slug']}")
+            index.add(PortalDataset(attrs.get('name') or attrs.get('title'), attrs.get('tags') or [],
+                                    _service_urls([attrs.get('url')]), keys - {''}))
+        next_url = (page.get('links') or {}).get('next')
+        if not next_url:
+            break
+    return len(index) - before
+
+
+def _index_ckan(index, root):
+    """Add the datasets of a CKAN portal from package_search pages; returns the number added."""
+    before = len(index)
+    for page_number in range(PORTAL_MAX_PAGES):
+        page = _fetch_json(f"{root}/api/3/action/package_search?rows={PORTAL_PAGE_SIZE}"
+                           f"&start={page_number * PORTAL_PAGE_SIZE}")
+        results = ((page or {}).get('result') or {}).get('results') if isinstance(page, dict) else None
+        if not results:
+            break
+        for package in results:
+            resources = package.get('resources') or []
+            keys = {str(package.get(k, '')).lower() for k in ('id', 'name')} - {''}
+            keywords = [t.get('name') for t in package.get('tags') or [] if isinstance(t, dict)]
+            index.add(PortalDataset(package.get('title'), keywords,
+                                    _service_urls([r.get('url') for r in resources if isinstance(r, dict)]), keys))
+        if len(results) < PORTAL_PAGE_SIZE:
+            break
+    return len(index) - before
+
+
+def build_portal_index(url):
+    """
+    Fetch a portal's dataset catalog once and index it.
+    
+    ArcGIS Hub sites are read from their DCAT feed (falling back to the paginated v3
+    API), CKAN portals from package_search, anything else (e.g. Socrata) from the
+    portal's /data.json catalog.
+    """
+    root = portal_root(url)
+    url_lower = url.lower()
+    if 'opendata.arcgis.com' in url_lower or '.hub.arcgis.com' in url_lower:
+        sources = [('dcat', f"{root}/api/feed/dcat-us/1.1.json"), ('hub_v3', root)]
+    elif 'ckan' in url_lower:
+        sources = [('ckan', root), ('dcat', f"{root}/data.json")]
+    else:
+        sources = [('dcat', f"{root}/data.json")]
+    
+    index = PortalIndex(root)
+    for kind, source in sources:
+        if kind == 'dcat':
+            catalog = _fetch_json(source)
+            added = _index_dcat(index, catalog) if catalog is not None else 0
+        elif kind == 'hub_v3':
+            added = _index_hub_v3(index, source)
+        else:
+            added = _index_ckan(index, source)
+        if added:
+            index.source = source
+            break
+    print(f"Indexed {len(index)} datasets with ArcGIS services for portal {root}")
+    return index
+
+
+class PortalDiscoveryCache:
+    """Per-run cache of portal indexes; each portal's catalog is fetched at most once."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._portals = {}  # root -> [lock, index]
+        self.lookups = 0
+    
+    def get(self, url):
+        """The PortalIndex of the URL's portal, building it on first use (thread-safe)."""
+        root = portal_root(url)
+        with self._lock:
+            self.lookups += 1
+            slot = self._portals.setdefault(root, [threading.Lock(), None])
+        with slot[0]:
+            if slot[1] is None:
+                slot[1] = build_portal_index(url)
+            return slot[1]
+    
+    def stats(self):
+        with self._lock:
+            indexes = [slot[1] for slot in self._portals.values() if slot[1] is not None]
+        return {
+            'portals': len(indexes),
+            'indexed_portals': sum(1 for index in indexes if index.source),
+            'datasets': sum(len(index) for index in indexes),
+            'lookups': self.lookups,
+        }
+
+
+PORTAL_CACHE = PortalDiscoveryCache()
+
+
+def extract_from_portal_index(url, layer_keywords):
+    """
+    Candidates from the cached catalog of the URL's portal (no per-record requests).
+    """
+    return PORTAL_CACHE.get(url).candidates(url, layer_keywords)
+
+
+
+def detector_strategies(url):
+    """
+    Ordered (name, function) extraction strategies that apply to a portal URL.
+    
+    The portal's cached catalog comes first, then the per-dataset API lookups; fetching
+    and parsing the portal page is the fallback, so a caller can stop as soon as one
+    strategy yields a good candidate.
+    """
+    url_lower = url.lower()
+    strategies = [('portal_index', extract_from_portal_index)]
+    if 'opendata.arcgis.com' in url_lower or '.hub.arcgis.com' in url_lower:
+        strategies.append(('hub_api', extract_from_arcgis_hub_api))
+    if any(domain in url_lower for domain in ['data.', 'opendata.']):
+        strategies.append(('socrata_api', extract_from_socrata_api))
+    if 'ckan' in url_lower:
+        strategies.append(('ckan_api', extract_from_ckan_api))
+    strategies.append(('html', extract_via_requests_method))
+    return strategies
+
+
+def detect_arcgis_candidates(url, layer_keywords=None, validate=None, max_candidates=3,
+                             high_relevance=HIGH_RELEVANCE_SCORE, slot=None):
+    """
+    Run the detector strategies for a portal URL until a relevant candidate validates.
+    
+    After each strategy, the new candidates scoring at least high_relevance are validated
+    (best first); once one of them is valid the remaining strategies are skipped.
+    
+    Args:
+        url: Opendata portal URL
+        layer_keywords: Keywords used for relevance scoring
+        validate: validate(ags_url) -> (is_valid, reason); defaults to validate_arcgis_url
+        max_candidates: Number of candidates returned (each validated at most once)
+        high_relevance: Score at which a valid candidate ends the search
+        slot: Optional slot(url) context manager held around every request made for
+              that URL (e.g. a per-host concurrency limit)
+        
+    Returns:
+        tuple: ([(arcgis_url, relevance_score, is_valid, reason), ...] valid ones first,
+                names of the strategies that ran)
+    """
+    layer_keywords = layer_keywords or []
+    if validate is None:
+        validate = lambda candidate_url: validate_arcgis_url(candidate_url)[:2]
+    if slot is None:
+        slot = lambda _url: contextlib.nullcontext()
+
+    def checked_validate(candidate_url):
+        with slot(candidate_url):
+            return validate(candidate_url)
+
+    scores = {}
+    checked = {}
+    strategies_run = []
+    for name, strategy in detector_strategies(url):
+        strategies_run.append(name)
+        try:
+            with slot(url):
+                found = strategy(url, layer_keywords) or []
+        except Exception as e:
+            print(f"{name} extraction failed for {url}: {e}")
+            found = []
+        for candidate_url, score in found:
+            if score > scores.get(candidate_url, float('-inf')):
+                scores[candidate_url] = score
+        
+        relevant = sorted((u for u in scores if scores[u] >= high_relevance and u not in checked),
+                          key=scores.get, reverse=True)
+        found_valid = False
+        for candidate_url in relevant[:max_candidates]:
+            checked[candidate_url] = checked_validate(candidate_url)
+            if checked[candidate_url][0]:
+                found_valid = True
+                break
+        if found_valid:
+            break
+    
+    # Validate the best remaining candidates so each returned one has a verdict
+    for candidate_url in sorted(scores, key=scores.get, reverse=True)[:max_candidates]:
+        if candidate_url not in checked:
+            checked[candidate_url] = checked_validate(candidate_url)
+    
+    results = [(u, scores[u], bool(valid), reason) for u, (valid, reason) in checked.items()]
+    results.sort(key=lambda r: (r[2], r[1]), reverse=True)
+    return results[:max_candidates], strategies_run
+
+
 def extract_from_arcgis_hub_api(url, layer_keywords):
     """
     Extract from ArcGIS Hub using their API.
@@ -7,9 +7,14 @@ A specialized spin-off of layers_prescrape.py focused on detecting opendata port
 and converting them to ArcGIS REST service URLs. Uses the same argument parsing and
 record finding logic as layers_prescrape but focuses solely on URL conversion.
 
+Portal URLs are converted concurrently (--workers, at most --host-limit requests per
+host). Each finished URL is appended to reports/{layer}_opendata_to_ags.journal.jsonl,
+so an interrupted run resumes where it stopped (--restart discards the journal).
+
 Usage:
     python3 opendata_to_ags.py --include "zoning_fl_*"
     python3 opendata_to_ags.py --include "buildings" --debug
+    python3 opendata_to_ags.py --workers 16 --host-limit 2
     python3 opendata_to_ags.py  # Process all layers
 """
 
@@ -27,15 +32,22 @@ from collections import defaultdict
 # Import core logic from layers_prescrape
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import argparse
+import concurrent.futures
 import csv
 import fnmatch
+import json
 import logging
 import os
 import re
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import psycopg2
 import psycopg2.extras
@@ -43,6 +55,8 @@ import psycopg2.extras
 # Import core logic from layers_prescrape
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from layers_prescrape import Config, DB
+from catalog_access import SQL_LAYER_ROWS_WITH_URL
+import opendata_detector
 from layers_helpers import (
     format_name, LAYER_CONFIGS, PG_CONNECTION, FL_COUNTIES, GA_COUNTIES, AL_COUNTIES, DE_COUNTIES, AZ_COUNTIES
 )
@@ -155,6 +169,9 @@ def validate_arcgis_url(url):
 REPORTS_DIR = Path("reports")
 REPORTS_DIR.mkdir(exist_ok=True)
 
+# new_ags_url markers for portal URLs that produced no candidate
+FAILED_MARKERS = ['NO_AGS_FOUND', 'URL_NOT_ACCESSIBLE', 'NOT_OPENDATA']
+
 @dataclass
 class OpendataConfig:
     """Configuration for opendata-to-AGS conversion."""
@@ -165,6 +182,82 @@ class OpendataConfig:
     generate_csv: bool = True
     max_candidates: int = 3  # Max ArcGIS URLs to extract per opendata portal
     apply: bool = False  # Whether to actually update the database
+    workers: int = 8  # Portal URLs converted concurrently
+    host_limit: int = 2  # Max concurrent requests per host (portal or ArcGIS server)
+    restart: bool = False  # Ignore earlier results (journal and CSV) and convert every URL again
+
+class HostLimiter:
+    """Caps concurrent requests per host across all conversion workers."""
+    
+    def __init__(self, limit: int):
+        self.limit = max(1, int(limit))
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+    
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the URL's host slots for the duration of the block."""
+        host = (urlparse(url).hostname or '').lower()
+        with self._lock:
+            semaphore = self._hosts.setdefault(host, threading.BoundedSemaphore(self.limit))
+        with semaphore:
+            yield
+
+class ConversionJournal:
+    """Append-only JSON Lines journal of converted portal URLs for one layer.
+    
+    One line per finished URL, flushed and fsynced as it is written, so an interrupted
+    run loses at most the URLs that were in flight. A torn last line (crash mid-write)
+    is ignored on load and terminated before the next append.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def load(self) -> Dict[str, dict]:
+        """Return {old_url: entry} for every complete line (later lines win)."""
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and entry.get('old_url'):
+                        entries[entry['old_url']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def reset(self):
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a+', encoding='utf-8')
+                if self._file.tell() > 0:
+                    self._file.seek(self._file.tell() - 1)
+                    if self._file.read(1) != '\n':
+                        self._file.write('\n')
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
 
 class OpendataToAGS:
     """Main engine for opendata-to-AGS URL conversion."""
@@ -191,7 +284,15 @@ class OpendataToAGS:
             sys.exit(1)
         
         # Load existing CSV data for skipping already-processed URLs
-        self.processed_urls = self._load_existing_csv_data()
+        self.processed_urls = {} if cfg.restart else self._load_existing_csv_data()
+        
+        # Journal of URLs converted by this or an interrupted earlier run
+        self.journal = ConversionJournal(REPORTS_DIR / f"{cfg.layer}_opendata_to_ags.journal.jsonl")
+        if cfg.restart:
+            self.journal.reset()
+        self.host_limiter = HostLimiter(cfg.host_limit)
+        self._validation_cache: Dict[str, Tuple[bool, str]] = {}
+        self._validation_lock = threading.Lock()
     
     def _load_existing_csv_data(self):
         """Load existing CSV data to skip already-processed URLs."""
@@ -337,16 +438,7 @@ class OpendataToAGS:
         """Get all entities from database for the current layer with their component parts."""
         entity_dict = {}
         
-        sql = """
-            SELECT layer_subgroup, state, county, city 
-            FROM m_gis_data_catalog_main 
-            WHERE status IS DISTINCT FROM 'DELETE' 
-            AND layer_subgroup = %s
-            AND src_url_file IS NOT NULL 
-            AND src_url_file != ''
-        """
-        
-        records = self.db.fetchall(sql, (self.cfg.layer,))
+        records = self.db.catalog_fetchall(SQL_LAYER_ROWS_WITH_URL, (self.cfg.layer,))
         
         for record in records:
             layer = record.get('layer_subgroup')
@@ -462,16 +554,7 @@ class OpendataToAGS:
     
     def _find_records_with_urls(self) -> List[Dict[str, Any]]:
         """Find all records for the layer that have URLs."""
-        sql = """
-            SELECT * FROM m_gis_data_catalog_main 
-            WHERE status IS DISTINCT FROM 'DELETE' 
-            AND layer_subgroup = %s
-            AND src_url_file IS NOT NULL 
-            AND src_url_file != ''
-            ORDER BY title
-        """
-        
-        records = self.db.fetchall(sql, (self.cfg.layer,))
+        records = self.db.catalog_fetchall(SQL_LAYER_ROWS_WITH_URL, (self.cfg.layer,))
         
         if not records:
             self.logger.warning(f"No records with URLs found for layer '{self.cfg.layer}'")
@@ -551,41 +634,125 @@ class OpendataToAGS:
         import fnmatch
         return fnmatch.fnmatch(entity.lower(), pattern.lower())
     
-    def _convert_opendata_to_ags(self, url: str, layer_keywords: List[str] = None) -> List[Tuple[str, float, bool, str]]:
+    def _validate_candidate(self, ags_url: str) -> Tuple[bool, str]:
+        """Validate an ArcGIS URL through its ?f=json metadata, once per run."""
+        with self._validation_lock:
+            cached = self._validation_cache.get(ags_url)
+        if cached is not None:
+            return cached
+        if not validate_arcgis_url(ags_url)[0]:
+            result = (False, "NOT_ARCGIS_SERVICE")
+        else:
+            result = tuple(opendata_detector.validate_arcgis_url(ags_url)[:2])
+        with self._validation_lock:
+            self._validation_cache[ags_url] = result
+        return result
+    
+    def _convert_opendata_to_ags(self, url: str, layer_keywords: List[str] = None) -> Tuple[List[Tuple[str, float, bool, str]], List[str]]:
         """
-        Convert opendata portal URL to ArcGIS URLs using Selenium.
+        Convert opendata portal URL to ArcGIS URLs.
+        
+        Runs the opendata_detector strategies (Hub/Socrata/CKAN APIs, then page parsing)
+        until a keyword-relevant candidate validates; Selenium extraction is the last resort
+        when none of them produced a valid candidate.
         
         Returns:
-            List of (ags_url, relevance_score, is_valid, validation_reason) tuples
+            (list of (ags_url, relevance_score, is_valid, validation_reason) tuples, strategies run)
         """
         try:
             self.logger.debug(f"Converting opendata URL: {url}")
             
-            # Use Selenium to extract the ArcGIS URL
-            ags_url = extract_arcgis_url_from_opendata(url, headless=True)
-            
-            if not ags_url:
-                self.logger.warning(f"No ArcGIS URL extracted from {url}")
-                return []
+            candidates, strategies = opendata_detector.detect_arcgis_candidates(
+                url, layer_keywords, validate=self._validate_candidate,
+                max_candidates=self.cfg.max_candidates, slot=self.host_limiter.slot,
+            )
             
-            # Validate the extracted URL
-            is_valid, reason = validate_arcgis_url(ags_url)
+            if not any(is_valid for _, _, is_valid, _ in candidates):
+                strategies.append('selenium')
+                with self.host_limiter.slot(url):
+                    ags_url = extract_arcgis_url_from_opendata(url, headless=True)
+                if ags_url and ags_url not in {c[0] for c in candidates}:
+                    with self.host_limiter.slot(ags_url):
+                        is_valid, reason = self._validate_candidate(ags_url)
+                    score = opendata_detector.calculate_relevance_score(ags_url, layer_keywords or [])
+                    candidates.insert(0, (ags_url, score, is_valid, reason))
             
-            # Simple relevance scoring based on URL patterns
-            score = 1.0  # Default score
-            if layer_keywords:
-                for keyword in layer_keywords:
-                    if keyword.lower() in ags_url.lower():
-                        score += 0.5
+            if not candidates:
+                self.logger.warning(f"No ArcGIS URL extracted from {url}")
             
             if self.cfg.debug:
-                self.logger.debug(f"  → {ags_url} (score: {score:.2f}, valid: {is_valid})")
+                for ags_url, score, is_valid, _ in candidates:
+                    self.logger.debug(f"  → {ags_url} (score: {score:.2f}, valid: {is_valid})")
             
-            return [(ags_url, score, is_valid, reason)]
+            return candidates, strategies
             
         except Exception as e:
             self.logger.error(f"Error converting {url}: {e}")
-            return []
+            return [], []
+    
+    def _process_portal_url(self, entity: str, old_url: str, layer_keywords: List[str]) -> dict:
+        """Convert one portal URL (worker thread); returns its journal entry."""
+        started = time.monotonic()
+        entry = {'old_url': old_url, 'entity': entity, 'candidates': [], 'strategies': []}
+        
+        # Validate URL accessibility before attempting conversion
+        with self.host_limiter.slot(old_url):
+            accessible = is_url_accessible(old_url)
+        if not accessible:
+            self.logger.warning(f"⚠️  URL not accessible for {entity}: {old_url}")
+            entry['status'] = 'URL_NOT_ACCESSIBLE'
+        else:
+            candidates, strategies = self._convert_opendata_to_ags(old_url, layer_keywords)
+            entry['status'] = 'CONVERTED' if candidates else 'NO_AGS_FOUND'
+            entry['candidates'] = [[u, round(score, 2), is_valid, reason] for u, score, is_valid, reason in candidates]
+            entry['strategies'] = strategies
+        
+        entry['seconds'] = round(time.monotonic() - started, 2)
+        entry['finished_at'] = datetime.now().isoformat(timespec='seconds')
+        return entry
+    
+    def _convert_pending_urls(self, pending: Dict[str, str], layer_keywords: List[str]) -> Dict[str, dict]:
+        """Convert {old_url: entity} concurrently, journaling each URL as it finishes."""
+        results = {}
+        if not pending:
+            return results
+        
+        workers = max(1, min(self.cfg.workers, len(pending)))
+        self.logger.info(f"Converting {len(pending)} opendata URLs with {workers} workers "
+                         f"(max {self.cfg.host_limit} requests per host)")
+        started = time.monotonic()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='opendata')
+        try:
+            futures = {
+                executor.submit(self._process_portal_url, entity, old_url, layer_keywords): old_url
+                for old_url, entity in pending.items()
+            }
+            for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                old_url = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    # Not journaled, so the next run retries it
+                    self.logger.error(f"❌ Conversion failed for {old_url}: {e}")
+                    continue
+                self.journal.append(entry)
+                results[old_url] = entry
+                if done % 25 == 0 or done == len(futures):
+                    elapsed = time.monotonic() - started
+                    self.logger.info(f"Converted {done}/{len(futures)} URLs ({done / elapsed:.2f} URLs/s)")
+        except KeyboardInterrupt:
+            self.logger.warning(f"Interrupted; {len(results)} URLs journaled, rerun to resume")
+            raise
+        finally:
+            # Queued URLs are dropped; ones still in flight are not journaled and get retried
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.journal.close()
+        
+        stats = opendata_detector.PORTAL_CACHE.stats()
+        if stats['portals']:
+            self.logger.info(f"Portal catalogs: {stats['indexed_portals']}/{stats['portals']} portals indexed "
+                             f"({stats['datasets']} datasets with services), {stats['lookups']} lookups")
+        return results
     
     def _run_conversion(self):
         """Main conversion logic."""
@@ -611,6 +778,30 @@ class OpendataToAGS:
                 self.logger.warning(f"No records found matching entity filters {filter_desc}")
                 return
         
+        # Extract layer keywords from the layer name
+        layer_keywords = [self.cfg.layer]
+        config = LAYER_CONFIGS.get(self.cfg.layer, {})
+        if 'external_frmt' in config:
+            layer_keywords.append(config['external_frmt'])
+        
+        # Portal URLs finished by an earlier (possibly interrupted) run are not converted again
+        journaled = self.journal.load()
+        if journaled:
+            self.logger.info(f"Resuming: {len(journaled)} URLs already converted in {self.journal.path}")
+        
+        # Each distinct portal URL is converted once, however many records share it
+        pending = {}
+        for entity, record in entity_records:
+            old_url = (record.get('src_url_file') or '').strip()
+            if not old_url or not is_opendata_portal(old_url):
+                continue
+            if old_url in self.processed_urls or old_url in journaled or old_url in pending:
+                continue
+            pending[old_url] = entity
+        
+        converted = dict(journaled)
+        converted.update(self._convert_pending_urls(pending, layer_keywords))
+        
         # Process each record for opendata-to-AGS conversion
         csv_rows = []
         headers = ["entity", "og_title", "old_url", "new_ags_url", "relevance_score", "ags_valid", "validation_reason"]
@@ -621,7 +812,7 @@ class OpendataToAGS:
         update_count = 0
         
         for entity, record in entity_records:
-            old_url = record.get('src_url_file', '').strip()
+            old_url = (record.get('src_url_file') or '').strip()
             og_title = record.get('title', '')
             record_id = record.get('id')
             
@@ -633,12 +824,12 @@ class OpendataToAGS:
                 opendata_count += 1
                 
                 # Check if URL was already processed (successfully or failed)
-                if old_url in self.processed_urls:
+                if old_url in self.processed_urls and old_url not in converted:
                     processed_data = self.processed_urls[old_url]
                     new_ags_url = processed_data['new_ags_url']
                     
                     # Skip if it was a failed extraction (don't retry)
-                    if new_ags_url in ['NO_AGS_FOUND', 'URL_NOT_ACCESSIBLE', 'NOT_OPENDATA']:
+                    if new_ags_url in FAILED_MARKERS:
                         self.logger.debug(f"⏭️  Skipping previously failed URL for {entity}: {old_url} ({new_ags_url})")
                     else:
                         self.logger.debug(f"⏭️  Skipping already-processed URL for {entity}: {old_url}")
@@ -650,24 +841,18 @@ class OpendataToAGS:
                     ])
                     continue
                 
-                self.logger.debug(f"🔍 Processing opendata URL for {entity}: {old_url}")
+                entry = converted.get(old_url)
+                if entry is None:
+                    # Conversion raised or was interrupted; the next run retries it
+                    continue
                 
-                # Validate URL accessibility before attempting conversion
-                if not is_url_accessible(old_url):
-                    self.logger.warning(f"⚠️  URL not accessible for {entity}: {old_url}")
+                if entry['status'] == 'URL_NOT_ACCESSIBLE':
                     csv_rows.append([
                         entity, og_title, old_url, "URL_NOT_ACCESSIBLE", "0.00", "NO", "URL_VALIDATION_FAILED"
                     ])
                     continue
                 
-                # Extract layer keywords from the layer name
-                layer_keywords = [self.cfg.layer]
-                config = LAYER_CONFIGS.get(self.cfg.layer, {})
-                if 'external_frmt' in config:
-                    layer_keywords.append(config['external_frmt'])
-                
-                # Convert to ArcGIS URLs
-                ags_candidates = self._convert_opendata_to_ags(old_url, layer_keywords)
+                ags_candidates = [tuple(c) for c in entry['candidates']]
                 
                 if ags_candidates:
                     conversion_count += 1
@@ -733,6 +918,8 @@ Examples:
   python3 opendata_to_ags.py --include "zoning_fl_*" --debug         # Process zoning with debug
   python3 opendata_to_ags.py --exclude "*_unincorporated"            # Skip unincorporated areas
   python3 opendata_to_ags.py --apply                                 # Apply changes to database
+  python3 opendata_to_ags.py --workers 16 --host-limit 2             # More portals in parallel
+  python3 opendata_to_ags.py --restart                               # Ignore the journal of an earlier run
         """
     )
     
@@ -750,6 +937,14 @@ Examples:
     parser.add_argument("--no-csv", dest="generate_csv", action="store_false", default=True,
                        help="Skip CSV report generation")
     
+    # Concurrency / resume options
+    parser.add_argument("--workers", type=int, default=8,
+                       help="Portal URLs converted concurrently (default: 8)")
+    parser.add_argument("--host-limit", type=int, default=2,
+                       help="Max concurrent requests per host (default: 2)")
+    parser.add_argument("--restart", action="store_true",
+                       help="Ignore earlier results (journal and CSV) and convert every URL again")
+    
     return parser
 
 def main():
@@ -770,7 +965,10 @@ def main():
             debug=args.debug,
             generate_csv=args.generate_csv,
             max_candidates=3,
-            apply=args.apply
+            apply=args.apply,
+            workers=args.workers,
+            host_limit=args.host_limit,
+            restart=args.restart
         )
         
         converter = OpendataToAGS(cfg)
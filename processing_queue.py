@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Run a queue of county parcel conversions (parcels_convert.py) concurrently.
+
+Each line of the queue file is one job: the arguments for parcels_convert.py
+(county, date stamp, function, data date, server[, state]), e.g.
+
+    broward current do_all_mapwise 20250708 gisdev
+
+Full command lines in the old processing_queue.sh form
+(`/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py broward ...`) are accepted too.
+Blank lines and lines starting with '#' are ignored.
+
+Scheduling:
+- At most --max-jobs conversions run at once.
+- Each running job is charged --work-mem-mb x --mem-ops against --db-memory-mb. A conversion sets
+  work_mem = '3500MB' (update_production, update_sale1q, ...) and PostgreSQL may claim work_mem
+  once per sort/hash step of a query, so a job only starts while the charge fits the budget.
+  One job is always allowed to run, whatever the budget.
+- Jobs for the same county never overlap (they share the parcels_<county> tables).
+- A failed county is logged and the queue keeps going; the exit code is 1 if any job failed.
+
+Each job's output goes to its own log file under --log-dir.
+
+Usage:
+    python3 processing_queue.py processing_queue.txt --max-jobs 3 --db-memory-mb 24000
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_PYTHON = "/usr/bin/python3"
+DEFAULT_SCRIPT = "/srv/tools/python/lib/parcels_convert.py"
+DEFAULT_LOG_DIR = "/srv/tools/python/lib/logs/processing_queue"
+DEFAULT_MAX_JOBS = 3
+DEFAULT_WORK_MEM_MB = 3500  # work_mem set by parcels_convert.update_production
+DEFAULT_MEM_OPS = 2  # sort/hash steps assumed to hold work_mem at the same time per job
+DEFAULT_DB_MEMORY_MB = 16000
+POLL_SECONDS = 2.0
+
+
+@dataclass
+class CountyJob:
+    """One parcels_convert.py run."""
+    line_no: int
+    command: List[str]
+    county: str
+    function: str = ""
+    process: Optional[subprocess.Popen] = None
+    log_path: Optional[Path] = None
+    started: float = 0.0
+    finished: float = 0.0
+    returncode: Optional[int] = None
+    error: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.county} (line {self.line_no})"
+
+
+def parse_queue_file(path: Path, python: str, script: str) -> List[CountyJob]:
+    """Read the queue file into jobs, in file order."""
+    jobs: List[CountyJob] = []
+    for line_no, raw in enumerate(path.read_text().splitlines(), start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            tokens = shlex.split(line)
+        except ValueError as e:
+            logging.error(f"Line {line_no}: cannot parse '{line}': {e}")
+            continue
+        script_index = next((i for i, t in enumerate(tokens) if t.endswith(".py")), None)
+        if script_index is not None:
+            command = tokens  # full command line (old processing_queue.sh form)
+            args = tokens[script_index + 1:]
+        else:
+            command = [python, script, *tokens]
+            args = tokens
+        if len(args) < 5:
+            logging.error(f"Line {line_no}: expected 'county date_stamp function data_date server [state]', got '{line}'")
+            continue
+        jobs.append(CountyJob(line_no=line_no, command=command, county=args[0].lower(), function=args[2]))
+    return jobs
+
+
+def load_county_registry(script: str):
+    """Import county_registry.py from next to parcels_convert.py (None if it is not there)."""
+    path = Path(script).with_name("county_registry.py")
+    if not path.exists():
+        return None
+    spec = importlib.util.spec_from_file_location("county_registry", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CountyScheduler:
+    """Start jobs while the job cap and database memory budget allow; never stop on failure."""
+
+    def __init__(self, jobs: List[CountyJob], max_jobs: int, job_memory_mb: int, db_memory_mb: int, log_dir: Path):
+        self.pending = list(jobs)
+        self.running: List[CountyJob] = []
+        self.done: List[CountyJob] = []
+        self.max_jobs = max(1, max_jobs)
+        self.job_memory_mb = job_memory_mb
+        self.db_memory_mb = db_memory_mb
+        self.log_dir = log_dir
+
+    @property
+    def memory_in_use_mb(self) -> int:
+        return len(self.running) * self.job_memory_mb
+
+    def _can_start(self) -> bool:
+        if not self.running:
+            return True
+        if len(self.running) >= self.max_jobs:
+            return False
+        return self.memory_in_use_mb + self.job_memory_mb <= self.db_memory_mb
+
+    def _next_job(self) -> Optional[CountyJob]:
+        busy = {job.county for job in self.running}
+        for job in self.pending:
+            if job.county not in busy:
+                return job
+        return None
+
+    def _start(self, job: CountyJob) -> None:
+        self.pending.remove(job)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        job.log_path = self.log_dir / f"{job.county}_{stamp}_line{job.line_no}.log"
+        job.started = time.monotonic()
+        try:
+            with open(job.log_path, "w") as log_file:
+                log_file.write(f"$ {shlex.join(job.command)}\n")
+                log_file.flush()
+                job.process = subprocess.Popen(job.command, stdout=log_file, stderr=subprocess.STDOUT,
+                                               start_new_session=True)
+        except OSError as e:
+            job.error = str(e)
+            job.returncode = -1
+            job.finished = time.monotonic()
+            logging.error(f"Could not start {job.label}: {e}")
+            self.done.append(job)
+            return
+        self.running.append(job)
+        logging.info(f"Started {job.label}: {shlex.join(job.command)} "
+                     f"[{len(self.running)} running, {self.memory_in_use_mb}MB of {self.db_memory_mb}MB work_mem budget]")
+
+    def _reap(self) -> None:
+        for job in list(self.running):
+            returncode = job.process.poll()
+            if returncode is None:
+                continue
+            job.returncode = returncode
+            job.finished = time.monotonic()
+            self.running.remove(job)
+            self.done.append(job)
+            minutes = (job.finished - job.started) / 60
+            if returncode == 0:
+                logging.info(f"Finished {job.label} in {minutes:.1f} min")
+            else:
+                logging.error(f"FAILED {job.label} with exit code {returncode} after {minutes:.1f} min; see {job.log_path}")
+
+    def run(self) -> List[CountyJob]:
+        """Run every job; return the finished jobs in completion order."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            while self.pending or self.running:
+                self._reap()
+                while self.pending and self._can_start():
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    self._start(job)
+                if self.running:
+                    time.sleep(POLL_SECONDS)
+        except KeyboardInterrupt:
+            logging.warning(f"Interrupted; stopping {len(self.running)} running job(s), "
+                            f"{len(self.pending)} not started")
+            self.stop()
+            raise
+        return self.done
+
+    def stop(self) -> None:
+        """Terminate running jobs (their whole process group) and wait for them."""
+        for job in self.running:
+            try:
+                os.killpg(job.process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for job in self.running:
+            try:
+                job.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(job.process.pid, signal.SIGKILL)
+                job.process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run county parcel conversions concurrently within a database memory budget.")
+    parser.add_argument("queue_file", help="File with one parcels_convert.py argument list (or command line) per line")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS,
+                        help=f"Maximum concurrent county conversions (default: {DEFAULT_MAX_JOBS})")
+    parser.add_argument("--db-memory-mb", type=int, default=DEFAULT_DB_MEMORY_MB,
+                        help=f"Database server memory the running jobs may claim through work_mem (default: {DEFAULT_DB_MEMORY_MB})")
+    parser.add_argument("--work-mem-mb", type=int, default=DEFAULT_WORK_MEM_MB,
+                        help=f"work_mem each conversion sets (default: {DEFAULT_WORK_MEM_MB})")
+    parser.add_argument("--mem-ops", type=int, default=DEFAULT_MEM_OPS,
+                        help=f"Sort/hash steps per job assumed to hold work_mem at once (default: {DEFAULT_MEM_OPS})")
+    parser.add_argument("--python", default=DEFAULT_PYTHON, help=f"Python interpreter for argument-only lines (default: {DEFAULT_PYTHON})")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help=f"parcels_convert.py path for argument-only lines (default: {DEFAULT_SCRIPT})")
+    parser.add_argument("--log-dir", default=DEFAULT_LOG_DIR, help=f"Directory for per-job logs (default: {DEFAULT_LOG_DIR})")
+    parser.add_argument("--dry-run", action="store_true", help="Print the jobs and the effective concurrency without running them")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    jobs = parse_queue_file(Path(args.queue_file), args.python, args.script)
+    if not jobs:
+        logging.error(f"No jobs found in {args.queue_file}")
+        sys.exit(1)
+
+    job_memory_mb = args.work_mem_mb * max(1, args.mem_ops)
+    by_memory = max(1, args.db_memory_mb // job_memory_mb) if job_memory_mb else args.max_jobs
+    concurrency = max(1, min(args.max_jobs, by_memory))
+    logging.info(f"{len(jobs)} job(s); up to {concurrency} at once "
+                 f"(--max-jobs {args.max_jobs}, {job_memory_mb}MB per job within {args.db_memory_mb}MB)")
+    if job_memory_mb > args.db_memory_mb:
+        logging.warning(f"A single job's work_mem claim ({job_memory_mb}MB) exceeds --db-memory-mb; running one job at a time")
+
+    if args.dry_run:
+        registry = load_county_registry(args.script)
+        for job in jobs:
+            print(f"{job.label}: {shlex.join(job.command)}")
+            if registry is None or job.function != "do_all_mapwise":
+                continue
+            try:
+                plan = registry.plan_county(job.county)
+            except KeyError:
+                print("    not in county_registry.json -- parcels_convert.py will reject this county")
+                continue
+            print(f"    stages: {' -> '.join(plan.stages)}")
+        return
+
+    scheduler = CountyScheduler(jobs, args.max_jobs, job_memory_mb, args.db_memory_mb, Path(args.log_dir))
+    started = time.monotonic()
+    try:
+        finished = scheduler.run()
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    failed = [job for job in finished if job.returncode != 0]
+    logging.info(f"Queue finished in {(time.monotonic() - started) / 60:.1f} min: "
+                 f"{len(finished) - len(failed)} succeeded, {len(failed)} failed")
+    for job in failed:
+        logging.error(f"  {job.label}: exit code {job.returncode}{' (' + job.error + ')' if job.error else ''}; log {job.log_path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,5 @@
 #!/bin/bash
 
-
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py broward current do_all_mapwise 20250708 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py seminole current do_all_mapwise 20250705 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py osceola current do_all_mapwise 20250706 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py lake current do_all_mapwise 20250706 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py marion current do_all_mapwise 20250705 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py hernando current do_all_mapwise 20250705 gisdev
-/usr/bin/python3 /srv/tools/python/lib/parcels_convert.py martin current do_all_mapwise 20250630 gisdev
\ No newline at end of file
+# County list lives in processing_queue.txt; processing_queue.py runs the conversions
+# concurrently (see --max-jobs / --db-memory-mb).
+cd "$(dirname "$0")" && exec /usr/bin/python3 processing_queue.py processing_queue.txt "$@"
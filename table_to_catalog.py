@@ -34,6 +34,7 @@ from typing import Dict, List, Optional, Tuple
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from catalog_access import SQL_LAYERS_TRANSFORMS, catalog_fetchall
 from layers_helpers import PG_CONNECTION, format_name
 from layers_prescrape import generate_expected_values
 
@@ -165,21 +166,8 @@ def fetch_transform_rows(conn) -> Dict[str, TransformRecord]:
 
 def fetch_catalog_map_parcel(conn) -> Dict[str, Dict[str, Optional[str]]]:
     """Fetch parcel_geo catalog rows keyed by entity."""
-    sql = """
-        SELECT ogc_fid,
-               layer_subgroup,
-               state,
-               county,
-               city,
-               fields_obj_transform
-        FROM m_gis_data_catalog_main
-        WHERE layer_subgroup = 'parcel_geo'
-          AND layer_subgroup IS NOT NULL
-          AND status IS DISTINCT FROM 'DELETE'
-    """
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(sql)
-        rows = cur.fetchall()
+        rows = catalog_fetchall(cur, SQL_LAYERS_TRANSFORMS, (["parcel_geo"],))
 
     result: Dict[str, Dict[str, Optional[str]]] = {}
     for row in rows:
@@ -204,22 +192,8 @@ def fetch_catalog_map_for_layers(conn, layers: List[str]) -> Dict[str, Dict[str,
     """
     if not layers:
         return {}
-    placeholders = ", ".join(["%s"] * len(layers))
-    sql = f"""
-        SELECT ogc_fid,
-               layer_subgroup,
-               state,
-               county,
-               city,
-               fields_obj_transform
-        FROM m_gis_data_catalog_main
-        WHERE layer_subgroup IN ({placeholders})
-          AND layer_subgroup IS NOT NULL
-          AND status IS DISTINCT FROM 'DELETE'
-    """
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(sql, layers)
-        rows = cur.fetchall()
+        rows = catalog_fetchall(cur, SQL_LAYERS_TRANSFORMS, (list(layers),))
 
     result: Dict[str, Dict[str, Optional[str]]] = {}
     for row in rows:
@@ -7,12 +7,18 @@ Features:
 2. Supports --test-retrieve (dry-run of rsync, skip further processing).
 3. Supports --test-execute (print commands instead of executing; runs even with no new data).
 4. Supports --debug for verbose rsync and detailed step logging.
-5. Parses each new upload-plan JSON file and executes its command list per entity, ensuring
-   corresponding .backup and .bat files exist.
+5. Parses each new .bat upload plan into typed steps (restore, delete, insert, update, drop),
+   ensuring the corresponding .backup exists. Restores of independent entities run in parallel
+   (--workers), large backups restore with `pg_restore --jobs`, and each entity's
+   delete/insert swap runs in a single transaction over a pooled connection. Plans whose
+   commands cannot be typed run line by line through the shell as before.
 6. Sensitive login details (REMOTE_USER, REMOTE_HOST, optional REMOTE_PORT) are loaded from a .env file.
 7. Logs are written to /srv/data/layers/logs, with console output mirrored.
 8. Optional --local flag uses '~/Downloads/test' as local base directory for testing.
    It also sets REMOTE_BASE_DIR to '/srv/tools/python/layers_scraping/upload_layer/test' so rsync pulls from the test directory.
+9. Completed plans are recorded in a ledger (upload_ledger.json under the local base directory).
+   Re-running after a partial failure picks up the unfinished plans, skips completed ones and
+   reuses staging tables that were already restored; --force ignores the ledger.
 
 Environment variables expected in .env:
     REMOTE_USER   – SSH username for rsync.
@@ -23,15 +29,22 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import hashlib
+import json
 import logging
 import os
 import shlex
 import subprocess
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Any, Union
 import re
 
+import psycopg2
+from psycopg2 import pool as pg_pool
 from dotenv import load_dotenv
 
 # ---------------------------------------------------------------------------
@@ -46,6 +59,11 @@ RSYNC_COMMON_FLAGS = ["-ah", "--no-motd"]  # -a (archive), -h (human-readable si
 RSYNC_ITEMIZE_FLAG = "-i"  # useful for detecting new/updated files
 RSYNC_BIN = os.getenv("RSYNC_BIN", "/opt/homebrew/bin/rsync")  # path to modern rsync binary
 
+LEDGER_FILENAME = "upload_ledger.json"
+DEFAULT_WORKERS = 3  # concurrent pg_restore processes (one per entity)
+DEFAULT_RESTORE_JOBS = 4  # pg_restore --jobs for large backups
+DEFAULT_LARGE_BACKUP_MB = 1024
+
 # ---------------------------------------------------------------------------
 # Argument Parsing
 # ---------------------------------------------------------------------------
@@ -58,6 +76,13 @@ def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--test-execute", action="store_true", help="Print would-be executed commands instead of running them.")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging and verbose rsync (-v).")
     parser.add_argument("--local", action="store_true", help="Use ~/Downloads/test as LOCAL_BASE_DIR for local testing.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Entity restores to run in parallel (default: {DEFAULT_WORKERS}).")
+    parser.add_argument("--restore-jobs", type=int, default=DEFAULT_RESTORE_JOBS,
+                        help=f"pg_restore --jobs for large backups (default: {DEFAULT_RESTORE_JOBS}).")
+    parser.add_argument("--large-backup-mb", type=int, default=DEFAULT_LARGE_BACKUP_MB,
+                        help=f"Backups at least this size restore with --restore-jobs (default: {DEFAULT_LARGE_BACKUP_MB}).")
+    parser.add_argument("--force", action="store_true", help="Ignore the ledger and re-run plans already recorded as completed.")
     return parser.parse_args(argv)
 
 
@@ -197,30 +222,399 @@ def parse_bat_commands(bat_path: Path) -> List[str]:
     return commands
 
 
-def process_bat_file(bat_path: Path, test_execute: bool) -> None:
-    """Validate matching .backup exists and execute commands from .bat."""
+# ---------------------------------------------------------------------------
+# Plan Parsing (typed steps)
+# ---------------------------------------------------------------------------
+
+# Connection options shared by pg_restore and psql, mapped to libpq keywords
+CONN_OPTIONS = {
+    "-h": "host", "--host": "host",
+    "-p": "port", "--port": "port",
+    "-U": "user", "--username": "user",
+    "-d": "dbname", "--dbname": "dbname",
+}
+# Other options that take a value (so their value is not mistaken for a positional argument)
+PG_RESTORE_VALUE_OPTIONS = {
+    "-f", "--file", "-F", "--format", "-I", "--index", "-j", "--jobs", "-L", "--use-list",
+    "-n", "--schema", "-N", "--exclude-schema", "-P", "--function", "-S", "--superuser",
+    "-t", "--table", "-T", "--trigger", "--role", "--section",
+}
+PSQL_VALUE_OPTIONS = {"-v", "--set", "--variable", "-P", "--pset", "-F", "--field-separator",
+                      "-R", "--record-separator", "-L", "--log-file", "-o", "--output"}
+# Statements PostgreSQL refuses to run inside a transaction block
+NON_TRANSACTIONAL_SQL = re.compile(r"^\s*(VACUUM|ALTER\s+SYSTEM|CREATE\s+DATABASE|DROP\s+DATABASE)\b|\bCONCURRENTLY\b", re.I)
+SQL_KINDS = {"DELETE": "delete", "INSERT": "insert", "UPDATE": "update", "DROP": "drop"}
+DROP_TABLE_PATTERN = re.compile(r"^\s*DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?([\w.\"]+)\s*;?\s*$", re.I)
+
+
+@dataclass
+class PlanStep:
+    """One command of an upload plan.
+
+    kind is restore, delete, insert, update, drop, sql (any other statement) or shell
+    (a command that could not be typed and runs through the shell unchanged).
+    """
+    kind: str
+    command: str
+    conn: Dict[str, str] = field(default_factory=dict)
+    sql: str = ""
+    argv: List[str] = field(default_factory=list)  # pg_restore arguments other than connection options
+    backup: str = ""
+
+    def describe(self) -> str:
+        if self.kind == "restore":
+            return f"restore {self.backup}"
+        if self.kind == "shell":
+            return f"shell {self.command}"
+        return f"{self.kind} {' '.join(self.sql.split())}"
+
+
+@dataclass
+class UploadPlan:
+    """The typed steps of one .bat file (one entity)."""
+    bat_path: Path
+    backup_path: Path
+    key: str
+    steps: List[PlanStep]
+    restore: PlanStep | None = None
+    statements: List[PlanStep] = field(default_factory=list)
+    conn: Dict[str, str] = field(default_factory=dict)
+    staging_table: str | None = None
+    legacy_reason: str | None = None  # set when the plan has to run line by line through the shell
+
+    @property
+    def name(self) -> str:
+        return self.bat_path.name
+
+
+def _split_option(token: str, tokens: List[str], index: int, value_options: set) -> tuple[str, str | None, int]:
+    """Return (option, value, next index) for the option at tokens[index]."""
+    if token.startswith("--") and "=" in token:
+        option, value = token.split("=", 1)
+        return option, value, index + 1
+    if token in CONN_OPTIONS or token in value_options or token in ("-c", "--command"):
+        value = tokens[index + 1] if index + 1 < len(tokens) else None
+        if value is None or (value.startswith("-") and token in CONN_OPTIONS):
+            return token, None, index + 1  # option given without a value (e.g. a bare `-h`)
+        return token, value, index + 2
+    if len(token) > 2 and token[:2] in CONN_OPTIONS and not token.startswith("--"):
+        return token[:2], token[2:], index + 1  # attached short form, e.g. -p5432
+    return token, None, index + 1
+
+
+def parse_step(command: str) -> PlanStep:
+    """Classify one command line of a plan; anything unrecognised becomes a shell step."""
+    shell_step = PlanStep(kind="shell", command=command)
+    try:
+        tokens = [t for t in shlex.split(command) if t != ";"]
+    except ValueError:
+        return shell_step
+    if not tokens:
+        return shell_step
+    program = Path(tokens[0]).name.lower().removesuffix(".exe")
+
+    if program == "pg_restore":
+        conn: Dict[str, str] = {}
+        argv: List[str] = []
+        positionals: List[str] = []
+        i = 1
+        while i < len(tokens):
+            token = tokens[i]
+            if not token.startswith("-") or token == "-":
+                positionals.append(token)
+                i += 1
+                continue
+            option, value, i = _split_option(token, tokens, i, PG_RESTORE_VALUE_OPTIONS)
+            if option in CONN_OPTIONS:
+                if value:
+                    conn[CONN_OPTIONS[option]] = value
+            elif value is not None:
+                argv.extend([option, value])
+            else:
+                argv.append(option)
+        if len(positionals) != 1:
+            return shell_step
+        return PlanStep(kind="restore", command=command, conn=conn, argv=argv, backup=positionals[0])
+
+    if program == "psql":
+        conn = {}
+        sql: List[str] = []
+        positionals = []
+        i = 1
+        while i < len(tokens):
+            token = tokens[i]
+            if not token.startswith("-"):
+                positionals.append(token)
+                i += 1
+                continue
+            option, value, i = _split_option(token, tokens, i, PSQL_VALUE_OPTIONS)
+            if option in ("-c", "--command"):
+                sql.append(value or "")
+            elif option in ("-f", "--file"):
+                return shell_step
+            elif option in CONN_OPTIONS and value:
+                conn[CONN_OPTIONS[option]] = value
+        for keyword, value in zip(("dbname", "user"), positionals):
+            conn.setdefault(keyword, value)
+        if len(sql) != 1 or not sql[0].strip() or NON_TRANSACTIONAL_SQL.search(sql[0]):
+            return shell_step
+        first_word = sql[0].split(None, 1)[0].upper()
+        return PlanStep(kind=SQL_KINDS.get(first_word, "sql"), command=command, conn=conn, sql=sql[0])
+
+    return shell_step
+
+
+def plan_key(bat_path: Path, backup_path: Path) -> str:
+    """Ledger key: the plan's file name plus a digest of its commands and backup size/mtime."""
+    digest = hashlib.sha256(bat_path.read_bytes())
+    stat = backup_path.stat()
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return f"{bat_path.name}:{digest.hexdigest()[:16]}"
+
+
+def load_plan(bat_path: Path) -> UploadPlan | None:
+    """Parse a .bat file into an UploadPlan (None when it cannot be run)."""
     backup_path = bat_path.with_suffix(".backup")
     if not backup_path.exists():
         logging.error("Missing .backup file for %s", bat_path.name)
-        return
+        return None
 
-    logging.info("Processing batch file: %s", bat_path)
     commands = parse_bat_commands(bat_path)
     if not commands:
         logging.warning("No commands parsed from %s; skipping", bat_path)
-        return
+        return None
 
     context = {
         "backup": str(backup_path),
         "bat": str(bat_path),
     }
+    steps = [parse_step(cmd.format(**context)) for cmd in commands]
+    plan = UploadPlan(bat_path=bat_path, backup_path=backup_path, key=plan_key(bat_path, backup_path), steps=steps)
+
+    # Typed execution needs: one leading restore, then psql statements against a single database
+    kinds = [step.kind for step in steps]
+    statements = steps[1:]
+    if "shell" in kinds:
+        plan.legacy_reason = "untyped command(s)"
+    elif kinds[0] != "restore" or "restore" in kinds[1:]:
+        plan.legacy_reason = "plan does not start with a single pg_restore"
+    elif not statements:
+        plan.legacy_reason = "no SQL statements after the restore"
+    elif any(step.conn != statements[0].conn for step in statements):
+        plan.legacy_reason = "statements target different connections"
+    if plan.legacy_reason:
+        return plan
+
+    plan.restore = steps[0]
+    plan.statements = statements
+    plan.conn = statements[0].conn
+    drops = [DROP_TABLE_PATTERN.match(step.sql) for step in statements if step.kind == "drop"]
+    staging = [m.group(1) for m in drops if m]
+    if len(staging) == 1:
+        plan.staging_table = staging[0]
+    return plan
+
 
-    for cmd in commands:
-        formatted_cmd = cmd.format(**context)
-        if test_execute:
-            logging.info("[TEST-EXECUTE] %s", formatted_cmd)
-        else:
-            run_subprocess(formatted_cmd, capture=True)
+# ---------------------------------------------------------------------------
+# Ledger
+# ---------------------------------------------------------------------------
+
+
+class UploadLedger:
+    """Local JSON record of plan progress (queued -> restored -> completed).
+
+    Entries are keyed by plan_key, so a .bat or .backup that changes gets a fresh entry.
+    The file is rewritten atomically after every change.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.plans: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                self.plans = json.loads(path.read_text()).get("plans", {})
+            except (OSError, ValueError) as exc:
+                logging.warning("Could not read ledger %s (%s); starting a new one", path, exc)
+
+    def done(self, key: str, stage: str) -> bool:
+        return stage in self.plans.get(key, {})
+
+    def mark(self, plan: UploadPlan, stage: str) -> None:
+        with self._lock:
+            entry = self.plans.setdefault(plan.key, {"bat": str(plan.bat_path)})
+            entry[stage] = _dt.datetime.now().isoformat(timespec="seconds")
+            if stage == "completed":
+                # Older unfinished versions of the same plan are superseded
+                for key, other in list(self.plans.items()):
+                    if key != plan.key and other.get("bat") == entry["bat"] and "completed" not in other:
+                        del self.plans[key]
+            self._save()
+
+    def pending_bats(self) -> List[Path]:
+        """.bat files of plans queued by an earlier run that never completed."""
+        paths = {Path(entry["bat"]) for entry in self.plans.values() if "completed" not in entry}
+        return sorted(path for path in paths if path.exists())
+
+    def _save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"plans": self.plans}, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Plan Execution
+# ---------------------------------------------------------------------------
+
+
+class ConnectionPools:
+    """Lazily created psycopg2 pools, one per distinct set of connection options."""
+
+    def __init__(self, maxconn: int):
+        self.maxconn = maxconn
+        self._pools: Dict[tuple, pg_pool.ThreadedConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, conn: Dict[str, str]) -> pg_pool.ThreadedConnectionPool:
+        key = tuple(sorted(conn.items()))
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = pg_pool.ThreadedConnectionPool(1, self.maxconn, **conn)
+            return self._pools[key]
+
+    def run(self, conn: Dict[str, str], statements: List[tuple[str, str]]) -> List[int]:
+        """Execute (label, sql) pairs in one transaction; return each statement's rowcount."""
+        pool = self._pool(conn)
+        db = pool.getconn()
+        try:
+            rowcounts = []
+            with db:  # commits on success, rolls back on error
+                with db.cursor() as cur:
+                    for label, sql in statements:
+                        logging.debug("  %s: %s", label, sql)
+                        cur.execute(sql)
+                        rowcounts.append(cur.rowcount)
+            return rowcounts
+        finally:
+            pool.putconn(db, close=bool(db.closed))
+
+    def table_exists(self, conn: Dict[str, str], table: str) -> bool:
+        pool = self._pool(conn)
+        db = pool.getconn()
+        try:
+            with db, db.cursor() as cur:
+                cur.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+                return bool(cur.fetchone()[0])
+        finally:
+            pool.putconn(db, close=bool(db.closed))
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.closeall()
+
+
+def build_restore_command(plan: UploadPlan, restore_jobs: int, large_backup_bytes: int) -> List[str]:
+    """pg_restore argv for the plan, adding --jobs when the backup is large."""
+    step = plan.restore
+    cmd = ["pg_restore", *step.argv]
+    for option, keyword in (("-h", "host"), ("-p", "port"), ("-U", "user"), ("-d", "dbname")):
+        if step.conn.get(keyword):
+            cmd.extend([option, step.conn[keyword]])
+    backup = Path(step.backup)
+    size = (backup if backup.exists() else plan.backup_path).stat().st_size
+    has_jobs = any(arg in ("-j", "--jobs") or arg.startswith("--jobs=") for arg in step.argv)
+    single_txn = any(arg in ("-1", "--single-transaction") for arg in step.argv)
+    if restore_jobs > 1 and size >= large_backup_bytes and not has_jobs and not single_txn:
+        cmd.extend(["--jobs", str(restore_jobs)])
+    cmd.append(step.backup)
+    return cmd
+
+
+def restore_plan(plan: UploadPlan, ledger: UploadLedger, pools: ConnectionPools, args: argparse.Namespace) -> None:
+    """Restore the plan's backup unless the ledger shows its staging table is already loaded."""
+    staging_conn = plan.conn
+    staging_exists = bool(plan.staging_table) and pools.table_exists(staging_conn, plan.staging_table)
+    if ledger.done(plan.key, "restored") and not args.force and (staging_exists or not plan.staging_table):
+        logging.info("%s: backup already restored; skipping pg_restore", plan.name)
+        return
+    if staging_exists:
+        # Left over from an interrupted restore; the plan drops this table at the end anyway
+        logging.warning("%s: dropping stale staging table %s before restoring", plan.name, plan.staging_table)
+        pools.run(staging_conn, [("drop", f"DROP TABLE {plan.staging_table}")])
+
+    cmd = build_restore_command(plan, args.restore_jobs, args.large_backup_mb * 1024 * 1024)
+    logging.info("%s: %s", plan.name, shlex.join(cmd))
+    run_subprocess(cmd, capture=True)
+    ledger.mark(plan, "restored")
+
+
+def swap_plan(plan: UploadPlan, ledger: UploadLedger, pools: ConnectionPools) -> None:
+    """Run the plan's statements (delete, insert, updates, drop) as one transaction."""
+    rowcounts = pools.run(plan.conn, [(step.kind, step.sql) for step in plan.statements])
+    summary = ", ".join(
+        f"{step.kind} {count}" for step, count in zip(plan.statements, rowcounts) if step.kind in ("delete", "insert", "update")
+    )
+    logging.info("%s: swap committed (%s)", plan.name, summary or "no row changes")
+    ledger.mark(plan, "completed")
+
+
+def run_legacy_plan(plan: UploadPlan, ledger: UploadLedger) -> None:
+    """Run every command of the plan through the shell, in order."""
+    logging.warning("%s: %s; running commands through the shell", plan.name, plan.legacy_reason)
+    for step in plan.steps:
+        run_subprocess(step.command, capture=True)
+    ledger.mark(plan, "completed")
+
+
+def log_plan(plan: UploadPlan) -> None:
+    """--test-execute output: the typed steps of a plan."""
+    mode = f"shell ({plan.legacy_reason})" if plan.legacy_reason else "typed"
+    logging.info("Plan %s [%s]", plan.name, mode)
+    for step in plan.steps:
+        logging.info("[TEST-EXECUTE] %s", step.describe() if not plan.legacy_reason else step.command)
+
+
+def run_plans(plans: List[UploadPlan], ledger: UploadLedger, args: argparse.Namespace) -> List[str]:
+    """Execute plans; return the names of those that failed.
+
+    Restores run on a thread pool in plan order; swaps run on the calling thread in the same
+    order as each restore finishes, so plans touching the same rows apply as they did serially.
+    """
+    todo = []
+    for plan in plans:
+        if ledger.done(plan.key, "completed") and not args.force:
+            logging.info("%s: already completed (ledger); skipping", plan.name)
+            continue
+        ledger.mark(plan, "queued")
+        todo.append(plan)
+
+    failed: List[str] = []
+    pools = ConnectionPools(maxconn=max(1, args.workers) + 1)
+    executor = ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="restore")
+    try:
+        restores: Dict[str, Future] = {
+            plan.key: executor.submit(restore_plan, plan, ledger, pools, args)
+            for plan in todo if not plan.legacy_reason
+        }
+        for plan in todo:
+            logging.info("Processing batch file: %s", plan.bat_path)
+            try:
+                if plan.legacy_reason:
+                    run_legacy_plan(plan, ledger)
+                    continue
+                restores[plan.key].result()
+                swap_plan(plan, ledger, pools)
+            except (subprocess.CalledProcessError, psycopg2.Error, OSError) as exc:
+                logging.error("%s failed: %s", plan.name, str(exc).strip())
+                failed.append(plan.name)
+    except KeyboardInterrupt:
+        logging.warning("Interrupted; queued restores cancelled (re-run to resume from the ledger)")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        pools.close()
+    return failed
 
 
 # ---------------------------------------------------------------------------
@@ -287,16 +681,31 @@ def main(argv: List[str] | None = None) -> None:
     # Determine which .bat files to process
     bat_paths = gather_bat_paths(changed_files, force_all=args.test_execute)
 
+    ledger = UploadLedger(LOCAL_BASE_DIR / LEDGER_FILENAME)
+    if not args.test_execute and not args.force:
+        # Plans left unfinished by an earlier run are retried even though rsync no longer reports them
+        for bat_path in ledger.pending_bats():
+            if bat_path not in bat_paths:
+                logging.info("Resuming unfinished plan from ledger: %s", bat_path.name)
+                bat_paths.append(bat_path)
+
     if not bat_paths and not args.test_execute:
         logging.info("No new .bat files detected; nothing to process.")
         return
 
-    processed_count = 0
-    for bat_path in bat_paths:
-        process_bat_file(bat_path, test_execute=args.test_execute)
-        processed_count += 1
+    plans = [plan for plan in (load_plan(bat_path) for bat_path in bat_paths) if plan]
+    if args.test_execute:
+        for plan in plans:
+            log_plan(plan)
+        logging.info("Processed %d batch file(s).", len(plans))
+        logging.info("Upload process completed.")
+        return
 
-    logging.info("Processed %d batch file(s).", processed_count)
+    failed = run_plans(plans, ledger, args)
+    logging.info("Processed %d batch file(s).", len(plans) - len(failed))
+    if failed:
+        logging.error("%d plan(s) failed: %s (re-run to retry; finished work is skipped)", len(failed), ", ".join(failed))
+        sys.exit(1)
 
     logging.info("Upload process completed.")
 